@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de big_o() sobre expresiones T(n) con cientos de términos.
+
+Compara:
+  • la implementación anterior (simplify + expand + degree + búsqueda en texto)
+  • clasificar() sobre la expresión SymPy (un recorrido del árbol)
+  • ExpresionSimbolica.big_o() sobre la representación dispersa
+
+Las expresiones son sumas de términos N^a * M^b * log(N)^c con coeficientes
+al azar; el último caso agrega además un término 2^N.
+
+Uso:
+    python benchmarks/bench_big_o.py [--terminos 25 50 100 200] [--semilla 0]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+import sympy
+from sympy.core.cache import clear_cache
+
+# Agregar el directorio src al path para importar módulos
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from core.expresion_simbolica import ExpresionSimbolica
+from core.clasificacion_asintotica import clasificar
+
+
+def big_o_anterior(expr):
+    """Réplica de la implementación anterior de big_o(), usada como referencia"""
+    try:
+        expr_simplificada = sympy.simplify(expr)
+        variables = list(expr_simplificada.free_symbols)
+        if not variables:
+            return "O(1)"
+        expr_str = str(expr_simplificada)
+        for v in variables:
+            if expr_simplificada.has(2**v) or f'2**{v}' in expr_str or '2**(' in expr_str:
+                return "O(2^n)"
+        for v in variables:
+            if expr_simplificada.has(sympy.log(v)) or f'log({v})' in expr_str or '/log(' in expr_str:
+                if (expr_simplificada.has(v * sympy.log(v)) or
+                        f'{v}*log({v})' in expr_str or f'log({v})*{v}' in expr_str):
+                    return "O(n log(n))"
+                return "O(log(n))"
+        expr_expanded = sympy.expand(expr_simplificada)
+        max_degree = max(sympy.degree(expr_expanded, v) for v in variables)
+        if max_degree == 0:
+            return "O(1)"
+        elif max_degree == 1:
+            return "O(n)"
+        elif max_degree == 2:
+            return "O(n²)"
+        elif max_degree == 3:
+            return "O(n³)"
+        return f"O(n^{max_degree})"
+    except Exception:
+        return "O(?)"
+
+
+def generar_costo(terminos, rng, exponencial=False):
+    """
+    Costo con 'terminos' sumandos distintos coef * N^a * M^b * log(N)^c,
+    construido con la aritmética de ExpresionSimbolica como en el analizador.
+    """
+    N = ExpresionSimbolica.variable('N')
+    M = ExpresionSimbolica.variable('M')
+    log_n = ExpresionSimbolica(sympy.log(sympy.Symbol('N'), 2))
+    dos_a_la_n = ExpresionSimbolica(2 ** sympy.Symbol('N'))
+    combinaciones = [(a, b, c) for a in range(10) for b in range(7) for c in range(3)]
+    elegidas = rng.sample(combinaciones, min(terminos, len(combinaciones)))
+    costo = ExpresionSimbolica.constante(0)
+    for a, b, c in elegidas:
+        termino = ExpresionSimbolica.constante(rng.randint(1, 9)) * N ** a * M ** b * log_n ** c
+        costo = costo + termino
+    if exponencial:
+        costo = costo + dos_a_la_n
+    return costo
+
+
+def medir(funcion):
+    clear_cache()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de big_o()")
+    parser.add_argument("--terminos", type=int, nargs='+', default=[25, 50, 100, 200],
+                        help="Cantidad de términos de cada expresión")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--sin-anterior", action="store_true",
+                        help="No medir la implementación anterior (lenta con muchos términos)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.semilla)
+    print(f"{'términos':>9} | {'anterior':>10} | {'clasificar':>10} | {'disperso':>10} | resultado")
+    print("-" * 75)
+    casos = [(terminos, False) for terminos in args.terminos] + [(args.terminos[-1], True)]
+    for terminos, exponencial in casos:
+        costo = generar_costo(terminos, rng, exponencial)
+        expr = costo.expr
+
+        if args.sin_anterior:
+            t_anterior, r_anterior = float('nan'), '-'
+        else:
+            t_anterior, r_anterior = medir(lambda: big_o_anterior(expr))
+        t_arbol, r_arbol = medir(lambda: clasificar(expr).como_big_o())
+        t_disperso, r_disperso = medir(costo.big_o)
+
+        print(f"{len(costo.terminos):>9} | {t_anterior * 1000:8.1f}ms | {t_arbol * 1000:8.2f}ms | "
+              f"{t_disperso * 1000:8.2f}ms | {r_disperso} (anterior: {r_anterior})")
+        assert r_arbol == r_disperso
+
+
+if __name__ == "__main__":
+    main()
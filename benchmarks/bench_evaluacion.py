@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la evaluación numérica de T(n) para las gráficas.
+
+Compara, para cada ejemplo de 'ejemplos/':
+  • la evaluación anterior: expr.subs(N, n) punto por punto (n = 1..20)
+  • evaluar_vector() sobre la misma grilla (evaluador lambdify compilado)
+  • evaluar_vector() sobre una grilla logarítmica hasta n = 10^6
+
+La primera llamada a evaluar_vector() incluye la compilación con lambdify;
+las siguientes reutilizan el evaluador guardado en el cache.
+
+Uso:
+    python benchmarks/bench_evaluacion.py [--n-max 1000000] [--repeticiones 5]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import sympy
+
+# Agregar el directorio src al path para importar módulos
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from core.pseudogrammar import tokenizar
+from core.parser_estructural import parsear
+from core.analizador_complejidad import AnalizadorComplejidad
+from core.expresion_simbolica import rango_evaluacion
+
+
+def evaluar_anterior(expr, n_values):
+    """Réplica del bucle de subs de las gráficas anteriores, usada como referencia"""
+    valores = []
+    for n in n_values:
+        try:
+            valores.append(float(expr.subs(sympy.Symbol('N'), int(n)).evalf()))
+        except (TypeError, ValueError):
+            valores.append(float('nan'))
+    return valores
+
+
+def cargar_funciones_tiempo():
+    """T(n) de la primera función de cada ejemplo"""
+    resultados = []
+    for archivo in sorted((PROJECT_ROOT / "ejemplos").glob("*.txt")):
+        arbol = parsear(tokenizar(archivo.read_text(encoding='utf-8')))
+        analizador = AnalizadorComplejidad(arbol)
+        funciones = list(analizador.funciones)
+        resultado = analizador.analizar(funciones[0] if funciones else None)
+        resultados.append((archivo.stem, resultado.funcion_tiempo))
+    return resultados
+
+
+def medir(funcion, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de evaluación de T(n)")
+    parser.add_argument("--n-max", type=int, default=10 ** 6, help="Mayor n de la grilla logarítmica")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones por caso")
+    args = parser.parse_args()
+
+    pequeno = np.arange(1, 21, dtype=float)
+    grande = rango_evaluacion(args.n_max)
+    print(f"Grilla grande: {len(grande)} puntos hasta n = {args.n_max}")
+    print(f"{'ejemplo':<32} | {'subs n≤20':>10} | {'compilar':>9} | {'vector n≤20':>11} | "
+          f"{'vector grande':>13} | log10 T(n_max)")
+    print("-" * 109)
+
+    total_anterior = total_vector = 0.0
+    for nombre, funcion_tiempo in cargar_funciones_tiempo():
+        expr = funcion_tiempo.expr
+        t_anterior = medir(lambda: evaluar_anterior(expr, pequeno), args.repeticiones)
+
+        inicio = time.perf_counter()
+        funcion_tiempo.evaluar_vector(pequeno)
+        t_compilar = time.perf_counter() - inicio
+
+        t_pequeno = medir(lambda: funcion_tiempo.evaluar_vector(pequeno), args.repeticiones)
+        t_grande = medir(lambda: funcion_tiempo.valores_grafica(grande), args.repeticiones)
+        total_anterior += t_anterior
+        total_vector += t_pequeno
+
+        # Los evaluadores compilados coinciden con subs donde ambos son finitos
+        referencia = np.array(evaluar_anterior(expr, pequeno))
+        finitos = np.isfinite(referencia)
+        assert np.allclose(funcion_tiempo.evaluar_vector(pequeno)[finitos], referencia[finitos]), nombre
+
+        ultimo = funcion_tiempo.evaluar_log(grande[-1:])[0] / np.log(10)
+        print(f"{nombre:<32} | {t_anterior * 1000:8.2f}ms | {t_compilar * 1000:7.1f}ms | "
+              f"{t_pequeno * 1000:9.3f}ms | {t_grande * 1000:11.3f}ms | {ultimo:.1f}")
+
+    print("-" * 109)
+    print(f"Total n≤20: subs {total_anterior * 1000:.1f}ms, vectorizado {total_vector * 1000:.2f}ms "
+          f"(x{total_anterior / total_vector:.0f})")
+
+
+if __name__ == "__main__":
+    main()
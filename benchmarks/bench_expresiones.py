@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Microbenchmarks de la aritmética de ExpresionSimbolica.
+
+Compara la representación dispersa de términos contra la implementación
+anterior, que envolvía una expresión SymPy y llamaba a sympify en cada
+operación:
+  • acumulación de constantes (el patrón 'cuerpo += ...' del analizador)
+  • costo de un bucle anidado: control + iteraciones * cuerpo
+  • costeo de cada archivo de 'ejemplos/' (T(n) como texto, sin big_o)
+  • costeo de un programa con todos los ejemplos concatenados
+
+Uso:
+    python benchmarks/bench_expresiones.py [--repeticiones 5]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import sympy
+from sympy.core.cache import clear_cache
+
+# Agregar el directorio src al path para importar módulos
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from core import analizador_complejidad
+from core.pseudogrammar import tokenizar
+from core.parser_estructural import parsear
+from core.expresion_simbolica import ExpresionSimbolica
+from core.analizador_expresiones import contar_operaciones
+
+
+class ExpresionSympy(ExpresionSimbolica):
+    """Réplica de la implementación anterior (SymPy en cada operación), usada como referencia"""
+
+    __slots__ = ('_sympy',)
+
+    def __init__(self, expr):
+        self._sympy = sympy.sympify(expr)
+
+    @property
+    def expr(self):
+        return self._sympy
+
+    def como_str(self):
+        return str(self.expr)
+
+    @classmethod
+    def constante(cls, valor):
+        return cls(sympy.Integer(valor))
+
+    @classmethod
+    def variable(cls, nombre):
+        return cls(sympy.Symbol(nombre))
+
+    @classmethod
+    def desde_tokens(cls, tokens):
+        return cls.constante(contar_operaciones(tokens))
+
+    def __add__(self, other):
+        return ExpresionSympy(self.expr + self._to_expr(other))
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __mul__(self, other):
+        return ExpresionSympy(self.expr * self._to_expr(other))
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __sub__(self, other):
+        return ExpresionSympy(self.expr - self._to_expr(other))
+
+    def __rsub__(self, other):
+        return ExpresionSympy(self._to_expr(other) - self.expr)
+
+    def __truediv__(self, other):
+        return ExpresionSympy(self.expr / self._to_expr(other))
+
+    def __pow__(self, power):
+        return ExpresionSympy(self.expr ** self._to_expr(power))
+
+
+def acumular_constantes(clase, cantidad=2000):
+    cuerpo = clase.constante(0)
+    for i in range(cantidad):
+        cuerpo += clase.constante(i % 7 + 1)
+    return cuerpo
+
+
+def bucles_anidados(clase, niveles=6, sentencias=20):
+    costo = clase.constante(0)
+    for _ in range(niveles):
+        cuerpo = costo
+        for i in range(sentencias):
+            cuerpo += clase.constante(i % 3 + 1)
+        iteraciones = clase.variable('N') - clase.constante(1) + clase.constante(1)
+        costo = clase.constante(2) + iteraciones + iteraciones * cuerpo
+    return costo
+
+
+def cargar_arboles():
+    """Parsea los ejemplos una sola vez, fuera de la medición"""
+    return [parsear(tokenizar(archivo.read_text(encoding='utf-8')))
+            for archivo in sorted((PROJECT_ROOT / "ejemplos").glob("*.txt"))]
+
+
+def cargar_programa_completo():
+    """Todos los ejemplos concatenados como un único programa"""
+    texto = "\n".join(archivo.read_text(encoding='utf-8')
+                      for archivo in sorted((PROJECT_ROOT / "ejemplos").glob("*.txt")))
+    return parsear(tokenizar(texto))
+
+
+def costear_ejemplos(clase, arboles):
+    """Calcula T(n) de todos los ejemplos usando 'clase' como representación de costos"""
+    original = analizador_complejidad.ExpresionSimbolica
+    analizador_complejidad.ExpresionSimbolica = clase
+    try:
+        for arbol in arboles:
+            analizador = analizador_complejidad.AnalizadorComplejidad(arbol)
+            funciones = list(analizador.funciones)
+            if funciones:
+                costo = analizador._analizar_funcion(analizador.funciones[funciones[0]], set())[0]
+            else:
+                costo = analizador._analizar_nodo(arbol, set())
+            costo.como_str()
+    finally:
+        analizador_complejidad.ExpresionSimbolica = original
+
+
+def costear_programa(clase, arbol):
+    """T(n) del programa completo: acumula el costo de todas las funciones"""
+    original = analizador_complejidad.ExpresionSimbolica
+    analizador_complejidad.ExpresionSimbolica = clase
+    try:
+        analizador = analizador_complejidad.AnalizadorComplejidad(arbol)
+        analizador._analizar_nodo(arbol, set()).como_str()
+    finally:
+        analizador_complejidad.ExpresionSimbolica = original
+
+
+def medir(funcion, repeticiones):
+    """Mejor tiempo, vaciando antes el cache global de SymPy para no favorecer a ninguna variante"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        clear_cache()
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ExpresionSimbolica")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones por caso")
+    args = parser.parse_args()
+
+    arboles = cargar_arboles()
+    programa = cargar_programa_completo()
+    casos = [
+        ("acumular 2000 constantes", acumular_constantes),
+        ("bucles anidados (6 niveles)", bucles_anidados),
+        ("costeo de ejemplos/", lambda clase: costear_ejemplos(clase, arboles)),
+        ("programa con todos los ejemplos", lambda clase: costear_programa(clase, programa)),
+    ]
+
+    print(f"{'caso':<32} | {'sympy':>10} | {'disperso':>10} | aceleración")
+    print("-" * 70)
+    for nombre, caso in casos:
+        t_sympy = medir(lambda: caso(ExpresionSympy), args.repeticiones)
+        t_disperso = medir(lambda: caso(ExpresionSimbolica), args.repeticiones)
+        print(f"{nombre:<32} | {t_sympy * 1000:8.1f}ms | {t_disperso * 1000:8.1f}ms | x{t_sympy / t_disperso:.1f}")
+
+    # La representación dispersa produce la misma expresión al bajar a SymPy
+    for caso in (acumular_constantes, bucles_anidados):
+        a = caso(ExpresionSympy).expr
+        b = caso(ExpresionSimbolica).expr
+        assert sympy.expand(a - b) == 0, caso.__name__
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de las actualizaciones de la gráfica: figura recreada vs persistente.
+
+Simula N actualizaciones sucesivas de la pestaña de gráfica (dos ejes,
+T(n) y su Big O) recorriendo los ejemplos y los rangos de n, y compara:
+  • recrear:    Figure + canvas nuevos en cada actualización (lo que hacía
+                la pestaña antes de SuperficieGrafica)
+  • persistente: una SuperficieGrafica; set_data + relim y dibujo completo
+  • blit:       una SuperficieGrafica con la vista sin cambios (se repite
+                la misma curva), que sólo restaura el fondo y pinta las curvas
+
+Se usa el canvas Agg (sin ventana); en la interfaz, además, recrear destruía
+y creaba el widget del canvas y la barra de herramientas, así que los tiempos
+de 'recrear' son una cota inferior. La memoria se mide con tracemalloc en
+una segunda pasada (tracemalloc enlentece las asignaciones).
+
+Uso:
+    python benchmarks/bench_grafica.py [--actualizaciones 500] [--sin-memoria]
+"""
+
+import gc
+import sys
+import math
+import time
+import argparse
+import statistics
+import tracemalloc
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Agregar el directorio src al path para importar módulos
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from core.pseudogrammar import tokenizar
+from core.parser_estructural import parsear
+from core.analizador_complejidad import AnalizadorComplejidad
+from core.expresion_simbolica import ExpresionSimbolica, rango_evaluacion
+from gui.superficie import SuperficieGrafica
+
+# Los mismos rangos que ofrece la pestaña de gráfica
+RANGOS = (20, 100, 1000, 10 ** 4, 10 ** 6)
+
+
+def preparar_curvas():
+    """Curvas ya evaluadas (como las entrega calcular_curvas) de cada ejemplo y rango"""
+    curvas = []
+    for archivo in sorted((PROJECT_ROOT / "ejemplos").glob("*.txt")):
+        analizador = AnalizadorComplejidad(parsear(tokenizar(archivo.read_text(encoding='utf-8'))))
+        funciones = list(analizador.funciones)
+        resultado = analizador.analizar(funciones[0] if funciones else None)
+        funcion_tiempo = resultado.funcion_tiempo
+        big_o_funcion = ExpresionSimbolica(funcion_tiempo.clase_asintotica().como_expresion())
+        for n_max in RANGOS:
+            n_values = rango_evaluacion(n_max)
+            t_values, t_en_log = funcion_tiempo.valores_grafica(n_values)
+            big_o_values, big_o_en_log = big_o_funcion.valores_grafica(n_values)
+            en_log10 = t_en_log or big_o_en_log
+            if en_log10:
+                t_values = funcion_tiempo.evaluar_log(n_values) / math.log(10)
+                big_o_values = big_o_funcion.evaluar_log(n_values) / math.log(10)
+            curvas.append({
+                'nombre': resultado.nombre_funcion or archivo.stem,
+                'big_o': resultado.big_o,
+                'n_max': n_max,
+                'n_values': n_values,
+                't_values': t_values,
+                'big_o_values': big_o_values,
+                'en_log10': en_log10,
+                't_str': funcion_tiempo.como_str(),
+            })
+    return curvas
+
+
+def configuracion(curvas):
+    marcador = 'o' if len(curvas['n_values']) <= 50 else 'None'
+    escala_log = curvas['n_max'] > 100
+    etiqueta_y = 'log₁₀ Tiempo de ejecución' if curvas['en_log10'] else 'Tiempo de ejecución'
+    escala_y = 'symlog' if escala_log and not curvas['en_log10'] else 'linear'
+    return marcador, 'log' if escala_log else 'linear', escala_y, etiqueta_y
+
+
+class GraficaRecreada:
+    """Réplica del dibujo anterior: una figura nueva por actualización"""
+
+    def __init__(self):
+        self.canvas = None
+
+    def actualizar(self, curvas):
+        marcador, escala_x, escala_y, etiqueta_y = configuracion(curvas)
+        fig = Figure(figsize=(12, 5), dpi=100)
+        ax1, ax2 = fig.subplots(1, 2)
+        fig.suptitle(f"Análisis de Complejidad - {curvas['nombre']}", fontsize=14)
+        etiqueta_t = f"T(n) = {curvas['t_str']}"
+        ax1.plot(curvas['n_values'], curvas['t_values'], 'b-', marker=marcador, linewidth=2,
+                 markersize=6, label=etiqueta_t)
+        ax2.plot(curvas['n_values'], curvas['t_values'], 'b-', marker=marcador, linewidth=2,
+                 markersize=6, label=etiqueta_t)
+        ax2.plot(curvas['n_values'], curvas['big_o_values'], 'r--', linewidth=2,
+                 label=f"Big O = {curvas['big_o']}")
+        ax1.set_title('Función de Tiempo T(n)')
+        ax2.set_title('Comparación T(n) vs Big O')
+        for ax in (ax1, ax2):
+            ax.set_xlabel('Tamaño de entrada (n)')
+            ax.set_ylabel(etiqueta_y)
+            ax.grid(True, alpha=0.3)
+            ax.legend()
+            ax.set_xscale(escala_x)
+            ax.set_yscale(escala_y)
+        fig.tight_layout()
+        self.canvas = FigureCanvasAgg(fig)
+        self.canvas.draw()
+
+
+class GraficaPersistente:
+    """La pestaña actual: una SuperficieGrafica cuyas curvas se actualizan"""
+
+    def __init__(self):
+        fig = Figure(figsize=(12, 5), dpi=100, layout='tight')
+        ax1, ax2 = fig.subplots(1, 2)
+        ax1.set_title('Función de Tiempo T(n)')
+        ax2.set_title('Comparación T(n) vs Big O')
+        for ax in (ax1, ax2):
+            ax.set_xlabel('Tamaño de entrada (n)')
+            ax.grid(True, alpha=0.3)
+        self.superficie = SuperficieGrafica(FigureCanvasAgg(fig))
+        self.superficie.agregar_curva('t', ax1, 'b-', linewidth=2, markersize=6)
+        self.superficie.agregar_curva('t_comparada', ax2, 'b-', linewidth=2, markersize=6)
+        self.superficie.agregar_curva('big_o', ax2, 'r--', linewidth=2)
+
+    def actualizar(self, curvas):
+        marcador, escala_x, escala_y, etiqueta_y = configuracion(curvas)
+        superficie = self.superficie
+        fig = superficie.figura
+        titulo = f"Análisis de Complejidad - {curvas['nombre']}"
+        if fig.get_suptitle() != titulo:
+            fig.suptitle(titulo, fontsize=14)
+        for ax in fig.axes:
+            if ax.get_ylabel() != etiqueta_y:
+                ax.set_ylabel(etiqueta_y)
+            superficie.fijar_escalas(ax, escala_x, escala_y)
+        etiqueta_t = f"T(n) = {curvas['t_str']}"
+        superficie.fijar_datos('t', curvas['n_values'], curvas['t_values'], etiqueta=etiqueta_t, marker=marcador)
+        superficie.fijar_datos('t_comparada', curvas['n_values'], curvas['t_values'],
+                               etiqueta=etiqueta_t, marker=marcador)
+        superficie.fijar_datos('big_o', curvas['n_values'], curvas['big_o_values'],
+                               etiqueta=f"Big O = {curvas['big_o']}")
+        superficie.refrescar()
+
+
+def secuencia(curvas, actualizaciones, repetir):
+    """Las curvas en orden cíclico, o siempre la misma si 'repetir'"""
+    if repetir:
+        return [curvas[-1]] * actualizaciones
+    return [curvas[i % len(curvas)] for i in range(actualizaciones)]
+
+
+def medir_latencias(grafica, pasos):
+    latencias = []
+    for curvas in pasos:
+        inicio = time.perf_counter()
+        grafica.actualizar(curvas)
+        latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+
+def medir_memoria(crear, pasos):
+    """(crecimiento retenido, pico) en bytes durante las actualizaciones"""
+    gc.collect()
+    tracemalloc.start()
+    grafica = crear()
+    grafica.actualizar(pasos[0])
+    gc.collect()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for curvas in pasos[1:]:
+        grafica.actualizar(curvas)
+    gc.collect()
+    final, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return final - base, pico - base
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de actualizaciones de la gráfica")
+    parser.add_argument("--actualizaciones", type=int, default=500, help="Actualizaciones sucesivas por caso")
+    parser.add_argument("--sin-memoria", action="store_true", help="Omitir la pasada con tracemalloc")
+    args = parser.parse_args()
+
+    curvas = preparar_curvas()
+    casos = (
+        ('recrear', GraficaRecreada, False),
+        ('persistente', GraficaPersistente, False),
+        ('blit', GraficaPersistente, True),
+    )
+    print(f"{args.actualizaciones} actualizaciones, {len(curvas)} curvas distintas (ejemplos × rangos)")
+    print(f"{'caso':<12} | {'media':>8} | {'p50':>8} | {'p95':>8} | {'total':>8} | "
+          f"{'retenido':>10} | {'pico':>10} | dibujos/blits")
+    print("-" * 100)
+
+    for nombre, crear, repetir in casos:
+        pasos = secuencia(curvas, args.actualizaciones, repetir)
+        grafica = crear()
+        grafica.actualizar(pasos[0])  # la primera actualización (creación) no se cuenta
+        latencias = medir_latencias(grafica, pasos[1:])
+        conteo = ""
+        if isinstance(grafica, GraficaPersistente):
+            conteo = f"{grafica.superficie.dibujos_completos}/{grafica.superficie.blits}"
+        memoria = "" if args.sin_memoria else medir_memoria(crear, pasos)
+        columnas_memoria = (f"{memoria[0] / 1024:8.0f}KB | {memoria[1] / 1024:8.0f}KB"
+                            if memoria else f"{'-':>10} | {'-':>10}")
+        print(f"{nombre:<12} | {statistics.mean(latencias) * 1000:6.2f}ms | "
+              f"{percentil(latencias, 50) * 1000:6.2f}ms | {percentil(latencias, 95) * 1000:6.2f}ms | "
+              f"{sum(latencias):7.2f}s | {columnas_memoria} | {conteo}")
+
+
+if __name__ == "__main__":
+    main()
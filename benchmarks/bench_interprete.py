@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de los motores de ejecución del perfil empírico.
+
+Compara, contra un intérprete ingenuo que recorre el AST en cada ejecución
+(despacha por tipo de nodo, vuelve a analizar los tokens de cada expresión
+cada vez que la evalúa y guarda las variables en diccionarios):
+  • el evaluador compilado en clausuras (core.interprete)
+  • el código Python generado (core.compilador_python), con contadores
+  • el mismo código sin contadores, como se usa para medir tiempos
+Los tres que cuentan deben dar las mismas operaciones.
+
+Uso:
+    python benchmarks/bench_interprete.py [--n 300] [--repeticiones 3]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Agregar el directorio src al path para importar módulos
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from core.pseudogrammar import tokenizar
+from core.parser_estructural import parsear
+from core.analizador_expresiones import contar_operaciones
+from core.interprete import Arreglo, Interprete
+from core.compilador_python import ProgramaCompilado
+from core.perfil_empirico import generar_argumentos, parametros_arreglo, parametros_funciones
+
+EJEMPLOS = (
+    ('ejemplo_insertion_sort.txt', 'insertion_sort'),
+    ('ejemplo_mergesort.txt', 'mergesort'),
+    ('ejemplo_quicksort.txt', 'quicksort'),
+    ('ejemplo_heapsort.txt', 'heapsort'),
+    ('ejemplo_mochila_dinamica.txt', 'problema_mochila'),
+    ('ejemplo_fibonacci_recursivo.txt', 'fibonacci'),
+)
+
+
+class _Retorno(Exception):
+    def __init__(self, valor):
+        self.valor = valor
+
+
+class InterpreteIngenuo:
+    """Recorrido directo del AST, como referencia: sin compilar nada"""
+
+    def __init__(self, arbol):
+        self.funciones = {}
+        pendientes = [arbol]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.tipo == 'FUNCION':
+                self.funciones.setdefault(nodo.props['nombre'], nodo)
+            pendientes.extend(nodo.hijos)
+        self.operaciones = 0
+
+    def ejecutar(self, nombre, argumentos):
+        self.operaciones = 0
+        return self.llamar(nombre, argumentos), self.operaciones
+
+    def llamar(self, nombre, argumentos):
+        funcion = self.funciones[nombre]
+        entorno = dict(zip(funcion.props['args'], argumentos))
+        try:
+            self.bloque(funcion.hijos, entorno)
+        except _Retorno as retorno:
+            return retorno.valor
+        return 0
+
+    def bloque(self, nodos, entorno):
+        k = 0
+        while k < len(nodos):
+            nodo = nodos[k]
+            if nodo.tipo == 'SI':
+                self.operaciones += contar_operaciones(nodo.props['cond'])
+                if self.evaluar(nodo.props['cond'], entorno):
+                    self.bloque(nodo.hijos, entorno)
+                elif k + 1 < len(nodos) and nodos[k + 1].tipo == 'SINO':
+                    self.bloque(nodos[k + 1].hijos, entorno)
+                if k + 1 < len(nodos) and nodos[k + 1].tipo == 'SINO':
+                    k += 1
+            elif nodo.tipo == 'PARA':
+                self.operaciones += 2
+                desde = int(self.evaluar(nodo.props['desde_expr'], entorno))
+                hasta = int(self.evaluar(nodo.props['hasta_expr'], entorno))
+                paso = 1 if desde <= hasta else -1
+                for valor in range(desde, hasta + paso, paso):
+                    entorno[nodo.props['var']] = valor
+                    self.operaciones += 1
+                    self.bloque(nodo.hijos, entorno)
+            elif nodo.tipo == 'MIENTRAS':
+                while True:
+                    self.operaciones += contar_operaciones(nodo.props['cond'])
+                    if not self.evaluar(nodo.props['cond'], entorno):
+                        break
+                    self.bloque(nodo.hijos, entorno)
+            elif nodo.tipo == 'ASIGNACION':
+                self.operaciones += contar_operaciones(nodo.props['expr'])
+                entorno[nodo.props['var']] = self.evaluar(nodo.props['expr'], entorno)
+            elif nodo.tipo == 'ASIGNACION_ARREGLO':
+                self.operaciones += contar_operaciones(nodo.props['expr']) + 1
+                valor = self.evaluar(nodo.props['expr'], entorno)
+                arreglo = entorno.get(nodo.props['nombre'])
+                if not isinstance(arreglo, Arreglo):
+                    arreglo = entorno[nodo.props['nombre']] = Arreglo()
+                indices = [self.evaluar(tokens, entorno) for tokens in nodo.props['indices']]
+                for indice in indices[:-1]:
+                    if not isinstance(arreglo.get(indice), Arreglo):
+                        arreglo[indice] = Arreglo()
+                    arreglo = arreglo[indice]
+                arreglo[indices[-1]] = valor
+            elif nodo.tipo == 'DECLARACION_ARREGLO':
+                if not isinstance(entorno.get(nodo.props['nombre']), Arreglo):
+                    entorno[nodo.props['nombre']] = Arreglo()
+            elif nodo.tipo == 'RETORNAR':
+                self.operaciones += contar_operaciones(nodo.props['args'])
+                raise _Retorno(self.evaluar(nodo.props['args'], entorno) if nodo.props['args'] else 0)
+            elif nodo.tipo == 'LLAMADA_FUNCION':
+                self.operaciones += 1
+                if nodo.props['nombre'] in self.funciones:
+                    self.llamar(nodo.props['nombre'], [self.evaluar(t, entorno) for t in nodo.props['expr_args']])
+                elif nodo.props['nombre'] == 'intercambiar':
+                    # intercambiar(a[i], a[j])
+                    (a, i), (b, j) = [(entorno[t[0]], self.evaluar(t[2:-1], entorno))
+                                      for t in nodo.props['expr_args']]
+                    a[i], b[j] = b[j], a[i]
+            k += 1
+
+    # --- expresiones: se vuelven a analizar los tokens en cada evaluación ---
+
+    def evaluar(self, tokens, entorno):
+        valor, _ = self._o(tokens, 0, entorno)
+        return valor
+
+    def _o(self, t, i, e):
+        a, i = self._y(t, i, e)
+        while i < len(t) and t[i].lower() in ('o', '||'):
+            b, i = self._y(t, i + 1, e)
+            a = a or b
+        return a, i
+
+    def _y(self, t, i, e):
+        a, i = self._comparacion(t, i, e)
+        while i < len(t) and t[i].lower() in ('y', '&&'):
+            b, i = self._comparacion(t, i + 1, e)
+            a = a and b
+        return a, i
+
+    def _comparacion(self, t, i, e):
+        a, i = self._suma(t, i, e)
+        if i < len(t) and t[i] in ('=', '!') and i + 1 < len(t) and t[i + 1] == '=':
+            igual = t[i] == '='
+            b, i = self._suma(t, i + 2, e)
+            return (a == b) if igual else (a != b), i
+        if i < len(t) and t[i] in ('<', '<=', '>', '>=', '=', '<>'):
+            operador = t[i]
+            b, i = self._suma(t, i + 1, e)
+            return {'<': a < b, '<=': a <= b, '>': a > b, '>=': a >= b, '=': a == b, '<>': a != b}[operador], i
+        return a, i
+
+    def _suma(self, t, i, e):
+        a, i = self._producto(t, i, e)
+        while i < len(t) and t[i] in ('+', '-'):
+            operador = t[i]
+            b, i = self._producto(t, i + 1, e)
+            a = a + b if operador == '+' else a - b
+        return a, i
+
+    def _producto(self, t, i, e):
+        a, i = self._unario(t, i, e)
+        while i < len(t) and (t[i] in ('*', '/', '%') or t[i].lower() in ('div', 'mod')):
+            operador = t[i].lower()
+            b, i = self._unario(t, i + 1, e)
+            if operador == '*':
+                a = a * b
+            elif operador in ('/', 'div'):
+                a = a // b
+            else:
+                a = a % b
+        return a, i
+
+    def _unario(self, t, i, e):
+        if t[i] == '-':
+            a, i = self._unario(t, i + 1, e)
+            return -a, i
+        return self._atomo(t, i, e)
+
+    def _atomo(self, t, i, e):
+        token = t[i]
+        if token == '(':
+            a, i = self._o(t, i + 1, e)
+            return a, i + 1
+        if token[0].isdigit():
+            return int(token), i + 1
+        if i + 1 < len(t) and t[i + 1] == '(':
+            argumentos = []
+            i += 2
+            while t[i] != ')':
+                valor, i = self._o(t, i, e)
+                argumentos.append(valor)
+                if t[i] == ',':
+                    i += 1
+            if token in self.funciones:
+                return self.llamar(token, argumentos), i + 1
+            return (max(argumentos) if token == 'max' else 0), i + 1
+        valor = e.get(token, 0)
+        while i + 1 < len(t) and t[i + 1] == '[':
+            indice, i = self._o(t, i + 2, e)
+            valor = valor[indice] if isinstance(valor, Arreglo) else 0
+        return valor, i + 1
+
+
+def medir(motor, funcion, generar, repeticiones):
+    """Mejor tiempo de varias ejecuciones; los argumentos se generan fuera de la medición"""
+    mejor = float('inf')
+    resultado = None
+    for _ in range(repeticiones):
+        # Arreglos nuevos en cada ejecución: los algoritmos de ordenamiento los modifican
+        argumentos = generar()
+        inicio = time.perf_counter()
+        resultado = motor.ejecutar(funcion, argumentos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de ejecución de pseudocódigo")
+    parser.add_argument("--n", type=int, default=300, help="Tamaño de entrada (fibonacci usa n / 15)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones por caso")
+    args = parser.parse_args()
+
+    print(f"{'caso':<18} | {'operaciones':>11} | {'ingenuo':>9} | {'clausuras':>9} | {'python':>9} | "
+          f"{'sin cont.':>9} | {'Mops/s':>6} | aceleración")
+    print("-" * 104)
+    for archivo, funcion in EJEMPLOS:
+        arbol = parsear(tokenizar((PROJECT_ROOT / "ejemplos" / archivo).read_text(encoding='utf-8')))
+        motores = (
+            InterpreteIngenuo(arbol),
+            Interprete(arbol),
+            ProgramaCompilado(arbol),
+            ProgramaCompilado(arbol, contar=False),
+        )
+        n = max(args.n // 15, 2) if funcion == 'fibonacci' else args.n
+        parametros = parametros_funciones(arbol)[funcion]
+        arreglos = parametros_arreglo(arbol)[funcion]
+
+        tiempos = []
+        cuentas = []
+        for motor in motores:
+            tiempo, (_, operaciones) = medir(
+                motor, funcion, lambda: generar_argumentos(parametros, arreglos, n), args.repeticiones)
+            tiempos.append(tiempo)
+            if operaciones is not None:
+                cuentas.append(operaciones)
+        if len(set(cuentas)) > 1:
+            print(f"  ¡{funcion}: las cuentas difieren {cuentas}!")
+        t_ingenuo, t_clausuras, t_python, t_sin = tiempos
+        print(f"{funcion:<18} | {cuentas[0]:>11} | {t_ingenuo * 1000:7.1f}ms | {t_clausuras * 1000:7.1f}ms | "
+              f"{t_python * 1000:7.1f}ms | {t_sin * 1000:7.1f}ms | {cuentas[0] / t_python / 1e6:6.1f} | "
+              f"x{t_ingenuo / t_clausuras:.1f} / x{t_ingenuo / t_python:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del tokenizador sobre un corpus de varios megabytes.
+
+Construye el corpus concatenando los ejemplos de 'ejemplos/' hasta alcanzar
+el tamaño pedido y mide tokens/segundo de:
+  • la implementación anterior (re.finditer con patrón en texto + dicts)
+  • tokenizar()        -> lista de Token compactos
+  • tokenizar_dicts()  -> adaptador con el formato de dicts
+
+Uso:
+    python benchmarks/bench_tokenizador.py [--mb 4] [--repeticiones 3]
+"""
+
+import sys
+import re
+import time
+import argparse
+from pathlib import Path
+
+# Agregar el directorio src al path para importar módulos
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from core.pseudogrammar import tok_regex, palabras_clave_set, tokenizar, tokenizar_dicts
+
+
+def tokenizar_anterior(texto):
+    """Réplica de la implementación original, usada como referencia"""
+    tokens = []
+    for mo in re.finditer(tok_regex, texto):
+        kind = mo.lastgroup
+        value = mo.group()
+        if kind == 'ESPACIO':
+            continue
+        if kind == 'IDENT':
+            if value.lower() in palabras_clave_set:
+                kind = 'PALABRA_CLAVE'
+        tokens.append({'tipo': kind, 'valor': value})
+    return tokens
+
+
+def construir_corpus(megabytes):
+    """Concatena los ejemplos hasta alcanzar el tamaño indicado"""
+    ejemplos = sorted((PROJECT_ROOT / "ejemplos").glob("*.txt"))
+    base = "\n".join(archivo.read_text(encoding='utf-8') for archivo in ejemplos) + "\n"
+    objetivo = int(megabytes * 1024 * 1024)
+    repeticiones = max(1, objetivo // len(base.encode('utf-8')) + 1)
+    return base * repeticiones
+
+
+def medir(funcion, texto, repeticiones):
+    """Retorna (mejor tiempo, número de tokens)"""
+    mejor = float('inf')
+    cantidad = 0
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        tokens = funcion(texto)
+        transcurrido = time.perf_counter() - inicio
+        cantidad = len(tokens)
+        del tokens
+        mejor = min(mejor, transcurrido)
+    return mejor, cantidad
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del tokenizador")
+    parser.add_argument("--mb", type=float, default=4, help="Tamaño del corpus en MB")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Repeticiones por variante")
+    args = parser.parse_args()
+
+    texto = construir_corpus(args.mb)
+    tamano_mb = len(texto.encode('utf-8')) / (1024 * 1024)
+    print(f"Corpus: {tamano_mb:.2f} MB")
+    print("-" * 65)
+
+    variantes = [
+        ("anterior (dicts)", tokenizar_anterior),
+        ("tokenizar (ListaTokens)", tokenizar),
+        ("tokenizar_dicts", tokenizar_dicts),
+    ]
+
+    referencia = None
+    for nombre, funcion in variantes:
+        tiempo, cantidad = medir(funcion, texto, args.repeticiones)
+        tokens_seg = cantidad / tiempo
+        if referencia is None:
+            referencia = tiempo
+        print(f"{nombre:<20} | {cantidad:>9} tokens | {tiempo:7.3f} s | "
+              f"{tokens_seg:>12,.0f} tok/s | x{referencia / tiempo:.2f}")
+
+
+if __name__ == "__main__":
+    main()
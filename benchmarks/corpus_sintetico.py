@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generador de pseudocódigo sintético de tamaño controlable.
+
+Cada programa tiene 'funciones' funciones f0..fN-1 de un parámetro n; fk
+llama una vez a fk+1, así que analizar f0 recorre todo el programa. El
+cuerpo de cada función es un árbol de ciclos de 'profundidad' niveles con
+'abanico' ciclos hermanos por nivel (Para hasta n, Para hasta la variable
+del ciclo contenedor o Mientras que divide a la mitad), y puede llamarse a
+sí misma según la forma de recursión:
+
+  ninguna      sin llamadas recursivas
+  lineal       T(n - 1)
+  binaria      T(n - 1) + T(n - 2)
+  division     2 T(n / 2)
+  logaritmica  T(n / 2)
+  mixta        una de las anteriores al azar por función
+
+Con la misma semilla el programa es siempre el mismo.
+
+Uso:
+    python benchmarks/corpus_sintetico.py [--funciones 10] [--profundidad 2] [--abanico 2]
+                                          [--recursion mixta] [--semilla 0] [--salida DIR]
+"""
+
+import sys
+import random
+import argparse
+from pathlib import Path
+
+FORMAS_RECURSION = ('ninguna', 'lineal', 'binaria', 'division', 'logaritmica', 'mixta')
+
+_LLAMADAS_RECURSIVAS = {
+    'ninguna': (),
+    'lineal': ('{f}(n - 1)',),
+    'binaria': ('{f}(n - 1)', '{f}(n - 2)'),
+    'division': ('{f}(n / 2)', '{f}(n / 2)'),
+    'logaritmica': ('{f}(n / 2)',),
+}
+
+_SANGRIA = '    '
+
+
+def nombre_caso(funciones, profundidad, abanico, recursion, semilla=0):
+    """Nombre estable de un programa sintético, p. ej. 'sintetico_f10_d2_a2_mixta_s0'"""
+    return f"sintetico_f{funciones}_d{profundidad}_a{abanico}_{recursion}_s{semilla}"
+
+
+def _bloque(lineas, nivel, profundidad, abanico, rng, sangria):
+    """Agrega a 'lineas' los ciclos del nivel 'nivel' (1 = el más externo) y sus cuerpos"""
+    prefijo = _SANGRIA * sangria
+    if nivel > profundidad:
+        variable = f"i{profundidad}" if profundidad else 'n'
+        lineas.append(f"{prefijo}s <- s + {variable} * 2")
+        lineas.append(f"{prefijo}a[{variable}] <- s")
+        return
+    formas = ('n', 'dependiente', 'mitad') if nivel > 1 else ('n', 'mitad')
+    for _ in range(abanico):
+        forma = rng.choice(formas)
+        variable = f"i{nivel}"
+        if forma == 'mitad':
+            lineas.append(f"{prefijo}{variable} <- n")
+            lineas.append(f"{prefijo}Mientras {variable} > 1 hacer")
+            _bloque(lineas, nivel + 1, profundidad, abanico, rng, sangria + 1)
+            lineas.append(f"{prefijo}{_SANGRIA}{variable} <- {variable} / 2")
+            lineas.append(f"{prefijo}fMientras")
+        else:
+            hasta = 'n' if forma == 'n' else f"i{nivel - 1}"
+            lineas.append(f"{prefijo}Para {variable} desde 1 hasta {hasta} hacer")
+            _bloque(lineas, nivel + 1, profundidad, abanico, rng, sangria + 1)
+            lineas.append(f"{prefijo}fPara")
+
+
+def _funcion(indice, funciones, profundidad, abanico, recursion, rng):
+    nombre = f"f{indice}"
+    llamadas = [plantilla.format(f=nombre) for plantilla in _LLAMADAS_RECURSIVAS[recursion]]
+    lineas = [f"Funcion {nombre}(n)"]
+    if llamadas:
+        lineas += [
+            f"{_SANGRIA}Si n <= 1 Entonces",
+            f"{_SANGRIA * 2}retornar 1",
+            f"{_SANGRIA}fSi",
+        ]
+    lineas.append(f"{_SANGRIA}s <- 0")
+    _bloque(lineas, 1, profundidad, abanico, rng, 1)
+    if indice + 1 < funciones:
+        lineas.append(f"{_SANGRIA}t <- f{indice + 1}(n)")
+    if llamadas:
+        lineas.append(f"{_SANGRIA}r <- {' + '.join(llamadas)}")
+    lineas.append(f"{_SANGRIA}retornar s")
+    lineas.append("fFuncion")
+    return lineas
+
+
+def generar_programa(funciones=10, profundidad=2, abanico=2, recursion='mixta', semilla=0):
+    """Texto de un programa sintético válido para el tokenizador y el parser"""
+    if recursion not in FORMAS_RECURSION:
+        raise ValueError(f"Forma de recursión desconocida: {recursion!r} (opciones: {', '.join(FORMAS_RECURSION)})")
+    if funciones < 1 or profundidad < 0 or abanico < 1:
+        raise ValueError("Se necesita al menos una función, profundidad >= 0 y abanico >= 1")
+    rng = random.Random(semilla)
+    formas = [forma for forma in FORMAS_RECURSION if forma != 'mixta']
+    bloques = []
+    for indice in range(funciones):
+        forma = rng.choice(formas) if recursion == 'mixta' else recursion
+        bloques.append('\n'.join(_funcion(indice, funciones, profundidad, abanico, forma, rng)))
+    return '\n\n'.join(bloques) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera pseudocódigo sintético de tamaño controlable")
+    parser.add_argument("--funciones", type=int, default=10, help="Cantidad de funciones")
+    parser.add_argument("--profundidad", type=int, default=2, help="Niveles de ciclos anidados")
+    parser.add_argument("--abanico", type=int, default=2, help="Ciclos hermanos por nivel")
+    parser.add_argument("--recursion", choices=FORMAS_RECURSION, default='mixta', help="Forma de recursión")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--salida", help="Directorio donde escribir el programa (por defecto, a stdout)")
+    args = parser.parse_args()
+
+    codigo = generar_programa(args.funciones, args.profundidad, args.abanico, args.recursion, args.semilla)
+    if args.salida is None:
+        sys.stdout.write(codigo)
+        return
+    directorio = Path(args.salida)
+    directorio.mkdir(parents=True, exist_ok=True)
+    ruta = directorio / f"{nombre_caso(args.funciones, args.profundidad, args.abanico, args.recursion, args.semilla)}.txt"
+    ruta.write_text(codigo, encoding='utf-8')
+    print(ruta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Suite de benchmarks del analizador, con resultados en JSON comparables.
+
+'correr' mide, para cada programa, las fases:
+  • tokenizar   tokenizar(código)
+  • parsear     parsear(tokens)
+  • analizar    AnalizadorComplejidad(árbol).calcular(función)
+  • big_o       T(n).big_o() y el texto de T(n)
+  • evaluacion  T(n).valores_grafica() sobre rango_evaluacion(n_max), como la gráfica
+sobre los ejemplos de 'ejemplos/' y sobre programas de corpus_sintetico.py.
+Antes de cada repetición se vacían los caches de sumatorias, recurrencias,
+evaluadores y el de SymPy: cada repetición hace el trabajo completo. Como
+timeit, se mide con el recolector de basura desactivado, y las
+repeticiones van por rondas sobre todos los casos. Se
+guardan el mínimo, la mediana y la primera repetición de cada fase junto
+con los datos de la máquina (Python, plataforma, CPU, versiones, commit).
+
+'comparar' señala las fases de un resultado más lentas que en otro por
+encima de un umbral relativo y de un mínimo absoluto; termina con código 1
+si hay regresiones.
+
+Uso:
+    python benchmarks/suite.py correr [--salida bench.json] [--repeticiones 7] [--solo-ejemplos]
+                                      [--funciones 5 20 50] [--profundidad 2] [--abanico 2]
+                                      [--recursion mixta] [--n-max 1000000]
+    python benchmarks/suite.py comparar base.json nuevo.json [--umbral 0.10] [--minimo-ms 0.5]
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+# Agregar el directorio src al path para importar módulos
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from core.pseudogrammar import tokenizar
+from core.parser_estructural import parsear
+from core.analizador_complejidad import AnalizadorComplejidad
+from core.perezoso import cargar_registrados
+from core.cache_resultados import version_analizador
+from core import iteraciones, recurrencias, expresion_simbolica
+from core.expresion_simbolica import rango_evaluacion
+
+from corpus_sintetico import FORMAS_RECURSION, generar_programa, nombre_caso
+
+FASES = ('tokenizar', 'parsear', 'analizar', 'big_o', 'evaluacion')
+MEDIDAS = ('minimo', 'mediana', 'primera')
+DEPENDENCIAS = ('sympy', 'numpy', 'matplotlib')
+VERSION_FORMATO = 1
+
+
+# --- metadatos ---
+
+def _commit():
+    """Commit de git del árbol medido (con '+' si tiene cambios sin guardar), o None"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True,
+                                text=True, timeout=10, check=True).stdout.strip()
+        cambios = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=PROJECT_ROOT,
+                                 capture_output=True, text=True, timeout=10, check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return commit + ('+' if cambios else '')
+
+
+def _version(paquete):
+    try:
+        return metadata.version(paquete)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def metadatos_maquina():
+    return {
+        'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementacion': platform.python_implementation(),
+        'plataforma': platform.platform(),
+        'maquina': platform.machine(),
+        'procesador': platform.processor() or None,
+        'cpus': os.cpu_count(),
+        'nodo': platform.node(),
+        'commit': _commit(),
+        'version_analizador': version_analizador(),
+        'dependencias': {paquete: _version(paquete) for paquete in DEPENDENCIAS},
+    }
+
+
+# --- casos ---
+
+def casos_ejemplos():
+    """[(nombre, código, función)] de los ejemplos, analizando la primera función como la CLI"""
+    return [(f"ejemplos/{ruta.name}", ruta.read_text(encoding='utf-8'), None)
+            for ruta in sorted((PROJECT_ROOT / "ejemplos").glob("*.txt"))]
+
+
+def casos_sinteticos(funciones, profundidad, abanico, recursion, semilla):
+    return [(f"sintetico/{nombre_caso(cantidad, profundidad, abanico, recursion, semilla)}",
+             generar_programa(cantidad, profundidad, abanico, recursion, semilla), 'f0')
+            for cantidad in funciones]
+
+
+# --- medición ---
+
+def _limpiar_caches():
+    iteraciones.limpiar_cache()
+    recurrencias.limpiar_cache()
+    expresion_simbolica.limpiar_cache()
+    if 'sympy' in sys.modules:
+        from sympy.core.cache import clear_cache
+        clear_cache()
+
+
+def _repeticion(codigo, nombre_funcion, valores):
+    """{fase: segundos} de una pasada completa, y (función, T(n), Big O)"""
+    tiempos = {}
+
+    def medir(fase, paso):
+        inicio = time.perf_counter()
+        valor = paso()
+        tiempos[fase] = time.perf_counter() - inicio
+        return valor
+
+    tokens = medir('tokenizar', lambda: tokenizar(codigo))
+    arbol = medir('parsear', lambda: parsear(tokens))
+
+    def analizar():
+        analizador = AnalizadorComplejidad(arbol)
+        nombre = nombre_funcion if nombre_funcion is not None else next(iter(analizador.funciones), None)
+        return nombre, analizador.calcular(nombre)[0]
+
+    nombre, funcion_tiempo = medir('analizar', analizar)
+    big_o, t_n = medir('big_o', lambda: (funcion_tiempo.big_o(), funcion_tiempo.como_str()))
+    medir('evaluacion', lambda: funcion_tiempo.valores_grafica(valores))
+    return tiempos, (nombre, t_n, big_o)
+
+
+def _resumen(muestras):
+    return {
+        fase: {
+            'minimo': min(valores_fase),
+            'mediana': statistics.median(valores_fase),
+            'primera': valores_fase[0],
+        }
+        for fase, valores_fase in muestras.items()
+    }
+
+
+def medir_casos(casos, repeticiones, valores):
+    """
+    {nombre: registro} con T(n), Big O, error y las medidas de cada fase.
+    Las repeticiones se hacen por rondas sobre todos los casos y no todas
+    seguidas: una racha de lentitud de la máquina reparte sus muestras entre
+    varios casos en vez de arruinar todas las de uno.
+    """
+    registros = {nombre: {'funcion': None, 't_n': None, 'big_o': None, 'error': None, 'fases': {}}
+                 for nombre, _, _ in casos}
+    muestras = {nombre: {fase: [] for fase in FASES} for nombre, _, _ in casos}
+    for _ in range(repeticiones):
+        for nombre, codigo, nombre_funcion in casos:
+            registro = registros[nombre]
+            if registro['error']:
+                continue
+            _limpiar_caches()
+            gc.collect()
+            gc.disable()
+            try:
+                tiempos, (registro['funcion'], registro['t_n'], registro['big_o']) = \
+                    _repeticion(codigo, nombre_funcion, valores)
+            except Exception as e:
+                registro['error'] = f"{type(e).__name__}: {e}"
+                continue
+            finally:
+                gc.enable()
+            for fase, segundos in tiempos.items():
+                muestras[nombre][fase].append(segundos)
+    for nombre, registro in registros.items():
+        if not registro['error']:
+            registro['fases'] = _resumen(muestras[nombre])
+    return registros
+
+
+def correr(args):
+    casos = casos_ejemplos()
+    if not args.solo_ejemplos:
+        casos += casos_sinteticos(args.funciones, args.profundidad, args.abanico, args.recursion, args.semilla)
+    # Las importaciones perezosas (SymPy) no se cuentan en la fase del primer caso
+    cargar_registrados()
+    valores = rango_evaluacion(args.n_max)
+
+    resultados = medir_casos(casos, args.repeticiones, valores)
+    print(f"{'caso':<52} | " + ' | '.join(f"{fase:>10}" for fase in FASES))
+    print("-" * (55 + 13 * len(FASES)))
+    for nombre, registro in resultados.items():
+        if registro['error']:
+            print(f"{nombre:<52} | ❌ {registro['error']}")
+            continue
+        print(f"{nombre:<52} | " + ' | '.join(
+            f"{registro['fases'][fase]['minimo'] * 1000:8.2f}ms" for fase in FASES))
+
+    totales = {fase: sum(registro['fases'][fase]['minimo'] for registro in resultados.values()
+                         if not registro['error']) for fase in FASES}
+    print("-" * (55 + 13 * len(FASES)))
+    print(f"{'total (mínimos)':<52} | " + ' | '.join(f"{totales[fase] * 1000:8.2f}ms" for fase in FASES))
+
+    informe = {
+        'formato': VERSION_FORMATO,
+        'maquina': metadatos_maquina(),
+        'parametros': {
+            'repeticiones': args.repeticiones,
+            'n_max': args.n_max,
+            'sinteticos': None if args.solo_ejemplos else {
+                'funciones': args.funciones, 'profundidad': args.profundidad, 'abanico': args.abanico,
+                'recursion': args.recursion, 'semilla': args.semilla,
+            },
+        },
+        'casos': resultados,
+        'totales': totales,
+    }
+    Path(args.salida).write_text(json.dumps(informe, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"\n💾 Resultados en {args.salida}")
+    return 1 if any(registro['error'] for registro in resultados.values()) else 0
+
+
+# --- comparación ---
+
+# Datos de la máquina que, si difieren, hacen poco confiable la comparación
+_CLAVES_MAQUINA = ('python', 'implementacion', 'plataforma', 'maquina', 'procesador', 'cpus', 'dependencias')
+
+
+def comparar_resultados(base, nuevo, umbral=0.10, minimo=5e-4, medida='minimo'):
+    """
+    (regresiones, mejoras, avisos): listas de textos. Una fase es una
+    regresión si tarda más que en 'base' en una fracción mayor a 'umbral' y,
+    además, en más de 'minimo' segundos (las fases muy cortas son ruidosas);
+    simétricamente para las mejoras. Además de cada caso se comparan los
+    totales por fase (suma de los mínimos), menos ruidosos que un caso
+    aislado. Los avisos señalan diferencias de máquina, casos faltantes y
+    cambios de resultado (T(n) o Big O).
+    """
+    regresiones, mejoras, avisos = [], [], []
+
+    def clasificar(texto, antes, despues):
+        if despues > antes * (1 + umbral) and despues - antes > minimo:
+            regresiones.append(f"{texto} (+{(despues / antes - 1) * 100:.0f}%)")
+        elif despues < antes * (1 - umbral) and antes - despues > minimo:
+            mejoras.append(f"{texto} (-{(1 - despues / antes) * 100:.0f}%)")
+
+    maquina_base, maquina_nueva = base.get('maquina', {}), nuevo.get('maquina', {})
+    for clave in _CLAVES_MAQUINA:
+        if maquina_base.get(clave) != maquina_nueva.get(clave):
+            avisos.append(f"máquina distinta: {clave} {maquina_base.get(clave)} -> {maquina_nueva.get(clave)}")
+    if base.get('parametros') != nuevo.get('parametros'):
+        avisos.append("parámetros distintos: los casos sintéticos o las repeticiones no coinciden")
+
+    for caso, registro in nuevo['casos'].items():
+        anterior = base['casos'].get(caso)
+        if anterior is None:
+            avisos.append(f"{caso}: no está en la base")
+            continue
+        if registro['error'] or anterior['error']:
+            if registro['error'] != anterior['error']:
+                avisos.append(f"{caso}: error {anterior['error']} -> {registro['error']}")
+            continue
+        for campo in ('t_n', 'big_o'):
+            if registro[campo] != anterior[campo]:
+                avisos.append(f"{caso}: {campo} cambió: {anterior[campo]} -> {registro[campo]}")
+        for fase in FASES:
+            if fase not in registro['fases'] or fase not in anterior['fases']:
+                continue
+            antes, despues = anterior['fases'][fase][medida], registro['fases'][fase][medida]
+            clasificar(f"{caso} {fase}: {antes * 1000:.3f}ms -> {despues * 1000:.3f}ms", antes, despues)
+    for caso in sorted(base['casos'].keys() - nuevo['casos'].keys()):
+        avisos.append(f"{caso}: falta en el resultado nuevo")
+    # Totales sobre los casos presentes en ambos, sin errores
+    comunes = [caso for caso, registro in nuevo['casos'].items()
+               if not registro['error'] and caso in base['casos'] and not base['casos'][caso]['error']]
+    for fase in FASES:
+        antes = sum(base['casos'][caso]['fases'][fase][medida] for caso in comunes)
+        despues = sum(nuevo['casos'][caso]['fases'][fase][medida] for caso in comunes)
+        if comunes:
+            clasificar(f"total {fase}: {antes * 1000:.3f}ms -> {despues * 1000:.3f}ms", antes, despues)
+    return regresiones, mejoras, avisos
+
+
+def comparar(args):
+    base = json.loads(Path(args.base).read_text(encoding='utf-8'))
+    nuevo = json.loads(Path(args.nuevo).read_text(encoding='utf-8'))
+    regresiones, mejoras, avisos = comparar_resultados(
+        base, nuevo, args.umbral, args.minimo_ms / 1000, args.medida)
+    for aviso in avisos:
+        print(f"⚠️  {aviso}")
+    if mejoras:
+        print(f"\n🚀 Mejoras ({len(mejoras)}):")
+        for mejora in mejoras:
+            print(f"  {mejora}")
+    if regresiones:
+        print(f"\n🐢 Regresiones ({len(regresiones)}) por encima de {args.umbral * 100:.0f}%:")
+        for regresion in regresiones:
+            print(f"  {regresion}")
+        return 1
+    print(f"\n✅ Sin regresiones por encima de {args.umbral * 100:.0f}%")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks del analizador de complejidad")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    correr_parser = subcomandos.add_parser('correr', help="Mide las fases y guarda los resultados en JSON")
+    correr_parser.add_argument("--salida", default="bench.json", help="Archivo JSON de resultados")
+    correr_parser.add_argument("--repeticiones", type=int, default=7, help="Repeticiones por caso")
+    correr_parser.add_argument("--n-max", type=int, default=10**6, help="n máximo de la evaluación")
+    correr_parser.add_argument("--solo-ejemplos", action="store_true", help="Sin programas sintéticos")
+    correr_parser.add_argument("--funciones", type=int, nargs='+', default=[5, 20, 50],
+                               help="Cantidad de funciones de cada programa sintético")
+    correr_parser.add_argument("--profundidad", type=int, default=2, help="Niveles de ciclos anidados")
+    correr_parser.add_argument("--abanico", type=int, default=2, help="Ciclos hermanos por nivel")
+    correr_parser.add_argument("--recursion", choices=FORMAS_RECURSION, default='mixta', help="Forma de recursión")
+    correr_parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador")
+
+    comparar_parser = subcomandos.add_parser('comparar', help="Señala regresiones entre dos resultados")
+    comparar_parser.add_argument("base", help="JSON de referencia")
+    comparar_parser.add_argument("nuevo", help="JSON a comparar")
+    comparar_parser.add_argument("--umbral", type=float, default=0.10, help="Fracción de aumento tolerada")
+    comparar_parser.add_argument("--minimo-ms", type=float, default=0.5,
+                                 help="Diferencia absoluta mínima (ms) para contar una fase")
+    comparar_parser.add_argument("--medida", choices=MEDIDAS, default='minimo', help="Medida a comparar")
+    args = parser.parse_args()
+
+    sys.exit(correr(args) if args.comando == 'correr' else comparar(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -61,6 +61,14 @@ def main_cli():
         print("\nOpciones:")
         print("  --verbose    Mostrar información detallada del análisis")
         print("  --save       Guardar el análisis automáticamente")
+        print("  --no-cache   No consultar ni actualizar el cache de resultados")
+        print("  --cache-stats  Mostrar estadísticas del cache al terminar")
+        print("  --timings    Mostrar tiempos por fase y contadores del análisis")
+        print("  --timings-json  Imprimir tiempos y contadores como un bloque JSON")
+        print("  --profile DIR  Perfilar con cProfile: DIR/<archivo>.pstats y .collapsed")
+        print("  --top N      Funciones por subsistema en el resumen del perfil (10)")
+        print("  --memory-report [RUTA]  Memoria por fase con tracemalloc, informe JSON (memoria.json)")
+        print("  --memory-baseline RUTA  Comparar con un informe anterior; sale con 1 si alguna fase creció")
         print("\nEjemplos:")
         print("  python main.py --cli ejemplos/ejemplo_busqueda_lineal.txt")
         print("  python main.py --cli ejemplos/ejemplo_fibonacci_recursivo.txt --verbose")
@@ -69,11 +77,19 @@ def main_cli():
     archivo = sys.argv[2]
     verbose = "--verbose" in sys.argv
     auto_save = "--save" in sys.argv
+    usar_cache = "--no-cache" not in sys.argv
+    tiempos = "--timings" in sys.argv
+    tiempos_json = "--timings-json" in sys.argv
+    directorio_perfil = _opcion("--profile", str)
+    
+    if "--memory-report" in sys.argv:
+        main_memoria([archivo])
+        return
     
     try:
-        from core.pseudogrammar import tokenizar
-        from core.parser_estructural import parsear
-        from core.analizador_complejidad import AnalizadorComplejidad
+        from contextlib import nullcontext
+        from core.cache_resultados import CacheResultados, analizar_con_detalles
+        from core.instrumentacion import instrumentar
         from core.serializacion import SerializadorAnalisis
         
         print("🔍 " + f"Analizando archivo: {archivo}")
@@ -87,38 +103,27 @@ def main_cli():
             print(codigo)
             print("─" * 50)
         
-        # Análisis
+        # Análisis (T(n), Big O y detalles se reutilizan del cache si el
+        # mismo código ya se analizó con esta versión del analizador)
         if verbose:
             print("\n  Procesando...")
-            print("  • Tokenizando código...")
-        
-        tokens = tokenizar(codigo)
-        
-        if verbose:
-            print("  • Construyendo árbol sintáctico...")
+            print("  • Tokenizando, construyendo árbol sintáctico y analizando complejidad...")
         
-        arbol = parsear(tokens)
-        analizador = AnalizadorComplejidad(arbol)
+        # Al perfilar siempre se analiza: un acierto del cache sólo mediría SQLite
+        perfil = None
+        if directorio_perfil:
+            from core.perfilado import PerfilAnalisis
+            perfil = PerfilAnalisis()
+        cache = CacheResultados() if usar_cache and perfil is None else None
+        with (instrumentar() if tiempos or tiempos_json else nullcontext()), (perfil or nullcontext()):
+            if cache is not None:
+                resultado, detalles = cache.analizar(codigo)
+            else:
+                resultado, detalles = analizar_con_detalles(codigo)
+        funciones = detalles['funciones']
         
-        if verbose:
-            print("  • Analizando complejidad...")
-        
-        # Buscar funciones
-        funciones = []
-        def encontrar_funciones(nodo):
-            if nodo.tipo == 'FUNCION':
-                nombre = nodo.props.get('nombre')
-                if nombre:
-                    funciones.append(nombre)
-            for hijo in nodo.hijos:
-                encontrar_funciones(hijo)
-        
-        encontrar_funciones(arbol)
-        
-        if funciones:
-            resultado = analizador.analizar(funciones[0])
-        else:
-            resultado = analizador.analizar()
+        if verbose and detalles.get('desde_cache'):
+            print("  • Resultado recuperado del cache")
         
         print("\n📊 Resultado del análisis:")
         print("═" * 50)
@@ -129,11 +134,23 @@ def main_cli():
         
         if verbose:
             print(f"\n Detalles adicionales:")
-            print(f"  • Tokens encontrados: {len(tokens)}")
+            print(f"  • Tokens encontrados: {detalles['tokens']}")
             print(f"  • Funciones detectadas: {len(funciones)}")
             if funciones:
                 print(f"  • Nombres de funciones: {', '.join(funciones)}")
         
+        if resultado.instrumentacion is not None:
+            if tiempos:
+                print()
+                resultado.instrumentacion.mostrar()
+            if tiempos_json:
+                print(resultado.instrumentacion.como_json())
+        
+        if perfil is not None:
+            ruta_pstats, ruta_colapsado = perfil.guardar(directorio_perfil, Path(archivo).stem)
+            print(f"\n🔬 Perfil guardado en {ruta_pstats} y {ruta_colapsado}")
+            perfil.mostrar(top=_opcion("--top", int, 10))
+        
         # Guardar automáticamente si se solicita
         if auto_save:
             try:
@@ -145,6 +162,11 @@ def main_cli():
         
         print("\n✅ Análisis completado exitosamente")
         
+        if cache is not None:
+            if "--cache-stats" in sys.argv:
+                mostrar_estadisticas_cache(cache)
+            cache.cerrar()
+        
     except FileNotFoundError:
         print(f" Error: No se encontró el archivo '{archivo}'")
         print("💡 Verifica que la ruta sea correcta y el archivo exista")
@@ -155,22 +177,384 @@ def main_cli():
             print("\n🔍 Detalles del error:")
             traceback.print_exc()
 
+def main_lote():
+    """Analiza todos los archivos .txt de un directorio con varios procesos"""
+    if len(sys.argv) < 3:
+        print("Uso: python main.py --batch <directorio> [opciones]")
+        print("\nOpciones:")
+        print("  --workers N   Procesos trabajadores (por defecto, uno por CPU)")
+        print("  --timeout S   Segundos máximos por archivo (por defecto 30)")
+        print("  --json        Una línea JSON por archivo en lugar de la tabla")
+        print("  --no-cache    Analizar todo, sin consultar el cache de resultados")
+        print("  --cache-stats Mostrar estadísticas del cache al terminar")
+        print("  --profile DIR Perfilar el lote en este proceso: DIR/lote.pstats y .collapsed")
+        print("  --top N       Funciones por subsistema en el resumen del perfil (10)")
+        print("  --memory-report [RUTA]  Memoria por fase de cada archivo (en este proceso), informe JSON")
+        print("  --memory-baseline RUTA  Comparar con un informe anterior")
+        print("\nEjemplo:")
+        print("  python main.py --batch ejemplos --workers 4")
+        return
+
+    import json
+    from contextlib import nullcontext
+    from core.analisis_lote import analizar_lote, rutas_de_directorio
+    from core.cache_resultados import CacheResultados
+
+    directorio = Path(sys.argv[2])
+    workers = _opcion("--workers", int)
+    tiempo_limite = _opcion("--timeout", float, 30.0)
+    como_json = "--json" in sys.argv
+    directorio_perfil = _opcion("--profile", str)
+    perfil = None
+    if directorio_perfil:
+        # cProfile sólo ve este proceso: se analiza todo aquí, sin trabajadores ni cache
+        from core.perfilado import PerfilAnalisis
+        perfil = PerfilAnalisis()
+        workers = 1
+
+    if not directorio.is_dir():
+        print(f" Error: '{directorio}' no es un directorio")
+        sys.exit(2)
+
+    rutas = rutas_de_directorio(directorio)
+    if "--memory-report" in sys.argv:
+        main_memoria(rutas)
+        return
+    if not como_json:
+        print(f"🔍 Analizando {len(rutas)} archivos de {directorio}")
+        print("═" * 70)
+
+    cache = CacheResultados() if "--no-cache" not in sys.argv and perfil is None else None
+    errores = 0
+    with perfil or nullcontext():
+        for registro in analizar_lote(rutas, workers=workers, tiempo_limite=tiempo_limite, cache=cache):
+            if registro['error']:
+                errores += 1
+            if como_json:
+                print(json.dumps(registro, ensure_ascii=False), flush=True)
+            elif registro['error']:
+                print(f"❌ {Path(registro['archivo']).name:<40} {registro['error']}", flush=True)
+            else:
+                print(f"✅ {Path(registro['archivo']).name:<40} {registro['big_o']:<15} "
+                      f"T(n) = {registro['t_n']}", flush=True)
+
+    if not como_json:
+        print("═" * 70)
+        print(f"Total: {len(rutas)} | Correctos: {len(rutas) - errores} | Errores: {errores}")
+    if perfil is not None:
+        # Con --json la salida estándar queda sólo para los registros
+        salida = sys.stderr if como_json else sys.stdout
+        ruta_pstats, ruta_colapsado = perfil.guardar(directorio_perfil, "lote")
+        print(f"\n🔬 Perfil guardado en {ruta_pstats} y {ruta_colapsado}", file=salida)
+        perfil.mostrar(top=_opcion("--top", int, 10), archivo=salida)
+    if cache is not None:
+        if "--cache-stats" in sys.argv:
+            mostrar_estadisticas_cache(cache)
+        cache.cerrar()
+    if errores:
+        sys.exit(1)
+
+def main_memoria(rutas):
+    """--memory-report: memoria por fase de cada archivo y informe JSON (opcionalmente contra una base)"""
+    import json
+    from core.memoria import TOP_SITIOS, comparar_informes, informe_memoria
+
+    ruta_informe = _opcion("--memory-report", str)
+    if ruta_informe is None or ruta_informe.startswith("--"):
+        ruta_informe = "memoria.json"
+    top = _opcion("--top", int, TOP_SITIOS)
+
+    print(f"🧠 Midiendo memoria de {len(rutas)} archivo(s) con tracemalloc")
+    print("═" * 70)
+    informe = informe_memoria(rutas, top=top)
+    errores = 0
+    for registro in informe.archivos:
+        if registro['error']:
+            errores += 1
+            print(f"❌ {Path(registro['archivo']).name:<40} {registro['error']}")
+        else:
+            print(f"✅ {Path(registro['archivo']).name:<40} {registro['big_o']:<15} T(n) = {registro['t_n']}")
+    print()
+    informe.mostrar(top=min(top, 5))
+
+    datos = informe.como_dict()
+    ruta_informe = Path(ruta_informe)
+    ruta_informe.parent.mkdir(parents=True, exist_ok=True)
+    ruta_informe.write_text(json.dumps(datos, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"\n💾 Informe guardado en {ruta_informe}")
+
+    ruta_base = _opcion("--memory-baseline", str)
+    if ruta_base:
+        regresiones = comparar_informes(json.loads(Path(ruta_base).read_text(encoding='utf-8')), datos)
+        if regresiones:
+            print(f"\n⚠️  {len(regresiones)} regresión(es) de memoria respecto de {ruta_base}:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            sys.exit(1)
+        print(f"✅ Sin regresiones de memoria respecto de {ruta_base}")
+    if errores:
+        sys.exit(1)
+
+def main_empirico():
+    """Perfil empírico: ejecuta el pseudocódigo con entradas crecientes y ajusta la curva"""
+    if len(sys.argv) < 3:
+        print("Uso: python main.py --empirico <archivo_pseudocodigo> [opciones]")
+        print("\nOpciones:")
+        print("  --funcion F   Función a medir (por defecto, la que ninguna otra llama)")
+        print("  --entrada E   Arreglos de entrada: aleatorio, ordenado o inverso")
+        print("  --max-n N     Tamaño máximo de entrada (por defecto 2^20)")
+        print("  --limite K    Operaciones máximas por ejecución")
+        print("  --motor M     compilado (código Python, por defecto) o interprete")
+        print("  --tiempo      Ajustar tiempos de ejecución en lugar de operaciones")
+        print("\nEjemplo:")
+        print("  python main.py --empirico ejemplos/ejemplo_quicksort.txt --entrada ordenado")
+        print("  python main.py --empirico ejemplos/ejemplo_mergesort.txt --tiempo")
+        return
+
+    from core.interprete import ErrorInterprete
+    from core.perfil_empirico import ENTRADAS, MOTORES, TAMANOS, perfil_empirico
+
+    ruta = Path(sys.argv[2])
+    if not ruta.is_file():
+        print(f" Error: '{ruta}' no es un archivo")
+        sys.exit(2)
+    entrada = _opcion("--entrada", str, "aleatorio")
+    if entrada not in ENTRADAS:
+        print(f" Error: entrada '{entrada}' desconocida (use {', '.join(ENTRADAS)})")
+        sys.exit(2)
+    motor = _opcion("--motor", str, "compilado")
+    if motor not in MOTORES:
+        print(f" Error: motor '{motor}' desconocido (use {', '.join(MOTORES)})")
+        sys.exit(2)
+    maximo = _opcion("--max-n", int, TAMANOS[-1])
+
+    try:
+        resultado = perfil_empirico(
+            ruta.read_text(encoding='utf-8'),
+            nombre_funcion=_opcion("--funcion", str),
+            entrada=entrada,
+            tamanos=[n for n in TAMANOS if n <= maximo],
+            limite=_opcion("--limite", int),
+            motor=motor,
+            medida="tiempo" if "--tiempo" in sys.argv else "operaciones",
+        )
+    except (ErrorInterprete, ValueError) as e:
+        print(f" Error durante la ejecución: {e}")
+        sys.exit(1)
+    resultado.mostrar()
+    if resultado.coincide is False:
+        sys.exit(1)
+
+def mostrar_estadisticas_cache(cache=None):
+    """Resumen del cache de resultados (el predeterminado si no se indica otro)"""
+    from core.cache_resultados import CacheResultados
+
+    propio = cache is None
+    if propio:
+        cache = CacheResultados()
+    datos = cache.estadisticas()
+    if propio:
+        cache.cerrar()
+    print("\n CACHE DE RESULTADOS")
+    print("─" * 50)
+    print(f"  Ubicación:     {datos['ruta']}")
+    if not datos['habilitado']:
+        print("  Estado:        deshabilitado (no se pudo abrir la base)")
+        return
+    print(f"  Versión:       {datos['version_analizador']}")
+    print(f"  Entradas:      {datos['entradas']}")
+    print(f"  Tamaño:        {datos['bytes'] / 1024:.1f} KiB de {datos['tamano_maximo'] / 1024 ** 2:.0f} MiB")
+    print(f"  Aciertos:      {datos['aciertos']} | Fallos: {datos['fallos']} "
+          f"({100 * datos['tasa_aciertos']:.1f}% de aciertos)")
+    if not propio:
+        print(f"  Esta ejecución: {datos['aciertos_sesion']} aciertos, {datos['fallos_sesion']} fallos")
+
+def _opcion(nombre, tipo, defecto=None):
+    """Valor de una opción '--nombre valor' de la línea de comandos"""
+    if nombre in sys.argv:
+        indice = sys.argv.index(nombre)
+        if indice + 1 < len(sys.argv):
+            return tipo(sys.argv[indice + 1])
+    return defecto
+
+def _direccion_servidor():
+    """(socket, puerto) elegidos con --socket / --port, o los predeterminados"""
+    from core.cliente_analisis import direccion_predeterminada
+    socket_unix = _opcion("--socket", str)
+    puerto = _opcion("--port", int)
+    if socket_unix is None and puerto is None:
+        try:
+            return direccion_predeterminada()
+        except PermissionError as e:
+            print(f" {e}; indique otra ruta con --socket")
+            sys.exit(2)
+    return socket_unix, puerto
+
+def main_servidor():
+    """Servidor de análisis de larga duración (JSON-RPC por socket Unix o TCP local)"""
+    from core.servidor_analisis import ServidorAnalisis, SocketOcupado
+
+    socket_unix, puerto = _direccion_servidor()
+    servidor = ServidorAnalisis(socket=socket_unix, puerto=puerto)
+    print(f"🔌 Servidor de análisis escuchando en {servidor.direccion} (pid {os.getpid()})")
+    print("   Detener con Ctrl+C o con: python main.py --client --stop")
+    sys.stdout.flush()
+    try:
+        servidor.ejecutar()
+    except (SocketOcupado, OSError) as e:
+        print(f" No se pudo iniciar el servidor: {e}")
+        sys.exit(2)
+
+def main_cliente():
+    """Cliente liviano: envía archivos al servidor en lugar de analizarlos aquí"""
+    import json
+    from core.cliente_analisis import ClienteAnalisis, ErrorServidor
+
+    socket_unix, puerto = _direccion_servidor()
+    objetivo = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else None
+    como_json = "--json" in sys.argv
+
+    try:
+        cliente = ClienteAnalisis(socket_unix, puerto)
+    except OSError as e:
+        print(f" No se pudo conectar con el servidor ({socket_unix or puerto}): {e}")
+        print("   Inícielo con: python main.py --serve")
+        sys.exit(2)
+
+    with cliente:
+        if "--stop" in sys.argv:
+            cliente.detener()
+            print("Servidor detenido")
+            return
+        if objetivo is None:
+            print(json.dumps(cliente.ping(), ensure_ascii=False))
+            return
+
+        ruta = Path(objetivo)
+        if ruta.is_dir():
+            rutas = sorted(ruta.rglob("*.txt"))
+            errores = 0
+            for registro in cliente.lote(rutas, workers=_opcion("--workers", int, 1)):
+                errores += bool(registro['error'])
+                if como_json:
+                    print(json.dumps(registro, ensure_ascii=False))
+                else:
+                    estado = registro['error'] or f"{registro['big_o']:<15} T(n) = {registro['t_n']}"
+                    print(f"{'❌' if registro['error'] else '✅'} {Path(registro['archivo']).name:<40} {estado}")
+            sys.exit(1 if errores else 0)
+
+        try:
+            resultado = cliente.analizar(ruta.read_text(encoding='utf-8'))
+        except ErrorServidor as e:
+            print(f" Error durante el análisis: {e.mensaje}")
+            sys.exit(1)
+        if como_json:
+            print(json.dumps(resultado, ensure_ascii=False))
+        else:
+            print(f" Función: {resultado['funcion'] or 'Código principal'}")
+            print(f"  T(n) = {resultado['t_n']}")
+            print(f" Big O: {resultado['big_o']}")
+            print(f" Recursivo: {'Sí' if resultado['recursivo'] else 'No'}")
+
+def perfil_arranque():
+    """
+    Ejecuta el resto de la línea de comandos con 'python -X importtime' y
+    resume cuánto tiempo de arranque se fue en importar cada paquete.
+
+        python main.py --profile-startup --cli ejemplos/ejemplo_busqueda_lineal.txt
+    """
+    import subprocess
+    import time
+
+    argumentos = [arg for arg in sys.argv[1:] if arg != "--profile-startup"] or ["--help"]
+    comando = [sys.executable, "-X", "importtime", str(Path(__file__).resolve()), *argumentos]
+    inicio = time.perf_counter()
+    proceso = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='replace')
+    total = time.perf_counter() - inicio
+
+    # Líneas "import time: propio | acumulado | módulo" (microsegundos)
+    por_paquete = {}
+    raices = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, modulo = linea[len("import time:"):].split("|")
+        paquete = modulo.strip().split(".")[0]
+        por_paquete[paquete] = por_paquete.get(paquete, 0) + int(propio)
+        if not modulo[1:].startswith(" "):
+            raices.append((int(acumulado), modulo.strip()))
+
+    importacion = sum(por_paquete.values())
+    print(f" PERFIL DE ARRANQUE: python main.py {' '.join(argumentos)}")
+    print("═" * 60)
+    print(f"  Tiempo total del proceso:  {total * 1000:8.1f} ms")
+    print(f"  Tiempo de importaciones:   {importacion / 1000:8.1f} ms")
+    print(f"  Código de salida:          {proceso.returncode}")
+    print("\n  Por paquete (tiempo propio):")
+    for paquete, micros in sorted(por_paquete.items(), key=lambda x: -x[1])[:12]:
+        print(f"    {paquete:<28} {micros / 1000:8.1f} ms  {100 * micros / max(importacion, 1):5.1f}%")
+    print("\n  Importaciones de primer nivel más costosas (acumulado):")
+    for micros, modulo in sorted(raices, reverse=True)[:8]:
+        print(f"    {modulo:<28} {micros / 1000:8.1f} ms")
+    pesados = [p for p in ("sympy", "numpy", "matplotlib", "ttkbootstrap") if p in por_paquete]
+    print(f"\n  Dependencias pesadas cargadas: {', '.join(pesados) if pesados else 'ninguna'}")
+
 if __name__ == "__main__":
     # Verificar argumentos de línea de comandos
-    if len(sys.argv) > 1:
+    if "--profile-startup" in sys.argv:
+        perfil_arranque()
+    elif len(sys.argv) > 1:
         if sys.argv[1] == "--cli":
             main_cli()
+        elif sys.argv[1] == "--batch":
+            main_lote()
+        elif sys.argv[1] == "--empirico":
+            main_empirico()
+        elif sys.argv[1] == "--serve":
+            main_servidor()
+        elif sys.argv[1] == "--client":
+            main_cliente()
+        elif sys.argv[1] == "--cache-stats":
+            mostrar_estadisticas_cache()
         elif sys.argv[1] == "--help" or sys.argv[1] == "-h":
             print(" ANALIZADOR DE COMPLEJIDAD TEMPORAL")
             print("═" * 50)
             print("\nUso:")
             print("  python main.py                    # Interfaz gráfica")
             print("  python main.py --cli <archivo>    # Análisis CLI")
+            print("  python main.py --batch <dir>      # Analizar un directorio en paralelo")
+            print("  python main.py --empirico <archivo>  # Ejecutar y ajustar la curva de operaciones")
+            print("  python main.py --serve            # Servidor de análisis (proceso caliente)")
+            print("  python main.py --client <archivo|dir>  # Analizar usando el servidor")
+            print("  python main.py --cache-stats      # Estadísticas del cache de resultados")
             print("  python main.py --help             # Esta ayuda")
             print("  python main.py --ejemplos         # Listar ejemplos")
+            print("  python main.py --profile-startup [args]  # Perfil de importaciones al arrancar")
             print("\nOpciones CLI:")
             print("  --verbose    Mostrar información detallada")
             print("  --save       Guardar análisis automáticamente")
+            print("  --no-cache   No usar el cache de resultados (también con --batch)")
+            print("  --cache-stats  Estadísticas del cache al terminar (también con --batch)")
+            print("  --timings    Tiempos por fase y contadores (--timings-json: bloque JSON)")
+            print("  --profile DIR  cProfile: .pstats, pilas colapsadas y resumen por subsistema (también con --batch)")
+            print("  --top N      Funciones por subsistema en el resumen del perfil")
+            print("  --memory-report [RUTA]  Memoria por fase con tracemalloc e informe JSON (también con --batch)")
+            print("  --memory-baseline RUTA  Comparar el informe con una línea base")
+            print("\nOpciones --batch:")
+            print("  --workers N  Procesos trabajadores (uno por CPU)")
+            print("  --timeout S  Segundos máximos por archivo")
+            print("  --json       Una línea JSON por archivo")
+            print("\nOpciones --empirico:")
+            print("  --funcion F  Función a medir")
+            print("  --entrada E  aleatorio, ordenado o inverso")
+            print("  --max-n N    Tamaño máximo de entrada")
+            print("  --limite K   Operaciones máximas por ejecución")
+            print("  --motor M    compilado o interprete")
+            print("  --tiempo     Ajustar tiempos en lugar de operaciones")
+            print("\nOpciones --serve / --client:")
+            print("  --socket RUTA  Socket Unix (por defecto en $XDG_RUNTIME_DIR o un directorio del usuario)")
+            print("  --port N       Puerto TCP de localhost en lugar del socket")
+            print("  --stop         (cliente) Detener el servidor")
             print("\nEjemplos:")
             print("  python main.py --cli ejemplos/ejemplo_busqueda_lineal.txt")
             print("  python main.py --cli ejemplos/ejemplo_fibonacci_recursivo.txt --verbose")
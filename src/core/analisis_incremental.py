@@ -0,0 +1,222 @@
+# analisis_incremental.py
+
+import re
+
+from .pseudogrammar import tokenizar
+from .parser_estructural import parsear, Nodo
+from .analizador_complejidad import AnalizadorComplejidad, CacheAnalisis
+
+# Caracteres que pueden formar parte de un identificador (ver pseudogrammar)
+_CARACTERES_IDENT = re.compile(r'[A-Za-z0-9ñÑáéíóúÁÉÍÓÚü_]')
+_CANDIDATA = re.compile(r'f?funcion', re.IGNORECASE)
+_APERTURA = 'funcion'
+
+
+def _palabras_funcion(codigo):
+    """
+    (posición, +1/-1) de cada Funcion/fFuncion que el tokenizador reconocería.
+
+    Una coincidencia es palabra clave si no continúa un identificador: lo
+    que la precede dentro de la misma palabra sólo puede ser un número
+    (el tokenizador separa "3Funcion" en NUMERO y Funcion).
+    """
+    for mo in _CANDIDATA.finditer(codigo):
+        inicio, fin = mo.span()
+        if fin < len(codigo) and _CARACTERES_IDENT.match(codigo, fin):
+            continue
+        k = inicio
+        while k > 0 and _CARACTERES_IDENT.match(codigo, k - 1):
+            k -= 1
+        if not codigo[k:inicio].isdigit() and k != inicio:
+            continue
+        yield inicio, 1 if mo.group().lower() == _APERTURA else -1
+
+
+def dividir_en_bloques(codigo):
+    """
+    Divide el texto en bloques de líneas completas.
+
+    Cada función de primer nivel (desde la línea que empieza con 'Funcion'
+    hasta la de su 'fFuncion') es un bloque; el texto entre funciones forma
+    bloques propios. Concatenar los bloques reproduce el texto original.
+    """
+    cortes = {0, len(codigo)}
+    profundidad = 0
+    cierre = None  # fin de la línea en la que la profundidad volvió a 0
+    for posicion, delta in _palabras_funcion(codigo):
+        if cierre is not None:
+            if posicion < cierre:
+                profundidad += delta
+                continue
+            if profundidad <= 0:
+                cortes.add(cierre)
+                profundidad = 0
+            cierre = None
+        if profundidad == 0:
+            inicio_linea = codigo.rfind('\n', 0, posicion) + 1
+            if delta < 0 or codigo[inicio_linea:posicion].strip():
+                continue
+            cortes.add(inicio_linea)
+        profundidad += delta
+        if profundidad <= 0:
+            cierre = codigo.find('\n', posicion) + 1 or len(codigo)
+    if cierre is not None and profundidad <= 0:
+        cortes.add(cierre)
+    cortes = sorted(cortes)
+    return [codigo[a:b] for a, b in zip(cortes, cortes[1:])]
+
+
+class AnalizadorIncremental:
+    """
+    Análisis incremental del texto de un editor, por bloques de función.
+
+    En cada actualizar(codigo) el texto se divide en bloques (cada función de
+    primer nivel es uno). Sólo los bloques cuyo texto cambió se tokenizan y
+    parsean de nuevo; los demás conservan sus nodos del AST. Como el cache de
+    costos del analizador se indexa por identidad de nodo, los costos de las
+    funciones que no cambiaron (ni llaman, directa o indirectamente, a una
+    que cambió) se trasladan al nuevo analizador y no se recalculan. Las
+    funciones que llaman a una función modificada se invalidan recorriendo
+    el grafo de llamadas en sentido inverso.
+
+    Si cambia algo que afecta a todas las funciones (los nombres definidos o
+    las variables de tamaño) se descarta el cache y se analiza todo, aunque
+    el parseo siga siendo por bloques.
+    """
+
+    def __init__(self, tamano_cache=4096):
+        self.tamano_cache = tamano_cache
+        self.analizador = None
+        self.bloques = []
+        self.estadisticas = {}
+        self._resultados = {}
+
+    # --- parseo por bloques ---
+
+    def _parsear_bloque(self, texto, anteriores):
+        """Bloque parseado para 'texto': reutilizado de 'anteriores' o parseado ahora"""
+        disponibles = anteriores.get(texto)
+        if disponibles:
+            return disponibles.pop(), False
+        tokens = tokenizar(texto)
+        raiz = parsear(tokens)
+        return {'texto': texto, 'raiz': raiz, 'tokens': len(tokens)}, True
+
+    def _parsear(self, codigo):
+        anteriores = {}
+        for bloque in self.bloques:
+            anteriores.setdefault(bloque['texto'], []).append(bloque)
+
+        textos = dividir_en_bloques(codigo)
+        bloques = []
+        reparseados = 0
+        for i, texto in enumerate(textos):
+            bloque, nuevo = self._parsear_bloque(texto, anteriores)
+            if bloque['raiz'].sin_cerrar and i + 1 < len(textos):
+                # Un bloque abierto (p. ej. falta un fSi) absorbe lo que sigue,
+                # igual que al parsear el texto completo
+                bloque, nuevo = self._parsear_bloque(''.join(textos[i:]), anteriores)
+                bloques.append(bloque)
+                reparseados += nuevo
+                break
+            bloques.append(bloque)
+            reparseados += nuevo
+
+        # Los nodos de cada bloque cuelgan de una raíz nueva; su profundidad y
+        # función contenedora no cambian, así que sólo se reasigna el padre
+        raiz = Nodo("PROGRAMA")
+        raiz.diagnosticos = []
+        for bloque in bloques:
+            for nodo in bloque['raiz'].hijos:
+                nodo.padre = raiz
+                raiz.hijos.append(nodo)
+            raiz.diagnosticos.extend(bloque['raiz'].diagnosticos)
+        raiz.sin_cerrar = bloques[-1]['raiz'].sin_cerrar if bloques else 0
+        self.bloques = bloques
+        return raiz, reparseados
+
+    # --- invalidación ---
+
+    @staticmethod
+    def _huella_global(analizador):
+        """Lo que comparten todas las funciones: nombres definidos y variables de tamaño"""
+        return frozenset(analizador.funciones), frozenset(analizador.variables_principales)
+
+    @staticmethod
+    def _afectadas(analizador, cambiadas):
+        """'cambiadas' más todas las funciones que las llaman (directa o indirectamente)"""
+        llamadores = {}
+        for origen, destinos in analizador.grafo.aristas.items():
+            for destino in destinos:
+                llamadores.setdefault(destino, []).append(origen)
+        afectadas = set(cambiadas)
+        pendientes = list(cambiadas)
+        while pendientes:
+            for origen in llamadores.get(pendientes.pop(), ()):
+                if origen not in afectadas:
+                    afectadas.add(origen)
+                    pendientes.append(origen)
+        return afectadas
+
+    def actualizar(self, codigo):
+        """Incorpora el nuevo texto y retorna el AnalizadorComplejidad listo para analizar"""
+        anterior = self.analizador
+        arbol, reparseados = self._parsear(codigo)
+        analizador = AnalizadorComplejidad(arbol, tamano_cache=self.tamano_cache)
+
+        if anterior is None or self._huella_global(anterior) != self._huella_global(analizador):
+            afectadas = set(analizador.funciones)
+        else:
+            cambiadas = {nombre for nombre, nodo in analizador.funciones.items()
+                         if anterior.funciones.get(nombre) is not nodo}
+            afectadas = self._afectadas(analizador, cambiadas)
+            # Sólo se conservan los costos de nodos de funciones no afectadas;
+            # los de nivel superior (fuera de funciones) se recalculan siempre
+            conservado = CacheAnalisis(self.tamano_cache)
+            for clave, valor in anterior.cache_analisis.entradas.items():
+                nombre = clave[1].funcion
+                if nombre is not None and nombre not in afectadas:
+                    conservado.entradas[clave] = valor
+            analizador.cache_analisis = conservado
+
+        self._resultados = {nombre: resultado for nombre, resultado in self._resultados.items()
+                            if nombre is not None and nombre not in afectadas}
+        self.analizador = analizador
+        self.estadisticas = {
+            'bloques': len(self.bloques),
+            'bloques_reparseados': reparseados,
+            'funciones': len(analizador.funciones),
+            'funciones_invalidadas': len(afectadas),
+            'costos_conservados': len(analizador.cache_analisis),
+        }
+        return analizador
+
+    # --- consultas ---
+
+    @property
+    def arbol(self):
+        return self.analizador.arbol if self.analizador is not None else None
+
+    @property
+    def tokens(self):
+        return sum(bloque['tokens'] for bloque in self.bloques)
+
+    def analizar(self, nombre_funcion=None):
+        """ResultadoAnalisis de una función del último texto (reutilizado si no cambió)"""
+        if self.analizador is None:
+            raise ValueError("No hay código: llame a actualizar() primero")
+        resultado = self._resultados.get(nombre_funcion)
+        if resultado is None:
+            resultado = self.analizador.analizar(nombre_funcion)
+            if nombre_funcion is not None:
+                self._resultados[nombre_funcion] = resultado
+        return resultado
+
+    def analizar_codigo(self, codigo, nombre_funcion=None):
+        """Como cache_resultados.analizar_con_detalles, pero incremental"""
+        analizador = self.actualizar(codigo)
+        funciones = list(analizador.funciones)
+        if nombre_funcion is None:
+            nombre_funcion = funciones[0] if funciones else None
+        resultado = self.analizar(nombre_funcion)
+        return resultado, {'tokens': self.tokens, 'funciones': funciones}
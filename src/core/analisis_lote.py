@@ -0,0 +1,322 @@
+# analisis_lote.py
+
+import os
+import sys
+import time
+import signal
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TiempoFuturoAgotado
+from pathlib import Path
+
+from .pseudogrammar import tokenizar
+from .parser_estructural import parsear
+from .analizador_complejidad import AnalizadorComplejidad
+from .cache_resultados import CacheResultados, analizar_con_detalles
+
+# Programa mínimo con el que cada proceso trabajador calienta SymPy y los
+# caches del analizador antes de recibir archivos reales: un mergesort con
+# un Para, un Mientras y dos llamadas recursivas (recurrencia y Big O)
+_PROGRAMA_CALENTAMIENTO = """
+Funcion calentar(arr, inicio, fin)
+    Si inicio < fin Entonces
+        medio <- (inicio + fin) / 2
+        calentar(arr, inicio, medio)
+        calentar(arr, medio + 1, fin)
+        Para i desde inicio hasta fin hacer
+            aux[i] <- arr[i]
+        fPara
+        k <- 1
+        Mientras k < fin hacer
+            k <- k * 2
+        fMientras
+    fSi
+fFuncion
+"""
+
+# Tareas que atiende un trabajador antes de ser reemplazado: acota la memoria
+# que acumulan los caches globales de SymPy a lo largo de miles de archivos
+TAREAS_POR_TRABAJADOR = 200
+
+# Margen sobre el tiempo límite antes de que el proceso principal dé por
+# perdida una tarea (si el trabajador no pudo interrumpirse a sí mismo)
+_MARGEN_TIEMPO = 5.0
+
+
+class TiempoAgotado(Exception):
+    """El análisis de un archivo superó el tiempo límite"""
+
+
+def analizar_codigo(codigo, nombre_funcion=None):
+    """
+    Analiza pseudocódigo y retorna su ResultadoAnalisis.
+
+    Si no se indica función se analiza la primera definida en el código
+    (o el programa completo si no hay funciones), igual que la CLI.
+    """
+    arbol = parsear(tokenizar(codigo))
+    analizador = AnalizadorComplejidad(arbol)
+    if nombre_funcion is None:
+        nombre_funcion = next(iter(analizador.funciones), None)
+    return analizador.analizar(nombre_funcion)
+
+
+def calentar():
+    """
+    Analiza _PROGRAMA_CALENTAMIENTO hasta el texto de T(n): importa SymPy y
+    recorre bucles, recursión y Big O antes del primer archivo real
+    """
+    arbol = parsear(tokenizar(_PROGRAMA_CALENTAMIENTO))
+    assert not arbol.diagnosticos, f"Programa de calentamiento inválido: {arbol.diagnosticos}"
+    AnalizadorComplejidad(arbol).analizar('calentar').funcion_tiempo.como_str()
+
+
+def resultado_como_dict(resultado):
+    """Campos de un ResultadoAnalisis como dict serializable en JSON"""
+    return {
+        'funcion': resultado.nombre_funcion,
+        't_n': resultado.funcion_tiempo.como_str(),
+        'big_o': resultado.big_o,
+        'recursivo': bool(resultado.recursivo),
+    }
+
+
+# Conexiones al cache de resultados abiertas en este proceso, por ruta
+_caches = {}
+
+
+def _cache_en_proceso(ruta_cache):
+    if ruta_cache not in _caches:
+        _caches[ruta_cache] = CacheResultados(ruta_cache)
+    return _caches[ruta_cache]
+
+
+def _interrumpir(signum, frame):
+    raise TiempoAgotado()
+
+
+def _analizar_ruta(ruta, tiempo_limite=None, ruta_cache=None):
+    """
+    Analiza un archivo y retorna un dict serializable (JSON) con el resultado.
+
+    Nunca lanza excepciones: los errores quedan en la clave 'error'. En
+    sistemas con setitimer el propio trabajador se interrumpe al superar
+    'tiempo_limite' (sólo desde el hilo principal, donde viven las señales).
+    Con 'ruta_cache' el resultado se guarda en ese cache de resultados.
+    """
+    registro = {
+        'archivo': str(ruta),
+        'funcion': None,
+        't_n': None,
+        'big_o': None,
+        'recursivo': False,
+        'error': None,
+        'segundos': 0.0,
+        'desde_cache': False,
+    }
+    temporizador = (tiempo_limite and hasattr(signal, 'setitimer')
+                    and threading.current_thread() is threading.main_thread())
+    if temporizador:
+        anterior = signal.signal(signal.SIGALRM, _interrumpir)
+        signal.setitimer(signal.ITIMER_REAL, tiempo_limite)
+    inicio = time.perf_counter()
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            codigo = f.read()
+        if ruta_cache is None:
+            resultado = analizar_codigo(codigo)
+        else:
+            resultado, detalles = analizar_con_detalles(codigo)
+            _cache_en_proceso(ruta_cache).guardar(codigo, resultado, detalles)
+        registro.update(resultado_como_dict(resultado))
+    except TiempoAgotado:
+        registro['error'] = f"Tiempo agotado ({tiempo_limite:g} s)"
+    except Exception as e:
+        registro['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if temporizador:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, anterior)
+        registro['segundos'] = time.perf_counter() - inicio
+    return registro
+
+
+def _inicializar_trabajador(rutas_importacion):
+    """Prepara un proceso trabajador: importa SymPy y el analizador y los calienta"""
+    for ruta in reversed(rutas_importacion):
+        if ruta not in sys.path:
+            sys.path.insert(0, ruta)
+    calentar()
+
+
+def _contexto_procesos():
+    """
+    forkserver con el analizador precargado donde existe (los trabajadores
+    nuevos nacen con SymPy ya importado); spawn en el resto (Windows).
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        contexto = multiprocessing.get_context('forkserver')
+        contexto.set_forkserver_preload(['sympy', __name__])
+        return contexto
+    return multiprocessing.get_context('spawn')
+
+
+class PoolAnalisis:
+    """
+    Conjunto de procesos trabajadores reutilizable entre lotes.
+
+    Los trabajadores se crean una vez, importan SymPy y analizan un programa
+    de calentamiento; cada lote posterior sólo paga el análisis. Se usa como
+    administrador de contexto:
+
+        with PoolAnalisis(workers=4) as pool:
+            for registro in pool.analizar(rutas):
+                ...
+    """
+
+    def __init__(self, workers=None, tiempo_limite=30.0, tareas_por_trabajador=TAREAS_POR_TRABAJADOR):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.tiempo_limite = tiempo_limite
+        self.tareas_por_trabajador = tareas_por_trabajador
+        self._ejecutor = None
+
+    def _crear_ejecutor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=_contexto_procesos(),
+            initializer=_inicializar_trabajador,
+            initargs=(list(sys.path),),
+            max_tasks_per_child=self.tareas_por_trabajador,
+        )
+
+    def __enter__(self):
+        self._ejecutor = self._crear_ejecutor()
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(wait=True, cancel_futures=True)
+            self._ejecutor = None
+
+    def _reiniciar(self):
+        """Descarta los trabajadores (uno quedó colgado) y crea otros nuevos"""
+        ejecutor = self._ejecutor
+        for proceso in list((getattr(ejecutor, '_processes', None) or {}).values()):
+            proceso.terminate()
+        ejecutor.shutdown(wait=False, cancel_futures=True)
+        self._ejecutor = self._crear_ejecutor()
+
+    def analizar(self, rutas, en_vuelo=None, ruta_cache=None):
+        """
+        Analiza 'rutas' y genera un dict por archivo en el mismo orden de entrada.
+
+        Sólo hay 'en_vuelo' tareas enviadas a la vez (por defecto dos por
+        trabajador), así que la memoria no crece con el tamaño del lote y
+        los resultados se entregan a medida que se completan. Con
+        'ruta_cache' cada trabajador guarda sus resultados en ese cache.
+        """
+        if self._ejecutor is None:
+            self._ejecutor = self._crear_ejecutor()
+        en_vuelo = en_vuelo or 2 * self.workers
+        espera = self.tiempo_limite + _MARGEN_TIEMPO if self.tiempo_limite else None
+        pendientes = deque()
+        rutas = iter(rutas)
+
+        def enviar():
+            for ruta in rutas:
+                pendientes.append((ruta, self._ejecutor.submit(_analizar_ruta, ruta, self.tiempo_limite, ruta_cache)))
+                if len(pendientes) >= en_vuelo:
+                    break
+
+        enviar()
+        try:
+            while pendientes:
+                ruta, futuro = pendientes.popleft()
+                try:
+                    registro = futuro.result(timeout=espera)
+                except TiempoFuturoAgotado:
+                    registro = _registro_error(ruta, f"Tiempo agotado ({self.tiempo_limite:g} s)")
+                    # Las tareas en vuelo se pierden con los trabajadores: se reenvían
+                    reenviar = [r for r, _ in pendientes]
+                    pendientes.clear()
+                    self._reiniciar()
+                    for r in reenviar:
+                        pendientes.append((r, self._ejecutor.submit(_analizar_ruta, r, self.tiempo_limite, ruta_cache)))
+                except Exception as e:
+                    registro = _registro_error(ruta, f"{type(e).__name__}: {e}")
+                enviar()
+                yield registro
+        finally:
+            # Si se deja de consumir el generador, lo que no empezó no se analiza
+            for _, futuro in pendientes:
+                futuro.cancel()
+
+
+def _registro_error(ruta, mensaje):
+    return {
+        'archivo': str(ruta),
+        'funcion': None,
+        't_n': None,
+        'big_o': None,
+        'recursivo': False,
+        'error': mensaje,
+        'segundos': 0.0,
+        'desde_cache': False,
+    }
+
+
+def rutas_de_directorio(directorio, patron='*.txt'):
+    """Archivos de pseudocódigo bajo 'directorio' (recursivo), ordenados"""
+    return sorted(Path(directorio).rglob(patron))
+
+
+def _consultar_cache(ruta, cache):
+    """Registro de 'ruta' armado desde el cache, o None si no está (o no se puede leer)"""
+    inicio = time.perf_counter()
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            encontrado = cache.obtener_registro(f.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+    if encontrado is None:
+        return None
+    registro = _registro_error(ruta, None)
+    registro.update(encontrado, desde_cache=True, segundos=time.perf_counter() - inicio)
+    return registro
+
+
+def analizar_lote(rutas, workers=None, tiempo_limite=30.0, en_vuelo=None, cache=None):
+    """
+    Analiza muchos archivos y genera sus resultados (dicts) en orden.
+
+    Con workers=1 el análisis se hace en este mismo proceso; con más se usa
+    un PoolAnalisis creado para el lote. Para varios lotes seguidos conviene
+    crear un PoolAnalisis y reutilizarlo.
+
+    Con un CacheResultados, los archivos ya analizados se responden desde el
+    cache en este proceso y sólo los demás se envían a analizar (si no falta
+    ninguno, ni siquiera se crean los trabajadores).
+    """
+    rutas = list(rutas)
+    if cache is not None and cache.habilitado:
+        encontrados = [_consultar_cache(ruta, cache) for ruta in rutas]
+        faltantes = [ruta for ruta, registro in zip(rutas, encontrados) if registro is None]
+        analizados = _analizar_rutas(faltantes, workers, tiempo_limite, en_vuelo, str(cache.ruta))
+        for registro in encontrados:
+            yield registro if registro is not None else next(analizados)
+        return
+    yield from _analizar_rutas(rutas, workers, tiempo_limite, en_vuelo)
+
+
+def _analizar_rutas(rutas, workers, tiempo_limite, en_vuelo, ruta_cache=None):
+    workers = max(1, workers or os.cpu_count() or 1)
+    if workers == 1 or len(rutas) <= 1:
+        for ruta in rutas:
+            yield _analizar_ruta(ruta, tiempo_limite, ruta_cache)
+        return
+    with PoolAnalisis(min(workers, len(rutas)), tiempo_limite) as pool:
+        yield from pool.analizar(rutas, en_vuelo, ruta_cache)
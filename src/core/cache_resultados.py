@@ -0,0 +1,293 @@
+# cache_resultados.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from importlib import metadata
+from pathlib import Path
+
+from .instrumentacion import actual, contar, fase
+
+# Módulos cuyo código determina el resultado de un análisis: si cambia
+# alguno, cambia la versión y las entradas anteriores dejan de coincidir
+_MODULOS_ANALISIS = (
+    'pseudogrammar.py',
+    'parser_estructural.py',
+    'recorrido.py',
+    'analizador_expresiones.py',
+    'expresion_simbolica.py',
+    'clasificacion_asintotica.py',
+    'grafo_llamadas.py',
+    'recurrencias.py',
+    'iteraciones.py',
+    'analizador_complejidad.py',
+)
+
+TAMANO_MAXIMO = 32 * 1024 * 1024  # bytes
+
+_version = None
+
+
+def _version_sympy():
+    """Versión instalada de SymPy, leída de sus metadatos sin importarlo"""
+    try:
+        return metadata.version('sympy')
+    except metadata.PackageNotFoundError:
+        return ''
+
+
+def version_analizador():
+    """Huella (sha256) del código fuente de los módulos de análisis y de la versión de SymPy"""
+    global _version
+    if _version is None:
+        huella = hashlib.sha256()
+        huella.update(f"sympy {_version_sympy()}".encode('utf-8'))
+        directorio = Path(__file__).parent
+        for nombre in _MODULOS_ANALISIS:
+            huella.update(nombre.encode('utf-8'))
+            huella.update((directorio / nombre).read_bytes())
+        _version = huella.hexdigest()[:16]
+    return _version
+
+
+def normalizar_codigo(codigo):
+    """Fines de línea uniformes, sin espacios al final de cada línea ni líneas vacías en los extremos"""
+    lineas = codigo.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(linea.rstrip() for linea in lineas).strip('\n')
+
+
+def ruta_predeterminada():
+    """$ANALIZADOR_CACHE, o resultados.sqlite3 en el directorio de cache del usuario"""
+    if os.environ.get('ANALIZADOR_CACHE'):
+        return Path(os.environ['ANALIZADOR_CACHE'])
+    base = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA') or Path.home() / '.cache'
+    return Path(base) / 'analizador_complejidad' / 'resultados.sqlite3'
+
+
+def analizar_con_detalles(codigo, nombre_funcion=None):
+    """
+    Analiza el código y retorna (ResultadoAnalisis, detalles).
+
+    'detalles' guarda lo que las interfaces muestran además del resultado:
+    cantidad de tokens y nombres de las funciones, en orden de aparición.
+    """
+    from .pseudogrammar import tokenizar
+    from .parser_estructural import parsear
+    from .analizador_complejidad import AnalizadorComplejidad
+
+    tokens = tokenizar(codigo)
+    analizador = AnalizadorComplejidad(parsear(tokens))
+    funciones = list(analizador.funciones)
+    if nombre_funcion is None:
+        nombre_funcion = funciones[0] if funciones else None
+    resultado = analizador.analizar(nombre_funcion)
+    return resultado, {'tokens': len(tokens), 'funciones': funciones}
+
+
+class CacheResultados:
+    """
+    Cache persistente de resultados de análisis, direccionado por contenido.
+
+    La clave es el sha256 de (versión del analizador, opciones, código
+    normalizado), así que un archivo ya analizado se reconoce aunque cambie
+    de nombre o de ubicación. Cada entrada guarda T(n) (texto y términos),
+    Big O, el indicador de recursión y los detalles, en una base SQLite.
+    Los términos se guardan como JSON (ExpresionSimbolica.como_json), no
+    con pickle: leer una base ajena no puede ejecutar código.
+
+    Al superar 'tamano_maximo' bytes se descartan las entradas usadas hace
+    más tiempo. Si la base no se puede abrir, el cache queda deshabilitado
+    y cada consulta es un fallo. La conexión puede usarse desde un hilo
+    distinto del que la creó (el ejecutor de la interfaz), pero no desde
+    dos hilos a la vez.
+    """
+
+    def __init__(self, ruta=None, tamano_maximo=TAMANO_MAXIMO):
+        self.ruta = Path(ruta) if ruta is not None else ruta_predeterminada()
+        self.tamano_maximo = tamano_maximo
+        self.aciertos = 0
+        self.fallos = 0
+        self._conexion = None
+        try:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            self._conexion = sqlite3.connect(str(self.ruta), timeout=10, isolation_level=None,
+                                            check_same_thread=False)
+            self._crear_tablas()
+        except (OSError, sqlite3.Error):
+            self._conexion = None
+
+    def _crear_tablas(self):
+        c = self._conexion
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute("PRAGMA synchronous=NORMAL")
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS resultados (
+                clave TEXT PRIMARY KEY,
+                funcion TEXT,
+                t_n TEXT NOT NULL,
+                big_o TEXT NOT NULL,
+                recursivo INTEGER NOT NULL,
+                terminos TEXT NOT NULL,
+                detalles TEXT NOT NULL,
+                tamano INTEGER NOT NULL,
+                usado REAL NOT NULL
+            )""")
+        c.execute("CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado)")
+        c.execute("CREATE TABLE IF NOT EXISTS meta (nombre TEXT PRIMARY KEY, valor INTEGER NOT NULL)")
+        c.execute("INSERT OR IGNORE INTO meta VALUES ('bytes', 0), ('aciertos', 0), ('fallos', 0)")
+
+    @property
+    def habilitado(self):
+        return self._conexion is not None
+
+    def cerrar(self):
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    @staticmethod
+    def clave(codigo, nombre_funcion=None):
+        opciones = json.dumps({'funcion': nombre_funcion}, sort_keys=True)
+        contenido = '\0'.join((version_analizador(), opciones, normalizar_codigo(codigo)))
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    # --- consultas ---
+
+    def _buscar(self, clave, columnas):
+        """Fila de 'clave' (actualizando su uso y los contadores) o None"""
+        if self._conexion is None:
+            self.fallos += 1
+            contar('cache_resultados.fallos')
+            return None
+        try:
+            fila = self._conexion.execute(
+                f"SELECT {columnas} FROM resultados WHERE clave = ?", (clave,)).fetchone()
+            with self._conexion:
+                if fila is not None:
+                    self._conexion.execute("UPDATE resultados SET usado = ? WHERE clave = ?", (time.time(), clave))
+                contador = 'aciertos' if fila is not None else 'fallos'
+                self._conexion.execute("UPDATE meta SET valor = valor + 1 WHERE nombre = ?", (contador,))
+        except sqlite3.Error:
+            fila = None
+        if fila is None:
+            self.fallos += 1
+            contar('cache_resultados.fallos')
+        else:
+            self.aciertos += 1
+            contar('cache_resultados.aciertos')
+        return fila
+
+    def obtener(self, codigo, nombre_funcion=None):
+        """(ResultadoAnalisis, detalles) guardados para este código, o None"""
+        fila = self._buscar(self.clave(codigo, nombre_funcion),
+                            "funcion, big_o, recursivo, terminos, detalles")
+        if fila is None:
+            return None
+        from .analizador_complejidad import ResultadoAnalisis
+        from .expresion_simbolica import ExpresionSimbolica
+
+        funcion, big_o, recursivo, terminos, detalles = fila
+        try:
+            funcion_tiempo = ExpresionSimbolica.desde_json(terminos)
+        except ValueError:
+            return None
+        detalles = dict(json.loads(detalles), desde_cache=True)
+        return ResultadoAnalisis(funcion_tiempo, big_o, bool(recursivo), funcion), detalles
+
+    def obtener_registro(self, codigo, nombre_funcion=None):
+        """Sólo los campos de texto (funcion, t_n, big_o, recursivo), sin reconstruir T(n)"""
+        fila = self._buscar(self.clave(codigo, nombre_funcion), "funcion, t_n, big_o, recursivo")
+        if fila is None:
+            return None
+        return {'funcion': fila[0], 't_n': fila[1], 'big_o': fila[2], 'recursivo': bool(fila[3])}
+
+    def guardar(self, codigo, resultado, detalles=None, nombre_funcion=None):
+        if self._conexion is None:
+            return
+        try:
+            terminos = resultado.funcion_tiempo.como_json()
+        except TypeError:
+            return  # T(n) con una función de SymPy que no se sabe guardar
+        t_n = resultado.funcion_tiempo.como_str()
+        detalles = json.dumps({k: v for k, v in (detalles or {}).items() if k != 'desde_cache'})
+        tamano = len(terminos) + len(t_n) + len(detalles) + len(resultado.big_o) + 64
+        clave = self.clave(codigo, nombre_funcion)
+        try:
+            with self._conexion:
+                anterior = self._conexion.execute(
+                    "SELECT tamano FROM resultados WHERE clave = ?", (clave,)).fetchone()
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (clave, resultado.nombre_funcion, t_n, resultado.big_o, int(bool(resultado.recursivo)),
+                     terminos, detalles, tamano, time.time()))
+                self._conexion.execute("UPDATE meta SET valor = valor + ? WHERE nombre = 'bytes'",
+                                       (tamano - (anterior[0] if anterior else 0),))
+                self._desalojar()
+        except sqlite3.Error:
+            pass
+
+    def _desalojar(self):
+        """Descarta las entradas menos usadas hasta quedar en el 90% del tamaño máximo"""
+        total = self._conexion.execute("SELECT valor FROM meta WHERE nombre = 'bytes'").fetchone()[0]
+        if total <= self.tamano_maximo:
+            return
+        objetivo = int(self.tamano_maximo * 0.9)
+        while total > objetivo:
+            filas = self._conexion.execute(
+                "SELECT clave, tamano FROM resultados ORDER BY usado LIMIT 256").fetchall()
+            if not filas:
+                total = 0
+                break
+            for clave, tamano in filas:
+                self._conexion.execute("DELETE FROM resultados WHERE clave = ?", (clave,))
+                total -= tamano
+                if total <= objetivo:
+                    break
+        self._conexion.execute("UPDATE meta SET valor = ? WHERE nombre = 'bytes'", (max(total, 0),))
+
+    def analizar(self, codigo, nombre_funcion=None):
+        """(ResultadoAnalisis, detalles) desde el cache o analizando (y guardando) el código"""
+        with fase('cache_resultados'):
+            encontrado = self.obtener(codigo, nombre_funcion)
+        if encontrado is not None:
+            # Sin análisis: la instrumentación activa sólo registra la consulta
+            encontrado[0].instrumentacion = actual()
+            return encontrado
+        resultado, detalles = analizar_con_detalles(codigo, nombre_funcion)
+        self.guardar(codigo, resultado, detalles, nombre_funcion)
+        return resultado, dict(detalles, desde_cache=False)
+
+    def limpiar(self):
+        if self._conexion is None:
+            return
+        with self._conexion:
+            self._conexion.execute("DELETE FROM resultados")
+            self._conexion.execute("UPDATE meta SET valor = 0")
+
+    def estadisticas(self):
+        """Entradas, bytes, límite y aciertos/fallos (de esta sesión y acumulados)"""
+        datos = {
+            'ruta': str(self.ruta),
+            'habilitado': self.habilitado,
+            'version_analizador': version_analizador(),
+            'tamano_maximo': self.tamano_maximo,
+            'aciertos_sesion': self.aciertos,
+            'fallos_sesion': self.fallos,
+        }
+        if self._conexion is not None:
+            meta = dict(self._conexion.execute("SELECT nombre, valor FROM meta").fetchall())
+            datos['entradas'] = self._conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+            datos['bytes'] = meta.get('bytes', 0)
+            datos['aciertos'] = meta.get('aciertos', 0)
+            datos['fallos'] = meta.get('fallos', 0)
+            consultas = datos['aciertos'] + datos['fallos']
+            datos['tasa_aciertos'] = datos['aciertos'] / consultas if consultas else 0.0
+        return datos
@@ -0,0 +1,199 @@
+# clasificacion_asintotica.py
+
+from fractions import Fraction
+
+from .perezoso import ModuloPerezoso
+
+sympy = ModuloPerezoso('sympy')
+
+# Letras usadas para las variables de tamaño en la notación Big O
+_LETRAS = 'nmkpqrst'
+_SUPERINDICES = {2: '²', 3: '³'}
+
+
+def _numero(valor):
+    """Convierte un número SymPy racional a int/Fraction"""
+    if valor.is_Integer:
+        return int(valor)
+    return Fraction(int(valor.p), int(valor.q))
+
+
+def _formatear_exponente(exponente):
+    if exponente in _SUPERINDICES:
+        return _SUPERINDICES[exponente]
+    if isinstance(exponente, Fraction) and exponente.denominator != 1:
+        return f"^({exponente})"
+    if isinstance(exponente, float):
+        # Exponentes irracionales (log2(3) de una recurrencia) con 3 decimales, como las bases
+        return f"^{round(exponente, 3)}"
+    return f"^{exponente}"
+
+
+class ClaseAsintotica:
+    """
+    Crecimiento dominante de una expresión.
+
+    'base' es la base del factor exponencial (1 si no hay), 'grados' el grado
+    polinomial por variable y 'potencia_log' la potencia del logaritmo. Por
+    ejemplo N²·log(N) es (1, {N: 2}, 1) y 2^N es (2, {}, 0).
+    """
+
+    __slots__ = ('base', 'grados', 'potencia_log')
+
+    def __init__(self, base=1, grados=None, potencia_log=0):
+        self.base = base
+        self.grados = grados or {}
+        self.potencia_log = potencia_log
+
+    @property
+    def grado(self):
+        return sum(self.grados.values())
+
+    @property
+    def variables(self):
+        return [v for v, g in self.grados.items() if g > 0]
+
+    def es_constante(self):
+        return self.base <= 1 and self.grado <= 0 and self.potencia_log <= 0
+
+    def clave(self):
+        """Orden de crecimiento: exponencial, grado total, logaritmo, mayor grado individual"""
+        if self.es_constante():
+            return (1, 0, 0, 0)
+        mayor = max(self.grados.values(), default=0)
+        return (self.base, self.grado, self.potencia_log, mayor)
+
+    def multiplicar(self, otra):
+        grados = dict(self.grados)
+        for variable, grado in otra.grados.items():
+            total = grados.get(variable, 0) + grado
+            if total:
+                grados[variable] = total
+            else:
+                grados.pop(variable, None)
+        return ClaseAsintotica(self.base * otra.base, grados, self.potencia_log + otra.potencia_log)
+
+    def elevar(self, exponente):
+        return ClaseAsintotica(
+            self.base ** exponente if self.base != float('inf') else self.base,
+            {v: g * exponente for v, g in self.grados.items()},
+            self.potencia_log * exponente,
+        )
+
+    def como_big_o(self):
+        if self.es_constante():
+            return "O(1)"
+        if self.base == float('inf'):
+            return "O(n^n)"
+
+        partes = []
+        if self.base > 1:
+            base = int(self.base) if float(self.base).is_integer() else round(float(self.base), 3)
+            partes.append(f"{base}^n")
+
+        grados = sorted((g for g in self.grados.values() if g > 0), reverse=True)
+        if grados:
+            polinomio = '*'.join(
+                letra + ('' if grado == 1 else _formatear_exponente(grado))
+                for letra, grado in zip(_LETRAS, grados)
+            )
+            if partes:
+                partes.insert(0, polinomio)
+            else:
+                partes.append(polinomio)
+
+        if self.potencia_log > 0:
+            log = "log(n)" if self.potencia_log == 1 else f"log(n)^{self.potencia_log}"
+            partes.append(log)
+
+        if len(partes) > 1 and self.base > 1:
+            return f"O({'*'.join(partes)})"
+        return f"O({' '.join(partes)})"
+
+    def como_expresion(self, var='N'):
+        """Función representativa de la clase (base^n · n^grado · log(n)^k) para graficar"""
+        n = sympy.Symbol(var)
+        if self.base == float('inf'):
+            return n ** n
+        expr = n ** self.grado * sympy.log(n, 2) ** self.potencia_log
+        if self.base > 1:
+            base = int(self.base) if float(self.base).is_integer() else sympy.Float(self.base)
+            expr = expr * base ** n
+        return sympy.Integer(1) if self.es_constante() else expr
+
+    def __repr__(self):
+        return f"ClaseAsintotica(base={self.base}, grados={self.grados}, log={self.potencia_log})"
+
+
+CONSTANTE = ClaseAsintotica()
+
+
+def _mayor(clases):
+    mejor = CONSTANTE
+    for clase in clases:
+        if clase.clave() > mejor.clave():
+            mejor = clase
+    return mejor
+
+
+def clasificar(expr):
+    """
+    Clase asintótica de una expresión SymPy, recorriendo su árbol una sola vez.
+
+    Suma: el término de mayor crecimiento. Producto: se combinan bases,
+    grados y potencias de logaritmo. No usa simplify ni expand.
+    """
+    if not expr.free_symbols:
+        return CONSTANTE
+    if expr.is_Symbol:
+        return ClaseAsintotica(grados={expr.name: 1})
+    if expr.is_Add:
+        return _mayor(clasificar(termino) for termino in expr.args)
+    if expr.is_Mul:
+        resultado = CONSTANTE
+        for factor in expr.args:
+            resultado = resultado.multiplicar(clasificar(factor))
+        return resultado
+    if expr.is_Pow:
+        base, exponente = expr.args
+        if not exponente.free_symbols:
+            if exponente.is_Rational:
+                return clasificar(base).elevar(_numero(exponente))
+            return clasificar(base).elevar(float(exponente))
+        if not base.free_symbols:
+            # Exponencial: c^f(N) con c > 1 crece como c^N
+            valor = float(base)
+            return ClaseAsintotica(base=valor) if valor > 1 else CONSTANTE
+        return ClaseAsintotica(base=float('inf'))
+    if isinstance(expr, sympy.exp):
+        return ClaseAsintotica(base=float(sympy.E))
+    if isinstance(expr, sympy.log):
+        interna = clasificar(expr.args[0])
+        if interna.base > 1:
+            # log(c^N) ~ N
+            return ClaseAsintotica(grados={s.name: 1 for s in expr.args[0].free_symbols})
+        if interna.es_constante():
+            return CONSTANTE
+        return ClaseAsintotica(grados={}, potencia_log=1)
+    # Otras funciones: crecen como su argumento de mayor crecimiento
+    return _mayor(clasificar(argumento) for argumento in expr.args)
+
+
+def clasificar_terminos(terminos):
+    """
+    Clase asintótica de la representación dispersa de ExpresionSimbolica.
+
+    Las variables (str) aportan su grado directamente; sólo los átomos SymPy
+    (log(N), 2**N, ...) se clasifican recorriendo su árbol.
+    """
+    mejor = CONSTANTE
+    for monomio in terminos:
+        clase = CONSTANTE
+        for atomo, exponente in monomio:
+            if isinstance(atomo, str):
+                clase = clase.multiplicar(ClaseAsintotica(grados={atomo: exponente}))
+            else:
+                clase = clase.multiplicar(clasificar(atomo).elevar(exponente))
+        if clase.clave() > mejor.clave():
+            mejor = clase
+    return mejor
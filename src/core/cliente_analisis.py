@@ -0,0 +1,133 @@
+# cliente_analisis.py
+#
+# Cliente liviano del servidor de análisis: sólo usa la biblioteca estándar,
+# así que importarlo no carga SymPy ni el analizador.
+
+import os
+import json
+import stat
+import socket
+import tempfile
+
+PUERTO_PREDETERMINADO = 8765
+
+
+def direccion_predeterminada():
+    """(socket, puerto) por defecto: socket Unix en un directorio del usuario, o TCP en Windows"""
+    if hasattr(socket, 'AF_UNIX') and hasattr(os, 'getuid'):
+        return os.path.join(_directorio_usuario(), 'analizador-complejidad.sock'), None
+    return None, PUERTO_PREDETERMINADO
+
+
+def _directorio_usuario():
+    """
+    $XDG_RUNTIME_DIR, que ya es privado del usuario, o si no existe un
+    directorio con el uid dentro del temporal. Ese directorio lo crea el
+    servidor con modo 0700; si ya existe debe ser del usuario y no accesible
+    para otros, o cualquiera podría poner ahí un socket propio.
+    """
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime and os.path.isdir(runtime):
+        return runtime
+    directorio = os.path.join(tempfile.gettempdir(), f'analizador-complejidad-{os.getuid()}')
+    try:
+        estado = os.lstat(directorio)
+    except FileNotFoundError:
+        return directorio
+    if not stat.S_ISDIR(estado.st_mode) or estado.st_uid != os.getuid() or estado.st_mode & 0o077:
+        raise PermissionError(f"{directorio} no es un directorio privado del usuario")
+    return directorio
+
+
+class ErrorServidor(Exception):
+    """El servidor respondió con un error JSON-RPC"""
+
+    def __init__(self, codigo, mensaje):
+        super().__init__(f"[{codigo}] {mensaje}")
+        self.codigo = codigo
+        self.mensaje = mensaje
+
+
+class ClienteAnalisis:
+    """
+    Conexión persistente con un ServidorAnalisis.
+
+        with ClienteAnalisis() as cliente:
+            print(cliente.analizar(codigo)['big_o'])
+
+    La conexión se abre una vez y se reutiliza en cada llamada.
+    """
+
+    def __init__(self, socket_unix=None, puerto=None, host='127.0.0.1', tiempo_limite=60.0):
+        if socket_unix is None and puerto is None:
+            socket_unix, puerto = direccion_predeterminada()
+        if socket_unix is not None:
+            self._conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._conexion.settimeout(tiempo_limite)
+            self._conexion.connect(socket_unix)
+        else:
+            self._conexion = socket.create_connection((host, puerto), timeout=tiempo_limite)
+            self._conexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._lector = self._conexion.makefile('rb')
+        self._siguiente_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        self._lector.close()
+        self._conexion.close()
+
+    def _enviar(self, metodo, parametros):
+        self._siguiente_id += 1
+        peticion = {'jsonrpc': '2.0', 'id': self._siguiente_id, 'method': metodo, 'params': parametros}
+        self._conexion.sendall(json.dumps(peticion, ensure_ascii=False).encode('utf-8') + b'\n')
+        return self._siguiente_id
+
+    def _mensajes(self):
+        for linea in self._lector:
+            yield json.loads(linea)
+        raise ConnectionError("El servidor cerró la conexión")
+
+    @staticmethod
+    def _resultado(mensaje):
+        if 'error' in mensaje:
+            raise ErrorServidor(mensaje['error']['code'], mensaje['error']['message'])
+        return mensaje['result']
+
+    def llamar(self, metodo, **parametros):
+        identificador = self._enviar(metodo, parametros)
+        for mensaje in self._mensajes():
+            if mensaje.get('id') == identificador:
+                return self._resultado(mensaje)
+
+    def ping(self):
+        return self.llamar('ping')
+
+    def analizar(self, codigo, funcion=None, todas=False, instrumentacion=False):
+        # Sólo se envía si se pide: un servidor anterior todavía en ejecución no lo conoce
+        extra = {'instrumentacion': True} if instrumentacion else {}
+        return self.llamar('analizar', codigo=codigo, funcion=funcion, todas=todas, **extra)
+
+    def comparar(self, codigo_a, codigo_b):
+        return self.llamar('comparar', codigo_a=codigo_a, codigo_b=codigo_b)
+
+    def lote(self, rutas, workers=1, tiempo_limite=30.0):
+        """Genera un dict por archivo a medida que el servidor los envía (en orden)"""
+        identificador = self._enviar('lote', {
+            'rutas': [os.path.abspath(str(ruta)) for ruta in rutas],
+            'workers': workers,
+            'tiempo_limite': tiempo_limite,
+        })
+        for mensaje in self._mensajes():
+            if mensaje.get('method') == 'resultado' and mensaje['params']['id'] == identificador:
+                yield mensaje['params']['registro']
+            elif mensaje.get('id') == identificador:
+                self._resultado(mensaje)
+                return
+
+    def detener(self):
+        return self.llamar('detener')
@@ -0,0 +1,492 @@
+# compilador_python.py
+#
+# Segundo motor de ejecución del pseudocódigo: traduce el árbol de 'parsear'
+# a código fuente Python, lo compila con compile() y ejecuta las funciones
+# resultantes. Los bucles, condiciones y llamadas son los de Python, así que
+# corre a velocidad de Python normal (entradas de 10^5 a 10^6 elementos).
+#
+# Con contadores, cada función acumula sus operaciones en una variable local
+# '_o' (los costos de las sentencias simples seguidas se suman en un solo
+# incremento) y la vuelca al contador global al retornar; las cabeceras de
+# bucle y la entrada a cada función comprueban el límite de operaciones. Sin
+# contadores no se emite nada de esto, para medir tiempos. Las cuentas son
+# las mismas que las del intérprete (interprete.py).
+
+import math
+import sys
+import threading
+from collections import OrderedDict
+
+from .analizador_expresiones import contar_operaciones
+from .interprete import (
+    _PREDEFINIDAS, _PROFUNDIDAD_MAXIMA, _SALIDA, Arreglo, ErrorInterprete, LimiteEjecucion, _entero, _escritas,
+    _longitud,
+)
+from .recorrido import SIN_VALOR
+
+_TAMANO_CACHE = 256
+
+# Código fuente generado -> objeto código de compile()
+_codigos = OrderedDict()
+_candado = threading.Lock()
+
+_SANGRIA = '    '
+_LONGITUD = {'longitud', 'tamano', 'tamaño'}
+
+# Traducción de operadores y palabras de las expresiones
+_OPERADORES = {
+    '+': '+', '-': '-', '*': '*', '/': '//', '%': '%', '^': '**',
+    '<': '<', '<=': '<=', '>': '>', '>=': '>=', '=': '==', '<>': '!=',
+}
+# Palabras que son operadores binarios sólo después de un operando ('y' también
+# puede ser una variable) y palabras que ocupan el lugar de un operando
+_BINARIAS = {'y': 'and', '&&': 'and', 'o': 'or', '||': 'or', 'div': '//', 'mod': '%'}
+_PREFIJAS = {
+    'no': 'not', 'not': 'not', '!': 'not',
+    'verdadero': 'True', 'true': 'True', 'falso': 'False', 'false': 'False',
+}
+
+
+def limpiar_cache():
+    with _candado:
+        _codigos.clear()
+
+
+def estadisticas_cache():
+    return {'entradas': len(_codigos)}
+
+
+def _compilar(fuente):
+    with _candado:
+        codigo = _codigos.get(fuente, SIN_VALOR)
+        if codigo is not SIN_VALOR:
+            _codigos.move_to_end(fuente)
+            return codigo
+    codigo = compile(fuente, '<pseudocodigo>', 'exec')
+    with _candado:
+        _codigos[fuente] = codigo
+        if len(_codigos) > _TAMANO_CACHE:
+            _codigos.popitem(last=False)
+    return codigo
+
+
+class _Filas(Arreglo):
+    """Arreglo de arreglos ('a[i][j]'): una fila nunca escrita es un arreglo vacío"""
+
+    __slots__ = ()
+
+    def __missing__(self, indice):
+        fila = self[indice] = Arreglo()
+        return fila
+
+
+def _es_operando(parte):
+    """La parte ya traducida termina un operando (variable, número, literal o cierre)"""
+    return parte in (')', ']', 'True', 'False') or parte.startswith('v_') or parte[0].isdigit()
+
+
+def _rango(desde, hasta):
+    inicio = _entero(desde)
+    fin = _entero(hasta)
+    if inicio <= fin:
+        return range(inicio, fin + 1)
+    return range(inicio, fin - 1, -1)
+
+
+def _entorno_base():
+    entorno = {
+        '_Arreglo': Arreglo,
+        '_Filas': _Filas,
+        '_Error': ErrorInterprete,
+        '_rango': _rango,
+        '_longitud': _longitud,
+    }
+    for nombre, funcion in _PREDEFINIDAS.items():
+        entorno['_p_' + nombre] = funcion
+    return entorno
+
+
+class _Funcion:
+    """
+    Variables de una función traducida: las que se indexan se inician como
+    arreglos, y las que se leen sin asignarlas toman su valor de '_G' si está
+    """
+
+    def __init__(self, parametros, escritas):
+        self.parametros = parametros
+        self.escritas = escritas
+        self.variables = {}  # nombre -> 0, '_Arreglo()' o '_Filas()' según su uso
+
+    def usar(self, nombre, dimensiones=0):
+        actual = self.variables.get(nombre, 0)
+        self.variables[nombre] = max(actual, min(dimensiones, 2))
+
+    def iniciales(self):
+        valores = {0: '0', 1: '_Arreglo()', 2: '_Filas()'}
+        lineas = []
+        for nombre, dimensiones in self.variables.items():
+            if nombre in self.parametros:
+                continue
+            inicial = valores[dimensiones]
+            if nombre not in self.escritas:
+                inicial = f"_G[{nombre!r}] if {nombre!r} in _G else {inicial}"
+            lineas.append(f"v_{nombre} = {inicial}")
+        return lineas
+
+
+class _Traductor:
+    def __init__(self, arbol, contar):
+        self.arbol = arbol
+        self.contar = contar
+        self.nombres = {}  # función del pseudocódigo -> nodo
+        pendientes = [arbol]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.tipo == 'FUNCION' and nodo.props.get('nombre'):
+                self.nombres.setdefault(nodo.props['nombre'], nodo)
+            pendientes.extend(reversed(nodo.hijos))
+        self.funcion = None
+
+    def traducir(self):
+        lineas = []
+        for nombre, nodo in self.nombres.items():
+            lineas += self._funcion(f"f_{nombre}", list(nodo.props.get('args', [])), nodo.hijos)
+        principal = [hijo for hijo in self.arbol.hijos if hijo.tipo not in ('FUNCION', 'CLASE')]
+        lineas += self._funcion('_principal', [], principal)
+        return '\n'.join(lineas) + '\n'
+
+    # --- expresiones ---
+
+    def _expresion(self, tokens):
+        """Código Python de una expresión; ErrorInterprete si no se puede traducir"""
+        partes = []
+        abiertos = []  # (delimitador, arreglo al que pertenece si es '[')
+        cerrado = None  # arreglo del último ']' cerrado, para 'a[i][j]'
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            siguiente = tokens[i + 1] if i + 1 < len(tokens) else None
+            clave = token.lower()
+            dueno, cerrado = cerrado, None
+            if token in ('!', '=') and siguiente == '=':
+                partes.append('!=' if token == '!' else '==')
+                i += 2
+                continue
+            if token in _OPERADORES:
+                partes.append(_OPERADORES[token])
+            elif token == '(':
+                abiertos.append(('(', None))
+                partes.append(token)
+            elif token == '[':
+                arreglo = dueno
+                if arreglo is None and i and tokens[i - 1].isidentifier():
+                    arreglo = tokens[i - 1]
+                if dueno is not None:
+                    self.funcion.usar(dueno, 2)
+                abiertos.append(('[', arreglo))
+                partes.append(token)
+            elif token in (')', ']'):
+                if not abiertos:
+                    raise ErrorInterprete(f"Expresión no reconocida: {' '.join(tokens)}")
+                _, cerrado = abiertos.pop()
+                partes.append(token)
+            elif token == ',':
+                if not abiertos:
+                    raise ErrorInterprete(f"Expresión no reconocida: {' '.join(tokens)}")
+                if abiertos[-1][0] == '[':
+                    # 'a[i, j]' es 'a[i][j]'
+                    if abiertos[-1][1] is not None:
+                        self.funcion.usar(abiertos[-1][1], 2)
+                    partes.append('][')
+                else:
+                    partes.append(',')
+            elif token[0].isdigit():
+                try:
+                    partes.append(repr(float(token) if '.' in token else int(token)))
+                except ValueError:
+                    raise ErrorInterprete(f"Número no reconocido: {token}") from None
+            elif clave in _BINARIAS and partes and _es_operando(partes[-1]):
+                partes.append(_BINARIAS[clave])
+            elif clave in _PREFIJAS:
+                partes.append(_PREFIJAS[clave])
+            elif token.isidentifier():
+                if siguiente == '(':
+                    i = self._llamada(tokens, i, partes, abiertos)
+                    continue
+                if siguiente == '.':
+                    raise ErrorInterprete(f"Atributos y métodos no soportados: {token}.{tokens[i + 2:i + 3]}")
+                self.funcion.usar(token, 1 if siguiente == '[' else 0)
+                partes.append('v_' + token)
+            else:
+                raise ErrorInterprete(f"Token inesperado '{token}' en: {' '.join(tokens)}")
+            i += 1
+        fuente = ' '.join(partes) or '0'
+        try:
+            compile(fuente, '<expresion>', 'eval')
+        except SyntaxError:
+            raise ErrorInterprete(f"Expresión no reconocida: {' '.join(tokens)}") from None
+        return fuente
+
+    def _llamada(self, tokens, i, partes, abiertos):
+        """Traduce 'f(' y retorna la posición siguiente; las funciones desconocidas valen 0"""
+        nombre = tokens[i]
+        clave = nombre.lower()
+        if nombre in self.nombres:
+            partes.append(f"f_{nombre}(")
+        elif clave in _PREDEFINIDAS:
+            partes.append(f"_p_{clave}(")
+        elif clave in _LONGITUD:
+            partes.append("_longitud(")
+        else:
+            # Como en el análisis: costo de la llamada y valor 0, sin evaluar argumentos
+            nivel = 0
+            i += 1
+            while i < len(tokens):
+                if tokens[i] == '(':
+                    nivel += 1
+                elif tokens[i] == ')':
+                    nivel -= 1
+                    if nivel == 0:
+                        break
+                i += 1
+            partes.append('0')
+            return i + 1
+        abiertos.append(('(', None))
+        return i + 2
+
+    # --- sentencias ---
+
+    def _funcion(self, nombre, parametros, nodos):
+        anterior, self.funcion = self.funcion, _Funcion(parametros, _escritas(nodos))
+        cuerpo = self._bloque(nodos, 1)
+        firma = ', '.join([f"v_{p}=0" for p in parametros] + ['*_'])
+        lineas = [f"def {nombre}({firma}):"]
+        if self.contar:
+            lineas.append(f"{_SANGRIA}if _C[0] > _L: _exceder()")
+            lineas.append(f"{_SANGRIA}_o = 0")
+        lineas += [_SANGRIA + linea for linea in self.funcion.iniciales()]
+        lineas += cuerpo
+        if self.contar:
+            lineas.append(f"{_SANGRIA}_C[0] += _o")
+        lineas.append(f"{_SANGRIA}return 0")
+        self.funcion = anterior
+        return lineas
+
+    def _bloque(self, nodos, nivel, costo_inicial=0, costo_final=0):
+        """
+        Líneas de un bloque. Las sentencias simples seguidas acumulan su costo
+        en 'pendiente', que se suma con un solo incremento antes de ellas.
+        """
+        sangria = _SANGRIA * nivel
+        lineas = []
+        pendiente = costo_inicial
+        simples = []
+
+        def volcar(costo, sentencias):
+            if self.contar and costo:
+                lineas.append(f"{sangria}_o += {costo}")
+            lineas.extend(sentencias)
+
+        k = 0
+        while k < len(nodos):
+            nodo = nodos[k]
+            sino = None
+            if nodo.tipo == 'SI' and k + 1 < len(nodos) and nodos[k + 1].tipo == 'SINO':
+                sino = nodos[k + 1]
+                k += 1
+            k += 1
+            if nodo.tipo == 'FUNCION':
+                continue
+            try:
+                costo, cabecera, compuesta = self._sentencia(nodo, nivel, sino)
+            except ErrorInterprete as error:
+                costo, cabecera, compuesta = 0, [f"{sangria}raise _Error({str(error)!r})"], None
+            pendiente += costo
+            simples += cabecera
+            if compuesta is not None:
+                volcar(pendiente, simples)
+                lineas += compuesta
+                pendiente, simples = 0, []
+        volcar(pendiente + costo_final, simples)
+        return lineas or [f"{sangria}pass"]
+
+    def _sentencia(self, nodo, nivel, sino=None):
+        """
+        (costo, líneas simples, líneas compuestas): las simples se agrupan con
+        las anteriores; si hay compuestas (None si no), el costo acumulado se
+        suma antes de ellas.
+        """
+        sangria = _SANGRIA * nivel
+        props = nodo.props
+        tipo = nodo.tipo
+        if tipo == 'ASIGNACION':
+            self.funcion.usar(props.get('var'))
+            return (contar_operaciones(props.get('expr', [])),
+                    [f"{sangria}v_{props.get('var')} = {self._expresion(props.get('expr', []))}"], None)
+        if tipo == 'ASIGNACION_ARREGLO':
+            return self._asignacion_arreglo(nodo, sangria)
+        if tipo == 'DECLARACION_ARREGLO':
+            # La variable ya empieza como arreglo vacío
+            self.funcion.usar(props.get('nombre'), len(self._indices(props.get('indices', []))))
+            return 0, [], None
+        if tipo == 'LLAMADA_FUNCION':
+            return 1, self._llamada_sentencia(nodo, sangria), None
+        if tipo == 'RETORNAR':
+            valor = self._expresion(props.get('args', []))
+            costo = contar_operaciones(props.get('args', []))
+            if self.contar:
+                # El costo de la sentencia se suma al volcar el contador local
+                return 0, [], [f"{sangria}_C[0] += _o + {costo}", f"{sangria}return {valor}"]
+            return 0, [], [f"{sangria}return {valor}"]
+        if tipo == 'SI':
+            condicion = self._expresion(props.get('cond', []))
+            lineas = [f"{sangria}if {condicion}:"] + self._bloque(nodo.hijos, nivel + 1)
+            if sino is not None:
+                lineas += [f"{sangria}else:"] + self._bloque(sino.hijos, nivel + 1)
+            return contar_operaciones(props.get('cond', [])), [], lineas
+        if tipo == 'SINO':
+            # 'Sino' sin un 'Si' inmediatamente antes: se ejecuta como bloque
+            return 0, [], self._bloque(nodo.hijos, nivel)
+        if tipo == 'PARA':
+            return 2, [], self._para(nodo, nivel)
+        if tipo == 'MIENTRAS':
+            costo = contar_operaciones(props.get('cond', []))
+            condicion = self._expresion(props.get('cond', []))
+            lineas = [f"{sangria}while {condicion}:"]
+            lineas += self._bloque(nodo.hijos, nivel + 1, costo_final=costo)
+            if self.contar:
+                lineas.append(f"{sangria}{_SANGRIA}if _o > _L: _exceder()")
+            return costo, [], lineas
+        raise ErrorInterprete(f"Sentencia no soportada: {tipo}")
+
+    def _para(self, nodo, nivel):
+        sangria = _SANGRIA * nivel
+        props = nodo.props
+        variable = props.get('var', 'i')
+        self.funcion.usar(variable)
+        desde = self._expresion(props.get('desde_expr') or [props.get('desde', '1')])
+        hasta = self._expresion(props.get('hasta_expr') or [props.get('hasta', '1')])
+        lineas = [f"{sangria}for v_{variable} in _rango({desde}, {hasta}):"]
+        lineas += self._bloque(nodo.hijos, nivel + 1, costo_inicial=1)
+        if self.contar:
+            lineas.append(f"{sangria}{_SANGRIA}if _o > _L: _exceder()")
+        return lineas
+
+    @staticmethod
+    def _indices(indices):
+        """Índices de 'a[i][j]' o 'a[i, j]' como listas de tokens"""
+        resultado = []
+        for tokens in indices:
+            parte, nivel = [], 0
+            for token in tokens:
+                if token in ('(', '['):
+                    nivel += 1
+                elif token in (')', ']'):
+                    nivel -= 1
+                if token == ',' and nivel == 0:
+                    resultado.append(parte)
+                    parte = []
+                else:
+                    parte.append(token)
+            resultado.append(parte)
+        return [parte for parte in resultado if parte]
+
+    def _asignacion_arreglo(self, nodo, sangria):
+        props = nodo.props
+        nombre = props.get('nombre')
+        if 'elementos' in props:
+            elementos = [float(e) if '.' in e else int(e) for e in props['elementos']]
+            self.funcion.usar(nombre, 1)
+            return len(elementos), [f"{sangria}v_{nombre} = _Arreglo.desde_lista({elementos!r})"], None
+        indices = self._indices(props.get('indices', []))
+        if not indices:
+            raise ErrorInterprete(f"Asignación a '{nombre}' sin índice")
+        self.funcion.usar(nombre, len(indices))
+        destino = f"v_{nombre}" + ''.join(f"[{self._expresion(indice)}]" for indice in indices)
+        valor = self._expresion(props.get('expr', []))
+        return contar_operaciones(props.get('expr', [])) + 1, [f"{sangria}{destino} = {valor}"], None
+
+    def _llamada_sentencia(self, nodo, sangria):
+        nombre = nodo.props.get('nombre', '')
+        argumentos = nodo.props.get('expr_args', [])
+        if nombre.lower() in _SALIDA or (nombre not in self.nombres and nombre.lower() != 'intercambiar'):
+            return []
+        if nombre not in self.nombres:
+            # intercambiar(a[i], a[j]) o intercambiar(x, y)
+            lugares = []
+            for tokens in argumentos:
+                if not (len(tokens) == 1 and tokens[0].isidentifier()
+                        or len(tokens) >= 4 and tokens[1] == '[' and tokens[-1] == ']'):
+                    raise ErrorInterprete(f"intercambiar: argumento no soportado {' '.join(tokens)}")
+                lugares.append(self._expresion(tokens))
+            if len(lugares) != 2:
+                raise ErrorInterprete("intercambiar necesita dos argumentos")
+            a, b = lugares
+            return [f"{sangria}{a}, {b} = {b}, {a}"]
+        valores = ', '.join(self._expresion(tokens) for tokens in argumentos)
+        return [f"{sangria}f_{nombre}({valores})"]
+
+
+class ProgramaCompilado:
+    """
+    Programa de pseudocódigo traducido a Python y compilado, con la misma
+    interfaz que Interprete:
+
+        programa = ProgramaCompilado(parsear(tokenizar(codigo)))
+        valor, operaciones = programa.ejecutar('suma', [Arreglo.desde_lista([3, 1, 2]), 3])
+
+    Con contar=False no se emiten contadores ni comprobaciones de límite y
+    'operaciones' es None: sirve para medir tiempos. La semántica es la del
+    intérprete salvo '/', que siempre es división entera ('//'). 'fuente'
+    tiene el código generado; los objetos código se guardan en un cache por
+    fuente, así que traducir de nuevo el mismo programa no vuelve a compilar.
+    """
+
+    def __init__(self, arbol, contar=True):
+        self.arbol = arbol
+        self.contar = contar
+        traductor = _Traductor(arbol, contar)
+        self.fuente = traductor.traducir()
+        self.contador = [0]
+        self.limite = math.inf
+        self._espacio = _entorno_base()
+        self._espacio['_C'] = self.contador
+        self._espacio['_L'] = math.inf
+        self._espacio['_exceder'] = self._exceder
+        self._espacio['_G'] = {}
+        exec(_compilar(self.fuente), self._espacio)
+        self.funciones = {nombre: self._espacio[f"f_{nombre}"] for nombre in traductor.nombres}
+        self.principal = self._espacio['_principal']
+
+    def _exceder(self):
+        raise LimiteEjecucion(f"Se superaron {self.limite} operaciones")
+
+    def ejecutar(self, nombre_funcion=None, argumentos=(), limite=None, globales=None):
+        """
+        Ejecuta una función (o el código fuera de funciones si nombre_funcion
+        es None) y retorna (valor, operaciones). El límite se comprueba al
+        entrar a cada función y en cada iteración de un bucle. 'globales'
+        da valor a las variables que se leen sin asignarlas, como en
+        Interprete.ejecutar.
+        """
+        if nombre_funcion is None:
+            funcion = self.principal
+        elif nombre_funcion in self.funciones:
+            funcion = self.funciones[nombre_funcion]
+        else:
+            raise ErrorInterprete(f"La función '{nombre_funcion}' no existe")
+        self.contador[0] = 0
+        self.limite = math.inf if limite is None else limite
+        self._espacio['_L'] = self.limite
+        self._espacio['_G'] = globales or {}
+        profundidad = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(profundidad, _PROFUNDIDAD_MAXIMA))
+        try:
+            valor = funcion(*argumentos)
+        except RecursionError:
+            raise LimiteEjecucion("Se superó la profundidad de recursión") from None
+        except (ZeroDivisionError, TypeError) as error:
+            raise ErrorInterprete(f"Error durante la ejecución: {error}") from None
+        finally:
+            sys.setrecursionlimit(profundidad)
+        return valor, (self.contador[0] if self.contar else None)
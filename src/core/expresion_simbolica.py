@@ -1,19 +1,301 @@
 # expresion_simbolica.py
 
-import sympy
+import json
+import math
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+
+from .perezoso import ModuloPerezoso
 from .analizador_expresiones import contar_operaciones
+from .clasificacion_asintotica import clasificar_terminos
+from .instrumentacion import contar, fase, medir_fase
+
+# SymPy se importa recién cuando hace falta: los polinomios se operan,
+# imprimen y clasifican sin él. Las funciones de SymPy y las consultas de
+# supuestos importan estos submódulos al usarse por primera vez
+sympy = ModuloPerezoso('sympy', submodulos=('sympy.sets.setexpr', 'sympy.assumptions.wrapper'))
+
+# Representación interna: diccionario disperso {monomio: coeficiente}.
+#   • monomio: frozenset de pares (átomo, exponente); frozenset() es el término constante
+#   • átomo: nombre de variable (str) o expresión SymPy indivisible (log(N), 2**N, ...)
+#   • coeficiente: int o Fraction
+# Las operaciones aritméticas trabajan sobre el diccionario y la expresión SymPy
+# sólo se construye cuando se pide (como_str, big_o, evaluar, graficar...).
+_CONSTANTE = frozenset()
+
+
+def _coeficiente_desde_sympy(numero):
+    if numero.is_Integer:
+        return int(numero)
+    return Fraction(int(numero.p), int(numero.q))
+
+
+def _coeficiente_a_sympy(coeficiente):
+    if isinstance(coeficiente, Fraction):
+        return sympy.Rational(coeficiente.numerator, coeficiente.denominator)
+    return sympy.Integer(coeficiente)
+
+
+def _multiplicar_monomios(m1, m2):
+    if not m1:
+        return m2
+    if not m2:
+        return m1
+    exponentes = dict(m1)
+    for atomo, exponente in m2:
+        total = exponentes.get(atomo, 0) + exponente
+        if total:
+            exponentes[atomo] = total
+        else:
+            del exponentes[atomo]
+    return frozenset(exponentes.items())
+
+
+def _terminos_desde_sympy(expr):
+    """Descompone una expresión SymPy (expandida) en el diccionario de términos"""
+    terminos = {}
+    for termino in sympy.Add.make_args(sympy.expand(expr)):
+        coeficiente, resto = termino.as_coeff_Mul()
+        if coeficiente.is_Rational:
+            coeficiente = _coeficiente_desde_sympy(coeficiente)
+        else:
+            # Coeficiente no racional (p. ej. flotante): se conserva como factor
+            coeficiente, resto = 1, termino
+        exponentes = {}
+        for factor in sympy.Mul.make_args(resto):
+            if factor == 1:
+                continue
+            base, exponente = factor.as_base_exp()
+            if exponente.is_Rational:
+                exponente = _coeficiente_desde_sympy(exponente)
+            else:
+                base, exponente = factor, 1
+            atomo = base.name if base.is_Symbol else base
+            exponentes[atomo] = exponentes.get(atomo, 0) + exponente
+        monomio = frozenset((a, e) for a, e in exponentes.items() if e)
+        total = terminos.get(monomio, 0) + coeficiente
+        if total:
+            terminos[monomio] = total
+        else:
+            terminos.pop(monomio, None)
+    return terminos
+
+
+# Clases de SymPy que pueden formar un átomo guardado como JSON; cualquier
+# otra hace que la expresión no se pueda guardar (nunca se evalúa texto)
+_CLASES_JSON = frozenset(('Add', 'Mul', 'Pow', 'log', 'exp', 'factorial', 'floor', 'ceiling'))
+
+
+def _numero_a_json(numero):
+    if isinstance(numero, bool) or not isinstance(numero, (int, Fraction)):
+        raise TypeError(f"Coeficiente no serializable: {numero!r}")
+    return numero if isinstance(numero, int) else [numero.numerator, numero.denominator]
+
+
+def _numero_desde_json(dato):
+    if isinstance(dato, int) and not isinstance(dato, bool):
+        return dato
+    numerador, denominador = dato
+    if not isinstance(numerador, int) or not isinstance(denominador, int):
+        raise ValueError(f"Número inválido: {dato!r}")
+    return Fraction(numerador, denominador)
+
+
+def _sympy_a_json(expr):
+    """Árbol [clase, argumentos...] de una expresión SymPy, sólo con clases de _CLASES_JSON"""
+    if expr.is_Symbol:
+        return ['Symbol', expr.name]
+    if expr.is_Integer:
+        return ['Integer', int(expr)]
+    if expr.is_Rational:
+        return ['Rational', int(expr.p), int(expr.q)]
+    if expr.is_Float:
+        # El valor binario exacto y su precisión: el texto decimal lo redondea
+        exacto = sympy.Rational(expr)
+        return ['Float', int(exacto.p), int(exacto.q), expr._prec]
+    nombre = type(expr).__name__
+    if nombre not in _CLASES_JSON:
+        raise TypeError(f"Expresión no serializable: {expr}")
+    return [nombre] + [_sympy_a_json(argumento) for argumento in expr.args]
+
+
+def _sympy_desde_json(dato):
+    nombre, *argumentos = dato
+    if nombre == 'Symbol' and isinstance(argumentos[0], str):
+        return sympy.Symbol(argumentos[0])
+    if all(isinstance(a, int) and not isinstance(a, bool) for a in argumentos):
+        if nombre == 'Integer':
+            return sympy.Integer(*argumentos)
+        if nombre == 'Rational':
+            return sympy.Rational(*argumentos)
+        if nombre == 'Float':
+            p, q, precision = argumentos
+            return sympy.Float(sympy.Rational(p, q), precision=precision)
+    if nombre not in _CLASES_JSON:
+        raise ValueError(f"Clase no permitida: {nombre!r}")
+    return getattr(sympy, nombre)(*[_sympy_desde_json(argumento) for argumento in argumentos])
+
+
+def _monomio_a_sympy(monomio):
+    factores = []
+    for atomo, exponente in monomio:
+        base = sympy.Symbol(atomo) if isinstance(atomo, str) else atomo
+        factores.append(base ** _coeficiente_a_sympy(exponente) if exponente != 1 else base)
+    return sympy.Mul(*factores)
+
+
+def _es_polinomio(terminos):
+    """True si todos los átomos son variables con exponente entero positivo"""
+    for monomio in terminos:
+        for atomo, exponente in monomio:
+            if not isinstance(atomo, str) or not isinstance(exponente, int) or exponente < 0:
+                return False
+    return True
+
+
+def _termino_como_str(monomio, coeficiente):
+    """Un término como lo imprime SymPy: '3*N**2/2', '-N*W', '5'"""
+    signo = '-' if coeficiente < 0 else ''
+    coeficiente = abs(Fraction(coeficiente))
+    if not monomio:
+        return signo + str(coeficiente)
+    factores = []
+    if coeficiente.numerator != 1:
+        factores.append(str(coeficiente.numerator))
+    for atomo, exponente in sorted(monomio):
+        factores.append(atomo if exponente == 1 else f"{atomo}**{exponente}")
+    texto = '*'.join(factores)
+    if coeficiente.denominator != 1:
+        texto += f"/{coeficiente.denominator}"
+    return signo + texto
+
+
+def _polinomio_como_str(terminos):
+    """
+    str() de la expresión SymPy equivalente, sin construirla (ni importar SymPy).
+
+    Reproduce el orden de StrPrinter: términos en orden lexicográfico
+    descendente de exponentes sobre las variables ordenadas por nombre,
+    y el caso especial 'c - k*x' de SymPy para dos términos.
+    """
+    if not terminos:
+        return '0'
+    variables = sorted({atomo for monomio in terminos for atomo, _ in monomio})
+    posicion = {variable: i for i, variable in enumerate(variables)}
+
+    def clave(monomio):
+        exponentes = [0] * len(variables)
+        for atomo, exponente in monomio:
+            exponentes[posicion[atomo]] = exponente
+        return tuple(exponentes)
+
+    orden = sorted(terminos, key=clave, reverse=True)
+    if len(orden) == 2 and _CONSTANTE in terminos and terminos[_CONSTANTE] > 0:
+        otro = orden[0]
+        if len(otro) == 1 and terminos[otro] < 0:
+            orden = [_CONSTANTE, otro]
+
+    partes = []
+    for monomio in orden:
+        texto = _termino_como_str(monomio, terminos[monomio])
+        if texto.startswith('-'):
+            partes.extend(('-', texto[1:]))
+        else:
+            partes.extend(('+', texto))
+    signo = partes.pop(0)
+    return ('-' if signo == '-' else '') + ' '.join(partes)
+
+
+# Evaluadores numéricos compilados con lambdify, compartidos por todas las
+# expresiones iguales: clave (expresión SymPy, variable) -> función NumPy
+_evaluadores = OrderedDict()
+_MAX_EVALUADORES = 256
+# La interfaz evalúa desde el hilo del ejecutor y desde el hilo de Tk
+_candado_evaluadores = threading.Lock()
+
+
+def _compilar(clave, construir):
+    """Obtiene (o compila y guarda) un evaluador NumPy del cache LRU"""
+    with _candado_evaluadores:
+        funcion = _evaluadores.get(clave)
+        if funcion is not None:
+            _evaluadores.move_to_end(clave)
+            return funcion
+    funcion = construir()
+    with _candado_evaluadores:
+        _evaluadores[clave] = funcion
+        if len(_evaluadores) > _MAX_EVALUADORES:
+            _evaluadores.popitem(last=False)
+    return funcion
+
+
+def limpiar_cache():
+    with _candado_evaluadores:
+        _evaluadores.clear()
+
+
+def _simplificar(expr):
+    """sympy.simplify, contado y medido como la fase 'simplify'"""
+    contar('sympy.simplify')
+    with fase('simplify'):
+        return sympy.simplify(expr)
+
+
+def _lambdify_vectorial(expr, simbolo):
+    """lambdify que siempre retorna un arreglo del tamaño de la entrada"""
+    import numpy as np
+    funcion = sympy.lambdify(simbolo, expr, modules='numpy')
+    return lambda x: np.broadcast_to(np.asarray(funcion(x), dtype=float), np.shape(x))
+
+
+def rango_evaluacion(n_max, puntos=400):
+    """
+    Valores de n para evaluar/graficar hasta n_max.
+
+    Hasta 'puntos' valores se usan todos los enteros 1..n_max; por encima,
+    una grilla logarítmica de enteros (np.logspace) con ~'puntos' valores.
+    """
+    import numpy as np
+    n_max = max(int(n_max), 1)
+    if n_max <= puntos:
+        return np.arange(1, n_max + 1, dtype=float)
+    return np.unique(np.round(np.logspace(0, math.log10(n_max), puntos))).astype(float)
+
 
 class ExpresionSimbolica:
+    __slots__ = ('terminos', '_expr')
+
     def __init__(self, expr):
-        self.expr = sympy.sympify(expr)
+        if isinstance(expr, ExpresionSimbolica):
+            self.terminos = dict(expr.terminos)
+            self._expr = expr._expr
+            return
+        expr = sympy.sympify(expr)
+        if expr.is_Integer:
+            valor = int(expr)
+            self.terminos = {_CONSTANTE: valor} if valor else {}
+        elif expr.is_Symbol:
+            self.terminos = {frozenset(((expr.name, 1),)): 1}
+        else:
+            self.terminos = _terminos_desde_sympy(expr)
+        self._expr = None
+
+    @classmethod
+    def _desde_terminos(cls, terminos):
+        nueva = cls.__new__(cls)
+        nueva.terminos = terminos
+        nueva._expr = None
+        return nueva
 
     @classmethod
     def constante(cls, valor):
-        return cls(sympy.Integer(valor))
+        valor = int(valor)
+        return cls._desde_terminos({_CONSTANTE: valor} if valor else {})
 
     @classmethod
     def variable(cls, nombre):
-        return cls(sympy.Symbol(nombre))
+        return cls._desde_terminos({frozenset(((nombre, 1),)): 1})
 
     @classmethod
     def desde_tokens(cls, tokens):
@@ -24,32 +306,121 @@ class ExpresionSimbolica:
         costo = contar_operaciones(tokens)
         return cls.constante(costo)
 
+    @property
+    def expr(self):
+        """Expresión SymPy equivalente (se construye una sola vez, al pedirla)"""
+        if self._expr is None:
+            contar('sympy.expresiones')
+            self._expr = sympy.Add(*[
+                _coeficiente_a_sympy(coeficiente) * _monomio_a_sympy(monomio)
+                for monomio, coeficiente in self.terminos.items()
+            ])
+        return self._expr
+
+    def como_json(self):
+        """
+        Términos como texto JSON: [[monomio, coeficiente], ...] con cada
+        monomio como [[átomo, exponente], ...]. Los átomos que no son
+        variables van como árbol de clases SymPy permitidas. TypeError si
+        alguno usa otra clase.
+        """
+        return json.dumps([
+            [[[atomo if isinstance(atomo, str) else _sympy_a_json(atomo), _numero_a_json(exponente)]
+              for atomo, exponente in monomio],
+             _numero_a_json(coeficiente)]
+            for monomio, coeficiente in self.terminos.items()
+        ], separators=(',', ':'))
+
+    @classmethod
+    def desde_json(cls, texto):
+        """Inversa de como_json(); ValueError si el texto no tiene esa forma"""
+        terminos = {}
+        try:
+            for monomio, coeficiente in json.loads(texto):
+                terminos[frozenset(
+                    (atomo if isinstance(atomo, str) else _sympy_desde_json(atomo), _numero_desde_json(exponente))
+                    for atomo, exponente in monomio
+                )] = _numero_desde_json(coeficiente)
+        except (TypeError, IndexError) as e:
+            raise ValueError(f"Términos inválidos: {e}") from e
+        return cls._desde_terminos(terminos)
+
+    def __getstate__(self):
+        return self.terminos
+
+    def __setstate__(self, terminos):
+        self.terminos = terminos
+        self._expr = None
+
+    @staticmethod
+    def _terminos_de(other):
+        if isinstance(other, ExpresionSimbolica):
+            return other.terminos
+        if isinstance(other, (int, Fraction)) and not isinstance(other, bool):
+            return {_CONSTANTE: other} if other else {}
+        return ExpresionSimbolica(other).terminos
+
+    def _sumar(self, otros, signo=1):
+        resultado = dict(self.terminos)
+        for monomio, coeficiente in otros.items():
+            total = resultado.get(monomio, 0) + signo * coeficiente
+            if total:
+                resultado[monomio] = total
+            else:
+                resultado.pop(monomio, None)
+        return ExpresionSimbolica._desde_terminos(resultado)
+
     def __add__(self, other):
-        return ExpresionSimbolica(self.expr + self._to_expr(other))
+        return self._sumar(self._terminos_de(other))
 
     def __radd__(self, other):
         return self.__add__(other)
 
     def __mul__(self, other):
-        return ExpresionSimbolica(self.expr * self._to_expr(other))
+        otros = self._terminos_de(other)
+        resultado = {}
+        for m1, c1 in self.terminos.items():
+            for m2, c2 in otros.items():
+                monomio = _multiplicar_monomios(m1, m2)
+                total = resultado.get(monomio, 0) + c1 * c2
+                if isinstance(total, Fraction) and total.denominator == 1:
+                    total = total.numerator
+                if total:
+                    resultado[monomio] = total
+                else:
+                    resultado.pop(monomio, None)
+        return ExpresionSimbolica._desde_terminos(resultado)
 
     def __rmul__(self, other):
         return self.__mul__(other)
 
     def __sub__(self, other):
-        return ExpresionSimbolica(self.expr - self._to_expr(other))
+        return self._sumar(self._terminos_de(other), -1)
 
     def __rsub__(self, other):
-        return ExpresionSimbolica(self._to_expr(other) - self.expr)
+        return ExpresionSimbolica._desde_terminos(dict(self._terminos_de(other)))._sumar(self.terminos, -1)
 
     def __truediv__(self, other):
+        otros = self._terminos_de(other)
+        if len(otros) == 1 and _CONSTANTE in otros:
+            return self * (1 / Fraction(otros[_CONSTANTE]))
         return ExpresionSimbolica(self.expr / self._to_expr(other))
 
     def __pow__(self, power):
+        otros = self._terminos_de(power)
+        if not otros:
+            return ExpresionSimbolica.constante(1)
+        if len(otros) == 1 and _CONSTANTE in otros:
+            exponente = otros[_CONSTANTE]
+            if isinstance(exponente, int) and exponente >= 0:
+                resultado = ExpresionSimbolica.constante(1)
+                for _ in range(exponente):
+                    resultado = resultado * self
+                return resultado
         return ExpresionSimbolica(self.expr ** self._to_expr(power))
 
     def __eq__(self, other):
-        return sympy.simplify(self.expr - self._to_expr(other)) == 0
+        return _simplificar(self.expr - self._to_expr(other)) == 0
 
     def _to_expr(self, other):
         if isinstance(other, ExpresionSimbolica):
@@ -57,140 +428,22 @@ class ExpresionSimbolica:
         return sympy.sympify(other)
 
     def simplificar(self):
-        return ExpresionSimbolica(sympy.simplify(self.expr))
+        return ExpresionSimbolica(_simplificar(self.expr))
 
     def como_str(self):
+        if self._expr is None and _es_polinomio(self.terminos):
+            return _polinomio_como_str(self.terminos)
         return str(self.expr)
 
+    def clase_asintotica(self):
+        """Término dominante como ClaseAsintotica (base exponencial, grados, potencia de log)"""
+        return clasificar_terminos(self.terminos)
+
+    @medir_fase('big_o')
     def big_o(self, var='N'):
         try:
-            # Simplificar la expresión primero
-            expr_simplificada = sympy.simplify(self.expr)
-            
-            # Obtener todas las variables en la expresión
-            variables = list(expr_simplificada.free_symbols)
-            
-            # Si no hay variables, es constante
-            if not variables:
-                return "O(1)"
-            
-            # Casos especiales para expresiones exponenciales
-            expr_str = str(expr_simplificada)
-            for v in variables:
-                v_str = str(v)
-                if (expr_simplificada.has(2**v) or 
-                    f'2**{v_str}' in expr_str or 
-                    '2**(' in expr_str):
-                    return f"O(2^n)"
-            
-            # Casos especiales para logarítmicos
-            for v in variables:
-                v_str = str(v)
-                if (expr_simplificada.has(sympy.log(v)) or 
-                    f'log({v_str})' in expr_str or
-                    '/log(' in expr_str):
-                    # Verificar si es N*log(N)
-                    if (expr_simplificada.has(v * sympy.log(v)) or
-                        f'{v_str}*log({v_str})' in expr_str or
-                        f'log({v_str})*{v_str}' in expr_str):
-                        return f"O(n log(n))"
-                    else:
-                        return f"O(log(n))"
-            
-            # Expandir para obtener términos individuales
-            expr_expanded = sympy.expand(expr_simplificada)
-            
-            # Encontrar el término dominante considerando todas las variables
-            max_degree = 0
-            degree_info = {}
-            
-            # Analizar el grado total de la expresión
-            for var_sym in variables:
-                degree = sympy.degree(expr_expanded, var_sym)
-                degree_info[str(var_sym)] = degree
-                max_degree = max(max_degree, degree)
-            
-            # Determinar la complejidad basada en el análisis
-            if max_degree == 0:
-                return "O(1)"
-            elif max_degree == 1:
-                # Verificar si es producto de variables (ej: a*b)
-                if len(variables) > 1 and expr_expanded.is_Mul:
-                    # Contar cuántas variables aparecen en el término principal
-                    var_count = sum(1 for v in variables if expr_expanded.has(v))
-                    if var_count > 1:
-                        return f"O(n*m)"  # Producto de variables
-                return "O(n)"
-            elif max_degree == 2:
-                return "O(n²)"
-            elif max_degree == 3:
-                return "O(n³)"
-            else:
-                return f"O(n^{max_degree})"
-                
-        except Exception as e:
-            # Fallback simple
-            expr_str = str(self.expr)
-            if any(op in expr_str for op in ['**2', '^2', '*N*', '*n*']):
-                return "O(n²)"
-            elif any(var in expr_str for var in ['N', 'n', 'a', 'b', 'c']):
-                return "O(n)"
-            else:
-                return "O(1)"
-            if expr_expanded.is_Add:
-                terms = expr_expanded.args
-                max_degree = 0
-                dominant_term = sympy.Integer(1)
-                
-                # Verificar si algún término contiene logaritmo
-                for term in terms:
-                    term_str = str(term)
-                    if 'log(' in term_str and (var in term_str or var.lower() in term_str):
-                        return f"O(log(n))"
-                
-                for term in terms:
-                    if term.has(n):
-                        # Obtener el grado del término respecto a n
-                        degree = sympy.degree(term, n)
-                        if degree > max_degree:
-                            max_degree = degree
-                            # Extraer solo la parte que depende de n
-                            dominant_term = term
-                        if degree > max_degree:
-                            max_degree = degree
-                            # Extraer solo la parte que depende de n
-                            dominant_term = term
-                
-                # Simplificar el término dominante removiendo constantes
-                if dominant_term.is_Mul:
-                    factors = []
-                    for factor in dominant_term.args:
-                        if factor.has(n):
-                            factors.append(factor)
-                    if factors:
-                        result = sympy.Mul(*factors)
-                    else:
-                        result = n**max_degree if max_degree > 0 else 1
-                else:
-                    result = dominant_term
-            else:
-                # Para expresiones no aditivas
-                if expr_expanded.has(n):
-                    degree = sympy.degree(expr_expanded, n)
-                    if degree > 0:
-                        result = n**degree
-                    else:
-                        result = expr_expanded
-                else:
-                    result = 1
-            
-            # Limpiar el resultado
-            if result == 1:
-                return "O(1)"
-            else:
-                return f"O({result})".replace(var, 'n')
-                
-        except Exception as e:
+            return self.clase_asintotica().como_big_o()
+        except Exception:
             # Fallback simple
             expr_str = str(self.expr)
             if any(op in expr_str for op in ['**2', '^2', '*N*', '*n*']):
@@ -203,27 +456,107 @@ class ExpresionSimbolica:
     def evaluar(self, **kwargs):
         return self.expr.subs(kwargs)
 
+    def _evaluador(self, var='N'):
+        """
+        Evaluador NumPy compilado de T(n).
+
+        Todas las variables de la expresión se ligan a 'var': los tamaños
+        de entrada (N, M, W...) crecen juntos en la gráfica.
+        """
+        expr = self.expr
+
+        def construir():
+            simbolo = sympy.Symbol(var)
+            ligada = expr.subs({s: simbolo for s in expr.free_symbols if s != simbolo})
+            return _lambdify_vectorial(ligada, simbolo)
+
+        return _compilar((expr, var), construir)
+
+    def _evaluador_log_atomo(self, atomo, var):
+        """Evaluador de log(átomo), con los logaritmos expandidos (log(2**N) -> N*log(2))"""
+
+        def construir():
+            simbolo = sympy.Symbol(var)
+            ligado = atomo.subs({s: simbolo for s in atomo.free_symbols if s != simbolo})
+            return _lambdify_vectorial(sympy.expand_log(sympy.log(ligado), force=True), simbolo)
+
+        return _compilar(('log', atomo, var), construir)
+
+    def evaluar_log(self, valores, var='N'):
+        """
+        log(T(n)) (natural) sobre una grilla, sin desbordamiento.
+
+        Cada término coef·Π átomo^e se evalúa como log|coef| + Σ e·log(átomo)
+        y la suma se combina con log-sum-exp, así que términos como 2^N
+        siguen siendo representables para n del orden de 10^6.
+        """
+        import numpy as np
+        x = np.asarray(valores, dtype=float)
+        if not self.terminos:
+            return np.full(x.shape, -np.inf)
+
+        logs = []
+        signos = []
+        with np.errstate(all='ignore'):
+            log_x = np.log(x)
+            for monomio, coeficiente in self.terminos.items():
+                log_termino = np.full(x.shape, math.log(abs(coeficiente)))
+                for atomo, exponente in monomio:
+                    if isinstance(atomo, str):
+                        log_atomo = log_x
+                    else:
+                        log_atomo = self._evaluador_log_atomo(atomo, var)(x)
+                    log_termino = log_termino + float(exponente) * log_atomo
+                logs.append(log_termino)
+                signos.append(1.0 if coeficiente > 0 else -1.0)
+
+            logs = np.vstack(logs)
+            maximo = np.max(np.where(np.isnan(logs), -np.inf, logs), axis=0)
+            base = np.where(np.isfinite(maximo), maximo, 0.0)
+            suma = np.sum(np.array(signos)[:, None] * np.exp(logs - base), axis=0)
+            return np.where(suma > 0, base + np.log(suma), np.nan)
+
+    def evaluar_vector(self, valores, var='N'):
+        """
+        T(n) evaluada sobre toda una grilla (np.arange, np.logspace...) de una vez.
+
+        Usa el evaluador compilado; los puntos que desbordan float64 se
+        recalculan en espacio logarítmico (y quedan en inf si T(n) > 1e308).
+        """
+        import numpy as np
+        x = np.asarray(valores, dtype=float)
+        with np.errstate(all='ignore'):
+            try:
+                y = np.array(self._evaluador(var)(x), dtype=float)
+            except (TypeError, ValueError, ZeroDivisionError):
+                y = np.full(x.shape, np.nan)
+            malos = ~np.isfinite(y)
+            if malos.any():
+                y[malos] = np.exp(self.evaluar_log(x[malos], var))
+        return y
+
+    def valores_grafica(self, valores, var='N'):
+        """
+        Valores listos para graficar: (ys, en_log10).
+
+        Si algún punto desborda float64 se retorna log10 T(n) en su lugar
+        y en_log10 es True, para que la curva exponencial siga visible.
+        """
+        import numpy as np
+        ys = self.evaluar_vector(valores, var)
+        if np.all(np.isfinite(ys)):
+            return ys, False
+        return self.evaluar_log(valores, var) / math.log(10), True
+
     def graficar(self, var='N', rango=(1, 20)):
+        import numpy as np
         import matplotlib.pyplot as plt
-        xs = list(range(rango[0], rango[1] + 1))
-        expr_simple = sympy.sympify(self.expr)
-        ys = []
-        for x in xs:
-            try:
-                y_val = expr_simple.subs({var: x})
-                if y_val.is_number:
-                    ys.append(float(y_val))
-                else:
-                    # Intentar evaluación numérica
-                    y_num = y_val.evalf()
-                    ys.append(float(y_num))
-            except (TypeError, ValueError):
-                # Si no se puede convertir, usar el valor x como fallback
-                ys.append(x)
-        
-        plt.plot(xs, ys, marker='o')
+        xs = np.arange(rango[0], rango[1] + 1, dtype=float)
+        ys, en_log10 = self.valores_grafica(xs, var)
+
+        plt.plot(xs, ys, marker='o' if len(xs) <= 50 else None)
         plt.xlabel(var)
-        plt.ylabel(str(expr_simple))
+        plt.ylabel(f"log10({self.expr})" if en_log10 else str(self.expr))
         plt.title('Complejidad temporal')
         plt.grid(True)
         plt.show()
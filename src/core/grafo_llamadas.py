@@ -0,0 +1,198 @@
+# grafo_llamadas.py
+
+# Clases de arista según dónde aparece la llamada
+LLAMADA = 'llamada'        # sentencia de llamada (nodo LLAMADA_FUNCION)
+RETORNO = 'retorno'        # llamada dentro de un 'retornar'
+EXPRESION = 'expresion'    # llamada dentro de una expresión, condición o argumento
+ANIDADA = 'anidada'        # función definida dentro de otra (su cuerpo se recorre con ella)
+
+# Propiedades de nodo que contienen listas de tokens
+_PROPS_CON_TOKENS = ('args', 'expr', 'cond')
+
+
+class GrafoLlamadas:
+    """
+    Grafo de llamadas entre funciones, construido en una sola pasada sobre el AST.
+
+    Cada nodo del AST conoce su función contenedora (nodo.funcion), así que
+    cada llamada se atribuye sin volver a recorrer la función. Las componentes
+    fuertemente conexas (Tarjan) determinan la recursión:
+      • directa:   la función se llama a sí misma
+      • mutua:     dos funciones se llaman entre sí
+      • indirecta: el ciclo pasa por tres o más funciones
+    """
+
+    def __init__(self, arbol, funciones=None):
+        self.funciones = funciones if funciones is not None else self._mapear_funciones(arbol)
+        # aristas[origen][destino] -> conjunto de clases de llamada
+        self.aristas = {nombre: {} for nombre in self.funciones}
+        # sitios[origen] -> lista de (destino, nodo, clase)
+        self.sitios = {nombre: [] for nombre in self.funciones}
+        self._construir(arbol)
+        # Componentes en orden ascendente: cada una después de las que llama
+        self.componentes = self._tarjan()
+        self.componente_de = {}
+        for indice, componente in enumerate(self.componentes):
+            for nombre in componente:
+                self.componente_de[nombre] = indice
+        self._recursion = self._clasificar_recursion()
+
+    # --- construcción ---
+
+    def _mapear_funciones(self, arbol):
+        funciones = {}
+        pendientes = [arbol]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.tipo == 'FUNCION' and nodo.props.get('nombre'):
+                funciones[nodo.props.get('nombre')] = nodo
+            pendientes.extend(reversed(nodo.hijos))
+        return funciones
+
+    def _agregar_arista(self, origen, destino, nodo, clase):
+        self.aristas[origen].setdefault(destino, set()).add(clase)
+        self.sitios[origen].append((destino, nodo, clase))
+
+    def _construir(self, arbol):
+        funciones = self.funciones
+        pendientes = [arbol]
+        while pendientes:
+            nodo = pendientes.pop()
+            pendientes.extend(reversed(nodo.hijos))
+
+            origen = nodo.funcion
+            tipo = nodo.tipo
+            if tipo == 'FUNCION':
+                # Una función anidada se recorre junto con la que la contiene
+                contenedora = nodo.padre.funcion if nodo.padre is not None else None
+                if contenedora in funciones and origen in funciones and contenedora != origen:
+                    self._agregar_arista(contenedora, origen, nodo, ANIDADA)
+                continue
+            if origen not in funciones:
+                continue
+
+            props = nodo.props
+            if tipo == 'LLAMADA_FUNCION' and props.get('nombre') in funciones:
+                self._agregar_arista(origen, props.get('nombre'), nodo, LLAMADA)
+
+            clase = RETORNO if tipo == 'RETORNAR' else EXPRESION
+            for clave in _PROPS_CON_TOKENS:
+                tokens = props.get(clave)
+                if not tokens:
+                    continue
+                for i in range(len(tokens) - 1):
+                    token = tokens[i]
+                    if isinstance(token, str) and token in funciones and tokens[i + 1] == '(':
+                        self._agregar_arista(origen, token, nodo, clase)
+
+    def _tarjan(self):
+        """Componentes fuertemente conexas (Tarjan iterativo), en orden ascendente"""
+        indice = {}
+        bajo = {}
+        en_pila = set()
+        pila = []
+        componentes = []
+        contador = 0
+
+        for raiz in self.funciones:
+            if raiz in indice:
+                continue
+            indice[raiz] = bajo[raiz] = contador
+            contador += 1
+            pila.append(raiz)
+            en_pila.add(raiz)
+            trabajo = [(raiz, iter(self.aristas[raiz]))]
+
+            while trabajo:
+                nombre, sucesores = trabajo[-1]
+                for destino in sucesores:
+                    if destino not in indice:
+                        indice[destino] = bajo[destino] = contador
+                        contador += 1
+                        pila.append(destino)
+                        en_pila.add(destino)
+                        trabajo.append((destino, iter(self.aristas[destino])))
+                        break
+                    elif destino in en_pila:
+                        bajo[nombre] = min(bajo[nombre], indice[destino])
+                else:
+                    trabajo.pop()
+                    if trabajo:
+                        padre = trabajo[-1][0]
+                        bajo[padre] = min(bajo[padre], bajo[nombre])
+                    if bajo[nombre] == indice[nombre]:
+                        componente = []
+                        while True:
+                            miembro = pila.pop()
+                            en_pila.discard(miembro)
+                            componente.append(miembro)
+                            if miembro == nombre:
+                                break
+                        componentes.append(tuple(reversed(componente)))
+        return componentes
+
+    def _clasificar_recursion(self):
+        recursion = {}
+        for nombre, destinos in self.aristas.items():
+            componente = self.componentes[self.componente_de[nombre]]
+            tipos = []
+            if nombre in destinos:
+                tipos.append('directa')
+            if len(componente) > 1:
+                if any(nombre in self.aristas[destino] for destino in destinos if destino != nombre):
+                    tipos.append('mutua')
+                if len(componente) > 2:
+                    tipos.append('indirecta')
+            recursion[nombre] = tuple(tipos)
+        return recursion
+
+    # --- consultas ---
+
+    def llamadas_desde(self, nombre):
+        """Funciones llamadas directamente por 'nombre'"""
+        return list(self.aristas.get(nombre, {}))
+
+    def tipos_recursion(self, nombre):
+        """Tupla con 'directa', 'mutua' y/o 'indirecta' (vacía si no es recursiva)"""
+        return self._recursion.get(nombre, ())
+
+    def es_recursiva(self, nombre):
+        return bool(self._recursion.get(nombre))
+
+    def hay_recursion(self):
+        return any(self._recursion.values())
+
+    def componente(self, nombre):
+        """Funciones de la componente fuertemente conexa de 'nombre'"""
+        indice = self.componente_de.get(nombre)
+        return self.componentes[indice] if indice is not None else ()
+
+    def condensacion(self):
+        """DAG de componentes: índice -> conjunto de índices de componentes llamadas"""
+        dag = {indice: set() for indice in range(len(self.componentes))}
+        for origen, destinos in self.aristas.items():
+            for destino in destinos:
+                a, b = self.componente_de[origen], self.componente_de[destino]
+                if a != b:
+                    dag[a].add(b)
+        return dag
+
+    def orden_ascendente(self):
+        """Funciones ordenadas de modo que cada una aparece después de las que llama"""
+        return [nombre for componente in self.componentes for nombre in componente]
+
+    def contexto(self, nombre, pila):
+        """
+        Parte de la pila de llamadas que puede influir en el costo de 'nombre'.
+
+        Sólo importan las funciones de la pila alcanzables desde 'nombre', y
+        como todas ellas llaman (transitivamente) a 'nombre', son exactamente
+        las de su misma componente. Para funciones no recursivas el contexto
+        es vacío y su costo es el mismo desde cualquier sitio de llamada.
+        """
+        if nombre not in self.componente_de:
+            return frozenset(pila)
+        if not self._recursion[nombre]:
+            return frozenset()
+        componente = self.componentes[self.componente_de[nombre]]
+        return frozenset(miembro for miembro in pila if miembro in componente)
@@ -0,0 +1,156 @@
+# instrumentacion.py
+
+import json
+import time
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Instrumentación del análisis en curso (None = desactivada). Una ContextVar
+# en vez de un global: el servidor y la interfaz analizan desde otros hilos
+_activa = ContextVar('instrumentacion', default=None)
+
+
+class _Fase:
+    """Mide una fase con perf_counter; las reentradas (fase dentro de sí misma) no se duplican"""
+
+    __slots__ = ('instrumentacion', 'nombre', 'inicio')
+
+    def __init__(self, instrumentacion, nombre):
+        self.instrumentacion = instrumentacion
+        self.nombre = nombre
+        self.inicio = None
+
+    def __enter__(self):
+        instrumentacion = self.instrumentacion
+        pila = instrumentacion._pila
+        datos = instrumentacion.fases.get(self.nombre)
+        if datos is None:
+            datos = instrumentacion.fases[self.nombre] = {
+                'segundos': 0.0, 'llamadas': 0, 'dentro_de': pila[-1] if pila else None}
+        datos['llamadas'] += 1
+        if self.nombre not in pila:
+            pila.append(self.nombre)
+            self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.inicio is not None:
+            instrumentacion = self.instrumentacion
+            instrumentacion.fases[self.nombre]['segundos'] += time.perf_counter() - self.inicio
+            instrumentacion._pila.pop()
+        return False
+
+
+class Instrumentacion:
+    """
+    Tiempos por fase y contadores de un análisis.
+
+    Las fases son inclusivas (el tiempo de 'analizar' incluye el de las
+    sumatorias y recurrencias que resuelve); 'dentro_de' indica la fase en
+    curso la primera vez que se entró a cada una. Se activa con
+    instrumentar(); mientras no haya una activa cada punto de medición
+    cuesta una consulta a la ContextVar (o a un atributo, en el recorrido).
+    """
+
+    def __init__(self):
+        self.fases = {}       # nombre -> {'segundos', 'llamadas', 'dentro_de'}
+        self.contadores = {}  # nombre -> entero
+        self._pila = []
+
+    def fase(self, nombre):
+        """Context manager que acumula el tiempo de 'nombre'"""
+        return _Fase(self, nombre)
+
+    def contar(self, nombre, cantidad=1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def como_dict(self):
+        """Bloque serializable en JSON con fases (en milisegundos) y contadores"""
+        return {
+            'fases': {
+                nombre: {
+                    'ms': round(datos['segundos'] * 1000, 3),
+                    'llamadas': datos['llamadas'],
+                    'dentro_de': datos['dentro_de'],
+                }
+                for nombre, datos in self.fases.items()
+            },
+            'contadores': dict(sorted(self.contadores.items())),
+        }
+
+    def como_json(self, **opciones):
+        return json.dumps(self.como_dict(), ensure_ascii=False, **opciones)
+
+    def _ordenadas(self, padre=None, nivel=0):
+        """(nivel, nombre) de las fases en orden de primera entrada, cada una bajo su fase contenedora"""
+        for nombre, datos in self.fases.items():
+            if datos['dentro_de'] == padre:
+                yield nivel, nombre
+                yield from self._ordenadas(nombre, nivel + 1)
+
+    def mostrar(self):
+        print("⏱  Tiempos por fase:")
+        for nivel, nombre in self._ordenadas():
+            datos = self.fases[nombre]
+            etiqueta = "  " * nivel + nombre
+            print(f"  {etiqueta:<24} {datos['segundos'] * 1000:10.3f} ms  ({datos['llamadas']} llamadas)")
+        if self.contadores:
+            print("🔢 Contadores:")
+            for nombre, valor in sorted(self.contadores.items()):
+                print(f"  {nombre:<24} {valor:>10}")
+
+
+def actual():
+    """Instrumentación activa en este contexto, o None"""
+    return _activa.get()
+
+
+@contextmanager
+def instrumentar(instrumentacion=None):
+    """
+    Activa 'instrumentacion' (una nueva si no se indica) durante el bloque:
+
+        with instrumentar() as instrumentacion:
+            resultado = analizar_codigo(codigo)
+        instrumentacion.mostrar()
+    """
+    if instrumentacion is None:
+        instrumentacion = Instrumentacion()
+    marca = _activa.set(instrumentacion)
+    try:
+        yield instrumentacion
+    finally:
+        _activa.reset(marca)
+
+
+def contar(nombre, cantidad=1):
+    """Suma 'cantidad' al contador 'nombre' si hay una instrumentación activa"""
+    instrumentacion = _activa.get()
+    if instrumentacion is not None:
+        instrumentacion.contar(nombre, cantidad)
+
+
+@contextmanager
+def fase(nombre):
+    """Mide el bloque como la fase 'nombre' si hay una instrumentación activa"""
+    instrumentacion = _activa.get()
+    if instrumentacion is None:
+        yield
+        return
+    with instrumentacion.fase(nombre):
+        yield
+
+
+def medir_fase(nombre):
+    """Decorador: cada llamada a la función cuenta como la fase 'nombre'"""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            instrumentacion = _activa.get()
+            if instrumentacion is None:
+                return funcion(*args, **kwargs)
+            with instrumentacion.fase(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
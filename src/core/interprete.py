@@ -0,0 +1,740 @@
+# interprete.py
+#
+# Intérprete de referencia para el AST de 'parsear'. Cada nodo y cada
+# expresión se compilan una sola vez en una clausura de Python, así que una
+# ejecución no vuelve a mirar tokens ni tipos de nodo: sólo llama clausuras
+# que leen y escriben posiciones fijas del marco de la función. Cada
+# sentencia suma al contador las operaciones que le asigna el modelo de costo
+# del analizador estático (contar_operaciones sobre sus tokens), de modo que
+# las cuentas medidas se comparan directamente con T(n).
+
+import math
+import sys
+
+from .analizador_expresiones import contar_operaciones
+
+# Profundidad de recursión de Python durante una ejecución: cada llamada del
+# pseudocódigo anida unas pocas clausuras
+_PROFUNDIDAD_MAXIMA = 50000
+
+# Funciones predefinidas que se pueden usar en expresiones
+_PREDEFINIDAS = {
+    'max': max,
+    'min': min,
+    'abs': abs,
+    'piso': math.floor,
+    'techo': math.ceil,
+    'raiz': math.isqrt,
+}
+# Procedimientos de salida: no se evalúan sus argumentos (pueden ser textos)
+_SALIDA = {'escribir', 'imprimir', 'mostrar', 'print'}
+_VERDADEROS = {'verdadero', 'true'}
+_FALSOS = {'falso', 'false'}
+_NEGACIONES = {'no', 'not', '!'}
+
+
+class ErrorInterprete(Exception):
+    """Construcción que el intérprete no sabe ejecutar o error durante la ejecución"""
+
+
+class LimiteEjecucion(Exception):
+    """La ejecución superó el máximo de operaciones o la profundidad de recursión"""
+
+
+class Arreglo(dict):
+    """Arreglo disperso (índice -> valor); las posiciones nunca escritas valen 0"""
+
+    __slots__ = ()
+
+    def __missing__(self, indice):
+        return 0
+
+    @classmethod
+    def desde_lista(cls, valores, inicio=0):
+        return cls(enumerate(valores, inicio))
+
+
+def _dividir(a, b):
+    if b == 0:
+        raise ErrorInterprete("División por cero")
+    # División entera entre enteros, como en los índices 'medio <- (inicio + fin) / 2'
+    if a.__class__ is int and b.__class__ is int:
+        return a // b
+    return a / b
+
+
+def _modulo(a, b):
+    if b == 0:
+        raise ErrorInterprete("Módulo por cero")
+    return a % b
+
+
+def _entero(valor):
+    if valor.__class__ is int:
+        return valor
+    return math.floor(valor)
+
+
+def _literal(valor):
+    def constante(f):
+        return valor
+    constante.valor = valor
+    return constante
+
+
+def _es_literal(cierre):
+    return hasattr(cierre, 'valor')
+
+
+def _fallar(mensaje):
+    def fallar(f):
+        raise ErrorInterprete(mensaje)
+    return fallar
+
+
+# Clausuras de cada operador binario; la variante '_c' tiene el operando derecho constante
+_BINARIAS = {
+    '+': lambda a, b: lambda f: a(f) + b(f),
+    '-': lambda a, b: lambda f: a(f) - b(f),
+    '*': lambda a, b: lambda f: a(f) * b(f),
+    '/': lambda a, b: lambda f: _dividir(a(f), b(f)),
+    'div': lambda a, b: lambda f: _dividir(a(f), b(f)),
+    'mod': lambda a, b: lambda f: _modulo(a(f), b(f)),
+    '%': lambda a, b: lambda f: _modulo(a(f), b(f)),
+    '^': lambda a, b: lambda f: a(f) ** b(f),
+    '<': lambda a, b: lambda f: a(f) < b(f),
+    '<=': lambda a, b: lambda f: a(f) <= b(f),
+    '>': lambda a, b: lambda f: a(f) > b(f),
+    '>=': lambda a, b: lambda f: a(f) >= b(f),
+    '=': lambda a, b: lambda f: a(f) == b(f),
+    '<>': lambda a, b: lambda f: a(f) != b(f),
+}
+_BINARIAS_C = {
+    '+': lambda a, c: lambda f: a(f) + c,
+    '-': lambda a, c: lambda f: a(f) - c,
+    '*': lambda a, c: lambda f: a(f) * c,
+    '<': lambda a, c: lambda f: a(f) < c,
+    '<=': lambda a, c: lambda f: a(f) <= c,
+    '>': lambda a, c: lambda f: a(f) > c,
+    '>=': lambda a, c: lambda f: a(f) >= c,
+    '=': lambda a, c: lambda f: a(f) == c,
+    '<>': lambda a, c: lambda f: a(f) != c,
+}
+_PYTHON = {
+    '+': lambda a, b: a + b, '-': lambda a, b: a - b, '*': lambda a, b: a * b,
+    '/': _dividir, 'div': _dividir, 'mod': _modulo, '%': _modulo, '^': lambda a, b: a ** b,
+}
+_COMPARADORES = ('<', '<=', '>', '>=', '=', '<>')
+
+
+def _binaria(operador, a, b):
+    if _es_literal(a) and _es_literal(b) and operador in _PYTHON:
+        return _literal(_PYTHON[operador](a.valor, b.valor))
+    if _es_literal(b) and operador in _BINARIAS_C:
+        return _BINARIAS_C[operador](a, b.valor)
+    return _BINARIAS[operador](a, b)
+
+
+def _separar_argumentos(tokens):
+    """Divide tokens por las comas de primer nivel"""
+    partes = [[]]
+    nivel = 0
+    for token in tokens:
+        if token in ('(', '['):
+            nivel += 1
+        elif token in (')', ']'):
+            nivel -= 1
+        if token == ',' and nivel == 0:
+            partes.append([])
+        else:
+            partes[-1].append(token)
+    return [parte for parte in partes if parte]
+
+
+def _escritas(nodos):
+    """Variables que un bloque asigna (sin entrar en funciones anidadas)"""
+    escritas = set()
+    pendientes = list(nodos)
+    while pendientes:
+        nodo = pendientes.pop()
+        tipo = nodo.tipo
+        if tipo == 'FUNCION':
+            continue
+        if tipo in ('ASIGNACION', 'PARA'):
+            escritas.add(nodo.props.get('var', 'i'))
+        elif tipo in ('ASIGNACION_ARREGLO', 'DECLARACION_ARREGLO'):
+            escritas.add(nodo.props.get('nombre'))
+        elif tipo == 'LLAMADA_FUNCION' and nodo.props.get('nombre', '').lower() == 'intercambiar':
+            escritas.update(tokens[0] for tokens in nodo.props.get('expr_args', []) if tokens)
+        pendientes.extend(nodo.hijos)
+    return escritas
+
+
+class _Ambito:
+    """Variables de una función: cada nombre tiene una posición fija en el marco"""
+
+    def __init__(self, parametros):
+        self.posiciones = {}
+        for nombre in parametros:
+            self.posicion(nombre)
+
+    def posicion(self, nombre):
+        posicion = self.posiciones.get(nombre)
+        if posicion is None:
+            posicion = self.posiciones[nombre] = len(self.posiciones)
+        return posicion
+
+    def __len__(self):
+        return len(self.posiciones)
+
+
+class _Funcion:
+    __slots__ = ('nombre', 'parametros', 'tamano_marco', 'cuerpo', 'libres', 'marco')
+
+    def __init__(self, nombre, parametros):
+        self.nombre = nombre
+        self.parametros = parametros
+        self.tamano_marco = len(parametros)
+        self.cuerpo = _fallar(f"La función '{nombre}' no se compiló")
+        self.libres = ()  # (posición, nombre) de las variables que lee sin asignarlas
+        self.marco = [0] * self.tamano_marco  # marco inicial de cada llamada
+
+    def compilada(self, cuerpo, ambito, escritas):
+        self.cuerpo = cuerpo
+        self.tamano_marco = len(ambito)
+        self.libres = tuple((posicion, nombre) for nombre, posicion in ambito.posiciones.items()
+                            if nombre not in escritas and nombre not in self.parametros)
+        self.iniciar({})
+
+    def iniciar(self, globales):
+        """Marco inicial con los valores de 'globales' en las variables libres"""
+        marco = [0] * self.tamano_marco
+        for posicion, nombre in self.libres:
+            marco[posicion] = globales.get(nombre, 0)
+        self.marco = marco
+
+
+class _Expresion:
+    """
+    Compila los tokens de una expresión en una clausura f(marco) -> valor.
+
+    Precedencia, de menor a mayor: O, Y, no, comparaciones, + -,
+    * / div mod, - unario, ^, y átomos (números, variables, arreglos,
+    llamadas y paréntesis).
+    """
+
+    def __init__(self, tokens, compilador, ambito):
+        self.tokens = tokens
+        self.i = 0
+        self.compilador = compilador
+        self.ambito = ambito
+
+    def _ver(self, desplazamiento=0):
+        i = self.i + desplazamiento
+        return self.tokens[i] if i < len(self.tokens) else None
+
+    def _clave(self):
+        token = self._ver()
+        return token.lower() if token is not None else None
+
+    def _tomar(self):
+        token = self._ver()
+        if token is None:
+            raise ErrorInterprete(f"Expresión incompleta: {' '.join(self.tokens)}")
+        self.i += 1
+        return token
+
+    def _esperar(self, token):
+        if self._tomar() != token:
+            raise ErrorInterprete(f"Se esperaba '{token}' en: {' '.join(self.tokens)}")
+
+    def compilar(self):
+        resultado = self._disyuncion()
+        if self.i != len(self.tokens):
+            raise ErrorInterprete(f"Expresión no reconocida: {' '.join(self.tokens)}")
+        return resultado
+
+    def _disyuncion(self):
+        izquierda = self._conjuncion()
+        while self._clave() in ('o', '||'):
+            self._tomar()
+            a, b = izquierda, self._conjuncion()
+            izquierda = lambda f, a=a, b=b: a(f) or b(f)
+        return izquierda
+
+    def _conjuncion(self):
+        izquierda = self._negacion()
+        while self._clave() in ('y', '&&'):
+            self._tomar()
+            a, b = izquierda, self._negacion()
+            izquierda = lambda f, a=a, b=b: a(f) and b(f)
+        return izquierda
+
+    def _negacion(self):
+        if self._clave() in _NEGACIONES and self._ver(1) != '=':
+            self._tomar()
+            a = self._negacion()
+            return lambda f: not a(f)
+        return self._comparacion()
+
+    def _operador_comparacion(self):
+        token = self._ver()
+        if token in ('=', '!') and self._ver(1) == '=':
+            # '==' y '!=' llegan como dos tokens
+            self.i += 2
+            return '=' if token == '=' else '<>'
+        if token in _COMPARADORES:
+            self.i += 1
+            return token
+        return None
+
+    def _comparacion(self):
+        izquierda = self._suma()
+        operador = self._operador_comparacion()
+        if operador is None:
+            return izquierda
+        return _binaria(operador, izquierda, self._suma())
+
+    def _suma(self):
+        resultado = self._producto()
+        while self._ver() in ('+', '-'):
+            operador = self._tomar()
+            resultado = _binaria(operador, resultado, self._producto())
+        return resultado
+
+    def _producto(self):
+        resultado = self._unario()
+        while self._ver() in ('*', '/', '%') or self._clave() in ('div', 'mod'):
+            operador = self._tomar().lower()
+            resultado = _binaria(operador, resultado, self._unario())
+        return resultado
+
+    def _unario(self):
+        if self._ver() == '-':
+            self._tomar()
+            a = self._unario()
+            if _es_literal(a):
+                return _literal(-a.valor)
+            return lambda f: -a(f)
+        if self._ver() == '+':
+            self._tomar()
+            return self._unario()
+        return self._potencia()
+
+    def _potencia(self):
+        base = self._atomo()
+        if self._ver() == '^':
+            self._tomar()
+            return _binaria('^', base, self._unario())
+        return base
+
+    def _atomo(self):
+        token = self._tomar()
+        if token == '(':
+            resultado = self._disyuncion()
+            self._esperar(')')
+            return resultado
+        if token[0].isdigit():
+            return _literal(float(token) if '.' in token else int(token))
+        clave = token.lower()
+        if clave in _VERDADEROS:
+            return _literal(True)
+        if clave in _FALSOS:
+            return _literal(False)
+        if not token.isidentifier():
+            raise ErrorInterprete(f"Token inesperado '{token}' en: {' '.join(self.tokens)}")
+        if self._ver() == '(':
+            self._tomar()
+            return self._llamada(token)
+        if self._ver() == '[':
+            return self.compilador.lectura_arreglo(self.ambito.posicion(token), self._indices())
+        if self._ver() == '.':
+            raise ErrorInterprete(f"Atributos y métodos no soportados: {token}.{self._ver(1)}")
+        posicion = self.ambito.posicion(token)
+        return lambda f: f[posicion]
+
+    def _indices(self):
+        """Índices de 'a[i][j]' o 'a[i, j]' como lista de clausuras"""
+        indices = []
+        while self._ver() == '[':
+            self._tomar()
+            indices.append(self._disyuncion())
+            while self._ver() == ',':
+                self._tomar()
+                indices.append(self._disyuncion())
+            self._esperar(']')
+        return indices
+
+    def _llamada(self, nombre):
+        argumentos = []
+        if self._ver() != ')':
+            argumentos.append(self._disyuncion())
+            while self._ver() == ',':
+                self._tomar()
+                argumentos.append(self._disyuncion())
+        self._esperar(')')
+        return self.compilador.llamada(nombre, argumentos)
+
+
+class Interprete:
+    """
+    Compila un árbol de 'parsear' una vez y ejecuta sus funciones contando
+    operaciones con el modelo de costo del analizador estático.
+
+        interprete = Interprete(parsear(tokenizar(codigo)))
+        valor, operaciones = interprete.ejecutar('suma', [Arreglo.desde_lista([3, 1, 2]), 3])
+
+    Los arreglos son Arreglo (diccionarios índice -> valor) y se pasan por
+    referencia; las variables sin asignar y las posiciones nunca escritas
+    valen 0. '/' entre enteros es división entera. Las llamadas a funciones
+    que no están en el programa cuestan 1 y devuelven 0, como en el análisis.
+    Una instancia ejecuta una sola llamada a la vez.
+    """
+
+    def __init__(self, arbol):
+        self.arbol = arbol
+        self.contador = [0]
+        self.limite = [math.inf]
+        self.funciones = {}
+        nodos = []
+        pendientes = [arbol]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.tipo == 'FUNCION' and nodo.props.get('nombre'):
+                nombre = nodo.props['nombre']
+                if nombre not in self.funciones:
+                    self.funciones[nombre] = _Funcion(nombre, list(nodo.props.get('args', [])))
+                    nodos.append(nodo)
+            pendientes.extend(reversed(nodo.hijos))
+        # Todas las funciones existen antes de compilar: la recursión y las
+        # llamadas hacia adelante se resuelven al compilar
+        for nodo in nodos:
+            funcion = self.funciones[nodo.props['nombre']]
+            ambito = _Ambito(funcion.parametros)
+            funcion.compilada(self._bloque(nodo.hijos, ambito), ambito, _escritas(nodo.hijos))
+        principal = _Funcion(None, [])
+        ambito = _Ambito([])
+        sentencias = [hijo for hijo in arbol.hijos if hijo.tipo not in ('FUNCION', 'CLASE')]
+        principal.compilada(self._bloque(sentencias, ambito), ambito, _escritas(sentencias))
+        self.principal = principal
+        self.globales = {}
+
+    # --- ejecución ---
+
+    def ejecutar(self, nombre_funcion=None, argumentos=(), limite=None, globales=None):
+        """
+        Ejecuta una función (o el código fuera de funciones si nombre_funcion
+        es None) y retorna (valor, operaciones). Lanza LimiteEjecucion si se
+        superan 'limite' operaciones o la profundidad de recursión.
+
+        'globales' da valor a las variables que una función lee sin
+        asignarlas (un arreglo 'a' que no es parámetro), en todas las
+        llamadas; las demás siguen valiendo 0.
+        """
+        if nombre_funcion is None:
+            funcion = self.principal
+        elif nombre_funcion in self.funciones:
+            funcion = self.funciones[nombre_funcion]
+        else:
+            raise ErrorInterprete(f"La función '{nombre_funcion}' no existe")
+        globales = globales or {}
+        if globales or self.globales:
+            for otra in (*self.funciones.values(), self.principal):
+                if otra.libres:
+                    otra.iniciar(globales)
+            self.globales = globales
+        self.contador[0] = 0
+        self.limite[0] = math.inf if limite is None else limite
+        profundidad = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(profundidad, _PROFUNDIDAD_MAXIMA))
+        try:
+            valor = self._invocar(funcion, list(argumentos))
+        except RecursionError:
+            raise LimiteEjecucion("Se superó la profundidad de recursión") from None
+        finally:
+            sys.setrecursionlimit(profundidad)
+        return valor, self.contador[0]
+
+    def _invocar(self, funcion, valores):
+        if self.contador[0] > self.limite[0]:
+            raise LimiteEjecucion(f"Se superaron {self.limite[0]} operaciones")
+        marco = funcion.marco[:]
+        cantidad = min(len(valores), len(funcion.parametros))
+        marco[:cantidad] = valores[:cantidad]
+        resultado = funcion.cuerpo(marco)
+        return 0 if resultado is None else resultado[0]
+
+    # --- expresiones ---
+
+    def _expresion(self, tokens, ambito):
+        """(clausura, costo) de una expresión; las que no se pueden compilar fallan al ejecutarse"""
+        costo = contar_operaciones(tokens)
+        if not tokens:
+            return _literal(0), costo
+        try:
+            return _Expresion(list(tokens), self, ambito).compilar(), costo
+        except ErrorInterprete as error:
+            return _fallar(str(error)), costo
+
+    def llamada(self, nombre, argumentos):
+        funcion = self.funciones.get(nombre)
+        invocar = self._invocar
+        if funcion is not None:
+            if len(argumentos) == 1:
+                a, = argumentos
+                return lambda f: invocar(funcion, [a(f)])
+            return lambda f: invocar(funcion, [argumento(f) for argumento in argumentos])
+        predefinida = _PREDEFINIDAS.get(nombre.lower())
+        if predefinida is not None:
+            return lambda f: predefinida(*[argumento(f) for argumento in argumentos])
+        if nombre.lower() in ('longitud', 'tamano', 'tamaño'):
+            return lambda f: _longitud(argumentos[0](f)) if argumentos else 0
+        # Función desconocida: costo constante (ya contado con la llamada) y valor 0
+        return _literal(0)
+
+    def lectura_arreglo(self, posicion, indices):
+        if len(indices) == 1:
+            indice, = indices
+
+            def leer(f):
+                arreglo = f[posicion]
+                return arreglo[indice(f)] if arreglo.__class__ is Arreglo else 0
+            return leer
+
+        def leer_anidado(f):
+            valor = f[posicion]
+            for indice in indices:
+                if valor.__class__ is not Arreglo:
+                    return 0
+                valor = valor[indice(f)]
+            return valor
+        return leer_anidado
+
+    # --- sentencias ---
+
+    def _bloque(self, nodos, ambito):
+        sentencias = []
+        k = 0
+        while k < len(nodos):
+            nodo = nodos[k]
+            sino = None
+            if nodo.tipo == 'SI' and k + 1 < len(nodos) and nodos[k + 1].tipo == 'SINO':
+                sino = nodos[k + 1]
+                k += 1
+            k += 1
+            if nodo.tipo == 'FUNCION':
+                continue
+            sentencias.append(self._sentencia(nodo, ambito, sino))
+        if not sentencias:
+            return lambda f: None
+        if len(sentencias) == 1:
+            return sentencias[0]
+        sentencias = tuple(sentencias)
+
+        def bloque(f):
+            for sentencia in sentencias:
+                resultado = sentencia(f)
+                if resultado is not None:
+                    return resultado
+        return bloque
+
+    def _sentencia(self, nodo, ambito, sino=None):
+        compilar = getattr(self, '_compilar_' + nodo.tipo.lower(), None)
+        if compilar is None:
+            return _fallar(f"Sentencia no soportada: {nodo.tipo}")
+        if nodo.tipo == 'SI':
+            return compilar(nodo, ambito, sino)
+        return compilar(nodo, ambito)
+
+    def _compilar_asignacion(self, nodo, ambito):
+        contador = self.contador
+        posicion = ambito.posicion(nodo.props.get('var'))
+        valor, costo = self._expresion(nodo.props.get('expr', []), ambito)
+
+        def asignar(f):
+            contador[0] += costo
+            f[posicion] = valor(f)
+        return asignar
+
+    def _destino(self, nodo, ambito):
+        """(posición del arreglo, clausuras de los índices) de 'a[i][j]'"""
+        indices = []
+        for tokens in nodo.props.get('indices', []):
+            for parte in _separar_argumentos(tokens):
+                indices.append(self._expresion(parte, ambito)[0])
+        return ambito.posicion(nodo.props.get('nombre')), indices
+
+    def _compilar_asignacion_arreglo(self, nodo, ambito):
+        contador = self.contador
+        props = nodo.props
+        posicion, indices = self._destino(nodo, ambito)
+        if 'elementos' in props:
+            elementos = [float(e) if '.' in e else int(e) for e in props['elementos']]
+            costo = len(elementos)
+
+            def inicializar(f):
+                contador[0] += costo
+                f[posicion] = Arreglo.desde_lista(elementos)
+            return inicializar
+
+        valor, costo = self._expresion(props.get('expr', []), ambito)
+        costo += 1
+        if not indices:
+            return _fallar(f"Asignación a '{props.get('nombre')}' sin índice")
+        *intermedios, ultimo = indices
+
+        def asignar_arreglo(f):
+            contador[0] += costo
+            nuevo = valor(f)
+            arreglo = f[posicion]
+            if arreglo.__class__ is not Arreglo:
+                arreglo = f[posicion] = Arreglo()
+            for indice in intermedios:
+                clave = indice(f)
+                interno = arreglo.get(clave)
+                if interno.__class__ is not Arreglo:
+                    interno = arreglo[clave] = Arreglo()
+                arreglo = interno
+            arreglo[ultimo(f)] = nuevo
+        return asignar_arreglo
+
+    def _compilar_declaracion_arreglo(self, nodo, ambito):
+        posicion = ambito.posicion(nodo.props.get('nombre'))
+
+        def declarar(f):
+            if f[posicion].__class__ is not Arreglo:
+                f[posicion] = Arreglo()
+        return declarar
+
+    def _compilar_para(self, nodo, ambito):
+        contador, limite = self.contador, self.limite
+        props = nodo.props
+        posicion = ambito.posicion(props.get('var', 'i'))
+        desde, _ = self._expresion(props.get('desde_expr') or [props.get('desde', '1')], ambito)
+        hasta, _ = self._expresion(props.get('hasta_expr') or [props.get('hasta', '1')], ambito)
+        cuerpo = self._bloque(nodo.hijos, ambito)
+
+        def para(f):
+            # Inicialización y salida; luego una comparación por iteración
+            contador[0] += 2
+            inicio = _entero(desde(f))
+            fin = _entero(hasta(f))
+            paso = 1 if inicio <= fin else -1
+            for valor in range(inicio, fin + paso, paso):
+                f[posicion] = valor
+                contador[0] += 1
+                resultado = cuerpo(f)
+                if resultado is not None:
+                    return resultado
+                if contador[0] > limite[0]:
+                    raise LimiteEjecucion(f"Se superaron {limite[0]} operaciones")
+        return para
+
+    def _compilar_mientras(self, nodo, ambito):
+        contador, limite = self.contador, self.limite
+        condicion, costo = self._expresion(nodo.props.get('cond', []), ambito)
+        cuerpo = self._bloque(nodo.hijos, ambito)
+
+        def mientras(f):
+            while True:
+                contador[0] += costo
+                if not condicion(f):
+                    return None
+                resultado = cuerpo(f)
+                if resultado is not None:
+                    return resultado
+                if contador[0] > limite[0]:
+                    raise LimiteEjecucion(f"Se superaron {limite[0]} operaciones")
+        return mientras
+
+    def _compilar_si(self, nodo, ambito, sino=None):
+        contador = self.contador
+        condicion, costo = self._expresion(nodo.props.get('cond', []), ambito)
+        entonces = self._bloque(nodo.hijos, ambito)
+        alternativa = self._bloque(sino.hijos, ambito) if sino is not None else None
+
+        def si(f):
+            contador[0] += costo
+            if condicion(f):
+                return entonces(f)
+            if alternativa is not None:
+                return alternativa(f)
+        return si
+
+    def _compilar_sino(self, nodo, ambito):
+        # 'Sino' sin un 'Si' inmediatamente antes: se ejecuta como bloque
+        return self._bloque(nodo.hijos, ambito)
+
+    def _compilar_retornar(self, nodo, ambito):
+        contador = self.contador
+        valor, costo = self._expresion(nodo.props.get('args', []), ambito)
+
+        def retornar(f):
+            contador[0] += costo
+            return (valor(f),)
+        return retornar
+
+    def _compilar_llamada_funcion(self, nodo, ambito):
+        contador = self.contador
+        nombre = nodo.props.get('nombre', '')
+        if nombre.lower() in _SALIDA or (nombre not in self.funciones and nombre.lower() != 'intercambiar'):
+            def sin_efecto(f):
+                contador[0] += 1
+            return sin_efecto
+        if nombre.lower() == 'intercambiar' and nombre not in self.funciones:
+            return self._intercambio(nodo, ambito)
+        argumentos = [self._expresion(tokens, ambito)[0] for tokens in nodo.props.get('expr_args', [])]
+        llamada = self.llamada(nombre, argumentos)
+
+        def llamar(f):
+            contador[0] += 1
+            llamada(f)
+        return llamar
+
+    def _intercambio(self, nodo, ambito):
+        """intercambiar(a[i], a[j]) o intercambiar(x, y): intercambia dos posiciones"""
+        contador = self.contador
+        lugares = []
+        for tokens in nodo.props.get('expr_args', []):
+            if len(tokens) >= 4 and tokens[1] == '[' and tokens[-1] == ']':
+                interno = _Expresion(tokens, self, ambito)
+                interno.i = 1
+                try:
+                    indices = interno._indices()
+                except ErrorInterprete as error:
+                    return _fallar(str(error))
+                lugares.append((ambito.posicion(tokens[0]), indices))
+            elif len(tokens) == 1 and tokens[0].isidentifier():
+                lugares.append((ambito.posicion(tokens[0]), []))
+            else:
+                return _fallar(f"intercambiar: argumento no soportado {' '.join(tokens)}")
+        if len(lugares) != 2:
+            return _fallar("intercambiar necesita dos argumentos")
+        (p1, i1), (p2, i2) = lugares
+
+        def contenedor(f, posicion, indices):
+            if not indices:
+                return f, posicion
+            arreglo = f[posicion]
+            if arreglo.__class__ is not Arreglo:
+                arreglo = f[posicion] = Arreglo()
+            for indice in indices[:-1]:
+                clave = indice(f)
+                interno = arreglo.get(clave)
+                if interno.__class__ is not Arreglo:
+                    interno = arreglo[clave] = Arreglo()
+                arreglo = interno
+            return arreglo, indices[-1](f)
+
+        def intercambiar(f):
+            contador[0] += 1
+            c1, k1 = contenedor(f, p1, i1)
+            c2, k2 = contenedor(f, p2, i2)
+            c1[k1], c2[k2] = c2[k2], c1[k1]
+        return intercambiar
+
+
+def _longitud(valor):
+    if valor.__class__ is Arreglo:
+        return max(valor) + 1 if valor else 0
+    return 0
@@ -0,0 +1,599 @@
+# iteraciones.py
+#
+# Número de iteraciones de los bucles. Un 'Para' suma el costo de su cuerpo
+# sobre los valores de su variable, Σ_{i=desde}^{hasta} cuerpo(i), y la suma
+# se evalúa en forma cerrada con las fórmulas de Faulhaber directamente sobre
+# los términos de ExpresionSimbolica: 'Para j desde i + 1 hasta N' dentro de
+# 'Para i desde 1 hasta N' cuesta N(N-1)/2 sin pasar por SymPy. Un 'Mientras'
+# cuenta sus iteraciones a partir de cómo el cuerpo actualiza la variable de
+# la condición (i <- i + 1, i <- i * 2, i <- i / 2...).
+
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+from math import comb
+
+from .perezoso import ModuloPerezoso
+from .expresion_simbolica import ExpresionSimbolica, _CONSTANTE
+from .instrumentacion import contar, fase
+from .recorrido import SIN_VALOR
+
+sympy = ModuloPerezoso('sympy')
+
+_TAMANO_CACHE = 1024
+
+# Sumas ya resueltas, por forma: los términos del cuerpo con la variable del
+# bucle reemplazada por su exponente, y los límites. 'Para i ... Para j ...'
+# y 'Para k ... Para m ...' comparten la misma entrada.
+_sumas = OrderedDict()
+_candado = threading.Lock()
+
+# k -> coeficientes del polinomio F_k(x) = Σ_{v=1}^{x} v^k, de grado 0 a k + 1
+_faulhaber = {0: (Fraction(0), Fraction(1))}
+
+# Índice de iteración con el que se suma el cuerpo de un 'Mientras'; no es un
+# identificador válido del pseudocódigo
+_ITERACION = '#k'
+
+# Operadores de comparación y conectores de las condiciones
+_COMPARADORES = {'<', '<=', '>', '>=', '<>'}
+_INVERSOS = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '<>': '<>'}
+_CONJUNCIONES = {'y', '&&'}
+_DISYUNCIONES = {'o', '||'}
+_NO_ARITMETICOS = {'y', 'o', 'no', 'mod', 'div', 'verdadero', 'falso'}
+
+
+def limpiar_cache():
+    with _candado:
+        _sumas.clear()
+
+
+def estadisticas_cache():
+    return {'entradas': len(_sumas), 'polinomios_faulhaber': len(_faulhaber)}
+
+
+# --- expresiones aritméticas ---
+
+class _NoAritmetica(Exception):
+    """La expresión no es un polinomio en sus variables"""
+
+
+def _numero(texto):
+    valor = Fraction(texto)
+    if valor.denominator == 1:
+        valor = valor.numerator
+    return ExpresionSimbolica._desde_terminos({_CONSTANTE: valor} if valor else {})
+
+
+def valor_constante(expresion):
+    """Valor de una expresión sin variables, o None"""
+    terminos = expresion.terminos
+    if not terminos:
+        return 0
+    if len(terminos) == 1 and _CONSTANTE in terminos:
+        return terminos[_CONSTANTE]
+    return None
+
+
+class _Expresion:
+    """Descenso recursivo sobre + - * / div ^ y paréntesis"""
+
+    def __init__(self, tokens, valor):
+        self.tokens = tokens
+        self.i = 0
+        self.valor = valor
+
+    def _ver(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def _tomar(self):
+        token = self._ver()
+        if token is None:
+            raise _NoAritmetica
+        self.i += 1
+        return token
+
+    def analizar(self):
+        resultado = self._suma()
+        if self.i != len(self.tokens):
+            raise _NoAritmetica
+        return resultado
+
+    def _suma(self):
+        resultado = self._producto()
+        while self._ver() in ('+', '-'):
+            if self._tomar() == '+':
+                resultado = resultado + self._producto()
+            else:
+                resultado = resultado - self._producto()
+        return resultado
+
+    def _producto(self):
+        resultado = self._potencia()
+        while self._ver() in ('*', '/', 'div'):
+            operador = self._tomar()
+            derecho = self._potencia()
+            if operador == '*':
+                resultado = resultado * derecho
+                continue
+            # Sólo divisiones por una constante: N / 2 sigue siendo polinomio
+            divisor = valor_constante(derecho)
+            if not divisor:
+                raise _NoAritmetica
+            resultado = resultado * (1 / Fraction(divisor))
+        return resultado
+
+    def _potencia(self):
+        base = self._unario()
+        if self._ver() == '^':
+            self._tomar()
+            exponente = valor_constante(self._unario())
+            if not isinstance(exponente, int) or exponente < 0:
+                raise _NoAritmetica
+            return base ** exponente
+        return base
+
+    def _unario(self):
+        if self._ver() == '-':
+            self._tomar()
+            return self._unario() * -1
+        if self._ver() == '+':
+            self._tomar()
+        return self._atomo()
+
+    def _atomo(self):
+        token = self._tomar()
+        if token == '(':
+            resultado = self._suma()
+            if self._tomar() != ')':
+                raise _NoAritmetica
+            return resultado
+        try:
+            return _numero(token)
+        except ValueError:
+            pass
+        if not token.isidentifier() or token.lower() in _NO_ARITMETICOS:
+            raise _NoAritmetica
+        if self._ver() in ('(', '[', '.'):
+            # Llamadas, accesos a arreglos y atributos: valor desconocido
+            raise _NoAritmetica
+        resultado = self.valor(token)
+        if resultado is None:
+            raise _NoAritmetica
+        return resultado
+
+
+def expresion_aritmetica(tokens, valor=ExpresionSimbolica.variable):
+    """
+    ExpresionSimbolica de una expresión en tokens, o None si no es un
+    polinomio (llamadas, arreglos, 'mod', divisiones por variables...).
+    'valor(nombre)' da la expresión de cada identificador.
+    """
+    if not tokens:
+        return None
+    try:
+        return _Expresion(list(tokens), valor).analizar()
+    except _NoAritmetica:
+        return None
+
+
+# --- sumatorias ---
+
+def _polinomio_faulhaber(k):
+    """Coeficientes de F_k a partir de (x+1)^(k+1) - 1 = Σ_{j<=k} C(k+1, j)·F_j(x)"""
+    coeficientes = _faulhaber.get(k)
+    if coeficientes is not None:
+        return coeficientes
+    resultado = [Fraction(comb(k + 1, grado)) for grado in range(k + 2)]
+    resultado[0] -= 1
+    for j in range(k):
+        for grado, coeficiente in enumerate(_polinomio_faulhaber(j)):
+            resultado[grado] -= comb(k + 1, j) * coeficiente
+    coeficientes = tuple(c / (k + 1) for c in resultado)
+    _faulhaber[k] = coeficientes
+    return coeficientes
+
+
+def _evaluar_polinomio(coeficientes, x):
+    resultado = ExpresionSimbolica.constante(0)
+    for coeficiente in reversed(coeficientes):
+        resultado = resultado * x + coeficiente
+    return resultado
+
+
+def _potencias_de(cuerpo, variable):
+    """
+    Agrupa los términos del cuerpo por la potencia de la variable del bucle:
+    {k: términos sin la variable}. None si la variable aparece fuera de un
+    monomio con exponente entero (log(i), 2**i, i**(1/2)...).
+    """
+    por_potencia = {}
+    for monomio, coeficiente in cuerpo.terminos.items():
+        potencia = 0
+        resto = []
+        for atomo, exponente in monomio:
+            if atomo == variable:
+                potencia = exponente
+            elif not isinstance(atomo, str) and sympy.Symbol(variable) in atomo.free_symbols:
+                return None
+            else:
+                resto.append((atomo, exponente))
+        if not isinstance(potencia, int) or potencia < 0:
+            return None
+        por_potencia.setdefault(potencia, {})[frozenset(resto)] = coeficiente
+    return por_potencia
+
+
+def sumatoria(cuerpo, variable, desde, hasta):
+    """
+    Σ_{variable=desde}^{hasta} cuerpo en forma cerrada (ExpresionSimbolica).
+
+    Si el cuerpo es un polinomio en la variable cada potencia se suma con
+    F_k(hasta) - F_k(desde - 1); si no (log(i), 2**i...) la suma completa
+    pasa por sympy.summation.
+    """
+    por_potencia = _potencias_de(cuerpo, variable)
+    if por_potencia is None:
+        clave = ('sympy', variable, frozenset(cuerpo.terminos.items()),
+                 frozenset(desde.terminos.items()), frozenset(hasta.terminos.items()))
+    else:
+        clave = (frozenset((k, frozenset(t.items())) for k, t in por_potencia.items()),
+                 frozenset(desde.terminos.items()), frozenset(hasta.terminos.items()))
+    with _candado:
+        resultado = _sumas.get(clave, SIN_VALOR)
+        if resultado is not SIN_VALOR:
+            _sumas.move_to_end(clave)
+            contar('cache_sumas.aciertos')
+            return resultado
+    contar('cache_sumas.fallos')
+
+    if por_potencia is None:
+        resultado = _sumatoria_sympy(cuerpo, variable, desde, hasta)
+    else:
+        anterior = desde - 1
+        resultado = ExpresionSimbolica.constante(0)
+        for potencia, terminos in por_potencia.items():
+            coeficientes = _polinomio_faulhaber(potencia)
+            suma = _evaluar_polinomio(coeficientes, hasta) - _evaluar_polinomio(coeficientes, anterior)
+            resultado += ExpresionSimbolica._desde_terminos(terminos) * suma
+
+    with _candado:
+        _sumas[clave] = resultado
+        if len(_sumas) > _TAMANO_CACHE:
+            _sumas.popitem(last=False)
+    return resultado
+
+
+def _sumatoria_sympy(cuerpo, variable, desde, hasta):
+    simbolo = sympy.Symbol(variable)
+    contar('sympy.sumatorias')
+    with fase('sumatoria_sympy'):
+        suma = sympy.summation(cuerpo.expr, (simbolo, desde.expr, hasta.expr))
+    if suma.has(sympy.Sum) or suma.has(sympy.Piecewise):
+        # Sin forma cerrada: cota superior con el cuerpo en el último valor
+        return (hasta - desde + 1) * ExpresionSimbolica(cuerpo.expr.subs(simbolo, hasta.expr))
+    return ExpresionSimbolica(suma)
+
+
+def orientar(desde, hasta):
+    """
+    (menor, mayor) de los límites de un 'Para': 'desde N - 1 hasta 0'
+    recorre los mismos valores que 'desde 0 hasta N - 1'.
+    """
+    inicio = valor_constante(desde)
+    fin = valor_constante(hasta)
+    if fin is not None and (inicio is None or inicio > fin):
+        return hasta, desde
+    return desde, hasta
+
+
+# --- bucles 'Mientras' ---
+
+def _conjuntos(cond):
+    """Partes de una condición unidas por 'Y'; None si hay una disyunción"""
+    partes = [[]]
+    for token in cond:
+        clave = token.lower() if isinstance(token, str) else token
+        if clave in _DISYUNCIONES:
+            return None
+        if clave in _CONJUNCIONES:
+            partes.append([])
+        else:
+            partes[-1].append(token)
+    return [parte for parte in partes if parte]
+
+
+def _comparacion(tokens, actualizadas):
+    """
+    (variable, operador, tokens del lado con la variable, tokens del límite)
+    si la comparación acota una sola variable actualizada en el cuerpo.
+    """
+    posiciones = [k for k, token in enumerate(tokens) if token in _COMPARADORES]
+    if len(posiciones) != 1:
+        return None
+    k = posiciones[0]
+    izquierda, operador, derecha = tokens[:k], tokens[k], tokens[k + 1:]
+    # 'X / v > 0' (dígitos de X) equivale a 'v <= X'
+    if (len(izquierda) >= 3 and izquierda[-2] in ('/', 'div') and izquierda[-1] in actualizadas
+            and izquierda[-1] not in izquierda[:-2] and operador in ('>', '>=') and derecha == ['0']):
+        return izquierda[-1], '<=', izquierda[-1:], izquierda[:-2]
+    for lado, otro, comparador in ((izquierda, derecha, operador), (derecha, izquierda, _INVERSOS[operador])):
+        variables = {token for token in lado if token in actualizadas}
+        if len(variables) == 1:
+            variable = variables.pop()
+            if variable not in otro:
+                return variable, comparador, lado, otro
+    return None
+
+
+def _con_variable(variable, valor):
+    """valor(nombre) que deja 'variable' como símbolo"""
+    def valor_con_variable(nombre):
+        return ExpresionSimbolica.variable(nombre) if nombre == variable else valor(nombre)
+    return valor_con_variable
+
+
+def _despejar(lado, variable, limite):
+    """
+    Límite de la variable sola: 'i * i <= N' acota i por N^(1/2) e 'i + 1 < N'
+    por N - 1. None si el lado no es c·v^k más términos sin la variable.
+    """
+    con_variable = {m: c for m, c in lado.terminos.items() if any(a == variable for a, _ in m)}
+    if len(con_variable) != 1:
+        return None
+    (monomio, coeficiente), = con_variable.items()
+    if len(monomio) != 1 or coeficiente <= 0:
+        return None
+    (_, grado), = monomio
+    if not isinstance(grado, int) or grado < 1:
+        return None
+    resto = lado - ExpresionSimbolica._desde_terminos(con_variable)
+    despejado = (limite - resto) * (1 / Fraction(coeficiente))
+    if grado == 1:
+        return despejado
+    return ExpresionSimbolica(despejado.expr ** sympy.Rational(1, grado))
+
+
+def _paso(variable, tokens, valor):
+    """('suma', c), ('producto', c) o None según cómo 'variable <- tokens' cambia la variable"""
+    nueva = expresion_aritmetica(tokens, _con_variable(variable, valor))
+    if nueva is None:
+        return None
+    diferencia = valor_constante(nueva - ExpresionSimbolica.variable(variable))
+    if diferencia:
+        return 'suma', diferencia
+    monomio = frozenset(((variable, 1),))
+    if len(nueva.terminos) == 1 and monomio in nueva.terminos:
+        factor = nueva.terminos[monomio]
+        if factor > 0 and factor != 1:
+            return 'producto', factor
+    return None
+
+
+def _paso_comun(variable, actualizaciones, valor):
+    """El paso más lento entre todas las asignaciones a la variable (deben ser del mismo tipo)"""
+    pasos = [_paso(variable, tokens, valor) for tokens in actualizaciones]
+    if not pasos or None in pasos:
+        return None
+    tipos = {tipo for tipo, _ in pasos}
+    if tipos == {'suma'}:
+        signos = {paso > 0 for _, paso in pasos}
+        if len(signos) != 1:
+            return None
+        return 'suma', min((paso for _, paso in pasos), key=abs)
+    if tipos == {'producto'}:
+        factores = [factor for _, factor in pasos]
+        if all(factor > 1 for factor in factores):
+            return 'producto', min(factores)
+        if all(factor < 1 for factor in factores):
+            return 'producto', max(factores)
+    return None
+
+
+def _logaritmo(argumento, base):
+    return ExpresionSimbolica(sympy.log(argumento.expr, _coeficiente(base)))
+
+
+def _coeficiente(valor):
+    if isinstance(valor, Fraction):
+        return sympy.Rational(valor.numerator, valor.denominator)
+    return sympy.Integer(valor)
+
+
+def _inicio(paso, operador, inicial):
+    """Valor de partida de la variable: sin asignación previa, 0 si suma y 1 si se multiplica"""
+    if inicial is not None:
+        return inicial
+    tipo, valor = paso
+    if operador in ('<', '<=', '<>') and valor > (0 if tipo == 'suma' else 1):
+        return ExpresionSimbolica.constante(0 if tipo == 'suma' else 1)
+    return None
+
+
+def _iteraciones_variable(operador, limite, paso, inicio):
+    """Iteraciones hasta que la variable, que parte de 'inicio', deja de cumplir 'v operador limite'"""
+    tipo, valor = paso
+    if inicio is None:
+        return None
+    if tipo == 'suma':
+        if valor > 0 and operador in ('<', '<=', '<>'):
+            cuenta = (limite - inicio) * (1 / Fraction(valor))
+        elif valor < 0 and operador in ('>', '>=', '<>'):
+            cuenta = (inicio - limite) * (1 / Fraction(-valor))
+        else:
+            return None
+        return cuenta + 1 if operador in ('<=', '>=') else cuenta
+    if valor > 1 and operador in ('<', '<=', '<>'):
+        # v = inicio·c^k: log_c(limite / inicio) pasos
+        if valor_constante(inicio) == 0:
+            return None
+        return _logaritmo(limite / inicio, valor) + 1
+    if valor < 1 and operador in ('>', '>=', '<>'):
+        # v = inicio / c^k: log_c(inicio / limite) pasos (límite al menos 1)
+        tope = valor_constante(limite)
+        cociente = inicio if tope is not None and tope <= 1 else inicio / limite
+        return _logaritmo(cociente, 1 / Fraction(valor)) + 1
+    return None
+
+
+def _progresiones(cond, actualizaciones, inicial, valor):
+    """
+    (variable, paso, inicio, cuenta) de cada variable que acota el bucle,
+    y {variable: límite} de las que se pudieron despejar.
+    """
+    progresiones = []
+    limites = {}
+    partes = _conjuntos(cond)
+    if not partes:
+        return progresiones, limites
+    for parte in partes:
+        comparacion = _comparacion(parte, actualizaciones)
+        if comparacion is None:
+            continue
+        variable, operador, tokens_lado, tokens_limite = comparacion
+        if any(variable == otra for otra, _, _, _ in progresiones):
+            continue
+        lado = expresion_aritmetica(tokens_lado, _con_variable(variable, valor))
+        limite = expresion_aritmetica(tokens_limite, valor)
+        if lado is None or limite is None:
+            continue
+        limite = _despejar(lado, variable, limite)
+        if limite is None:
+            continue
+        limites.setdefault(variable, limite)
+        paso = _paso_comun(variable, actualizaciones[variable], valor)
+        if paso is None:
+            continue
+        inicio = _inicio(paso, operador, inicial(variable))
+        cuenta = _iteraciones_variable(operador, limite, paso, inicio)
+        if cuenta is not None:
+            progresiones.append((variable, paso, inicio, cuenta))
+    return progresiones, limites
+
+
+def iteraciones_mientras(cond, actualizaciones, inicial, valor=ExpresionSimbolica.variable):
+    """
+    Iteraciones de un 'Mientras', o None si la condición no sigue un patrón conocido.
+
+    cond: tokens de la condición.
+    actualizaciones: variable -> lista de tokens de cada 'variable <- ...' del cuerpo.
+    inicial(variable): ExpresionSimbolica del valor antes del bucle, o None.
+    valor(nombre): ExpresionSimbolica de los demás identificadores.
+
+    Para 'i < n1 Y j < n2' el bucle termina cuando falla cualquiera de las
+    dos, así que se suman las cuentas de las variables acotadas.
+    """
+    progresiones, _ = _progresiones(cond, actualizaciones, inicial, valor)
+    if not progresiones:
+        return None
+    total = progresiones[0][3]
+    for _, _, _, cuenta in progresiones[1:]:
+        total = total + cuenta
+    return total
+
+
+def variables_de(expresion):
+    """Nombres de las variables de una expresión, sin pasar por SymPy si es un polinomio"""
+    nombres = set()
+    for monomio in expresion.terminos:
+        for atomo, _ in monomio:
+            if isinstance(atomo, str):
+                nombres.add(atomo)
+            else:
+                nombres.update(simbolo.name for simbolo in atomo.free_symbols)
+    return nombres
+
+
+def sumatoria_mientras(cuerpo, cond, actualizaciones, inicial, valor=ExpresionSimbolica.variable):
+    """
+    Costo de un 'Mientras' cuyo cuerpo más la condición cuesta 'cuerpo' por
+    iteración, o None si las iteraciones no siguen un patrón conocido.
+
+    Si el cuerpo depende de una variable que acota el bucle (un bucle interno
+    hasta 'i'), se suma sobre los valores que toma: con 'i <- i * 2' desde 1
+    el costo es Σ_k cuerpo(2^k), y no cuerpo(i) por el número de iteraciones.
+    Las variables actualizadas que no se pueden sumar se reemplazan por su
+    límite, así que el resultado no contiene variables del bucle.
+    """
+    progresiones, limites = _progresiones(cond, actualizaciones, inicial, valor)
+    if not progresiones:
+        return None
+    total = progresiones[0][3]
+    for _, _, _, cuenta in progresiones[1:]:
+        total = total + cuenta
+    presentes = variables_de(cuerpo)
+    sumables = [p for p in progresiones if p[0] in presentes]
+    if not sumables:
+        return acotar(total * cuerpo, actualizaciones, limites)
+    suma = None
+    if len(sumables) == 1:
+        variable, paso, inicio, _ = sumables[0]
+        suma = _suma_progresion(cuerpo, variable, paso, inicio, total)
+    if suma is None:
+        suma = _suma_sustituida(cuerpo, sumables, total)
+    return acotar(suma, actualizaciones, limites)
+
+
+def _potencia_simplificada(base, exponente):
+    """base^exponente con 2^(log(N)/log(2)) reducido a N"""
+    potencia = _coeficiente(base) ** exponente.expr
+    return ExpresionSimbolica(sympy.powsimp(sympy.expand_log(sympy.expand_power_exp(potencia), force=True)))
+
+
+def _suma_progresion(cuerpo, variable, paso, inicio, cuenta):
+    """
+    Σ_{k=0}^{cuenta-1} cuerpo(v_k) con v_k = inicio + c·k o inicio·c^k, sin
+    sympy.summation: la progresión aritmética pasa por Faulhaber y la
+    geométrica suma cada potencia v^p como (q^cuenta - 1) / (q - 1) con
+    q = c^p. None si el cuerpo no es un polinomio en la variable.
+    """
+    por_potencia = _potencias_de(cuerpo, variable)
+    if por_potencia is None:
+        return None
+    tipo, razon = paso
+    if tipo == 'suma':
+        valor = inicio + ExpresionSimbolica.variable(_ITERACION) * razon
+        por_iteracion = ExpresionSimbolica.constante(0)
+        for potencia, terminos in por_potencia.items():
+            por_iteracion += ExpresionSimbolica._desde_terminos(terminos) * valor ** potencia
+        return sumatoria(por_iteracion, _ITERACION, ExpresionSimbolica.constante(0), cuenta - 1)
+    suma = ExpresionSimbolica.constante(0)
+    for potencia, terminos in por_potencia.items():
+        resto = ExpresionSimbolica._desde_terminos(terminos)
+        if potencia == 0:
+            suma += resto * cuenta
+            continue
+        q = Fraction(razon) ** potencia
+        geometrica = (_potencia_simplificada(q, cuenta) - 1) * (1 / (q - 1))
+        suma += resto * inicio ** potencia * geometrica
+    return suma
+
+
+def _suma_sustituida(cuerpo, sumables, cuenta):
+    """Σ_k cuerpo con cada variable en función de k, con sympy.summation"""
+    k = sympy.Symbol(_ITERACION)
+    sustituciones = {}
+    for variable, (tipo, paso), inicio, _ in sumables:
+        if tipo == 'suma':
+            sustituciones[sympy.Symbol(variable)] = inicio.expr + _coeficiente(paso) * k
+        else:
+            sustituciones[sympy.Symbol(variable)] = inicio.expr * _coeficiente(paso) ** k
+    por_iteracion = ExpresionSimbolica(cuerpo.expr.subs(sustituciones))
+    suma = sumatoria(por_iteracion, _ITERACION, ExpresionSimbolica.constante(0), cuenta - 1)
+    return ExpresionSimbolica(sympy.powsimp(sympy.expand_log(suma.expr, force=True)))
+
+
+def acotar(costo, variables, limites, respaldo=None):
+    """
+    Reemplaza en 'costo' cada una de 'variables' (las actualizadas en el
+    bucle) por su límite, o por 'respaldo' si no se despejó; sin límite ni
+    respaldo queda igual.
+    """
+    sustituciones = {}
+    for variable in variables_de(costo) & set(variables):
+        limite = limites.get(variable, respaldo)
+        if limite is not None:
+            sustituciones[sympy.Symbol(variable)] = limite.expr
+    if not sustituciones:
+        return costo
+    return ExpresionSimbolica(costo.expr.subs(sustituciones))
@@ -0,0 +1,244 @@
+# memoria.py
+#
+# Informe de memoria: ejecuta tokenizador, parser, análisis y Big O como
+# fases separadas bajo tracemalloc y registra, para cada una, el pico de
+# memoria sobre el inicio de la fase, lo que queda retenido al terminarla y
+# los sitios que más memoria retienen. El informe se guarda como JSON y
+# sirve de línea base: comparar_informes() señala las fases que crecieron.
+
+import gc
+import os
+import sys
+import time
+import platform
+import tracemalloc
+from pathlib import Path
+
+from .analizador_complejidad import AnalizadorComplejidad
+from .parser_estructural import parsear
+from .perezoso import cargar_registrados
+from .pseudogrammar import tokenizar
+from . import iteraciones, recurrencias
+
+TOP_SITIOS = 10
+
+# Una fase es una regresión si supera a la línea base en esta fracción y,
+# además, en estos bytes (los valores chicos varían entre ejecuciones)
+TOLERANCIA = 0.10
+HOLGURA_BYTES = 64 * 1024
+
+_ARCHIVOS_PROPIOS = (tracemalloc.__file__, __file__)
+
+
+def _sitio(estadistica):
+    """'ruta:línea' del sitio de asignación, relativa a la entrada de sys.path que la contiene"""
+    marco = estadistica.traceback[0]
+    archivo = marco.filename
+    for raiz in sorted(filter(None, sys.path), key=len, reverse=True):
+        if archivo.startswith(raiz.rstrip(os.sep) + os.sep):
+            archivo = archivo[len(raiz.rstrip(os.sep)) + 1:]
+            break
+    return f"{archivo}:{marco.lineno}"
+
+
+def _instantanea():
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, archivo) for archivo in _ARCHIVOS_PROPIOS])
+
+
+def _medir(nombre, paso, top, antes=None):
+    """
+    Ejecuta paso() como la fase 'nombre'. Retorna (valor, medición,
+    instantánea final): pico y retenido en bytes respecto del inicio de la
+    fase y los 'top' sitios que más memoria retienen. 'antes' es la
+    instantánea final de la fase anterior, si la hubo; con top=0 no se toma
+    ninguna (el costo de tracemalloc es proporcional a los bloques vivos).
+    """
+    gc.collect()
+    if top and antes is None:
+        antes = _instantanea()
+    inicial = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+    valor = paso()
+    segundos = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    gc.collect()
+    final = tracemalloc.get_traced_memory()[0]
+    despues = _instantanea() if top else None
+    sitios = [
+        {'sitio': _sitio(diferencia), 'bytes': diferencia.size_diff, 'bloques': diferencia.count_diff}
+        for diferencia in (despues.compare_to(antes, 'lineno')[:top] if top else ())
+        if diferencia.size_diff > 0
+    ]
+    return valor, {
+        'fase': nombre,
+        'pico': pico - inicial,
+        'retenido': final - inicial,
+        'segundos': segundos,
+        'sitios': sitios,
+    }, despues
+
+
+def _importaciones():
+    """
+    Carga los módulos perezosos (SymPy) con su propio tracemalloc y lo
+    detiene: así las instantáneas de las demás fases no recorren las cientos
+    de miles de asignaciones de la importación. Sin sitios: serían todos del
+    cargador de módulos y agruparlos tarda segundos.
+    """
+    tracemalloc.start()
+    try:
+        _, medicion, _ = _medir('importaciones', cargar_registrados, 0)
+    finally:
+        tracemalloc.stop()
+    return medicion
+
+
+class InformeMemoria:
+    """Mediciones por fase de uno o varios archivos, serializables en JSON"""
+
+    def __init__(self, archivos, importaciones=None):
+        # [{'archivo', 'funcion', 't_n', 'big_o', 'recursivo', 'error', 'fases', 'retenido'}]
+        self.archivos = archivos
+        self.importaciones = importaciones  # medición de la fase 'importaciones', o None
+
+    @property
+    def retenido_total(self):
+        """
+        Suma de lo que retuvo cada archivo: cota superior del crecimiento de
+        un trabajador que analiza el lote (no descuenta lo que un archivo
+        posterior libera, como las entradas desalojadas de los caches)
+        """
+        return sum(registro['retenido'] for registro in self.archivos)
+
+    def resumen(self):
+        """{fase: {'pico': máximo entre archivos, 'retenido': suma}}"""
+        resumen = {}
+        if self.importaciones is not None:
+            resumen['importaciones'] = {k: self.importaciones[k] for k in ('pico', 'retenido')}
+        for registro in self.archivos:
+            for medicion in registro['fases']:
+                fase = resumen.setdefault(medicion['fase'], {'pico': 0, 'retenido': 0})
+                fase['pico'] = max(fase['pico'], medicion['pico'])
+                fase['retenido'] += medicion['retenido']
+        return resumen
+
+    def como_dict(self):
+        return {
+            'python': platform.python_version(),
+            'importaciones': self.importaciones,
+            'archivos': self.archivos,
+            'resumen': self.resumen(),
+            'retenido_total': self.retenido_total,
+        }
+
+    def mostrar(self, top=5):
+        print("🧠 Memoria por fase (pico sobre el inicio de la fase / retenido al terminar):")
+        mediciones = [('', self.importaciones)] if self.importaciones is not None else []
+        for registro in self.archivos:
+            nombre = Path(registro['archivo']).name if len(self.archivos) > 1 else ''
+            mediciones.extend((nombre, medicion) for medicion in registro['fases'])
+        for nombre, medicion in mediciones:
+            etiqueta = f"{nombre} {medicion['fase']}".strip()
+            print(f"  {etiqueta:<40} {_kib(medicion['pico']):>12} {_kib(medicion['retenido']):>12}"
+                  f"  {medicion['segundos'] * 1000:8.1f} ms")
+        if len(self.archivos) > 1:
+            print(f"  {'retenido por los archivos (suma)':<40} {'':>12} {_kib(self.retenido_total):>12}")
+        for nombre, medicion in mediciones:
+            if not medicion['sitios'] or len(self.archivos) > 1:
+                continue
+            print(f"\n  Sitios que más retienen en '{medicion['fase']}':")
+            for sitio in medicion['sitios'][:top]:
+                print(f"    {_kib(sitio['bytes']):>12} {sitio['bloques']:>8} bloques  {sitio['sitio']}")
+
+
+def _kib(cantidad):
+    return f"{cantidad / 1024:,.1f} KiB"
+
+
+def _fases_archivo(codigo, nombre_funcion, top):
+    """Mediciones de tokens, AST, análisis y Big O de un código (tracemalloc ya iniciado)"""
+    fases = []
+    tokens, medicion, instantanea = _medir('tokens', lambda: tokenizar(codigo), top)
+    fases.append(medicion)
+    arbol, medicion, instantanea = _medir('ast', lambda: parsear(tokens), top, instantanea)
+    fases.append(medicion)
+
+    def analizar():
+        analizador = AnalizadorComplejidad(arbol)
+        nombre = nombre_funcion if nombre_funcion is not None else next(iter(analizador.funciones), None)
+        return nombre, analizador.calcular(nombre)
+
+    (nombre, (funcion_tiempo, recursivo)), medicion, instantanea = _medir('analisis', analizar, top, instantanea)
+    fases.append(medicion)
+    # El Big O y el texto de T(n) son los que llegan a construir expresiones SymPy
+    (big_o, t_n), medicion, _ = _medir(
+        'big_o', lambda: (funcion_tiempo.big_o(), funcion_tiempo.como_str()), top, instantanea)
+    fases.append(medicion)
+    return {'funcion': nombre, 't_n': t_n, 'big_o': big_o, 'recursivo': bool(recursivo)}, fases
+
+
+def informe_memoria(rutas, nombre_funcion=None, top=TOP_SITIOS, importaciones=True):
+    """
+    InformeMemoria de los archivos en 'rutas', analizados uno tras otro en
+    este proceso. Los caches de sumatorias y recurrencias se vacían antes de
+    empezar para que el informe no dependa de análisis anteriores; dentro del
+    lote se conservan, como en un trabajador. El 'retenido' de cada archivo
+    es lo que sigue vivo al terminarlo (entradas de caches, caches de SymPy):
+    lo que el archivo deja en un trabajador.
+    """
+    iteraciones.limpiar_cache()
+    recurrencias.limpiar_cache()
+    medicion_importaciones = _importaciones() if importaciones else None
+
+    archivos = []
+    for ruta in rutas:
+        registro = {'archivo': str(ruta), 'funcion': None, 't_n': None, 'big_o': None,
+                    'recursivo': False, 'error': None, 'fases': [], 'retenido': 0}
+        # Se traza cada archivo por separado: las instantáneas sólo recorren
+        # sus propias asignaciones y no las de todos los archivos anteriores
+        gc.collect()
+        tracemalloc.start()
+        try:
+            codigo = Path(ruta).read_text(encoding='utf-8')
+            campos, registro['fases'] = _fases_archivo(codigo, nombre_funcion, top)
+            registro.update(campos)
+            gc.collect()
+            registro['retenido'] = tracemalloc.get_traced_memory()[0]
+        except Exception as e:
+            registro['error'] = f"{type(e).__name__}: {e}"
+        finally:
+            tracemalloc.stop()
+        archivos.append(registro)
+    return InformeMemoria(archivos, medicion_importaciones)
+
+
+def comparar_informes(base, nuevo, tolerancia=TOLERANCIA, holgura=HOLGURA_BYTES):
+    """
+    Regresiones de 'nuevo' respecto de 'base' (dicts de como_dict()): una
+    lista de textos 'archivo fase medida: antes -> después', vacía si ninguna
+    fase supera a la base en más de 'tolerancia' y 'holgura' bytes.
+    """
+    def por_fase(informe):
+        valores = {}
+        for registro in informe['archivos']:
+            nombre = Path(registro['archivo']).name
+            for medicion in registro['fases']:
+                valores[(nombre, medicion['fase'])] = medicion
+        if informe.get('importaciones'):
+            valores[('', 'importaciones')] = informe['importaciones']
+        return valores
+
+    anteriores = por_fase(base)
+    regresiones = []
+    for clave, medicion in por_fase(nuevo).items():
+        anterior = anteriores.get(clave)
+        if anterior is None:
+            continue
+        for medida in ('pico', 'retenido'):
+            antes, despues = anterior[medida], medicion[medida]
+            if despues > antes * (1 + tolerancia) and despues - antes > holgura:
+                nombre = ' '.join(parte for parte in clave if parte)
+                regresiones.append(f"{nombre} {medida}: {_kib(antes)} -> {_kib(despues)}")
+    return regresiones
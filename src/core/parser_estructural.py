@@ -1,25 +1,216 @@
+from collections.abc import MutableMapping
+
+from .pseudogrammar import arreglos_tokens, tokenizar_stream
+from .instrumentacion import medir_fase
+from .recorrido import recorrer
+
+
+# Campos tipados de cada clase de nodo, en el orden en que el parser los declara.
+# Cada tipo obtiene una subclase de Nodo con un slot por campo; las propiedades
+# que no figuran aquí se guardan en el diccionario 'extra' del nodo.
+CAMPOS_POR_TIPO = {
+    'CLASE': ('nombre',),
+    'FUNCION': ('nombre', 'args'),
+    'SI': ('cond',),
+    'MIENTRAS': ('cond',),
+    'PARA': ('var', 'desde', 'hasta', 'desde_expr', 'hasta_expr'),
+    'RETORNAR': ('args',),
+    'ASIGNACION': ('var', 'expr'),
+    'ASIGNACION_ARREGLO': ('nombre', 'indices', 'elementos', 'expr', 'tamano', 'coincide_tamano'),
+    'DECLARACION_ARREGLO': ('nombre', 'indices', 'tamano'),
+    'LLAMADA_FUNCION': ('nombre', 'args', 'expr_args'),
+    'LLAMADA_METODO': ('obj', 'metodo', 'args'),
+}
+
+# Atributos propios de un tipo que no forman parte de sus props
+ATRIBUTOS_ADICIONALES = {
+    'PROGRAMA': ('diagnosticos', 'sin_cerrar'),
+}
+
+
+class VistaProps(MutableMapping):
+    """
+    Vista tipo diccionario sobre los campos de un nodo.
+
+    Mantiene la interfaz 'nodo.props' del formato anterior: lectura, escritura,
+    'get', 'items', 'in', etc. Los cambios se reflejan directamente en el nodo.
+    """
+
+    __slots__ = ('nodo',)
+
+    def __init__(self, nodo):
+        self.nodo = nodo
+
+    def __getitem__(self, clave):
+        nodo = self.nodo
+        if clave in nodo.CAMPOS:
+            try:
+                return getattr(nodo, clave)
+            except AttributeError:
+                raise KeyError(clave) from None
+        if nodo.extra is None:
+            raise KeyError(clave)
+        return nodo.extra[clave]
+
+    def get(self, clave, default=None):
+        nodo = self.nodo
+        if clave in nodo.CAMPOS:
+            return getattr(nodo, clave, default)
+        if nodo.extra is None:
+            return default
+        return nodo.extra.get(clave, default)
+
+    def __contains__(self, clave):
+        nodo = self.nodo
+        if clave in nodo.CAMPOS:
+            return hasattr(nodo, clave)
+        return nodo.extra is not None and clave in nodo.extra
+
+    def __setitem__(self, clave, valor):
+        nodo = self.nodo
+        if clave in nodo.CAMPOS:
+            setattr(nodo, clave, valor)
+        else:
+            if nodo.extra is None:
+                nodo.extra = {}
+            nodo.extra[clave] = valor
+        if clave == 'nombre' and nodo.tipo == 'FUNCION':
+            nodo._actualizar_contexto()
+
+    def __delitem__(self, clave):
+        nodo = self.nodo
+        if clave in nodo.CAMPOS:
+            try:
+                delattr(nodo, clave)
+            except AttributeError:
+                raise KeyError(clave) from None
+        elif nodo.extra is None:
+            raise KeyError(clave)
+        else:
+            del nodo.extra[clave]
+
+    def __iter__(self):
+        nodo = self.nodo
+        for campo in nodo.CAMPOS:
+            if hasattr(nodo, campo):
+                yield campo
+        if nodo.extra:
+            yield from nodo.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
 class Nodo:
+    """
+    Nodo del AST.
+
+    'Nodo(tipo, props, hijos)' crea la subclase compacta correspondiente al
+    tipo: los campos de CAMPOS_POR_TIPO son slots (nodo.cond, nodo.desde...)
+    y 'props' es una vista de diccionario sobre ellos. Cada nodo conoce su
+    padre, su profundidad y el nombre de la función que lo contiene, que se
+    actualizan al enlazarlo con add_hijo.
+    """
+
+    __slots__ = ('tipo', 'hijos', 'padre', 'profundidad', 'funcion', 'extra')
+
+    CAMPOS = ()
+
+    def __new__(cls, tipo=None, props=None, hijos=None):
+        if cls is Nodo:
+            cls = _clases_nodo.get(tipo, Nodo)
+        return object.__new__(cls)
+
     def __init__(self, tipo, props=None, hijos=None):
         self.tipo = tipo
-        self.props = props or {}
+        self.padre = None
+        self.profundidad = 0
+        self.extra = None
+        if props:
+            campos = self.CAMPOS
+            for clave, valor in props.items():
+                if clave in campos:
+                    setattr(self, clave, valor)
+                else:
+                    if self.extra is None:
+                        self.extra = {}
+                    self.extra[clave] = valor
+        self.funcion = getattr(self, 'nombre', None) if tipo == 'FUNCION' else None
         self.hijos = hijos or []
+        for hijo in self.hijos:
+            hijo.padre = self
+            hijo._actualizar_contexto()
+
+    @property
+    def props(self):
+        return VistaProps(self)
+
+    @props.setter
+    def props(self, valores):
+        vista = VistaProps(self)
+        vista.clear()
+        vista.update(valores or {})
 
     def add_hijo(self, nodo):
+        nodo.padre = self
         self.hijos.append(nodo)
+        nodo._actualizar_contexto()
 
-    def __repr__(self, nivel=0):
-        indent = "  " * nivel
-        props = []
-        for k, v in self.props.items():
-            if isinstance(v, list):
-                props.append(f"{k}={v}")
+    def _actualizar_contexto(self):
+        """Recalcula profundidad y función contenedora de este nodo y su subárbol"""
+        pendientes = [self]
+        while pendientes:
+            nodo = pendientes.pop()
+            padre = nodo.padre
+            if padre is not None:
+                nodo.profundidad = padre.profundidad + 1
+            if nodo.tipo == 'FUNCION':
+                nodo.funcion = getattr(nodo, 'nombre', None)
             else:
-                props.append(f"{k}='{v}'")
-        props_str = " " + " ".join(props) if props else ""
-        out = f"{indent}{self.tipo}{props_str}\n"
-        for hijo in self.hijos:
-            out += hijo.__repr__(nivel + 1)
-        return out
+                nodo.funcion = padre.funcion if padre is not None else None
+            pendientes.extend(nodo.hijos)
+
+    def ancestros(self):
+        """Itera desde el padre hasta la raíz"""
+        nodo = self.padre
+        while nodo is not None:
+            yield nodo
+            nodo = nodo.padre
+
+    def __repr__(self, nivel=0):
+        lineas = []
+
+        def linea(nodo, nivel):
+            props = []
+            for k, v in nodo.props.items():
+                if isinstance(v, list):
+                    props.append(f"{k}={v}")
+                else:
+                    props.append(f"{k}='{v}'")
+            props_str = " " + " ".join(props) if props else ""
+            lineas.append(f"{'  ' * nivel}{nodo.tipo}{props_str}\n")
+            return nivel + 1
+
+        recorrer(self, pre=linea, estado=nivel)
+        return ''.join(lineas)
+
+
+def _crear_clase_nodo(tipo, campos):
+    nombre_clase = 'Nodo' + tipo.title().replace('_', '')
+    slots = campos + ATRIBUTOS_ADICIONALES.get(tipo, ())
+    return type(nombre_clase, (Nodo,), {'__slots__': slots, 'CAMPOS': campos})
+
+
+# Subclase compacta por tipo de nodo
+_clases_nodo = {
+    tipo: _crear_clase_nodo(tipo, CAMPOS_POR_TIPO.get(tipo, ()))
+    for tipo in set(CAMPOS_POR_TIPO) | set(ATRIBUTOS_ADICIONALES)
+}
+# Publicarlas en el módulo para que los árboles se puedan serializar con pickle
+globals().update({clase.__name__: clase for clase in _clases_nodo.values()})
 
 def calcular_tamano(indices):
     tam = 1
@@ -34,295 +225,496 @@ def calcular_tamano(indices):
     return tam
 
 
-def parsear(tokens, debug=False):
-    i = 0
-    stack = []
-    root = Nodo("PROGRAMA")
-    actual = root
-
-    def show_stack():
-        if debug:
-            print("  Stack:", [nodo.tipo for nodo in stack])
-            print("  Actual:", actual.tipo)
+# Palabras clave de cierre de bloque y los tipos de nodo que cierra cada una
+CIERRES = {
+    'fclase': ('CLASE',),
+    'ffuncion': ('FUNCION',),
+    'fmientras': ('MIENTRAS',),
+    'fpara': ('PARA',),
+    'fsi': ('SI', 'SINO'),
+}
+
+# Tokens que terminan una sentencia simple (asignación, retorno)
+FIN_SENTENCIA = ('NUEVA_LINEA', 'PALABRA_CLAVE')
+
+# Listas entre paréntesis y condiciones no cruzan líneas: si falta el cierre,
+# la línea actual es el punto de resincronización
+FIN_LINEA = ('NUEVA_LINEA',)
+
+# Tokens que pueden aparecer dentro de un límite de 'Para'
+_APERTURAS_LIMITE = ('PAREN_IZQ', 'CORCHETE_IZQ')
+_CIERRES_LIMITE = ('PAREN_DER', 'CORCHETE_DER')
+_OPERADORES_LIMITE = ('SUMA', 'RESTA', 'MULTIPLICACION', 'DIVISION', 'POTENCIA', 'PUNTO', 'COMA')
+
+# Cache de palabras clave en minúsculas: cada variante se normaliza una sola vez
+_claves_normalizadas = {}
+
+
+def _normalizar_clave(valor):
+    clave = _claves_normalizadas.get(valor)
+    if clave is None:
+        clave = _claves_normalizadas[valor] = valor.lower()
+    return clave
+
+
+class _Parser:
+    """
+    Parser de una sola pasada con despacho por tabla.
+
+    Las palabras clave se despachan por su forma en minúsculas y los
+    identificadores por el tipo del token siguiente. Todas las lecturas
+    verifican límites: la entrada truncada o mal formada genera diagnósticos
+    en lugar de excepciones, y los bloques se resincronizan en los cierres f*.
+    """
+
+    def __init__(self, tokens, debug=False):
+        self.tipos, self.valores, self.hay, self.liberar = arreglos_tokens(tokens)
+        self.i = 0
+        self.stack = []
+        self.root = Nodo("PROGRAMA")
+        self.actual = self.root
+        self.debug = debug
+        self.diagnosticos = []
+
+    # --- utilidades ---
+
+    def show_stack(self):
+        if self.debug:
+            print("  Stack:", [nodo.tipo for nodo in self.stack])
+            print("  Actual:", self.actual.tipo)
             print("-" * 40)
 
-    while i < len(tokens):
-        t = tokens[i]
-        if debug:
-            print(f"\nToken[{i}]: {t}")
+    def diagnostico(self, mensaje, i=None):
+        i = self.i if i is None else i
+        valor = self.valores[i] if self.hay(i) else None
+        self.diagnosticos.append({'mensaje': mensaje, 'indice': i, 'valor': valor})
+        if self.debug:
+            print(f"  DIAGNOSTICO [{i}]: {mensaje}")
 
-        # CLASE
-        if t['tipo'] == 'PALABRA_CLAVE' and t['valor'].lower() == 'clase':
+    def es_clave(self, i, clave):
+        return (self.hay(i) and self.tipos[i] == 'PALABRA_CLAVE'
+                and _normalizar_clave(self.valores[i]) == clave)
+
+    def bloques_abiertos(self):
+        """Bloques abiertos del más interno al más externo (sin incluir PROGRAMA)"""
+        if not self.stack:
+            return []
+        return [self.actual] + self.stack[:0:-1]
+
+    def abrir(self, nodo):
+        self.actual.add_hijo(nodo)
+        self.stack.append(self.actual)
+        self.actual = nodo
+
+    def leer_condicion(self, i, terminador, nombre_bloque):
+        """Lee la condición de Si/Mientras a partir de i; retorna (cond, i)"""
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        cond = []
+        if hay(i) and tipos[i] == 'PAREN_IZQ':
             i += 1
-            nombre = tokens[i]['valor']
-            nodo = Nodo("CLASE", {'nombre': nombre})
-            actual.add_hijo(nodo)
-            stack.append(actual)
-            actual = nodo
+            while hay(i) and tipos[i] != 'PAREN_DER' and tipos[i] not in FIN_LINEA:
+                cond.append(valores[i])
+                i += 1
+            if hay(i) and tipos[i] == 'PAREN_DER':
+                i += 1
+            else:
+                self.diagnostico(f"Falta ')' en la condición de '{nombre_bloque}'", i)
+        else:
+            while hay(i) and tipos[i] not in FIN_LINEA and not self.es_clave(i, terminador):
+                cond.append(valores[i])
+                i += 1
+            if not self.es_clave(i, terminador):
+                self.diagnostico(f"Se esperaba '{terminador}' después de la condición de '{nombre_bloque}'", i)
+        if self.es_clave(i, terminador):
             i += 1
-            if debug:
-                print(f"Abro CLASE '{nombre}'")
-                show_stack()
+        return cond, i
 
-        # FUNCION
-        elif t['tipo'] == 'PALABRA_CLAVE' and t['valor'].lower() == 'funcion':
+    def leer_argumentos_llamada(self, i, nombre):
+        """
+        Lee argumentos desde i (después de '(') hasta ')'; retorna (args, expr_args, i).
+
+        'args' conserva sólo identificadores y números de cada argumento;
+        'expr_args' conserva todos sus tokens (operadores incluidos).
+        """
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        args = []
+        expr_args = []
+        temp = []
+        expr = []
+        while hay(i) and tipos[i] != 'PAREN_DER' and tipos[i] not in FIN_LINEA:
+            if tipos[i] == 'COMA':
+                if temp:
+                    args.append(temp)
+                    temp = []
+                if expr:
+                    expr_args.append(expr)
+                    expr = []
+            else:
+                if tipos[i] in ('IDENT', 'NUMERO'):
+                    temp.append(valores[i])
+                expr.append(valores[i])
             i += 1
-            nombre = tokens[i]['valor']
-            args = []
-            if tokens[i+1]['tipo'] == 'PAREN_IZQ':
-                i += 2
-                while tokens[i]['tipo'] != 'PAREN_DER':
-                    if tokens[i]['tipo'] == 'IDENT':
-                        args.append(tokens[i]['valor'])
-                    i += 1
-                    if tokens[i]['tipo'] == 'COMA':
-                        i += 1
-                i += 1
-            nodo = Nodo("FUNCION", {'nombre': nombre, 'args': args})
-            actual.add_hijo(nodo)
-            stack.append(actual)
-            actual = nodo
+        if temp:
+            args.append(temp)
+        if expr:
+            expr_args.append(expr)
+        if hay(i) and tipos[i] == 'PAREN_DER':
+            i += 1
+        else:
+            self.diagnostico(f"Falta ')' en la llamada a '{nombre}'", i)
+        return args, expr_args, i
+
+    # --- bucle principal ---
+
+    def parsear(self):
+        tipos, valores, hay, liberar = self.tipos, self.valores, self.hay, self.liberar
+        debug = self.debug
+        por_clave = _MANEJADORES_CLAVE
+        por_siguiente = _MANEJADORES_IDENT
+
+        while hay(self.i):
+            i = self.i
+            liberar(i)
+            tipo = tipos[i]
             if debug:
-                print(f"Abro FUNCION '{nombre}' args={args}")
-                show_stack()
+                print(f"\nToken[{i}]: {tipo} {valores[i]!r}")
+
+            manejador = None
+            if tipo == 'PALABRA_CLAVE':
+                clave = _normalizar_clave(valores[i])
+                manejador = por_clave.get(clave)
+                if manejador is None and clave in CIERRES:
+                    self.cerrar_bloque(clave)
+                    continue
+            elif tipo == 'IDENT' and hay(i + 1):
+                manejador = por_siguiente.get(tipos[i + 1])
+
+            if manejador is None:
+                self.i = i + 1
+            else:
+                manejador(self)
+
+        abiertos = self.bloques_abiertos()
+        for nodo in abiertos:
+            self.diagnostico(f"Bloque '{nodo.tipo}' sin cerrar")
+        self.root.diagnosticos = self.diagnosticos
+        self.root.sin_cerrar = len(abiertos)
+        return self.root
 
-        # ASIGNACION
-        elif t['tipo'] == 'IDENT' and i+1 < len(tokens) and tokens[i+1]['tipo'] == 'ASIGNACION':
-            var = t['valor']
+    # --- manejadores de palabras clave ---
+
+    def parsear_clase(self):
+        i = self.i + 1
+        if not self.hay(i):
+            self.diagnostico("Se esperaba el nombre de la clase", i)
+            self.i = i
+            return
+        nombre = self.valores[i]
+        self.abrir(Nodo("CLASE", {'nombre': nombre}))
+        self.i = i + 1
+        if self.debug:
+            print(f"Abro CLASE '{nombre}'")
+            self.show_stack()
+
+    def parsear_funcion(self):
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        i = self.i + 1
+        if not hay(i):
+            self.diagnostico("Se esperaba el nombre de la función", i)
+            self.i = i
+            return
+        nombre = valores[i]
+        args = []
+        if hay(i + 1) and tipos[i + 1] == 'PAREN_IZQ':
             i += 2
-            expr = []
-            while i < len(tokens) and tokens[i]['tipo'] not in ('NUEVA_LINEA', 'PALABRA_CLAVE', 'PAREN_DER'):
-                expr.append(tokens[i]['valor'])
-                i += 1
-            nodo = Nodo("ASIGNACION", {'var': var, 'expr': expr})
-            actual.add_hijo(nodo)
-            if debug:
-                print(f"ASIGNACION '{var} <- {' '.join(expr)}'")
-                show_stack()
-                
-        # ACCESO, DECLARACION O ASIGNACION DE ARREGLO (SOPORTA MULTIDIMENSIONALES)
-        elif t['tipo'] == 'IDENT' and i+1 < len(tokens) and tokens[i+1]['tipo'] == 'CORCHETE_IZQ':
-            nombre = t['valor']
-            indices = []
-            i += 1
-            while i < len(tokens) and tokens[i]['tipo'] == 'CORCHETE_IZQ':
+            while hay(i) and tipos[i] != 'PAREN_DER' and tipos[i] not in FIN_LINEA:
+                if tipos[i] == 'IDENT':
+                    args.append(valores[i])
                 i += 1
-                index_expr = []
-                while i < len(tokens) and tokens[i]['tipo'] != 'CORCHETE_DER':
-                    index_expr.append(tokens[i]['valor'])
-                    i += 1
-                indices.append(index_expr)
-                if i < len(tokens) and tokens[i]['tipo'] == 'CORCHETE_DER':
-                    i += 1
-            # Si es asignación
-            if i < len(tokens) and tokens[i]['tipo'] == 'ASIGNACION':
+            if hay(i) and tipos[i] == 'PAREN_DER':
                 i += 1
-                # Inicialización con llaves
-                if i < len(tokens) and tokens[i]['tipo'] == 'LLAVE_IZQ':
-                    i += 1
-                    elementos = []
-                    while i < len(tokens) and tokens[i]['tipo'] != 'LLAVE_DER':
-                        if tokens[i]['tipo'] == 'NUMERO':
-                            elementos.append(tokens[i]['valor'])
-                        i += 1
-                    if i < len(tokens) and tokens[i]['tipo'] == 'LLAVE_DER':
-                        i += 1
-                    tamano_declarado = calcular_tamano(indices)
-                    tamano_elementos = len(elementos)
-                    coincide_tamano = None
-                    if tamano_declarado is not None:
-                        coincide_tamano = (tamano_declarado == tamano_elementos)
-                    nodo = Nodo("ASIGNACION_ARREGLO", {
-                        'nombre': nombre,
-                        'indices': indices,
-                        'elementos': elementos,
-                        'tamano': tamano_elementos,
-                        'coincide_tamano': coincide_tamano
-                    })
-                    actual.add_hijo(nodo)
-                else:
-                    # Asignación tradicional
-                    expr = []
-                    while i < len(tokens) and tokens[i]['tipo'] not in ('NUEVA_LINEA', 'PALABRA_CLAVE', 'PAREN_DER'):
-                        expr.append(tokens[i]['valor'])
-                        i += 1
-                    nodo = Nodo("ASIGNACION_ARREGLO", {
-                        'nombre': nombre,
-                        'indices': indices,
-                        'expr': expr,
-                        'tamano': calcular_tamano(indices)
-                    })
-                    actual.add_hijo(nodo)
             else:
-                # Declaración sin asignación
-                tamano = calcular_tamano(indices)
-                nodo = Nodo("DECLARACION_ARREGLO", {
-                    'nombre': nombre,
-                    'indices': indices,
-                    'tamano': tamano
-                })
-                actual.add_hijo(nodo)
+                self.diagnostico(f"Falta ')' en la definición de '{nombre}'", i)
+        self.abrir(Nodo("FUNCION", {'nombre': nombre, 'args': args}))
+        self.i = i
+        if self.debug:
+            print(f"Abro FUNCION '{nombre}' args={args}")
+            self.show_stack()
 
+    def parsear_si(self):
+        cond, self.i = self.leer_condicion(self.i + 1, 'entonces', 'Si')
+        self.abrir(Nodo("SI", {'cond': cond}))
+        if self.debug:
+            print(f"Abro SI cond={cond}")
+            self.show_stack()
 
-        # SI
-        elif t['tipo'] == 'PALABRA_CLAVE' and t['valor'].lower() == 'si':
-            i += 1
-            if tokens[i]['tipo'] == 'PAREN_IZQ':
-                i += 1
-                cond = []
-                while tokens[i]['tipo'] != 'PAREN_DER':
-                    cond.append(tokens[i]['valor'])
-                    i += 1
+    def parsear_sino(self):
+        if not self.stack:
+            self.diagnostico("'Sino' fuera de un bloque 'Si'")
+            self.i += 1
+            return
+        nodo = Nodo("SINO")
+        self.stack[-1].add_hijo(nodo)
+        self.actual = nodo
+        self.i += 1
+        if self.debug:
+            print("Abro SINO")
+            self.show_stack()
+
+    def parsear_mientras(self):
+        cond, self.i = self.leer_condicion(self.i + 1, 'hacer', 'Mientras')
+        self.abrir(Nodo("MIENTRAS", {'cond': cond}))
+        if self.debug:
+            print(f"Abro MIENTRAS cond={cond}")
+            self.show_stack()
+
+    def parsear_para(self):
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        i = self.i + 1
+        props = {}
+        # Encabezado posicional: var [desde] inicio [hasta] fin [hacer]
+        campos = (('var', 'la variable', 'desde'),
+                  ('desde', 'el valor inicial', 'hasta'),
+                  ('hasta', 'el valor final', 'hacer'))
+        for campo, descripcion, separador in campos:
+            if not hay(i) or tipos[i] == 'NUEVA_LINEA':
+                self.diagnostico(f"Encabezado 'Para' incompleto: falta {descripcion}", i)
+                break
+            props[campo] = valores[i]
+            if campo == 'var':
                 i += 1
             else:
-                cond = []
-                while tokens[i]['valor'].lower() != 'entonces':
-                    cond.append(tokens[i]['valor'])
-                    i += 1
-            if tokens[i]['valor'].lower() == 'entonces':
+                # 'desde'/'hasta' conservan el primer token; la expresión
+                # completa del límite (N/2 - 1, i + 1...) va en '<campo>_expr'
+                props[campo + '_expr'], fin = self.leer_limite(i)
+                i = fin if fin > i else i + 1
+            if self.es_clave(i, separador):
                 i += 1
-            nodo = Nodo("SI", {'cond': cond})
-            actual.add_hijo(nodo)
-            stack.append(actual)
-            actual = nodo
-            if debug:
-                print(f"Abro SI cond={cond}")
-                show_stack()
-
-        # SINO
-        elif t['tipo'] == 'PALABRA_CLAVE' and t['valor'].lower() == 'sino':
-            nodo = Nodo("SINO")
-            stack[-1].add_hijo(nodo)
-            actual = nodo
-            i += 1
-            if debug:
-                print("Abro SINO")
-                show_stack()
+        self.abrir(Nodo("PARA", props))
+        self.i = i
+        if self.debug:
+            print(f"Abro PARA var={props.get('var')}, desde={props.get('desde')}, hasta={props.get('hasta')}")
+            self.show_stack()
 
-        # MIENTRAS
-        elif t['tipo'] == 'PALABRA_CLAVE' and t['valor'].lower() == 'mientras':
+    def leer_expresion(self, i):
+        """
+        Tokens del lado derecho de una asignación a partir de i; retorna (expr, i).
+        Los paréntesis balanceados son parte de la expresión; un ')' sin abrir
+        la termina, igual que el fin de línea o una palabra clave.
+        """
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        expr = []
+        nivel = 0
+        while hay(i) and tipos[i] not in FIN_SENTENCIA:
+            if tipos[i] == 'PAREN_IZQ':
+                nivel += 1
+            elif tipos[i] == 'PAREN_DER':
+                if nivel == 0:
+                    break
+                nivel -= 1
+            expr.append(valores[i])
             i += 1
-            if tokens[i]['tipo'] == 'PAREN_IZQ':
-                i += 1
-                cond = []
-                while tokens[i]['tipo'] != 'PAREN_DER':
-                    cond.append(tokens[i]['valor'])
-                    i += 1
-                i += 1
+        return expr, i
+
+    def leer_limite(self, i):
+        """
+        Tokens de un límite de 'Para' a partir de i. Como las palabras 'hasta'
+        y 'hacer' son opcionales, la expresión termina en la primera palabra
+        clave, en el fin de línea o donde un operando sigue a otro operando.
+        """
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        expr = []
+        nivel = 0
+        espera_operando = True
+        while hay(i) and tipos[i] not in FIN_SENTENCIA:
+            tipo = tipos[i]
+            if tipo in _APERTURAS_LIMITE:
+                if not espera_operando and tipo == 'PAREN_IZQ' and nivel == 0:
+                    break
+                nivel += 1
+                espera_operando = True
+            elif tipo in _CIERRES_LIMITE:
+                if nivel == 0:
+                    break
+                nivel -= 1
+                espera_operando = False
+            elif tipo in _OPERADORES_LIMITE:
+                espera_operando = True
             else:
-                cond = []
-                while tokens[i]['valor'].lower() != 'hacer':
-                    cond.append(tokens[i]['valor'])
-                    i += 1
-            if tokens[i]['valor'].lower() == 'hacer':
-                i += 1
-            nodo = Nodo("MIENTRAS", {'cond': cond})
-            actual.add_hijo(nodo)
-            stack.append(actual)
-            actual = nodo
-            if debug:
-                print(f"Abro MIENTRAS cond={cond}")
-                show_stack()
+                if not espera_operando and nivel == 0:
+                    break
+                espera_operando = False
+            expr.append(valores[i])
+            i += 1
+        return expr, i
 
-        # PARA
-        elif t['tipo'] == 'PALABRA_CLAVE' and t['valor'].lower() == 'para':
+    def parsear_retornar(self):
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        i = self.i + 1
+        ret = []
+        while hay(i) and tipos[i] not in FIN_SENTENCIA:
+            ret.append(valores[i])
             i += 1
-            var = tokens[i]['valor']
+        self.actual.add_hijo(Nodo("RETORNAR", {'args': ret}))
+        self.i = i
+        if self.debug:
+            print(f"RETORNAR {ret}")
+            self.show_stack()
+
+    def cerrar_bloque(self, clave):
+        """Cierra el bloque abierto que corresponde a la palabra de cierre"""
+        tipos_validos = CIERRES[clave]
+        cierre = self.valores[self.i]
+        abiertos = self.bloques_abiertos()
+        for profundidad, nodo in enumerate(abiertos):
+            if nodo.tipo in tipos_validos:
+                break
+        else:
+            self.diagnostico(f"'{cierre}' sin bloque abierto correspondiente")
+            self.i += 1
+            return
+
+        # Resincronizar: los bloques internos sin cierre se cierran aquí
+        for nodo in abiertos[:profundidad]:
+            self.diagnostico(f"Bloque '{nodo.tipo}' sin cerrar antes de '{cierre}'")
+        if self.debug:
+            print(f"Cierro bloque '{cierre}' y regreso de {self.actual.tipo} a {self.stack[-profundidad - 1].tipo}")
+        for _ in range(profundidad + 1):
+            self.actual = self.stack.pop()
+        self.i += 1
+        self.show_stack()
+
+    # --- manejadores de identificadores (según el token siguiente) ---
+
+    def parsear_asignacion(self):
+        i = self.i
+        var = self.valores[i]
+        expr, i = self.leer_expresion(i + 2)
+        self.actual.add_hijo(Nodo("ASIGNACION", {'var': var, 'expr': expr}))
+        self.i = i
+        if self.debug:
+            print(f"ASIGNACION '{var} <- {' '.join(expr)}'")
+            self.show_stack()
+
+    def parsear_arreglo(self):
+        """Acceso, declaración o asignación de arreglo (soporta multidimensionales)"""
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        i = self.i
+        nombre = valores[i]
+        indices = []
+        i += 1
+        while hay(i) and tipos[i] == 'CORCHETE_IZQ':
             i += 1
-            if tokens[i]['valor'].lower() == 'desde':
+            index_expr = []
+            nivel = 0
+            while hay(i) and tipos[i] not in FIN_LINEA and (nivel or tipos[i] != 'CORCHETE_DER'):
+                if tipos[i] == 'CORCHETE_IZQ':
+                    nivel += 1
+                elif tipos[i] == 'CORCHETE_DER':
+                    nivel -= 1
+                index_expr.append(valores[i])
                 i += 1
-            start = tokens[i]['valor']
-            i += 1
-            if tokens[i]['valor'].lower() == 'hasta':
+            indices.append(index_expr)
+            if hay(i) and tipos[i] == 'CORCHETE_DER':
                 i += 1
-            end = tokens[i]['valor']
+        # Si es asignación
+        if hay(i) and tipos[i] == 'ASIGNACION':
             i += 1
-            if tokens[i]['valor'].lower() == 'hacer':
+            # Inicialización con llaves
+            if hay(i) and tipos[i] == 'LLAVE_IZQ':
                 i += 1
-            nodo = Nodo("PARA", {'var': var, 'desde': start, 'hasta': end})
-            actual.add_hijo(nodo)
-            stack.append(actual)
-            actual = nodo
-            if debug:
-                print(f"Abro PARA var={var}, desde={start}, hasta={end}")
-                show_stack()
+                elementos = []
+                while hay(i) and tipos[i] != 'LLAVE_DER':
+                    if tipos[i] == 'NUMERO':
+                        elementos.append(valores[i])
+                    i += 1
+                if hay(i) and tipos[i] == 'LLAVE_DER':
+                    i += 1
+                tamano_declarado = calcular_tamano(indices)
+                tamano_elementos = len(elementos)
+                coincide_tamano = None
+                if tamano_declarado is not None:
+                    coincide_tamano = (tamano_declarado == tamano_elementos)
+                nodo = Nodo("ASIGNACION_ARREGLO", {
+                    'nombre': nombre,
+                    'indices': indices,
+                    'elementos': elementos,
+                    'tamano': tamano_elementos,
+                    'coincide_tamano': coincide_tamano
+                })
+            else:
+                # Asignación tradicional
+                expr, i = self.leer_expresion(i)
+                nodo = Nodo("ASIGNACION_ARREGLO", {
+                    'nombre': nombre,
+                    'indices': indices,
+                    'expr': expr,
+                    'tamano': calcular_tamano(indices)
+                })
+        else:
+            # Declaración sin asignación
+            nodo = Nodo("DECLARACION_ARREGLO", {
+                'nombre': nombre,
+                'indices': indices,
+                'tamano': calcular_tamano(indices)
+            })
+        self.actual.add_hijo(nodo)
+        self.i = i
 
-        # retornar
-        elif t['tipo'] == 'PALABRA_CLAVE' and t['valor'].lower() == 'retornar':
-            i += 1
-            ret = []
-            while i < len(tokens) and tokens[i]['tipo'] not in ('NUEVA_LINEA', 'PALABRA_CLAVE'):
-                if tokens[i]['tipo'] != 'COMA':
-                    ret.append(tokens[i]['valor'])
-                i += 1
-            nodo = Nodo("RETORNAR", {'args': ret})
-            actual.add_hijo(nodo)
-            if debug:
-                print(f"RETORNAR {ret}")
-                show_stack()
+    def parsear_llamada_funcion(self):
+        nombre = self.valores[self.i]
+        args, expr_args, self.i = self.leer_argumentos_llamada(self.i + 2, nombre)
+        self.actual.add_hijo(Nodo("LLAMADA_FUNCION", {'nombre': nombre, 'args': args, 'expr_args': expr_args}))
+        if self.debug:
+            print(f"LLAMADA_FUNCION {nombre} args={args}")
+            self.show_stack()
 
-        # LLAMADA_FUNCION
-        elif t['tipo'] == 'IDENT' and i+1 < len(tokens) and tokens[i+1]['tipo'] == 'PAREN_IZQ':
-            nombre = t['valor']
-            i += 2
-            args = []
-            temp = []
-            while tokens[i]['tipo'] != 'PAREN_DER':
-                if tokens[i]['tipo'] == 'COMA':
-                    if temp:
-                        args.append(temp)
-                        temp = []
-                elif tokens[i]['tipo'] in ('IDENT', 'NUMERO'):
-                    temp.append(tokens[i]['valor'])
-                i += 1
-            if temp:
-                args.append(temp)
-            i += 1
-            nodo = Nodo("LLAMADA_FUNCION", {'nombre': nombre, 'args': args})
-            actual.add_hijo(nodo)
-            if debug:
-                print(f"LLAMADA_FUNCION {nombre} args={args}")
-                show_stack()
-
-        # LLAMADA_METODO
-        elif (t['tipo'] == 'IDENT' and i+1 < len(tokens) and
-              tokens[i+1]['tipo'] == 'PUNTO' and
-              tokens[i+2]['tipo'] == 'IDENT' and
-              tokens[i+3]['tipo'] == 'PAREN_IZQ'):
-            obj = t['valor']
-            metodo = tokens[i+2]['valor']
-            i += 4
-            args = []
-            temp = []
-            while tokens[i]['tipo'] != 'PAREN_DER':
-                if tokens[i]['tipo'] == 'COMA':
-                    if temp:
-                        args.append(temp)
-                        temp = []
-                elif tokens[i]['tipo'] in ('IDENT', 'NUMERO'):
-                    temp.append(tokens[i]['valor'])
-                i += 1
-            if temp:
-                args.append(temp)
-            i += 1
-            nodo = Nodo("LLAMADA_METODO", {'obj': obj, 'metodo': metodo, 'args': args})
-            actual.add_hijo(nodo)
-            if debug:
-                print(f"LLAMADA_METODO {obj}.{metodo} args={args}")
-                show_stack()
+    def parsear_llamada_metodo(self):
+        tipos, valores, hay = self.tipos, self.valores, self.hay
+        i = self.i
+        if not (hay(i + 3) and tipos[i + 2] == 'IDENT' and tipos[i + 3] == 'PAREN_IZQ'):
+            self.i = i + 1
+            return
+        obj = valores[i]
+        metodo = valores[i + 2]
+        args, _, self.i = self.leer_argumentos_llamada(i + 4, f"{obj}.{metodo}")
+        self.actual.add_hijo(Nodo("LLAMADA_METODO", {'obj': obj, 'metodo': metodo, 'args': args}))
+        if self.debug:
+            print(f"LLAMADA_METODO {obj}.{metodo} args={args}")
+            self.show_stack()
 
-        # CIERRE DE BLOQUE
-        elif t['tipo'] == 'PALABRA_CLAVE' and t['valor'].lower().startswith('f'):
-            if debug:
-                print(f"Cierro bloque '{t['valor']}' y regreso de {actual.tipo} a {stack[-1].tipo if stack else 'VACIO'}")
-            actual = stack.pop()
-            i += 1
-            if debug:
-                show_stack()
 
-        else:
-            i += 1
+# Tablas de despacho
+_MANEJADORES_CLAVE = {
+    'clase': _Parser.parsear_clase,
+    'funcion': _Parser.parsear_funcion,
+    'si': _Parser.parsear_si,
+    'sino': _Parser.parsear_sino,
+    'mientras': _Parser.parsear_mientras,
+    'para': _Parser.parsear_para,
+    'retornar': _Parser.parsear_retornar,
+}
+
+_MANEJADORES_IDENT = {
+    'ASIGNACION': _Parser.parsear_asignacion,
+    'CORCHETE_IZQ': _Parser.parsear_arreglo,
+    'PAREN_IZQ': _Parser.parsear_llamada_funcion,
+    'PUNTO': _Parser.parsear_llamada_metodo,
+}
+
+
+@medir_fase('parsear')
+def parsear(tokens, debug=False):
+    """
+    Construye el AST a partir de los tokens (lista, ListaTokens o flujo de tokens).
 
-    return root
+    Nunca lanza IndexError con entrada truncada: los problemas encontrados se
+    registran en la lista 'diagnosticos' del nodo PROGRAMA retornado.
+    """
+    return _Parser(tokens, debug).parsear()
 
 
+def parsear_archivo(ruta, chunk_size=64 * 1024, debug=False):
+    """Parsea un archivo de pseudocódigo leyéndolo por fragmentos, sin cargarlo completo"""
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return parsear(tokenizar_stream(f, chunk_size), debug)
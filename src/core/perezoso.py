@@ -0,0 +1,76 @@
+# perezoso.py
+
+import importlib
+import time
+
+from .instrumentacion import fase
+
+# Módulos perezosos creados, para poder informar cuáles llegaron a cargarse
+_registrados = []
+
+
+class ModuloPerezoso:
+    """
+    Sustituto de un módulo que recién se importa al usar uno de sus atributos.
+
+        sympy = ModuloPerezoso('sympy')
+        ...
+        sympy.Symbol('N')   # aquí se importa SymPy (una sola vez)
+
+    Cada atributo obtenido se guarda en la instancia, así que después de la
+    primera consulta el acceso cuesta lo mismo que en el módulo real.
+
+    'submodulos' son los que el propio módulo importa recién al usarse una
+    función que los necesita; cargar_registrados() los importa junto con él
+    para que ese costo no aparezca después, en medio del análisis.
+    """
+
+    def __init__(self, nombre, submodulos=()):
+        self.__dict__['_nombre'] = nombre
+        self.__dict__['_submodulos'] = tuple(submodulos)
+        self.__dict__['_modulo'] = None
+        self.__dict__['segundos_carga'] = None
+        _registrados.append(self)
+
+    def cargar(self):
+        modulo = self.__dict__['_modulo']
+        if modulo is None:
+            inicio = time.perf_counter()
+            with fase(f'importar {self._nombre}'):
+                modulo = importlib.import_module(self._nombre)
+            self.__dict__['segundos_carga'] = time.perf_counter() - inicio
+            self.__dict__['_modulo'] = modulo
+        return modulo
+
+    def cargar_submodulos(self):
+        self.cargar()
+        for submodulo in self._submodulos:
+            with fase(f'importar {submodulo}'):
+                importlib.import_module(submodulo)
+
+    def cargado(self):
+        return self.__dict__['_modulo'] is not None
+
+    def __getattr__(self, atributo):
+        valor = getattr(self.cargar(), atributo)
+        self.__dict__[atributo] = valor
+        return valor
+
+    def __repr__(self):
+        estado = 'cargado' if self.cargado() else 'sin cargar'
+        return f"<módulo perezoso '{self._nombre}' ({estado})>"
+
+
+def cargar_registrados():
+    """Importa todos los módulos perezosos creados hasta ahora, con sus submódulos"""
+    for modulo in _registrados:
+        modulo.cargar_submodulos()
+
+
+def modulos_cargados():
+    """Nombre y segundos de importación de los módulos perezosos que se cargaron"""
+    vistos = {}
+    for modulo in _registrados:
+        if modulo.cargado() and modulo._nombre not in vistos:
+            vistos[modulo._nombre] = modulo.segundos_carga
+    return vistos
@@ -0,0 +1,543 @@
+# perfil_empirico.py
+#
+# Perfil empírico: ejecuta el pseudocódigo con el intérprete sobre entradas
+# de tamaño creciente, cuenta operaciones con el mismo modelo de costo que el
+# análisis estático y ajusta las cuentas a las clases de complejidad
+# habituales. Sirve para validar el resultado de AnalizadorComplejidad. Por
+# omisión ejecuta el código traducido a Python (compilador_python.py); el
+# intérprete queda como motor de referencia.
+
+import math
+import random
+import time
+from fractions import Fraction
+
+from .analizador_complejidad import AnalizadorComplejidad
+from .clasificacion_asintotica import ClaseAsintotica
+from .compilador_python import ProgramaCompilado
+from .grafo_llamadas import GrafoLlamadas
+from .interprete import _PREDEFINIDAS, _SALIDA, Arreglo, ErrorInterprete, Interprete, LimiteEjecucion, _escritas
+from .parser_estructural import parsear
+from .pseudogrammar import tokenizar
+
+# Tamaños de entrada: crecimiento geométrico de razón 1.25 entre 2 y 2^20,
+# denso al principio para que los algoritmos exponenciales tengan puntos
+TAMANOS = tuple(sorted({round(2 * 1.25 ** k) for k in range(60) if 2 * 1.25 ** k <= 2 ** 20}))
+TIEMPO_MAXIMO = 10.0
+ENTRADAS = ('aleatorio', 'ordenado', 'inverso')
+MEDIDAS = ('operaciones', 'tiempo')
+
+# Motores de ejecución y operaciones máximas por ejecución de cada uno: el
+# código compilado a Python es varias veces más rápido que el intérprete
+MOTORES = {'compilado': ProgramaCompilado, 'interprete': Interprete}
+LIMITES = {'compilado': 20_000_000, 'interprete': 2_000_000}
+
+# Con medida 'tiempo', cada tamaño se repite hasta acumular este tiempo (o
+# _REPETICIONES_MAXIMAS veces) y se toma la ejecución más rápida
+_TIEMPO_POR_TAMANO = 0.05
+_REPETICIONES_MAXIMAS = 20
+
+_PHI = (1 + 5 ** 0.5) / 2
+
+# Clases candidatas del ajuste, de menor a mayor crecimiento
+CANDIDATAS = (
+    ClaseAsintotica(),
+    ClaseAsintotica(potencia_log=1),
+    ClaseAsintotica(grados={'n': Fraction(1, 2)}),
+    ClaseAsintotica(grados={'n': 1}),
+    ClaseAsintotica(grados={'n': 1}, potencia_log=1),
+    ClaseAsintotica(grados={'n': 2}),
+    ClaseAsintotica(grados={'n': 3}),
+    ClaseAsintotica(base=_PHI),
+    ClaseAsintotica(base=2),
+)
+
+# Parámetros escalares que suelen ser el primer o el último índice del arreglo
+_INICIOS = {'inicio', 'ini', 'izq', 'izquierda', 'bajo', 'lo', 'low', 'i', 'primero'}
+_FINES = {'fin', 'der', 'derecha', 'alto', 'hi', 'high', 'ultimo'}
+
+# Funciones que el intérprete resuelve sin que estén en el programa
+_CONOCIDAS = set(_PREDEFINIDAS) | _SALIDA | {'longitud', 'tamano', 'tamaño', 'intercambiar'}
+_CONECTORES = {'y', 'o', '&&', '||'}
+
+# Con búsquedas los arreglos toman valores desde 1 y las claves este valor,
+# que no está en ningún arreglo: el peor caso de la búsqueda
+_CLAVE_AUSENTE = 0
+
+
+class ResultadoEmpirico:
+    def __init__(self, nombre_funcion, entrada, mediciones, ajustes, clase_estatica, motivo_fin,
+                 medida='operaciones', no_concluyente=None):
+        self.nombre_funcion = nombre_funcion
+        self.entrada = entrada
+        self.medida = medida
+        self.mediciones = mediciones  # [(n, operaciones o segundos)]
+        self.ajustes = ajustes  # [(error, clase, a, b)] ordenados por error
+        self.clase_estatica = clase_estatica
+        self.motivo_fin = motivo_fin
+        # Por qué la ejecución no sirve para validar la clase estática, o None
+        self.no_concluyente = no_concluyente
+
+    @property
+    def clase(self):
+        return self.ajustes[0][1] if self.ajustes else None
+
+    @property
+    def error(self):
+        return self.ajustes[0][0] if self.ajustes else math.inf
+
+    @property
+    def coincide(self):
+        if self.clase is None or self.clase_estatica is None:
+            return None
+        if _firma(self.clase) == _firma(self.clase_estatica):
+            return True
+        return None if self.no_concluyente else False
+
+    def mostrar(self):
+        nombre = f"Función: '{self.nombre_funcion}': " if self.nombre_funcion else ""
+        print(f"{nombre}Perfil empírico (entrada {self.entrada}, {self.medida}):")
+        for n, valor in self.mediciones:
+            if self.medida == 'tiempo':
+                print(f"  n = {n:>7}  tiempo = {valor * 1000:.3f} ms")
+            else:
+                print(f"  n = {n:>7}  operaciones = {valor}")
+        if self.motivo_fin:
+            print(f"  ({self.motivo_fin})")
+        if self.clase is None:
+            print("  Sin mediciones suficientes para ajustar una curva")
+            return
+        for error, clase, a, b in self.ajustes[:3]:
+            print(f"  {clase.como_big_o():<14} T(n) ≈ {a:.4g}·f(n) + {b:.4g}   error {error:.2%}")
+        print(f"  Big O empírico: {self.clase.como_big_o()}")
+        if self.clase_estatica is not None:
+            coincide = self.coincide
+            if coincide is None:
+                estado = f"no concluyente: {self.no_concluyente}"
+            else:
+                estado = "coincide" if coincide else "NO coincide"
+            print(f"  Big O estático: {self.clase_estatica.como_big_o()} ({estado})")
+
+
+def _firma(clase):
+    """Forma comparable de una clase: base redondeada, grado total y potencia del logaritmo"""
+    if clase.es_constante():
+        return (1, 0, 0)
+    base = round(float(clase.base), 2) if clase.base > 1 else 1
+    return (base, float(clase.grado), clase.potencia_log)
+
+
+def _evaluar_clase(clase, n):
+    try:
+        valor = float(n) ** float(clase.grado)
+        if clase.potencia_log:
+            valor *= math.log2(n) ** clase.potencia_log
+        if clase.base > 1:
+            valor *= float(clase.base) ** n
+        return valor
+    except OverflowError:
+        return math.inf
+
+
+def ajustar_curva(mediciones, clase):
+    """
+    Ajusta operaciones ≈ a·f(n) + b por mínimos cuadrados relativos (pesos 1/y²)
+    y retorna (error, a, b), con el error como raíz del error relativo medio.
+    La clase constante sólo ajusta b.
+    """
+    puntos = [(n, y) for n, y in mediciones if y > 0]
+    if not puntos:
+        return math.inf, 0.0, 0.0
+    if clase.es_constante():
+        # Mínimo de Σ((b - y)/y)²
+        b = sum(1 / y for _, y in puntos) / sum(1 / (y * y) for _, y in puntos)
+        a = 0.0
+    else:
+        sgg = sgb = sbb = sgy = sby = 0.0
+        for n, y in puntos:
+            g = _evaluar_clase(clase, n)
+            if math.isinf(g):
+                return math.inf, 0.0, 0.0
+            peso = 1 / (y * y)
+            sgg += peso * g * g
+            sgb += peso * g
+            sbb += peso
+            sgy += peso * g * y
+            sby += peso * y
+        determinante = sgg * sbb - sgb * sgb
+        if determinante <= 0 or not math.isfinite(determinante):
+            return math.inf, 0.0, 0.0
+        a = (sgy * sbb - sgb * sby) / determinante
+        b = (sgg * sby - sgb * sgy) / determinante
+        if a <= 0:
+            return math.inf, a, b
+    error = math.sqrt(sum(((a * _evaluar_clase(clase, n) + b - y) / y) ** 2 for n, y in puntos) / len(puntos))
+    return error, a, b
+
+
+def parametros_funciones(arbol):
+    """Función -> lista de parámetros, en orden de aparición"""
+    parametros = {}
+    pendientes = [arbol]
+    while pendientes:
+        nodo = pendientes.pop()
+        if nodo.tipo == 'FUNCION' and nodo.props.get('nombre'):
+            parametros.setdefault(nodo.props['nombre'], list(nodo.props.get('args', [])))
+        pendientes.extend(reversed(nodo.hijos))
+    return parametros
+
+
+def _funcion_principal(parametros, grafo):
+    """Primera función que no es llamada por ninguna otra"""
+    llamadas = set()
+    for origen, destinos in grafo.aristas.items():
+        llamadas.update(destino for destino in destinos if destino != origen)
+    for nombre in parametros:
+        if nombre not in llamadas:
+            return nombre
+    return next(iter(parametros), None)
+
+
+def _tokens_nodo(nodo):
+    for valor in nodo.props.values():
+        if isinstance(valor, list):
+            if valor and all(isinstance(t, str) for t in valor):
+                yield valor
+            else:
+                for parte in valor:
+                    if isinstance(parte, list):
+                        yield parte
+
+
+def _argumentos_llamadas(tokens, funciones):
+    """(función, posición, nombre) por cada argumento que es una sola variable en 'f(a, b)'"""
+    for i in range(len(tokens) - 1):
+        if tokens[i] in funciones and tokens[i + 1] == '(':
+            nivel = 0
+            posicion = 0
+            actual = []
+            for token in tokens[i + 2:]:
+                if token in ('(', '['):
+                    nivel += 1
+                elif token in (')', ']'):
+                    if nivel == 0:
+                        break
+                    nivel -= 1
+                if token == ',' and nivel == 0:
+                    if len(actual) == 1:
+                        yield tokens[i], posicion, actual[0]
+                    posicion += 1
+                    actual = []
+                else:
+                    actual.append(token)
+            if len(actual) == 1:
+                yield tokens[i], posicion, actual[0]
+
+
+def parametros_arreglo(arbol):
+    """
+    Parámetros de cada función que se usan como arreglos: los indexados en su
+    cuerpo y, hasta un punto fijo, los que se pasan en una posición que la
+    función llamada usa como arreglo.
+    """
+    funciones = parametros_funciones(arbol)
+    indexados = {nombre: set() for nombre in funciones}
+    pasajes = {nombre: [] for nombre in funciones}
+    pendientes = [(hijo, None) for hijo in arbol.hijos]
+    while pendientes:
+        nodo, actual = pendientes.pop()
+        if nodo.tipo == 'FUNCION':
+            actual = nodo.props.get('nombre')
+        elif actual is not None:
+            if nodo.tipo in ('ASIGNACION_ARREGLO', 'DECLARACION_ARREGLO'):
+                indexados[actual].add(nodo.props.get('nombre'))
+            if nodo.tipo == 'LLAMADA_FUNCION' and nodo.props.get('nombre') in funciones:
+                for posicion, tokens in enumerate(nodo.props.get('expr_args', [])):
+                    if len(tokens) == 1:
+                        pasajes[actual].append((nodo.props['nombre'], posicion, tokens[0]))
+            for tokens in _tokens_nodo(nodo):
+                for i in range(len(tokens) - 1):
+                    if tokens[i + 1] == '[':
+                        indexados[actual].add(tokens[i])
+                pasajes[actual].extend(_argumentos_llamadas(tokens, funciones))
+        pendientes.extend((hijo, actual) for hijo in nodo.hijos)
+
+    arreglos = {
+        nombre: {p for p in parametros if p in indexados[nombre]}
+        for nombre, parametros in funciones.items()
+    }
+    cambio = True
+    while cambio:
+        cambio = False
+        for nombre, llamadas in pasajes.items():
+            for destino, posicion, argumento in llamadas:
+                parametros = funciones[destino]
+                if (posicion < len(parametros) and parametros[posicion] in arreglos[destino]
+                        and argumento in funciones[nombre]
+                        and argumento not in arreglos[nombre]):
+                    arreglos[nombre].add(argumento)
+                    cambio = True
+    return arreglos
+
+
+def _funciones_alcanzables(arbol, nombre_funcion):
+    """Nodos FUNCION de 'nombre_funcion' y de las funciones que llama, directa o indirectamente"""
+    grafo = GrafoLlamadas(arbol)
+    alcanzables = {nombre_funcion}
+    pendientes = [nombre_funcion]
+    while pendientes:
+        for destino in grafo.llamadas_desde(pendientes.pop()):
+            if destino not in alcanzables:
+                alcanzables.add(destino)
+                pendientes.append(destino)
+    return [grafo.funciones[nombre] for nombre in alcanzables if nombre in grafo.funciones]
+
+
+def llamadas_desconocidas(arbol, nombre_funcion):
+    """Funciones que no están en el programa llamadas desde 'nombre_funcion' (al ejecutarse cuestan 1)"""
+    funciones = parametros_funciones(arbol)
+    desconocidas = set()
+    for funcion in _funciones_alcanzables(arbol, nombre_funcion):
+        pendientes = list(funcion.hijos)
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.tipo == 'FUNCION':
+                continue
+            nombres = [nodo.props.get('nombre', '')] if nodo.tipo == 'LLAMADA_FUNCION' else []
+            for tokens in _tokens_nodo(nodo):
+                nombres.extend(tokens[i] for i in range(len(tokens) - 1)
+                               if tokens[i + 1] == '(' and tokens[i].isidentifier())
+            desconocidas.update(nombre for nombre in nombres
+                                if nombre and nombre not in funciones and nombre.lower() not in _CONOCIDAS)
+            pendientes.extend(nodo.hijos)
+    return desconocidas
+
+
+def _comparaciones_igualdad(tokens):
+    """(izquierda, derecha) de cada 'a = b' o 'a == b' de una condición"""
+    partes = [[]]
+    for token in tokens:
+        if token.lower() in _CONECTORES:
+            partes.append([])
+        else:
+            partes[-1].append(token)
+    for parte in partes:
+        if '=' in parte:
+            k = parte.index('=')
+            derecha = parte[k + 1:]
+            if derecha[:1] == ['=']:
+                derecha = derecha[1:]
+            yield parte[:k], derecha
+
+
+def entradas_libres(arbol):
+    """
+    Función -> (arreglos, claves). 'arreglos' son los nombres que la función
+    indexa sin asignarlos ni recibirlos como parámetro (un arreglo de entrada
+    global); 'claves' lo que una condición compara por igualdad con un
+    elemento de un arreglo ('a[i] = x'), que indica una búsqueda.
+    """
+    parametros = parametros_funciones(arbol)
+    arreglos_parametro = parametros_arreglo(arbol)
+    entradas = {}
+    pendientes = [arbol]
+    while pendientes:
+        nodo = pendientes.pop()
+        pendientes.extend(nodo.hijos)
+        nombre = nodo.props.get('nombre')
+        if nodo.tipo != 'FUNCION' or not nombre or nombre in entradas:
+            continue
+        escritas = _escritas(nodo.hijos) | set(parametros[nombre])
+        arreglos, claves = set(), set()
+        internos = [hijo for hijo in nodo.hijos if hijo.tipo != 'FUNCION']
+        while internos:
+            interno = internos.pop()
+            internos.extend(hijo for hijo in interno.hijos if hijo.tipo != 'FUNCION')
+            for tokens in _tokens_nodo(interno):
+                arreglos.update(tokens[i] for i in range(len(tokens) - 1)
+                                if tokens[i + 1] == '[' and tokens[i] not in escritas)
+            if interno.tipo in ('SI', 'MIENTRAS'):
+                for izquierda, derecha in _comparaciones_igualdad(interno.props.get('cond', [])):
+                    for lado, otro in ((izquierda, derecha), (derecha, izquierda)):
+                        if (len(lado) >= 4 and lado[1] == '[' and lado[-1] == ']' and len(otro) == 1
+                                and (lado[0] in arreglos_parametro[nombre] or lado[0] not in escritas)):
+                            claves.add(otro[0])
+        entradas[nombre] = (arreglos, claves)
+    return entradas
+
+
+def _valores_arreglo(n, entrada, generador, desde=0):
+    if entrada == 'ordenado':
+        valores = list(range(desde, n + desde))
+    elif entrada == 'inverso':
+        valores = list(range(n - 1 + desde, desde - 1, -1))
+    else:
+        valores = generador.choices(range(desde, max(n, 1) + desde), k=n)
+    return Arreglo.desde_lista(valores)
+
+
+def generar_argumentos(parametros, arreglos, n, entrada='aleatorio', semilla=0, claves=()):
+    """
+    Argumentos de tamaño n: arreglos de n elementos y escalares según su
+    nombre. Si la función busca 'claves', los arreglos van desde 1 y los
+    parámetros que son claves valen _CLAVE_AUSENTE, que no se encuentra.
+    """
+    generador = random.Random(semilla + n)
+    desde = 1 if claves else 0
+    argumentos = []
+    for parametro in parametros:
+        if parametro in arreglos:
+            argumentos.append(_valores_arreglo(n, entrada, generador, desde))
+        elif parametro in claves:
+            argumentos.append(_CLAVE_AUSENTE)
+        elif parametro.lower() in _INICIOS:
+            argumentos.append(0)
+        elif parametro.lower() in _FINES:
+            argumentos.append(n - 1)
+        else:
+            argumentos.append(n)
+    return argumentos
+
+
+def generar_globales(arreglos, claves, n, entrada='aleatorio', semilla=0):
+    """
+    Valores de las variables libres: cada arreglo libre con n elementos
+    (como los parámetros) y cada clave libre con _CLAVE_AUSENTE
+    """
+    generador = random.Random(semilla + n + 1)
+    desde = 1 if claves else 0
+    globales = {nombre: _valores_arreglo(n, entrada, generador, desde) for nombre in sorted(arreglos)}
+    for clave in claves:
+        if clave.isidentifier() and clave not in globales:
+            globales[clave] = _CLAVE_AUSENTE
+    return globales
+
+
+def _cronometrar(programa, nombre_funcion, generar):
+    """Menor tiempo de varias ejecuciones; cada una recibe argumentos y globales nuevos"""
+    mejor = math.inf
+    acumulado = 0.0
+    for _ in range(_REPETICIONES_MAXIMAS):
+        argumentos, globales = generar()
+        inicio = time.perf_counter()
+        programa.ejecutar(nombre_funcion, argumentos, globales=globales)
+        duracion = time.perf_counter() - inicio
+        mejor = min(mejor, duracion)
+        acumulado += duracion
+        if acumulado >= _TIEMPO_POR_TAMANO:
+            break
+    return mejor
+
+
+def medir(programa, nombre_funcion, tamanos=TAMANOS, entrada='aleatorio',
+          limite=LIMITES['interprete'], tiempo_maximo=TIEMPO_MAXIMO, cronometrado=None):
+    """
+    Ejecuta la función con tamaños crecientes y retorna ([(n, operaciones)], motivo_fin).
+    Se detiene al superar el límite de operaciones, la recursión o el tiempo total.
+
+    'programa' es un Interprete o un ProgramaCompilado con contadores. Si se
+    indica 'cronometrado' (un ProgramaCompilado sin contadores), cada tamaño
+    que terminó dentro del límite se vuelve a ejecutar con él y la medición
+    es su tiempo en segundos.
+    """
+    parametros = parametros_funciones(programa.arbol)[nombre_funcion]
+    arreglos = parametros_arreglo(programa.arbol)[nombre_funcion]
+    # Arreglos libres y claves de búsqueda de la función y de las que llama
+    entradas = entradas_libres(programa.arbol)
+    libres, claves = set(), set()
+    for funcion in _funciones_alcanzables(programa.arbol, nombre_funcion):
+        arreglos_libres, claves_funcion = entradas[funcion.props['nombre']]
+        libres |= arreglos_libres
+        claves |= claves_funcion
+    mediciones = []
+    inicio = time.perf_counter()
+    for n in tamanos:
+        def generar(n=n):
+            return (generar_argumentos(parametros, arreglos, n, entrada, claves=claves),
+                    generar_globales(libres, claves, n, entrada))
+        try:
+            argumentos, globales = generar()
+            _, operaciones = programa.ejecutar(nombre_funcion, argumentos, limite, globales)
+        except LimiteEjecucion as error:
+            return mediciones, f"detenido en n = {n}: {error}"
+        if cronometrado is not None:
+            mediciones.append((n, _cronometrar(cronometrado, nombre_funcion, generar)))
+        else:
+            mediciones.append((n, operaciones))
+        if time.perf_counter() - inicio > tiempo_maximo:
+            return mediciones, f"detenido tras n = {n}: se superaron {tiempo_maximo:g} s"
+    return mediciones, ""
+
+
+def ajustar(mediciones):
+    """Ajustes de todas las candidatas, ordenados por error: [(error, clase, a, b)]"""
+    # Los tamaños muy pequeños están dominados por constantes
+    puntos = [(n, y) for n, y in mediciones if n >= 4]
+    if len(puntos) < 4:
+        puntos = mediciones
+    if len(puntos) < 3:
+        return []
+    ajustes = []
+    for orden, clase in enumerate(CANDIDATAS):
+        error, a, b = ajustar_curva(puntos, clase)
+        if math.isfinite(error):
+            ajustes.append((error, orden, clase, a, b))
+    ajustes.sort(key=lambda ajuste: ajuste[:2])
+    if ajustes:
+        # Con errores casi iguales (cuentas constantes ajustan a·n + b con a ≈ 0)
+        # gana la clase de menor crecimiento
+        tolerancia = ajustes[0][0] * 1.05 + 1e-3
+        simple = min((ajuste for ajuste in ajustes if ajuste[0] <= tolerancia), key=lambda ajuste: ajuste[1])
+        ajustes.remove(simple)
+        ajustes.insert(0, simple)
+    return [(error, clase, a, b) for error, _, clase, a, b in ajustes]
+
+
+def perfil_empirico(codigo, nombre_funcion=None, entrada='aleatorio', tamanos=TAMANOS, limite=None,
+                    tiempo_maximo=TIEMPO_MAXIMO, comparar=True, motor='compilado', medida='operaciones'):
+    """
+    Perfil empírico de una función del pseudocódigo (por omisión, la primera
+    que no es llamada por otra función). 'motor' es 'compilado' o
+    'interprete' (el límite de operaciones por omisión depende de él); con
+    medida 'tiempo' se ajustan los tiempos del código compilado sin
+    contadores. Si 'comparar' es True incluye la clase del análisis estático
+    para validarla.
+    """
+    if medida == 'tiempo' and motor != 'compilado':
+        raise ValueError("La medida 'tiempo' requiere el motor 'compilado'")
+    arbol = parsear(tokenizar(codigo))
+    parametros = parametros_funciones(arbol)
+    if nombre_funcion is None:
+        nombre_funcion = _funcion_principal(parametros, GrafoLlamadas(arbol))
+    if nombre_funcion not in parametros:
+        raise ErrorInterprete(f"La función '{nombre_funcion}' no existe")
+    programa = MOTORES[motor](arbol)
+    cronometrado = ProgramaCompilado(arbol, contar=False) if medida == 'tiempo' else None
+    mediciones, motivo_fin = medir(programa, nombre_funcion, tamanos, entrada,
+                                   LIMITES[motor] if limite is None else limite, tiempo_maximo, cronometrado)
+    ajustes = ajustar(mediciones)
+    clase_estatica = None
+    no_concluyente = None
+    if comparar:
+        resultado = AnalizadorComplejidad(arbol).analizar(nombre_funcion)
+        clase_estatica = resultado.funcion_tiempo.clase_asintotica()
+        no_concluyente = _motivo_no_concluyente(arbol, nombre_funcion, ajustes, clase_estatica)
+    return ResultadoEmpirico(nombre_funcion, entrada, mediciones, ajustes=ajustes,
+                             clase_estatica=clase_estatica, motivo_fin=motivo_fin, medida=medida,
+                             no_concluyente=no_concluyente)
+
+
+def _motivo_no_concluyente(arbol, nombre_funcion, ajustes, clase_estatica):
+    """
+    Por qué las mediciones no sirven para validar la clase estática, o None:
+    las funciones que no están en el programa cuestan 1 al ejecutarse, y una
+    búsqueda que termina en pasos constantes no llegó a su peor caso.
+    """
+    desconocidas = llamadas_desconocidas(arbol, nombre_funcion)
+    if desconocidas:
+        return f"llama a funciones que no están en el programa ({', '.join(sorted(desconocidas))})"
+    if ajustes and ajustes[0][1].es_constante() and not clase_estatica.es_constante():
+        alcanzables = {funcion.props['nombre'] for funcion in _funciones_alcanzables(arbol, nombre_funcion)}
+        if any(claves for nombre, (_, claves) in entradas_libres(arbol).items() if nombre in alcanzables):
+            return "la búsqueda terminó en pasos constantes: la entrada generada no alcanza el peor caso"
+    return None
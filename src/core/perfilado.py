@@ -0,0 +1,194 @@
+# perfilado.py
+
+import sys
+import pstats
+import cProfile
+from pathlib import Path
+
+# Subsistema de cada módulo propio, para agrupar las funciones calientes
+SUBSISTEMAS = {
+    'pseudogrammar': 'tokenizador',
+    'parser_estructural': 'parser',
+    'analizador_complejidad': 'analizador',
+    'analizador_expresiones': 'analizador',
+    'grafo_llamadas': 'analizador',
+    'iteraciones': 'analizador',
+    'recurrencias': 'analizador',
+    'clasificacion_asintotica': 'analizador',
+    'expresion_simbolica': 'analizador',
+    'perezoso': 'importaciones',
+}
+ORDEN_SUBSISTEMAS = ('tokenizador', 'parser', 'analizador', 'sympy', 'importaciones', 'otros')
+_PAQUETES_SYMPY = {'sympy', 'mpmath'}
+
+# Las ramas de las pilas colapsadas con menos de esta fracción del total se
+# suman al tiempo propio de su padre: acota el archivo en recursiones profundas
+_FRACCION_MINIMA = 1e-4
+
+
+def etiqueta(funcion):
+    """'nombre (archivo.py:línea)' de una clave de pstats; los builtins quedan como '<built-in ...>'"""
+    archivo, linea, nombre = funcion
+    if archivo == '~':
+        return nombre.replace(';', ',')
+    return f"{nombre} ({Path(archivo).name}:{linea})".replace(';', ',')
+
+
+def _subsistema_propio(funcion):
+    archivo = funcion[0]
+    if archivo == '~':
+        return None
+    if archivo.startswith('<frozen importlib'):
+        return 'importaciones'
+    ruta = Path(archivo)
+    if _PAQUETES_SYMPY & set(ruta.parts):
+        return 'sympy'
+    return SUBSISTEMAS.get(ruta.stem)
+
+
+class PerfilAnalisis:
+    """
+    cProfile alrededor de un análisis, con salidas para herramientas externas.
+
+        with PerfilAnalisis() as perfil:
+            analizar_con_detalles(codigo)
+        perfil.guardar('out', 'mergesort')   # mergesort.pstats y mergesort.collapsed
+        perfil.mostrar(top=10)
+
+    Las funciones de la biblioteca estándar y los builtins (re.finditer,
+    dict.get...) cuentan para el subsistema de quien más tiempo las llamó:
+    el tiempo de la expresión regular del tokenizador es del tokenizador.
+    """
+
+    def __init__(self):
+        self.perfil = cProfile.Profile()
+        self._estadisticas = None
+
+    def __enter__(self):
+        self._estadisticas = None
+        self.perfil.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.perfil.disable()
+        return False
+
+    def estadisticas(self):
+        if self._estadisticas is None:
+            self._estadisticas = pstats.Stats(self.perfil)
+        return self._estadisticas
+
+    # --- salidas ---
+
+    def guardar(self, directorio, nombre):
+        """Escribe <nombre>.pstats y <nombre>.collapsed en 'directorio'; retorna sus rutas"""
+        directorio = Path(directorio)
+        directorio.mkdir(parents=True, exist_ok=True)
+        ruta_pstats = directorio / f"{nombre}.pstats"
+        ruta_colapsado = directorio / f"{nombre}.collapsed"
+        self.estadisticas().dump_stats(ruta_pstats)
+        with open(ruta_colapsado, 'w', encoding='utf-8') as f:
+            for pila, micros in sorted(self.pilas_colapsadas().items()):
+                f.write(f"{pila} {micros}\n")
+        return ruta_pstats, ruta_colapsado
+
+    def pilas_colapsadas(self):
+        """
+        {'raíz;...;función': microsegundos de tiempo propio}, el formato de
+        flamegraph.pl, speedscope e inferno.
+
+        cProfile sólo guarda aristas llamador -> llamado, así que las pilas se
+        reconstruyen repartiendo el tiempo de cada función entre las llamadas
+        que hace en proporción a lo que costó cada arista (como gprof2dot).
+        Las llamadas recursivas no se vuelven a expandir: su tiempo queda como
+        propio de quien hace la llamada. Con recursión las aristas cuentan dos
+        veces el tiempo anidado, así que los llamados se reducen hasta caber en
+        el peso de la función y la suma de las pilas no supera el total medido.
+        """
+        datos = self.estadisticas().stats
+        llamados = {}
+        for funcion, (_, _, _, _, llamadores) in datos.items():
+            for llamador, (_, _, _, acumulado) in llamadores.items():
+                llamados.setdefault(llamador, []).append((funcion, acumulado))
+        # Raíces, sin el propio __exit__ ni Profiler.disable que cierran la medición
+        raices = [funcion for funcion, valores in datos.items()
+                  if not valores[4] and funcion[0] != __file__ and '_lsprof' not in funcion[2]]
+        total = sum(datos[funcion][3] for funcion in raices)
+        minimo = total * _FRACCION_MINIMA
+
+        pilas = {}
+        pendientes = [(etiqueta(raiz), raiz, datos[raiz][3], frozenset((raiz,))) for raiz in raices]
+        while pendientes:
+            pila, funcion, peso, en_pila = pendientes.pop()
+            _, _, propio, acumulado, _ = datos[funcion]
+            escala = peso / acumulado if acumulado > 0 else 0.0
+            propio = min(propio * escala, peso)
+            hijos = [(llamado, costo * escala) for llamado, costo in llamados.get(funcion, ())]
+            suma = sum(costo for _, costo in hijos)
+            if suma > peso - propio:
+                reduccion = (peso - propio) / suma
+                hijos = [(llamado, costo * reduccion) for llamado, costo in hijos]
+            for llamado, costo in hijos:
+                if costo < minimo or llamado in en_pila:
+                    propio += costo
+                else:
+                    pendientes.append((f"{pila};{etiqueta(llamado)}", llamado, costo, en_pila | {llamado}))
+            micros = round(propio * 1e6)
+            if micros > 0:
+                pilas[pila] = pilas.get(pila, 0) + micros
+        return pilas
+
+    def subsistema(self, funcion):
+        """Subsistema de una función de pstats (ver la documentación de la clase)"""
+        datos = self.estadisticas().stats
+        visitadas = set()
+        actual = funcion
+        while actual not in visitadas:
+            visitadas.add(actual)
+            propio = _subsistema_propio(actual)
+            if propio is not None:
+                return propio
+            llamadores = datos.get(actual, (0, 0, 0, 0, {}))[4]
+            if not llamadores:
+                break
+            actual = max(llamadores, key=lambda llamador: llamadores[llamador][3])
+        return 'otros'
+
+    def por_subsistema(self, top=10):
+        """
+        {subsistema: {'segundos': tiempo propio total, 'funciones': [...]}} en
+        ORDEN_SUBSISTEMAS; 'funciones' son las 'top' de más tiempo propio como
+        dicts con etiqueta, propio, acumulado y llamadas.
+        """
+        grupos = {nombre: [] for nombre in ORDEN_SUBSISTEMAS}
+        for funcion, (_, llamadas, propio, acumulado, _) in self.estadisticas().stats.items():
+            grupos[self.subsistema(funcion)].append({
+                'funcion': etiqueta(funcion),
+                'propio': propio,
+                'acumulado': acumulado,
+                'llamadas': llamadas,
+            })
+        resumen = {}
+        for nombre, funciones in grupos.items():
+            funciones.sort(key=lambda datos: -datos['propio'])
+            resumen[nombre] = {
+                'segundos': sum(datos['propio'] for datos in funciones),
+                'funciones': funciones[:top],
+            }
+        return resumen
+
+    def mostrar(self, top=10, archivo=None):
+        archivo = archivo or sys.stdout
+        resumen = self.por_subsistema(top)
+        total = sum(grupo['segundos'] for grupo in resumen.values()) or 1.0
+        print("🔬 Tiempo propio por subsistema:", file=archivo)
+        for nombre, grupo in resumen.items():
+            print(f"  {nombre:<12} {grupo['segundos'] * 1000:10.1f} ms  {100 * grupo['segundos'] / total:5.1f}%",
+                  file=archivo)
+        for nombre, grupo in resumen.items():
+            if not grupo['funciones']:
+                continue
+            print(f"\n  {nombre} — funciones más costosas (propio / acumulado / llamadas):", file=archivo)
+            for datos in grupo['funciones']:
+                print(f"    {datos['propio'] * 1000:9.2f} ms {datos['acumulado'] * 1000:9.2f} ms "
+                      f"{datos['llamadas']:>8}  {datos['funcion']}", file=archivo)
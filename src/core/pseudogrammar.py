@@ -1,4 +1,7 @@
 import re
+from enum import Enum
+
+from .instrumentacion import medir_fase
 
 # Palabras clave del pseudocódigo
 palabras_clave = [
@@ -52,15 +55,291 @@ token_specification += [
 tok_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification)
 palabras_clave_set = set(pc.lower() for pc in palabras_clave)
 
+# Regex maestro precompilado para el escáner: consume el espacio en blanco
+# previo a cada token, de modo que los espacios no generan coincidencias propias
+especificacion_escaner = [
+    (nombre, r'[^ \t\n]' if nombre == 'DESCONOCIDO' else patron)
+    for nombre, patron in token_specification if nombre != 'ESPACIO'
+]
+patron_tokens = re.compile(
+    r'[ \t]*(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in especificacion_escaner) + ')'
+)
+
+
+class TipoToken(str, Enum):
+    """Tipos de token. Hereda de str para compararse igual que los nombres antiguos."""
+    MENOR_IGUAL = 'MENOR_IGUAL'
+    MAYOR_IGUAL = 'MAYOR_IGUAL'
+    DIFERENTE = 'DIFERENTE'
+    ASIGNACION = 'ASIGNACION'
+    MENOR = 'MENOR'
+    MAYOR = 'MAYOR'
+    IGUAL = 'IGUAL'
+    SUMA = 'SUMA'
+    RESTA = 'RESTA'
+    MULTIPLICACION = 'MULTIPLICACION'
+    DIVISION = 'DIVISION'
+    POTENCIA = 'POTENCIA'
+    PUNTO = 'PUNTO'
+    Y = 'Y'
+    O = 'O'
+    NUMERO = 'NUMERO'
+    IDENT = 'IDENT'
+    PALABRA_CLAVE = 'PALABRA_CLAVE'
+    PAREN_IZQ = 'PAREN_IZQ'
+    PAREN_DER = 'PAREN_DER'
+    COMA = 'COMA'
+    CORCHETE_IZQ = 'CORCHETE_IZQ'
+    CORCHETE_DER = 'CORCHETE_DER'
+    LLAVE_IZQ = 'LLAVE_IZQ'
+    LLAVE_DER = 'LLAVE_DER'
+    NUEVA_LINEA = 'NUEVA_LINEA'
+    ESPACIO = 'ESPACIO'
+    DESCONOCIDO = 'DESCONOCIDO'
+
+    def __str__(self):
+        return self.value
+
+
+class Token:
+    """
+    Token compacto: tipo (TipoToken), valor y posición en el texto.
+
+    Soporta lectura tipo diccionario (t['tipo'], t['valor'], t.get(...))
+    para mantener compatibilidad con el formato anterior basado en dicts.
+    """
+    __slots__ = ('tipo', 'valor', 'pos')
+
+    def __init__(self, tipo, valor, pos=0):
+        self.tipo = tipo
+        self.valor = valor
+        self.pos = pos
+
+    def __getitem__(self, clave):
+        if clave == 'tipo':
+            return self.tipo
+        if clave == 'valor':
+            return self.valor
+        raise KeyError(clave)
+
+    def get(self, clave, defecto=None):
+        try:
+            return self[clave]
+        except KeyError:
+            return defecto
+
+    def keys(self):
+        return ('tipo', 'valor')
+
+    def como_dict(self):
+        return {'tipo': str(self.tipo), 'valor': self.valor}
+
+    def __eq__(self, otro):
+        if isinstance(otro, Token):
+            return self.tipo == otro.tipo and self.valor == otro.valor
+        if isinstance(otro, dict):
+            return self.como_dict() == otro
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Token({self.tipo.value}, {self.valor!r}, {self.pos})"
+
+
+# Mapeo grupo del regex -> TipoToken, resuelto una sola vez
+_tipo_por_grupo = {name: TipoToken[name] for name, _ in especificacion_escaner}
+
+
+class ListaTokens:
+    """
+    Secuencia de tokens almacenada en arreglos paralelos (tipos, valores, posiciones).
+
+    Evita crear un objeto por token; los Token se materializan solo al indexar
+    o iterar, por lo que el código existente que usa tokens[i]['tipo'] sigue funcionando.
+    """
+    __slots__ = ('tipos', 'valores', 'posiciones')
+
+    def __init__(self, tipos=None, valores=None, posiciones=None):
+        self.tipos = tipos if tipos is not None else []
+        self.valores = valores if valores is not None else []
+        self.posiciones = posiciones if posiciones is not None else []
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ListaTokens(self.tipos[i], self.valores[i], self.posiciones[i])
+        return Token(self.tipos[i], self.valores[i], self.posiciones[i])
+
+    def __iter__(self):
+        return map(Token, self.tipos, self.valores, self.posiciones)
+
+    def append(self, token):
+        self.tipos.append(token.tipo)
+        self.valores.append(token.valor)
+        self.posiciones.append(token.pos)
+
+    def __repr__(self):
+        return f"ListaTokens({list(self)!r})"
+
+
+def arreglos_tokens(tokens):
+    """
+    Retorna (tipos, valores, hay, liberar) para recorrer los tokens por índice.
+
+    - ListaTokens: usa sus arreglos paralelos sin copiar.
+    - list/tuple de Token o dicts con el formato anterior: se convierten a arreglos.
+    - Cualquier otro iterable (p. ej. tokenizar_stream): se envuelve en un FlujoTokens.
+
+    hay(i) indica si existe el token i; liberar(i) permite descartar los anteriores.
+    """
+    if isinstance(tokens, ListaTokens):
+        tipos, valores = tokens.tipos, tokens.valores
+    elif isinstance(tokens, (list, tuple)):
+        tipos, valores = [t['tipo'] for t in tokens], [t['valor'] for t in tokens]
+    else:
+        flujo = FlujoTokens(tokens)
+        return flujo.tipos, flujo.valores, flujo.hay, flujo.liberar
+    return tipos, valores, len(tipos).__gt__, _sin_liberar
+
+
+def _sin_liberar(hasta):
+    pass
+
+
+def _clasificar_ident(valor):
+    if valor.lower() in palabras_clave_set:
+        return TipoToken.PALABRA_CLAVE
+    return TipoToken.IDENT
+
+
+def escanear(texto, inicio=0):
+    """Genera objetos Token recorriendo el texto en una sola pasada."""
+    tipos = _tipo_por_grupo
+    for mo in patron_tokens.finditer(texto, inicio):
+        kind = mo.lastgroup
+        valor = mo[kind]
+        tipo = _clasificar_ident(valor) if kind == 'IDENT' else tipos[kind]
+        yield Token(tipo, valor, mo.start(kind))
+
+
+@medir_fase('tokenizar')
 def tokenizar(texto):
-    tokens = []
-    for mo in re.finditer(tok_regex, texto):
+    """Tokeniza el texto completo y retorna una ListaTokens."""
+    tipos_grupo = _tipo_por_grupo
+    tipos_ident = {}  # Los identificadores se repiten mucho: clasificar cada uno una vez
+    tipos, valores, posiciones = [], [], []
+    agregar_tipo, agregar_valor, agregar_pos = tipos.append, valores.append, posiciones.append
+    for mo in patron_tokens.finditer(texto):
         kind = mo.lastgroup
-        value = mo.group()
-        if kind == 'ESPACIO':
-            continue
+        valor = mo[kind]
         if kind == 'IDENT':
-            if value.lower() in palabras_clave_set:
-                kind = 'PALABRA_CLAVE'
-        tokens.append({'tipo': kind, 'valor': value})
-    return tokens
+            tipo = tipos_ident.get(valor)
+            if tipo is None:
+                tipo = tipos_ident[valor] = _clasificar_ident(valor)
+            agregar_tipo(tipo)
+        else:
+            agregar_tipo(tipos_grupo[kind])
+        agregar_valor(valor)
+        agregar_pos(mo.start(kind))
+    return ListaTokens(tipos, valores, posiciones)
+
+
+# Caracteres que el token más largo ambiguo necesita ver más allá de su final
+# ("1" puede continuar como "1.5", "<" como "<=" o "<-"): un token que termina
+# a menos de esta distancia del final del fragmento se difiere al siguiente.
+_MARGEN_FRAGMENTO = 2
+
+
+def tokenizar_stream(fileobj, chunk_size=64 * 1024):
+    """
+    Genera Token leyendo el archivo por fragmentos de chunk_size caracteres.
+
+    Los tokens que cruzan el límite entre fragmentos (identificadores, números,
+    operadores compuestos como '<-' o '<=') se completan con el fragmento siguiente.
+    Las posiciones son absolutas respecto al inicio del archivo.
+    """
+    tipos = _tipo_por_grupo
+    buffer = ''
+    base = 0
+    fin_archivo = False
+    while not fin_archivo:
+        fragmento = fileobj.read(chunk_size)
+        fin_archivo = not fragmento
+        buffer += fragmento
+        limite = len(buffer) if fin_archivo else len(buffer) - _MARGEN_FRAGMENTO
+        consumido = 0
+        for mo in patron_tokens.finditer(buffer):
+            if mo.end() > limite:
+                break
+            kind = mo.lastgroup
+            valor = mo[kind]
+            tipo = _clasificar_ident(valor) if kind == 'IDENT' else tipos[kind]
+            yield Token(tipo, valor, base + mo.start(kind))
+            consumido = mo.end()
+        if consumido:
+            buffer = buffer[consumido:]
+            base += consumido
+
+
+class FlujoTokens:
+    """
+    Ventana deslizante sobre un iterador de Token con acceso por índice absoluto.
+
+    Los tokens se leen del iterador solo cuando se piden y los ya consumidos se
+    descartan con liberar(), de modo que nunca se retiene la lista completa.
+    """
+    # Cantidad mínima de tokens consumidos antes de compactar la ventana
+    _UMBRAL_LIBERAR = 1024
+
+    def __init__(self, tokens):
+        self._fuente = iter(tokens)
+        self._base = 0
+        self._tipos = []
+        self._valores = []
+        self._agotado = False
+        self.tipos = _VistaFlujo(self, self._tipos)
+        self.valores = _VistaFlujo(self, self._valores)
+
+    def hay(self, i):
+        """Indica si existe el token i, leyendo del iterador si hace falta"""
+        while i - self._base >= len(self._tipos):
+            if self._agotado:
+                return False
+            token = next(self._fuente, None)
+            if token is None:
+                self._agotado = True
+                return False
+            self._tipos.append(token['tipo'])
+            self._valores.append(token['valor'])
+        return True
+
+    def liberar(self, hasta):
+        """Descarta los tokens con índice menor que 'hasta'"""
+        descartar = hasta - self._base
+        if descartar >= self._UMBRAL_LIBERAR:
+            del self._tipos[:descartar]
+            del self._valores[:descartar]
+            self._base = hasta
+
+
+class _VistaFlujo:
+    __slots__ = ('_flujo', '_datos')
+
+    def __init__(self, flujo, datos):
+        self._flujo = flujo
+        self._datos = datos
+
+    def __getitem__(self, i):
+        flujo = self._flujo
+        if not flujo.hay(i):
+            raise IndexError(i)
+        return self._datos[i - flujo._base]
+
+
+def tokenizar_dicts(texto):
+    """Adaptador con el formato anterior: lista de {'tipo': ..., 'valor': ...}."""
+    lista = tokenizar(texto)
+    return [{'tipo': tipo.value, 'valor': valor} for tipo, valor in zip(lista.tipos, lista.valores)]
@@ -0,0 +1,121 @@
+# recorrido.py
+#
+# Recorridos del AST con una pila explícita en lugar de la pila de Python.
+# Un recorrido recursivo sobre nodo.hijos falla con RecursionError pasados
+# unos mil niveles de Si/Para/Mientras anidados (sys.getrecursionlimit());
+# con estos la profundidad sólo está limitada por la memoria.
+
+# Retornado por el visitante 'pre' de recorrer(): no bajar a los hijos
+PODAR = object()
+
+# Retornado por 'previo' en plegar(): el valor del subárbol no se conoce.
+# Los caches lo usan también como valor por defecto de get()
+SIN_VALOR = object()
+
+_FIN = object()
+
+
+def _hijos(nodo):
+    return nodo.hijos
+
+
+def preorden(raiz, podar=None):
+    """
+    Nodos del subárbol de 'raiz' en preorden: cada nodo antes que sus hijos
+    y los hermanos en orden. Si podar(nodo) es verdadero no se baja a los
+    hijos de ese nodo (el nodo sí se produce).
+    """
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        yield nodo
+        if podar is None or not podar(nodo):
+            pendientes.extend(reversed(nodo.hijos))
+
+
+def recorrer(raiz, pre=None, post=None, estado=None):
+    """
+    Recorrido en profundidad con visitantes, en el orden de uno recursivo.
+
+    pre(nodo, estado) se llama al entrar a cada nodo y retorna el estado que
+    reciben sus hijos (el de la ruta desde la raíz: nivel, condiciones...),
+    o PODAR para no bajar a ellos. Sin 'pre' los hijos heredan el estado.
+    post(nodo, estado) se llama al salir, después de todos sus hijos, con el
+    mismo estado que recibió 'pre'.
+    """
+    pendientes = [(raiz, estado, False)]
+    while pendientes:
+        nodo, estado, saliendo = pendientes.pop()
+        if saliendo:
+            post(nodo, estado)
+            continue
+        estado_hijos = pre(nodo, estado) if pre is not None else estado
+        if post is not None:
+            pendientes.append((nodo, estado, True))
+        if estado_hijos is not PODAR:
+            pendientes.extend((hijo, estado_hijos, False) for hijo in reversed(nodo.hijos))
+
+
+class Fallo:
+    """Excepción al combinar un nodo, que sube por plegar() hasta un nodo que la tolere"""
+
+    __slots__ = ('excepcion',)
+
+    def __init__(self, excepcion):
+        self.excepcion = excepcion
+
+
+def plegar(raiz, combinar, hijos=None, previo=None, tolera_fallos=None):
+    """
+    Valor de 'raiz' calculado de las hojas hacia arriba, como
+
+        def valor(nodo):
+            return combinar(nodo, [valor(hijo) for hijo in hijos(nodo)])
+
+    pero sin recursión. 'hijos' elige qué hijos se combinan (por defecto
+    nodo.hijos). 'previo(nodo)' puede dar el valor de un subárbol sin
+    recorrerlo, por ejemplo desde un cache; retorna SIN_VALOR si no lo
+    conoce. Los nodos se combinan en postorden.
+
+    Si combinar lanza una excepción, ésta sube como en la versión recursiva:
+    los hermanos siguientes no se calculan y el padre no se combina, salvo
+    que tolera_fallos(padre) sea verdadero; entonces el padre recibe un
+    Fallo en lugar del valor de ese hijo. Si llega a la raíz, se relanza.
+    """
+    hijos = hijos or _hijos
+    raices = []
+    # Marcos: (nodo, iterador de sus hijos, valores de los hijos ya calculados, lista del padre)
+    marcos = []
+
+    def entrar(nodo, destino):
+        if previo is not None:
+            valor = previo(nodo)
+            if valor is not SIN_VALOR:
+                destino.append(valor)
+                return
+        marcos.append((nodo, iter(hijos(nodo)), [], destino))
+
+    entrar(raiz, raices)
+    while marcos:
+        nodo, pendientes, valores, destino = marcos[-1]
+        fallido = bool(valores) and isinstance(valores[-1], Fallo)
+        if not fallido or (tolera_fallos is not None and tolera_fallos(nodo)):
+            hijo = next(pendientes, _FIN)
+            if hijo is not _FIN:
+                entrar(hijo, valores)
+                continue
+            fallido = False
+        marcos.pop()
+        if fallido:
+            destino.append(valores[-1])
+            continue
+        try:
+            destino.append(combinar(nodo, valores))
+        except Exception as e:
+            destino.append(Fallo(e))
+
+    valor = raices[0]
+    if isinstance(valor, Fallo):
+        raise valor.excepcion
+    return valor
+
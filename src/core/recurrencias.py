@@ -0,0 +1,711 @@
+# recurrencias.py
+#
+# Extracción y resolución de recurrencias T(n) = Σ a_i·T(f_i(n)) + g(n) de
+# funciones con recursión directa. La forma de cada llamada recursiva se
+# obtiene de sus argumentos en el AST; g(n) es el trabajo no recursivo que
+# calcula el analizador. La solución depende sólo de la forma de la
+# recurrencia, así que se memoriza por forma entre análisis.
+
+import threading
+from collections import OrderedDict, Counter
+from fractions import Fraction
+
+from .perezoso import ModuloPerezoso
+from .instrumentacion import contar, fase
+from .recorrido import SIN_VALOR, plegar
+
+# sympify() de un texto arma la primera vez el espacio de nombres del
+# parser, que importa estos submódulos
+sympy = ModuloPerezoso('sympy', submodulos=('sympy.combinatorics', 'sympy.tensor.tensor'))
+
+# Tokens aritméticos que se traducen a SymPy; cualquier otro token que no sea
+# número ni identificador hace que la expresión no se pueda interpretar
+_OPERADORES = {'+': '+', '-': '-', '*': '*', '/': '/', 'div': '/', '^': '**', '(': '(', ')': ')'}
+_NO_ARITMETICOS = {'%', 'mod'}
+_PROPS_CON_TOKENS = ('args', 'expr', 'cond')
+
+# Caminos de ejecución distintos que se consideran antes de desistir
+_MAX_ALTERNATIVAS = 64
+
+_TAMANO_CACHE = 1024
+_soluciones = OrderedDict()
+_candado = threading.Lock()
+
+
+class Recurrencia:
+    """
+    T(n) = Σ a_i·T(f_i(n)) + g(n) reducida a su forma.
+
+    'terminos' es una tupla ordenada de (tipo, parametro, a): ('division', b, a)
+    representa a·T(n/b) y ('resta', k, a) representa a·T(n-k). 'trabajo' es
+    la ClaseAsintotica de g(n); 'coeficiente' el de su término dominante y
+    'constante' su parte constante, medidos en el tamaño (coeficiente None
+    si g(n) no se pudo expresar en él). Dos recurrencias con la misma forma
+    tienen la misma solución.
+    """
+
+    __slots__ = ('terminos', 'trabajo', 'coeficiente', 'constante')
+
+    def __init__(self, llamadas, trabajo, coeficiente=None, constante=0):
+        conteo = Counter(llamadas)
+        self.terminos = tuple(sorted((tipo, parametro, a) for (tipo, parametro), a in conteo.items()))
+        self.trabajo = trabajo
+        self.coeficiente = coeficiente
+        self.constante = constante
+
+    def forma(self):
+        trabajo = self.trabajo
+        return (self.terminos, trabajo.base, trabajo.grado, trabajo.potencia_log,
+                self.coeficiente, self.constante)
+
+    def __str__(self):
+        partes = []
+        for tipo, parametro, a in self.terminos:
+            coeficiente = '' if a == 1 else f"{a}·"
+            if tipo == 'division':
+                fraccion = 1 / parametro
+                argumento = (f"n/{parametro}" if parametro.denominator == 1
+                             else f"{fraccion.numerator}n/{fraccion.denominator}")
+            else:
+                argumento = f"n-{parametro}"
+            partes.append(f"{coeficiente}T({argumento})")
+        partes.append(self.trabajo.como_big_o())
+        return "T(n) = " + " + ".join(partes)
+
+    def __repr__(self):
+        return f"Recurrencia({self})"
+
+
+# --- resolución ---
+
+def resolver(recurrencia):
+    """
+    Solución (ExpresionSimbolica en N) de una recurrencia, o None si su forma
+    no tiene un método aplicable. Memorizada por forma.
+
+    Con el coeficiente y la constante de g(n) la solución conserva el
+    coeficiente principal y, donde la hay en forma cerrada, la solución
+    particular; el caso base cuesta la parte constante de g(n), que incluye
+    la rama del caso base. Sin ellos es sólo el representante asintótico.
+    """
+    forma = recurrencia.forma()
+    with _candado:
+        solucion = _soluciones.get(forma, SIN_VALOR)
+        if solucion is not SIN_VALOR:
+            _soluciones.move_to_end(forma)
+            contar('cache_recurrencias.aciertos')
+            return solucion
+    contar('cache_recurrencias.fallos')
+    with fase('recurrencias'):
+        solucion = _resolver(recurrencia)
+    with _candado:
+        _soluciones[forma] = solucion
+        while len(_soluciones) > _TAMANO_CACHE:
+            _soluciones.popitem(last=False)
+    return solucion
+
+
+def limpiar_cache():
+    with _candado:
+        _soluciones.clear()
+
+
+def _resolver(recurrencia):
+    from .expresion_simbolica import ExpresionSimbolica
+
+    trabajo = recurrencia.trabajo
+    if trabajo.base == float('inf'):
+        return None
+    divisiones = [(parametro, a) for tipo, parametro, a in recurrencia.terminos if tipo == 'division']
+    restas = [(parametro, a) for tipo, parametro, a in recurrencia.terminos if tipo == 'resta']
+    if divisiones and restas:
+        return None
+    coeficiente = recurrencia.coeficiente
+    if coeficiente is None:
+        constantes = None
+    else:
+        constantes = (_sympy_numero(coeficiente), _sympy_numero(recurrencia.constante))
+    if divisiones:
+        expr = _resolver_division(divisiones, trabajo, constantes)
+    else:
+        expr = _resolver_resta(restas, trabajo, constantes)
+    return ExpresionSimbolica(expr) if expr is not None else None
+
+
+def _sympy_numero(valor):
+    if isinstance(valor, Fraction):
+        return sympy.Rational(valor.numerator, valor.denominator)
+    if isinstance(valor, float):
+        return sympy.Integer(int(valor)) if valor.is_integer() else sympy.Float(valor)
+    return sympy.sympify(valor)
+
+
+def _numero_exacto(valor):
+    """int o Fraction de un racional de SymPy; los demás números quedan como están"""
+    if valor.is_Rational:
+        return int(valor) if valor.is_Integer else Fraction(int(valor.p), int(valor.q))
+    return valor
+
+
+def _representante(base, grado, potencia_log):
+    """base^N · N^grado · log2(N)^potencia_log"""
+    n = sympy.Symbol('N')
+    expr = n ** _sympy_numero(grado) * sympy.log(n, 2) ** _sympy_numero(potencia_log)
+    if base != 1:
+        expr = _sympy_numero(base) ** n * expr
+    return expr
+
+
+def _exponente_critico(divisiones):
+    """p tal que Σ a_i / b_i^p = 1 (exacto si todas las divisiones son iguales)"""
+    bases = {b for b, _ in divisiones}
+    if len(bases) == 1:
+        a = sum(a for _, a in divisiones)
+        return sympy.log(_sympy_numero(a), _sympy_numero(bases.pop()))
+
+    def exceso(p):
+        return sum(a / float(b) ** p for b, a in divisiones) - 1
+
+    # exceso(0) = Σ a_i - 1 >= 0 y decrece con p
+    bajo, alto = 0.0, 1.0
+    while exceso(alto) > 0:
+        alto *= 2
+    for _ in range(100):
+        medio = (bajo + alto) / 2
+        if exceso(medio) > 0:
+            bajo = medio
+        else:
+            alto = medio
+    aproximado = Fraction(bajo).limit_denominator(1000)
+    if abs(exceso(float(aproximado))) < 1e-12:
+        return _sympy_numero(aproximado)
+    return sympy.Float(bajo)
+
+
+def _resolver_division(divisiones, trabajo, constantes):
+    """
+    Akra–Bazzi (el teorema maestro cuando todas las divisiones son iguales).
+    'constantes' es (c, t0): g(n) ~ c·n^d·log^q(n) y el costo del caso base.
+    """
+    grado, potencia_log = trabajo.grado, trabajo.potencia_log
+    if trabajo.base > 1:
+        representante = _representante(trabajo.base, grado, potencia_log)
+        return representante if constantes is None else constantes[0] * representante
+    p = _exponente_critico(divisiones)
+    diferencia = float(p) - float(grado)
+    if constantes is None:
+        if abs(diferencia) < 1e-9:
+            return _representante(1, grado, potencia_log + 1)
+        if diferencia > 0:
+            return _representante(1, p, 0)
+        return _representante(1, grado, potencia_log)
+
+    c, t0 = constantes
+    n = sympy.Symbol('N')
+    grado = _sympy_numero(grado)
+    if abs(diferencia) < 1e-9:
+        # g(n) = Θ(n^p log^q n)  →  T(n) = n^p (c·ln^(q+1)(n) / ((q+1)·Σ a_i b_i^-p ln b_i) + t0)
+        q = _sympy_numero(potencia_log) + 1
+        denominador = q * sum(_sympy_numero(a) * _sympy_numero(b) ** -grado * sympy.log(_sympy_numero(b))
+                              for b, a in divisiones)
+        return c * sympy.log(2) ** q / denominador * _representante(1, grado, q) + t0 * n ** grado
+    # Solución particular de T(n) = Σ a_i T(n/b_i) + c·n^d: c·n^d / (1 - Σ a_i b_i^-d)
+    particular = c / (1 - sum(_sympy_numero(a) * _sympy_numero(b) ** -grado for b, a in divisiones))
+    if diferencia > 0:
+        # Dominan las hojas: n^p con el coeficiente que deja T(1) = t0
+        if potencia_log:
+            # Sin solución particular en forma cerrada: el costo de las hojas
+            # acota por debajo, y sin él T(n) es sólo asintótico
+            return t0 * _representante(1, p, 0) if t0 > 0 else _representante(1, p, 0)
+        return (t0 - particular) * _representante(1, p, 0) + particular * n ** grado
+    # Domina el trabajo de la raíz
+    if potencia_log:
+        return particular * _representante(1, grado, potencia_log)
+    return particular * n ** grado + (t0 - particular) * n ** p
+
+
+def _peso_raiz(restas, raiz, iniciales):
+    """
+    κ tal que U(n) ~ κ·raiz^n para U(n) = Σ a_i U(n - k_i) con U(j) =
+    iniciales[j] en los K valores iniciales.
+
+    La función generatriz de U es Q(z)/R(z) con R(z) = 1 - Σ a_i z^k_i y Q
+    los términos de grado < K de R(z)·Σ_{j<K} U(j)·z^j. 'raiz' es la raíz
+    positiva de la ecuación característica, que es simple, así que ζ = 1/raiz
+    es un polo simple y κ = -raiz·Q(ζ)/R'(ζ).
+    """
+    z = sympy.Symbol('z')
+    mayor = len(iniciales)
+    r = 1 - sum(_sympy_numero(a) * z ** int(k) for k, a in restas)
+    producto = sympy.expand(r * sum(u * z ** j for j, u in enumerate(iniciales)))
+    q = sum(producto.coeff(z, j) * z ** j for j in range(mayor))
+    zeta = 1 / raiz
+    return sympy.expand(sympy.radsimp(-raiz * q.subs(z, zeta) / sympy.diff(r, z).subs(z, zeta)))
+
+
+def _particular_polinomica(restas, trabajo, grado):
+    """
+    Polinomio P de grado 'grado' con P(n) - Σ a_i·P(n - k_i) = trabajo(n),
+    por coeficientes indeterminados (1 no es raíz de la ecuación
+    característica, así que existe y es único); None si no se puede despejar
+    """
+    n = sympy.Symbol('N')
+    coeficientes = sympy.symbols(f'p0:{grado + 1}')
+    polinomio = sum(p * n ** m for m, p in enumerate(coeficientes))
+    ecuacion = sympy.expand(polinomio - sum(_sympy_numero(a) * polinomio.subs(n, n - int(k)) for k, a in restas)
+                            - trabajo)
+    solucion = sympy.solve(sympy.Poly(ecuacion, n).all_coeffs(), coeficientes, dict=True)
+    if not solucion:
+        return None
+    return polinomio.subs(solucion[0])
+
+
+def _resolver_resta(restas, trabajo, constantes):
+    """
+    Ecuación característica x^K = Σ a_i·x^(K-k_i) de la parte homogénea.
+    'constantes' es (c, t0): g(n) ~ c·n^d·log^q(n) y el costo del caso base.
+    """
+    if any(k.denominator != 1 for k, _ in restas):
+        return None
+    x = sympy.Symbol('x')
+    mayor = max(int(k) for k, _ in restas)
+    polinomio = x ** mayor - sum(a * x ** (mayor - int(k)) for k, a in restas)
+    raices = sympy.Poly(polinomio, x).real_roots()
+    raiz = max(raices)
+    multiplicidad = raices.count(raiz)
+    valor = float(raiz)
+    if isinstance(raiz, sympy.CRootOf):
+        raiz = sympy.Float(valor)
+
+    grado, potencia_log = trabajo.grado, trabajo.potencia_log
+    if trabajo.base > valor + 1e-9:
+        representante = _representante(trabajo.base, grado, potencia_log)
+    elif abs(trabajo.base - valor) < 1e-9:
+        # g(n) crece como la solución homogénea: cada raíz repetida suma un factor n
+        representante = _representante(raiz, grado + multiplicidad, potencia_log)
+        if constantes is not None and valor == 1:
+            # T(n) = T(n-k) + g(n): t0 más la suma de g sobre n/k niveles
+            c, t0 = constantes
+            k = _sympy_numero(restas[0][0])
+            return c / (k * (_sympy_numero(grado) + 1)) * representante + t0
+    else:
+        representante = _representante(raiz, multiplicidad - 1, 0)
+        grado_entero = _sympy_numero(grado)
+        if constantes is not None and trabajo.base == 1 and not potencia_log and grado_entero.is_Integer:
+            # Dominan las hojas: T(n) = U(n) + P(n), con P la solución
+            # particular para g(n) = c·n^d + t0 y U la homogénea que parte
+            # del caso base menos P, U(n) ~ κ·raiz^n
+            c, t0 = constantes
+            n = sympy.Symbol('N')
+            trabajo_n = c * n ** grado_entero + t0 if grado_entero else c
+            particular = _particular_polinomica(restas, trabajo_n, int(grado_entero))
+            if particular is not None:
+                iniciales = [t0 - particular.subs(n, j) for j in range(mayor)]
+                peso = _peso_raiz(restas, raiz, iniciales)
+                if peso.is_positive:
+                    return sympy.expand(peso * representante + particular)
+        # Sin solución particular en forma cerrada: T(n) es sólo asintótico
+        return representante
+    if constantes is None:
+        return representante
+    return constantes[0] * representante
+
+
+# --- extracción ---
+
+def expresion_desde_tokens(tokens, entorno):
+    """
+    Expresión SymPy de una lista de tokens aritméticos, o None si contiene
+    algo que no lo sea. Cada identificador se reemplaza por entorno(nombre).
+    """
+    partes = []
+    locales = {}
+    marcadores = {}
+    for token in tokens:
+        if token in _OPERADORES:
+            partes.append(_OPERADORES[token])
+        elif token in _NO_ARITMETICOS:
+            return None
+        elif _es_numero(token):
+            partes.append(token)
+        elif token.isidentifier():
+            marcador = marcadores.get(token)
+            if marcador is None:
+                marcador = marcadores[token] = f"_v{len(marcadores)}"
+                locales[marcador] = entorno(token)
+            partes.append(marcador)
+        else:
+            return None
+    if not partes:
+        return None
+    try:
+        return sympy.sympify(' '.join(partes), locals=locales)
+    except Exception:
+        return None
+
+
+def _es_numero(token):
+    try:
+        float(token)
+    except ValueError:
+        return False
+    return True
+
+
+def _argumentos_en_tokens(tokens, nombre):
+    """Argumentos (listas de tokens) de cada llamada 'nombre(...)' en una expresión"""
+    llamadas = []
+    for i in range(len(tokens) - 1):
+        if tokens[i] != nombre or tokens[i + 1] != '(':
+            continue
+        argumentos, actual, nivel = [], [], 0
+        for token in tokens[i + 2:]:
+            if token == '(':
+                nivel += 1
+            elif token == ')':
+                if nivel == 0:
+                    break
+                nivel -= 1
+            elif token == ',' and nivel == 0:
+                argumentos.append(tuple(actual))
+                actual = []
+                continue
+            actual.append(token)
+        if actual:
+            argumentos.append(tuple(actual))
+        llamadas.append(tuple(argumentos))
+    return llamadas
+
+
+class _Extractor:
+    """Recorre el cuerpo de una función y arma sus recurrencias por camino de ejecución"""
+
+    def __init__(self, nodo_funcion, nombre, parametros):
+        self.nodo_funcion = nodo_funcion
+        self.nombre = nombre
+        self.parametros = list(parametros)
+        self.tamano = sympy.Dummy('S')
+        self.simbolos = {p: sympy.Symbol(p) for p in self.parametros}
+        self.asignaciones = {}      # variable -> lista de tokens de cada asignación
+        self.con_recursion = set()  # nodos cuyo subárbol contiene una llamada recursiva
+        self.condiciones = []       # condiciones de los Si de la función
+        self._valores = {}
+        self._recorrer(nodo_funcion)
+
+    def _recorrer(self, raiz):
+        pendientes = list(raiz.hijos)
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.tipo == 'FUNCION':
+                continue
+            if nodo.tipo == 'ASIGNACION':
+                self.asignaciones.setdefault(nodo.props.get('var'), []).append(nodo.props.get('expr') or [])
+            elif nodo.tipo == 'SI':
+                self.condiciones.append(nodo.props.get('cond') or [])
+            if self._llamadas_propias(nodo):
+                actual = nodo
+                while actual is not None and actual is not raiz and actual not in self.con_recursion:
+                    self.con_recursion.add(actual)
+                    actual = actual.padre
+            pendientes.extend(nodo.hijos)
+
+    def _llamadas_propias(self, nodo):
+        """Llamadas recursivas del propio nodo (no de sus hijos), como tuplas de argumentos"""
+        props = nodo.props
+        llamadas = []
+        if nodo.tipo == 'LLAMADA_FUNCION' and props.get('nombre') == self.nombre:
+            argumentos = props.get('expr_args') or props.get('args') or []
+            llamadas.append(tuple(tuple(argumento) for argumento in argumentos))
+        for clave in _PROPS_CON_TOKENS:
+            tokens = props.get(clave)
+            if tokens and nodo.tipo != 'LLAMADA_FUNCION':
+                llamadas.extend(_argumentos_en_tokens(tokens, self.nombre))
+        return llamadas
+
+    # --- valores de las variables ---
+
+    def _valor(self, nombre, visitando=()):
+        """Parámetro: su símbolo. Variable asignada una vez: su expresión. Otra: desconocida"""
+        if nombre in self._valores:
+            return self._valores[nombre]
+        asignaciones = self.asignaciones.get(nombre, [])
+        if nombre in self.simbolos:
+            valor = self.simbolos[nombre] if not asignaciones else sympy.Dummy(nombre)
+        elif len(asignaciones) == 1 and nombre not in visitando:
+            valor = expresion_desde_tokens(
+                asignaciones[0], lambda variable: self._valor(variable, visitando + (nombre,)))
+            if valor is None:
+                valor = sympy.Dummy(nombre)
+        else:
+            valor = sympy.Dummy(nombre)
+        self._valores[nombre] = valor
+        return valor
+
+    def _expresion(self, tokens):
+        return expresion_desde_tokens(tokens, self._valor)
+
+    # --- caminos de ejecución ---
+
+    def _alternativas(self, raiz):
+        """
+        Conjunto de multiconjuntos (tuplas ordenadas) de llamadas de cada
+        camino por el cuerpo de 'raiz'. Se pliega de las hojas hacia arriba
+        bajando sólo por los nodos con llamadas recursivas: el valor de los
+        demás es {()} y el de un ciclo o una función anidada no se usa.
+        """
+        def hijos(nodo):
+            if nodo is not raiz and (nodo not in self.con_recursion
+                                     or nodo.tipo in ('FUNCION', 'PARA', 'MIENTRAS')):
+                return ()
+            return nodo.hijos
+
+        def combinar(nodo, valores):
+            return self._secuencia(nodo.hijos, valores) if valores else {()}
+
+        return plegar(raiz, combinar, hijos=hijos)
+
+    def _secuencia(self, nodos, valores):
+        """Alternativas de un bloque, dadas las de cada uno de sus nodos ('valores')"""
+        alternativas = {()}
+        i = 0
+        while i < len(nodos):
+            nodo, ramas = nodos[i], valores[i]
+            i += 1
+            # El Sino es el nodo hermano que sigue a su Si
+            sino = nodos[i] if nodo.tipo == 'SI' and i < len(nodos) and nodos[i].tipo == 'SINO' else None
+            if sino is not None:
+                otras = valores[i]
+                i += 1
+            if nodo.tipo == 'FUNCION':
+                continue
+            if nodo not in self.con_recursion and sino not in self.con_recursion:
+                continue
+            propias = tuple(self._llamadas_propias(nodo))
+            if nodo.tipo in ('PARA', 'MIENTRAS'):
+                # El número de llamadas dependería de las iteraciones
+                return None
+            if nodo.tipo == 'SI':
+                if sino is None:
+                    otras = {()}
+                if ramas is None or otras is None:
+                    return None
+                ramas = ramas | otras
+            elif ramas is None:
+                return None
+            alternativas = {
+                tuple(sorted(previa + propias + rama)) for previa in alternativas for rama in ramas
+            }
+            if len(alternativas) > _MAX_ALTERNATIVAS:
+                return None
+        return alternativas
+
+    # --- forma de cada llamada ---
+
+    def _modelos(self):
+        """Medidas del tamaño: un parámetro, o la diferencia entre dos (un rango)"""
+        cantidad = len(self.parametros)
+        for i in range(cantidad):
+            yield ('parametro', i)
+        for i in range(cantidad):
+            for j in range(cantidad):
+                if i != j:
+                    yield ('rango', i, j)
+
+    def _tamano_llamada(self, argumentos, modelo):
+        """Tamaño del subproblema como expresión en S (puede contener incógnitas)"""
+        if len(argumentos) != len(self.parametros):
+            return None
+        tamano = self.tamano
+        if modelo[0] == 'parametro':
+            nuevo = self._expresion(argumentos[modelo[1]])
+            if nuevo is None:
+                return None
+            nuevo = nuevo.subs(self.simbolos[self.parametros[modelo[1]]], tamano)
+        else:
+            _, inferior, superior = modelo
+            desde = self._expresion(argumentos[inferior])
+            hasta = self._expresion(argumentos[superior])
+            if desde is None or hasta is None:
+                return None
+            simbolo_inferior = self.simbolos[self.parametros[inferior]]
+            simbolo_superior = self.simbolos[self.parametros[superior]]
+            nuevo = (hasta - desde).subs(simbolo_superior, simbolo_inferior + tamano)
+        nuevo = sympy.expand(nuevo)
+        if nuevo.atoms(sympy.Dummy) == {tamano} and nuevo.free_symbols != {tamano}:
+            # Depende de otros parámetros: esta medida no describe la llamada
+            return None
+        return nuevo
+
+    def _lineal(self, expr):
+        """(c, r) si expr = c·S + r con c y r racionales"""
+        coeficiente = expr.coeff(self.tamano)
+        resto = sympy.expand(expr - coeficiente * self.tamano)
+        if coeficiente.free_symbols or resto.free_symbols:
+            return None
+        if not (coeficiente.is_Rational and resto.is_Rational):
+            return None
+        return Fraction(str(coeficiente)), Fraction(str(resto))
+
+    def _reduccion(self, tamano):
+        """('resta', k) para S - k, ('division', b) para S/b + r; None si no reduce"""
+        lineal = self._lineal(tamano)
+        if lineal is None:
+            return None
+        coeficiente, resto = lineal
+        if coeficiente == 1 and resto < 0:
+            return ('resta', -resto)
+        if 0 < coeficiente < 1:
+            return ('division', 1 / coeficiente)
+        return None
+
+    def _formas(self, alternativa, modelo):
+        formas = []
+        particion = []
+        for argumentos in alternativa:
+            tamano = self._tamano_llamada(argumentos, modelo)
+            if tamano is None:
+                return None
+            if tamano.atoms(sympy.Dummy) - {self.tamano}:
+                particion.append(tamano)
+                continue
+            forma = self._reduccion(tamano)
+            if forma is None:
+                return None
+            formas.append(forma)
+        if particion:
+            # Subproblemas con un punto de corte desconocido (medio, pivote...):
+            # si juntos no superan el tamaño original se toma la partición
+            # equilibrada, el caso promedio
+            if len(particion) < 2:
+                return None
+            total = sympy.expand(sum(particion))
+            if total.free_symbols - {self.tamano}:
+                return None
+            lineal = self._lineal(total)
+            if lineal is None:
+                return None
+            coeficiente, resto = lineal
+            if coeficiente > 1 or (coeficiente == 1 and resto > 0):
+                return None
+            formas.extend([('division', Fraction(len(particion)))] * len(particion))
+        return formas
+
+    def _divisor_paridad(self, modelo):
+        """b si alguna condición prueba 'p % b' sobre el parámetro que mide el tamaño"""
+        if modelo[0] != 'parametro':
+            return None
+        parametro = self.parametros[modelo[1]]
+        for cond in self.condiciones:
+            for i in range(len(cond) - 2):
+                if cond[i] == parametro and cond[i + 1] in _NO_ARITMETICOS and cond[i + 2].isdigit():
+                    return Fraction(int(cond[i + 2]))
+        return None
+
+    def _trabajo_en_tamano(self, trabajo, clase, modelo):
+        """
+        (c, t0) de g(n) expresado en el tamaño S según 'modelo': el
+        coeficiente de su término dominante (que debe ser de la clase
+        'clase') y su parte constante. (None, 0) si g(n) depende de algo más
+        que S, como una variable que no se puede sustituir.
+        """
+        from .clasificacion_asintotica import clasificar
+
+        expr = trabajo.expr
+        reemplazos = {}
+        for simbolo in expr.free_symbols:
+            nombre = simbolo.name
+            if nombre in self.simbolos or nombre in self.asignaciones:
+                reemplazos[simbolo] = self._valor(nombre)
+            elif nombre == 'N':
+                # Tamaño genérico del costo de otras funciones llamadas
+                reemplazos[simbolo] = self.tamano
+        expr = expr.xreplace(reemplazos)
+        if modelo[0] == 'parametro':
+            expr = expr.xreplace({self.simbolos[self.parametros[modelo[1]]]: self.tamano})
+        else:
+            _, inferior, superior = modelo
+            simbolo_inferior = self.simbolos[self.parametros[inferior]]
+            expr = expr.xreplace({self.simbolos[self.parametros[superior]]: simbolo_inferior + self.tamano})
+
+        terminos = sympy.Add.make_args(sympy.expand(expr))
+        if any(termino.free_symbols - {self.tamano} for termino in terminos):
+            return None, 0
+        constante = sum((termino for termino in terminos if not termino.free_symbols), sympy.Integer(0))
+        clases = [(termino, clasificar(termino)) for termino in terminos if termino.free_symbols]
+        if not clases:
+            # g(n) constante: es a la vez el término dominante y el caso base
+            if not clase.es_constante() or not constante > 0:
+                return None, 0
+            return _numero_exacto(constante), _numero_exacto(constante)
+        mayor = max(clase_termino.clave() for _, clase_termino in clases)
+        if mayor != clase.clave():
+            return None, 0
+        dominante = sum(termino for termino, clase_termino in clases if clase_termino.clave() == mayor)
+        representante = _representante(1, clase.grado, clase.potencia_log).subs(sympy.Symbol('N'), self.tamano)
+        if clase.base != 1:
+            # La base exacta de g(n) ((1/2 + sqrt(5)/2)^S), no la aproximada de la clase
+            exponenciales = [potencia for potencia in dominante.atoms(sympy.Pow)
+                             if potencia.exp == self.tamano and potencia.base.is_number
+                             and abs(float(potencia.base) - clase.base) < 1e-9]
+            base = exponenciales[0] if exponenciales else _sympy_numero(clase.base) ** self.tamano
+            representante = base * representante
+        # Casi siempre el cociente se cancela término a término o al juntar
+        # las potencias de S (2^S·φ^S/(1 + sqrt(5))^S); simplify sólo si no
+        coeficiente = sympy.expand(dominante / representante)
+        if coeficiente.free_symbols:
+            coeficiente = sympy.expand(sympy.powsimp(coeficiente, combine='base', force=True))
+        if coeficiente.free_symbols:
+            coeficiente = sympy.simplify(coeficiente)
+        if coeficiente.free_symbols or not coeficiente.is_positive:
+            return None, 0
+        return _numero_exacto(coeficiente), _numero_exacto(constante) if constante > 0 else 0
+
+    def extraer(self, trabajo):
+        clase = trabajo.clase_asintotica()
+        alternativas = self._alternativas(self.nodo_funcion)
+        if not alternativas:
+            return None
+        alternativas = [alternativa for alternativa in alternativas if alternativa]
+        if not alternativas:
+            return None
+
+        for modelo in self._modelos():
+            formas = []
+            for alternativa in alternativas:
+                forma = self._formas(alternativa, modelo)
+                if forma is None:
+                    break
+                formas.append(forma)
+            else:
+                formas = self._combinar_paridad(formas, modelo)
+                coeficiente, constante = self._trabajo_en_tamano(trabajo, clase, modelo)
+                return [Recurrencia(forma, clase, coeficiente, constante) for forma in formas]
+        return None
+
+    def _combinar_paridad(self, formas, modelo):
+        """
+        Con 'Si p % b = 0' una rama divide por b y la otra resta menos que b:
+        la resta deja un múltiplo de b, así que la sigue una división y el
+        camino completo es T(n/b) más trabajo constante.
+        """
+        divisor = self._divisor_paridad(modelo)
+        if divisor is None:
+            return formas
+        divisiones = [forma for forma in formas
+                      if all(tipo == 'division' and parametro == divisor for tipo, parametro in forma)]
+        if not divisiones:
+            return formas
+        peor = max(divisiones, key=len)
+        return [peor if len(forma) == 1 and forma[0][0] == 'resta' and forma[0][1] < divisor else forma
+                for forma in formas]
+
+
+def extraer_recurrencias(nodo_funcion, nombre, parametros, trabajo):
+    """
+    Recurrencias de una función con recursión directa, una por cada camino
+    de ejecución distinto que hace llamadas recursivas, o None si alguna
+    llamada no se puede expresar como T(n/b) o T(n-k) del mismo tamaño.
+
+    'trabajo' es la ExpresionSimbolica del trabajo no recursivo g(n).
+    """
+    return _Extractor(nodo_funcion, nombre, parametros).extraer(trabajo)
@@ -0,0 +1,294 @@
+# servidor_analisis.py
+
+import os
+import json
+import stat
+import socket
+import time
+import inspect
+import threading
+import socketserver
+from contextlib import nullcontext
+
+from .analisis_lote import (
+    analizar_codigo, analizar_lote, calentar, resultado_como_dict, PoolAnalisis,
+)
+from .pseudogrammar import tokenizar
+from .parser_estructural import parsear
+from .analizador_complejidad import AnalizadorComplejidad
+from .instrumentacion import instrumentar
+
+# Códigos de error de JSON-RPC 2.0
+ERROR_JSON = -32700
+ERROR_PETICION = -32600
+ERROR_METODO = -32601
+ERROR_PARAMETROS = -32602
+ERROR_ANALISIS = -32000
+
+
+class SocketOcupado(Exception):
+    """La ruta del socket Unix la usa un servidor activo u otro archivo"""
+
+
+class ClienteDesconectado(Exception):
+    """El cliente cerró la conexión: no tiene sentido seguir escribiéndole"""
+
+
+class ErrorRPC(Exception):
+    def __init__(self, codigo, mensaje):
+        super().__init__(mensaje)
+        self.codigo = codigo
+        self.mensaje = mensaje
+
+
+def _clase_como_dict(resultado):
+    clase = resultado.funcion_tiempo.clase_asintotica()
+    return {'base': clase.base, 'grados': clase.grados, 'potencia_log': clase.potencia_log}
+
+
+class ServidorAnalisis:
+    """
+    Servidor de análisis de larga duración (JSON-RPC 2.0, una petición por línea).
+
+    Mantiene SymPy, el tokenizador, el parser y el analizador cargados y
+    calientes, así que cada petición sólo paga el análisis en sí. Escucha en
+    un socket Unix o en un puerto TCP de localhost.
+
+    Métodos:
+      • ping()                                  -> {'pid', 'peticiones', 'segundos_activo'}
+      • analizar(codigo, funcion=None, todas=False, instrumentacion=False)
+                                                -> con instrumentacion, tiempos por fase y contadores
+      • lote(rutas, workers=1, tiempo_limite=30) -> un aviso 'resultado' por archivo
+      • comparar(codigo_a, codigo_b)
+      • detener()
+    """
+
+    def __init__(self, socket=None, puerto=None, host='127.0.0.1'):
+        if socket is None and puerto is None:
+            raise ValueError("Se necesita un socket Unix o un puerto TCP")
+        self.socket = socket
+        self.puerto = puerto
+        self.host = host
+        self.peticiones = 0
+        self.inicio = time.monotonic()
+        self._servidor = None
+        self._pool = None
+        self._detener = False
+        # El análisis es CPU puro: se atiende de a una petición para no
+        # competir por el GIL ni compartir caches de SymPy entre hilos
+        self._candado = threading.Lock()
+        self._metodos = {
+            'ping': self.ping,
+            'analizar': self.analizar,
+            'lote': self.lote,
+            'comparar': self.comparar,
+            'detener': self.detener,
+        }
+
+    # --- métodos RPC ---
+
+    def ping(self):
+        return {
+            'pid': os.getpid(),
+            'peticiones': self.peticiones,
+            'segundos_activo': time.monotonic() - self.inicio,
+        }
+
+    def analizar(self, codigo, funcion=None, todas=False, instrumentacion=False):
+        if not isinstance(codigo, str):
+            raise ErrorRPC(ERROR_PARAMETROS, "'codigo' debe ser un texto")
+        inicio = time.perf_counter()
+        with (instrumentar() if instrumentacion else nullcontext()) as medicion:
+            if todas:
+                analizador = AnalizadorComplejidad(parsear(tokenizar(codigo)))
+                funciones = {nombre: resultado_como_dict(resultado)
+                             for nombre, resultado in analizador.analizar_todas().items()}
+                respuesta = {'funciones': funciones}
+            else:
+                try:
+                    resultado = analizar_codigo(codigo, funcion)
+                except ValueError as e:
+                    raise ErrorRPC(ERROR_PARAMETROS, str(e))
+                respuesta = resultado_como_dict(resultado)
+        respuesta['segundos'] = time.perf_counter() - inicio
+        if medicion is not None:
+            respuesta['instrumentacion'] = medicion.como_dict()
+        return respuesta
+
+    def lote(self, rutas, workers=1, tiempo_limite=30.0, avisar=None):
+        """Analiza archivos del disco del servidor; cada resultado se envía con 'avisar'"""
+        if not isinstance(rutas, list):
+            raise ErrorRPC(ERROR_PARAMETROS, "'rutas' debe ser una lista")
+        if workers and workers > 1:
+            if self._pool is None or self._pool.workers != workers:
+                if self._pool is not None:
+                    self._pool.cerrar()
+                self._pool = PoolAnalisis(workers, tiempo_limite)
+            self._pool.tiempo_limite = tiempo_limite
+            registros = self._pool.analizar(rutas)
+        else:
+            registros = analizar_lote(rutas, workers=1, tiempo_limite=tiempo_limite)
+        total = errores = 0
+        try:
+            for registro in registros:
+                total += 1
+                errores += bool(registro['error'])
+                if avisar is not None:
+                    avisar(registro)
+        finally:
+            # Si 'avisar' falla (el cliente se desconectó) el lote se corta
+            # aquí: cerrar el generador cancela los archivos que faltan
+            registros.close()
+        return {'total': total, 'errores': errores}
+
+    def comparar(self, codigo_a, codigo_b):
+        resultado_a = analizar_codigo(codigo_a)
+        resultado_b = analizar_codigo(codigo_b)
+        clave_a = resultado_a.funcion_tiempo.clase_asintotica().clave()
+        clave_b = resultado_b.funcion_tiempo.clase_asintotica().clave()
+        if clave_a < clave_b:
+            mas_eficiente = 'a'
+        elif clave_b < clave_a:
+            mas_eficiente = 'b'
+        else:
+            mas_eficiente = 'igual'
+        a = resultado_como_dict(resultado_a)
+        b = resultado_como_dict(resultado_b)
+        a['clase'] = _clase_como_dict(resultado_a)
+        b['clase'] = _clase_como_dict(resultado_b)
+        return {'a': a, 'b': b, 'mas_eficiente': mas_eficiente}
+
+    def detener(self):
+        # El servidor se apaga después de enviar esta respuesta (ver atender)
+        self._detener = True
+        return {'detenido': True}
+
+    # --- protocolo ---
+
+    def atender(self, linea, escribir):
+        """
+        Procesa una línea de petición y escribe la respuesta (y avisos) con
+        'escribir'. Una notificación (petición sin 'id') se ejecuta pero no
+        recibe respuesta. Si 'escribir' lanza ClienteDesconectado, se propaga.
+        """
+        try:
+            peticion = json.loads(linea)
+        except ValueError:
+            escribir({'jsonrpc': '2.0', 'id': None, 'error': {'code': ERROR_JSON, 'message': "JSON inválido"}})
+            return
+        identificador = peticion.get('id') if isinstance(peticion, dict) else None
+        notificacion = (isinstance(peticion, dict) and 'id' not in peticion
+                        and isinstance(peticion.get('method'), str))
+        try:
+            if not isinstance(peticion, dict) or not isinstance(peticion.get('method'), str):
+                raise ErrorRPC(ERROR_PETICION, "Petición inválida")
+            metodo = self._metodos.get(peticion['method'])
+            if metodo is None:
+                raise ErrorRPC(ERROR_METODO, f"Método desconocido: {peticion['method']}")
+            parametros = peticion.get('params') or {}
+            if not isinstance(parametros, dict):
+                raise ErrorRPC(ERROR_PARAMETROS, "'params' debe ser un objeto")
+            try:
+                inspect.signature(metodo).bind(**parametros)
+            except TypeError as e:
+                raise ErrorRPC(ERROR_PARAMETROS, str(e))
+            if metodo == self.lote and not notificacion:
+                parametros = dict(parametros, avisar=lambda registro: escribir({
+                    'jsonrpc': '2.0', 'method': 'resultado', 'params': {'id': identificador, 'registro': registro},
+                }))
+            with self._candado:
+                self.peticiones += 1
+                resultado = metodo(**parametros)
+            respuesta = {'jsonrpc': '2.0', 'id': identificador, 'result': resultado}
+        except ClienteDesconectado:
+            raise
+        except ErrorRPC as e:
+            respuesta = {'jsonrpc': '2.0', 'id': identificador, 'error': {'code': e.codigo, 'message': e.mensaje}}
+        except Exception as e:
+            respuesta = {'jsonrpc': '2.0', 'id': identificador,
+                         'error': {'code': ERROR_ANALISIS, 'message': f"{type(e).__name__}: {e}"}}
+        try:
+            if not notificacion:
+                escribir(respuesta)
+        finally:
+            if self._detener:
+                # shutdown() espera al bucle principal: se llama desde otro hilo
+                threading.Thread(target=self._servidor.shutdown, daemon=True).start()
+
+    def _crear_manejador(self):
+        servidor = self
+
+        class Manejador(socketserver.StreamRequestHandler):
+            def handle(self):
+                def escribir(mensaje):
+                    try:
+                        self.wfile.write(json.dumps(mensaje, ensure_ascii=False).encode('utf-8') + b'\n')
+                        self.wfile.flush()
+                    except (BrokenPipeError, ConnectionResetError) as e:
+                        raise ClienteDesconectado(str(e)) from e
+
+                try:
+                    for linea in self.rfile:
+                        if linea.strip():
+                            servidor.atender(linea.decode('utf-8'), escribir)
+                except (ClienteDesconectado, ConnectionResetError):
+                    pass
+
+        return Manejador
+
+    def calentar(self):
+        """Importa SymPy y ejercita el analizador antes de aceptar conexiones"""
+        calentar()
+
+    def _preparar_socket(self):
+        """
+        Crea el directorio del socket (modo 0700) si falta. Un socket que ya
+        existe sólo se borra si rechaza conexiones (quedó de un servidor que
+        terminó); un servidor activo o un archivo que no es socket son un error.
+        """
+        directorio = os.path.dirname(os.path.abspath(self.socket))
+        os.makedirs(directorio, mode=0o700, exist_ok=True)
+        try:
+            modo = os.lstat(self.socket).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(modo):
+            raise SocketOcupado(f"{self.socket} existe y no es un socket")
+        prueba = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            prueba.connect(self.socket)
+        except ConnectionRefusedError:
+            os.unlink(self.socket)
+            return
+        finally:
+            prueba.close()
+        raise SocketOcupado(f"Ya hay un servidor escuchando en {self.socket}")
+
+    def ejecutar(self):
+        """Escucha hasta recibir 'detener' (o Ctrl+C)"""
+        if self.socket is not None:
+            self._preparar_socket()
+        self.calentar()
+        if self.socket is not None:
+            clase = type('Servidor', (socketserver.ThreadingMixIn, socketserver.UnixStreamServer),
+                         {'daemon_threads': True})
+            self._servidor = clase(self.socket, self._crear_manejador())
+        else:
+            clase = type('Servidor', (socketserver.ThreadingMixIn, socketserver.TCPServer),
+                         {'daemon_threads': True, 'allow_reuse_address': True})
+            self._servidor = clase((self.host, self.puerto), self._crear_manejador())
+        try:
+            self._servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._servidor.server_close()
+            if self._pool is not None:
+                self._pool.cerrar()
+            if self.socket is not None and os.path.exists(self.socket):
+                os.unlink(self.socket)
+
+    @property
+    def direccion(self):
+        return self.socket if self.socket is not None else f"{self.host}:{self.puerto}"
+
@@ -27,9 +27,7 @@ class AnalizadorApp:
     """Clase principal de la aplicación"""
     
     def __init__(self):
-        # Configurar matplotlib para usar backend compatible con tkinter
-        import matplotlib
-        matplotlib.use('TkAgg')
+        # matplotlib se importa (con backend TkAgg) al dibujar la primera gráfica
         
         # Crear ventana principal
         self.ventana = tb.Window(themename="flatly")
@@ -207,10 +205,15 @@ class AnalizadorApp:
     
     def _on_closing(self):
         """Maneja el evento de cierre de la aplicación"""
+        # Detener el hilo de análisis en segundo plano (si se llegó a crear)
+        ejecutor = getattr(self.ventana, 'ejecutor_analisis', None)
+        if ejecutor is not None:
+            ejecutor.cerrar()
+        
         try:
-            # Cerrar todas las figuras de matplotlib
-            import matplotlib.pyplot as plt
-            plt.close('all')
+            # Cerrar todas las figuras de matplotlib (si llegó a importarse)
+            if 'matplotlib.pyplot' in sys.modules:
+                sys.modules['matplotlib.pyplot'].close('all')
         except:
             pass
         
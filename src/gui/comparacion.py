@@ -1,12 +1,7 @@
 import ttkbootstrap as tb
 import tkinter.filedialog
 import tkinter.messagebox
-import matplotlib
-matplotlib.use('TkAgg')  # Configurar backend antes de importar pyplot
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import numpy as np
-import sympy
+import math
 import sys
 import os
 
@@ -15,13 +10,22 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.pseudogrammar import tokenizar
 from core.parser_estructural import parsear
+from core.recorrido import preorden
 from core.analizador_complejidad import AnalizadorComplejidad
 from core.serializacion import SerializadorAnalisis
+from core.expresion_simbolica import rango_evaluacion
+from gui.grafica import backend_tk
+from gui.superficie import SuperficieGrafica
+
+# Mayor tamaño de entrada de la comparación
+N_MAXIMO = 10 ** 6
 
 def crear_pestana_comparacion(frame):
     # Variables para almacenar los algoritmos a comparar
     algoritmo1 = None
     algoritmo2 = None
+    # Figura de la comparación (persistente, ver obtener_superficie)
+    superficie_comparacion = None
     serializador = SerializadorAnalisis()
     
     def cargar_codigo_nuevo():
@@ -198,14 +202,8 @@ def crear_pestana_comparacion(frame):
     
     def encontrar_funciones(nodo):
         """Encuentra todas las funciones definidas en el árbol"""
-        funciones = []
-        if nodo.tipo == 'FUNCION':
-            nombre = nodo.props.get('nombre')
-            if nombre:
-                funciones.append(nombre)
-        for hijo in nodo.hijos:
-            funciones.extend(encontrar_funciones(hijo))
-        return funciones
+        return [funcion.props.get('nombre') for funcion in preorden(nodo)
+                if funcion.tipo == 'FUNCION' and funcion.props.get('nombre')]
     
     def comparar_algoritmos():
         """Genera la comparación visual entre ambos algoritmos"""
@@ -213,95 +211,34 @@ def crear_pestana_comparacion(frame):
             tkinter.messagebox.showwarning("Advertencia", "Necesita cargar dos algoritmos para comparar")
             return
 
-        # Limpiar frame de gráfica
-        for widget in frame_grafica.winfo_children():
-            widget.destroy()
-
         try:
-            # Crear figura de matplotlib embebida
-            fig = Figure(figsize=(10, 6), dpi=100)
-            ax = fig.add_subplot(111)
-            fig.suptitle('Comparación de Algoritmos', fontsize=14)
+            superficie = obtener_superficie()
+            ax = superficie.figura.axes[0]
 
             # Configurar rango de valores
-            n_values = np.arange(1, 21)
+            n_values = rango_evaluacion(N_MAXIMO)
 
-            # Evaluar algoritmo 1
-            t1_values = []
-            expr1 = algoritmo1["resultado"].funcion_tiempo.expr
-            for n in n_values:
-                try:
-                    # Usar sympy para evaluación segura
-                    val = expr1.subs(sympy.Symbol('N'), n)
-                    # Asegurar que el resultado sea numérico
-                    if hasattr(val, 'evalf'):
-                        result = float(val.evalf())
-                    else:
-                        result = float(val)
-                    # Limitar valores muy grandes para visualización
-                    t1_values.append(min(result, 1e6))
-                except Exception as e:
-                    # Fallback basado en Big O
-                    big_o = algoritmo1["resultado"].big_o
-                    if "2^" in big_o or "2**" in big_o:
-                        t1_values.append(min(2**n, 1e6))
-                    elif "n**2" in big_o or "n^2" in big_o:
-                        t1_values.append(n**2)
-                    elif "n" in big_o.lower():
-                        t1_values.append(n)
-                    else:
-                        t1_values.append(1)
-
-            # Evaluar algoritmo 2
-            t2_values = []
-            expr2 = algoritmo2["resultado"].funcion_tiempo.expr
-            for n in n_values:
-                try:
-                    # Usar sympy para evaluación segura
-                    val = expr2.subs(sympy.Symbol('N'), n)
-                    # Asegurar que el resultado sea numérico
-                    if hasattr(val, 'evalf'):
-                        result = float(val.evalf())
-                    else:
-                        result = float(val)
-                    # Limitar valores muy grandes para visualización
-                    t2_values.append(min(result, 1e6))
-                except Exception as e:
-                    # Fallback basado en Big O
-                    big_o = algoritmo2["resultado"].big_o
-                    if "2^" in big_o or "2**" in big_o:
-                        t2_values.append(min(2**n, 1e6))
-                    elif "n**2" in big_o or "n^2" in big_o:
-                        t2_values.append(n**2)
-                    elif "n" in big_o.lower():
-                        t2_values.append(n)
-                    else:
-                        t2_values.append(1)
-            
-            # Graficar ambos algoritmos
-            ax.plot(n_values, t1_values, 'b-o', linewidth=2, markersize=6, 
-                   label=f'{algoritmo1["nombre"]}: {algoritmo1["resultado"].big_o}')
-            ax.plot(n_values, t2_values, 'r-s', linewidth=2, markersize=6, 
-                   label=f'{algoritmo2["nombre"]}: {algoritmo2["resultado"].big_o}')
+            # Evaluar ambos algoritmos sobre toda la grilla (evaluadores compilados)
+            funcion1 = algoritmo1["resultado"].funcion_tiempo
+            funcion2 = algoritmo2["resultado"].funcion_tiempo
+            t1_values, t1_en_log = funcion1.valores_grafica(n_values)
+            t2_values, t2_en_log = funcion2.valores_grafica(n_values)
+            en_log10 = t1_en_log or t2_en_log
+            if en_log10:
+                # Alguna curva desborda: ambas se muestran como log10 T(n)
+                t1_values = funcion1.evaluar_log(n_values) / math.log(10)
+                t2_values = funcion2.evaluar_log(n_values) / math.log(10)
             
-            ax.set_xlabel('Tamaño de entrada (n)')
-            ax.set_ylabel('Tiempo de ejecución')
-            ax.set_title('Comparación de Complejidad Temporal')
-            ax.grid(True, alpha=0.3)
-            ax.legend()
-            
-            fig.tight_layout()
-            
-            # Integrar con tkinter
-            canvas = FigureCanvasTkAgg(fig, frame_grafica)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
-            
-            # Agregar barra de herramientas de navegación
-            toolbar_frame = tb.Frame(frame_grafica)
-            toolbar_frame.pack(fill="x")
-            toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
-            toolbar.update()
+            # Actualizar ambas curvas sobre la figura existente
+            superficie.fijar_datos('algoritmo1', n_values, t1_values,
+                                   etiqueta=f'{algoritmo1["nombre"]}: {algoritmo1["resultado"].big_o}')
+            superficie.fijar_datos('algoritmo2', n_values, t2_values,
+                                   etiqueta=f'{algoritmo2["nombre"]}: {algoritmo2["resultado"].big_o}')
+            superficie.fijar_escalas(ax, 'log', 'linear' if en_log10 else 'symlog')
+            etiqueta_y = 'log₁₀ Tiempo de ejecución' if en_log10 else 'Tiempo de ejecución'
+            if ax.get_ylabel() != etiqueta_y:
+                ax.set_ylabel(etiqueta_y)
+            superficie.refrescar()
             
             # Actualizar análisis comparativo
             actualizar_analisis_comparativo()
@@ -309,6 +246,37 @@ def crear_pestana_comparacion(frame):
         except Exception as e:
             etiqueta_analisis.config(text=f"Error al generar comparación: {str(e)}")
     
+    def obtener_superficie():
+        """Figura de la comparación: se crea con la primera comparación y luego se reutiliza"""
+        nonlocal superficie_comparacion
+        if superficie_comparacion is not None:
+            return superficie_comparacion
+        
+        Figure, FigureCanvasTkAgg, NavigationToolbar2Tk = backend_tk()
+        
+        # Crear figura de matplotlib embebida
+        fig = Figure(figsize=(10, 6), dpi=100, layout='tight')
+        ax = fig.add_subplot(111)
+        fig.suptitle('Comparación de Algoritmos', fontsize=14)
+        ax.set_xlabel('Tamaño de entrada (n)')
+        ax.set_title('Comparación de Complejidad Temporal')
+        ax.grid(True, alpha=0.3)
+        
+        # Integrar con tkinter
+        canvas = FigureCanvasTkAgg(fig, frame_grafica)
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        
+        # Agregar barra de herramientas de navegación
+        toolbar_frame = tb.Frame(frame_grafica)
+        toolbar_frame.pack(fill="x")
+        toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
+        toolbar.update()
+        
+        superficie_comparacion = SuperficieGrafica(canvas)
+        superficie_comparacion.agregar_curva('algoritmo1', ax, 'b-', linewidth=2)
+        superficie_comparacion.agregar_curva('algoritmo2', ax, 'r--', linewidth=2)
+        return superficie_comparacion
+    
     def actualizar_analisis_comparativo():
         """Actualiza el texto del análisis comparativo"""
         if algoritmo1 is None or algoritmo2 is None:
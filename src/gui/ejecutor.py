@@ -0,0 +1,206 @@
+# ejecutor.py
+#
+# Ejecuta análisis y evaluaciones fuera del hilo de Tk. La interfaz nunca
+# espera: envía trabajos y recibe resultados y avisos de progreso por un
+# sondeo periódico con after(), siempre en el hilo principal.
+
+import queue
+import threading
+from collections import deque
+
+INTERVALO_SONDEO_MS = 50
+
+
+class TrabajoCancelado(Exception):
+    """El trabajo quedó obsoleto: se envió otro con la misma clave o se canceló"""
+
+
+class Trabajo:
+    """
+    Un trabajo enviado al EjecutorAnalisis.
+
+    La función del trabajo lo recibe como primer argumento y puede llamar a
+    progreso() o verificar() entre etapas: ambos lanzan TrabajoCancelado si
+    el trabajo ya no interesa, de modo que el hilo pasa al siguiente sin
+    terminar el cálculo. Lo que no se puede interrumpir (una llamada larga
+    de SymPy) simplemente se descarta al terminar.
+    """
+
+    def __init__(self, ejecutor, clave, funcion, args, al_terminar, al_fallar, al_progresar):
+        self.clave = clave
+        self.funcion = funcion
+        self.args = args
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.al_progresar = al_progresar
+        self._ejecutor = ejecutor
+        self._cancelado = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    def verificar(self):
+        if self._cancelado.is_set():
+            raise TrabajoCancelado()
+
+    def progreso(self, fraccion, mensaje=""):
+        """Informa el avance (0 a 1); se entrega en el hilo de Tk, sólo el último de cada sondeo"""
+        self.verificar()
+        self._ejecutor._mensajes.put((self, 'progreso', (fraccion, mensaje)))
+
+
+class EjecutorAnalisis:
+    """
+    Hilo trabajador único con una cola de trabajos por clave.
+
+        ejecutor.enviar('analisis', analizar, codigo, al_terminar=mostrar)
+
+    Enviar un trabajo con una clave ya usada cancela el anterior: si todavía
+    no empezó se reemplaza en la cola (sólo se ejecuta el más reciente) y si
+    está en curso su resultado se descarta. Los resultados, errores y avisos
+    de progreso se entregan en el hilo de Tk mediante after(), que sólo se
+    programa mientras haya trabajos pendientes.
+
+    Hay un único hilo porque el análisis es CPU puro (no ganaría nada con
+    varios por el GIL) y así SymPy y los caches nunca se usan en paralelo.
+    """
+
+    def __init__(self, widget, intervalo_ms=INTERVALO_SONDEO_MS):
+        self.widget = widget
+        self.intervalo_ms = intervalo_ms
+        self._mensajes = queue.SimpleQueue()
+        self._condicion = threading.Condition()
+        self._cola = deque()        # claves en orden de llegada
+        self._pendientes = {}       # clave -> trabajo más reciente aún no iniciado
+        self._vigentes = {}         # clave -> último trabajo enviado
+        self._en_curso = None
+        self._sondeo = None
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._bucle, name="ejecutor-analisis", daemon=True)
+        self._hilo.start()
+
+    # --- hilo de Tk ---
+
+    def enviar(self, clave, funcion, *args, al_terminar=None, al_fallar=None, al_progresar=None):
+        """Encola funcion(trabajo, *args) y cancela el trabajo anterior con la misma clave"""
+        trabajo = Trabajo(self, clave, funcion, args, al_terminar, al_fallar, al_progresar)
+        with self._condicion:
+            anterior = self._vigentes.get(clave)
+            if anterior is not None:
+                anterior.cancelar()
+            self._vigentes[clave] = trabajo
+            if clave not in self._pendientes:
+                self._cola.append(clave)
+            self._pendientes[clave] = trabajo
+            self._condicion.notify()
+        self._programar_sondeo()
+        return trabajo
+
+    def cancelar(self, clave=None):
+        """Cancela el trabajo vigente de 'clave' (o todos)"""
+        with self._condicion:
+            claves = list(self._vigentes) if clave is None else [clave]
+            for c in claves:
+                trabajo = self._vigentes.pop(c, None)
+                if trabajo is not None:
+                    trabajo.cancelar()
+                self._pendientes.pop(c, None)
+
+    def ocupado(self, clave=None):
+        with self._condicion:
+            if clave is None:
+                return bool(self._pendientes) or self._en_curso is not None
+            return clave in self._pendientes or (self._en_curso is not None and self._en_curso.clave == clave)
+
+    def cerrar(self):
+        """Cancela todo y detiene el hilo (sin esperar un cálculo en curso)"""
+        self.cancelar()
+        with self._condicion:
+            self._cerrado = True
+            self._condicion.notify()
+        if self._sondeo is not None:
+            try:
+                self.widget.after_cancel(self._sondeo)
+            except Exception:
+                pass
+            self._sondeo = None
+
+    def _programar_sondeo(self):
+        if self._sondeo is None and not self._cerrado:
+            self._sondeo = self.widget.after(self.intervalo_ms, self._sondear)
+
+    def _sondear(self):
+        """Entrega lo que terminó; de los avisos de progreso sólo el último de cada trabajo"""
+        self._sondeo = None
+        mensajes = []
+        while True:
+            try:
+                mensajes.append(self._mensajes.get_nowait())
+            except queue.Empty:
+                break
+
+        terminados = {id(trabajo) for trabajo, tipo, _ in mensajes if tipo != 'progreso'}
+        ultimo_progreso = {}
+        for indice, (trabajo, tipo, _) in enumerate(mensajes):
+            if tipo == 'progreso':
+                ultimo_progreso[id(trabajo)] = indice
+
+        for indice, (trabajo, tipo, valor) in enumerate(mensajes):
+            if trabajo.cancelado:
+                continue
+            if tipo == 'progreso':
+                if id(trabajo) in terminados or ultimo_progreso[id(trabajo)] != indice:
+                    continue
+                if trabajo.al_progresar is not None:
+                    trabajo.al_progresar(*valor)
+                continue
+            with self._condicion:
+                if self._vigentes.get(trabajo.clave) is trabajo:
+                    del self._vigentes[trabajo.clave]
+            if tipo == 'resultado':
+                if trabajo.al_terminar is not None:
+                    trabajo.al_terminar(valor)
+            elif trabajo.al_fallar is not None:
+                trabajo.al_fallar(valor)
+
+        if self.ocupado() or not self._mensajes.empty():
+            self._programar_sondeo()
+
+    # --- hilo trabajador ---
+
+    def _bucle(self):
+        while True:
+            with self._condicion:
+                while not self._cola and not self._cerrado:
+                    self._condicion.wait()
+                if self._cerrado:
+                    return
+                trabajo = self._pendientes.pop(self._cola.popleft(), None)
+                self._en_curso = trabajo
+            if trabajo is None or trabajo.cancelado:
+                with self._condicion:
+                    self._en_curso = None
+                continue
+            try:
+                valor = trabajo.funcion(trabajo, *trabajo.args)
+                self._mensajes.put((trabajo, 'resultado', valor))
+            except TrabajoCancelado:
+                pass
+            except Exception as e:
+                self._mensajes.put((trabajo, 'error', e))
+            finally:
+                with self._condicion:
+                    self._en_curso = None
+
+
+def ejecutor_compartido(widget):
+    """El EjecutorAnalisis de la ventana de 'widget' (se crea con el primer pedido)"""
+    ventana = widget.winfo_toplevel()
+    ejecutor = getattr(ventana, 'ejecutor_analisis', None)
+    if ejecutor is None:
+        ejecutor = ventana.ejecutor_analisis = EjecutorAnalisis(ventana)
+    return ejecutor
@@ -10,9 +10,9 @@ from tkinter import ttk
 # Agregar el directorio padre al path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.pseudogrammar import tokenizar
-from core.parser_estructural import parsear
-from core.analizador_complejidad import AnalizadorComplejidad
+from core.cache_resultados import CacheResultados
+from core.analisis_incremental import AnalizadorIncremental
+from gui.ejecutor import ejecutor_compartido
 from core.serializacion import SerializadorAnalisis
 
 class ScrollableFrame(tb.Frame):
@@ -70,6 +70,16 @@ def crear_pestana_entrada_mejorada(frame, cambiar_a_grafica_callback=None, cambi
     
     # Variable global para almacenar el último resultado del análisis
     ultimo_resultado = None
+    # Volver a analizar un código ya visto (o un ejemplo abierto de nuevo)
+    # se responde desde el cache de resultados en disco
+    cache = CacheResultados()
+    # Al editar sólo se reparsean y reanalizan las funciones que cambiaron
+    incremental = AnalizadorIncremental()
+    analisis_en_vivo = tk.BooleanVar(value=False)
+    analisis_programado = None
+    # Análisis fuera del hilo de Tk; texto del trabajo vigente (para descartarlo si se edita)
+    ejecutor = ejecutor_compartido(frame)
+    codigo_en_analisis = None
     serializador = SerializadorAnalisis()
     
     # --- FUNCIONES ---
@@ -109,107 +119,144 @@ def crear_pestana_entrada_mejorada(frame, cambiar_a_grafica_callback=None, cambi
         nonlocal ultimo_resultado
         ultimo_resultado = None
 
-    def analizar_codigo():
+    def tarea_analisis(trabajo, codigo):
+        """Se ejecuta en el hilo del ejecutor: nunca toca widgets"""
+        # Analizar la primera función: desde el cache si el código ya se
+        # analizó, o reanalizando sólo los bloques de función modificados
+        trabajo.progreso(0.1, "Consultando el cache de resultados")
+        encontrado = cache.obtener(codigo)
+        if encontrado is not None:
+            resultado, detalles = encontrado
+        else:
+            trabajo.progreso(0.3, "Tokenizando, parseando y analizando")
+            resultado, detalles = incremental.analizar_codigo(codigo)
+            trabajo.progreso(0.8, "Guardando en el cache")
+            cache.guardar(codigo, resultado, detalles)
+        # T(n) como texto puede requerir SymPy: se prepara aquí y no en la interfaz
+        trabajo.progreso(0.9, "Preparando el resultado")
+        resultado.funcion_tiempo.como_str()
+        return resultado, detalles
+
+    def analizar_codigo(en_vivo=False):
+        nonlocal codigo_en_analisis
         codigo = texto_codigo.get(1.0, "end-1c").strip()
         if not codigo:
-            tkinter.messagebox.showwarning("Advertencia", "Por favor ingrese código para analizar")
+            if not en_vivo:
+                tkinter.messagebox.showwarning("Advertencia", "Por favor ingrese código para analizar")
             return
         
-        try:
-            # Mostrar mensaje de procesamiento
-            texto_resultado.config(state="normal")
-            texto_resultado.delete(1.0, "end")
-            texto_resultado.insert("end", " Procesando análisis...\n")
-            texto_resultado.config(state="disabled")
-            container.update()
-            
-            # Tokenizar y parsear
-            tokens = tokenizar(codigo)
-            arbol = parsear(tokens)
-            analizador = AnalizadorComplejidad(arbol)
-            
-            # Buscar funciones
-            funciones = []
-            def encontrar_funciones(nodo):
-                if nodo.tipo == 'FUNCION':
-                    nombre = nodo.props.get('nombre')
-                    if nombre:
-                        funciones.append(nombre)
-                for hijo in nodo.hijos:
-                    encontrar_funciones(hijo)
-            
-            encontrar_funciones(arbol)
-            
-            # Analizar
-            if funciones:
-                resultado = analizador.analizar(funciones[0])
-            else:
-                resultado = analizador.analizar()
-            
-            # Mostrar resultado
-            texto_resultado.config(state="normal")
-            texto_resultado.delete(1.0, "end")
-            
-            # Resultado exitoso
-            texto_resultado.insert("end", " ANÁLISIS COMPLETADO EXITOSAMENTE\n\n")
-            texto_resultado.insert("end", f" Función: {resultado.nombre_funcion or 'Código principal'}\n")
-            texto_resultado.insert("end", f" Tipo: {'Función recursiva' if resultado.recursivo else 'Función iterativa'}\n")
-            texto_resultado.insert("end", f"  T(n) = {resultado.funcion_tiempo.como_str()}\n")
-            texto_resultado.insert("end", f" Big O: {resultado.big_o}\n")
-            texto_resultado.insert("end", f" Recursivo: {'Sí' if resultado.recursivo else 'No'}\n\n")
-            
-            # Información adicional
-            texto_resultado.insert("end", " Detalles adicionales:\n")
-            texto_resultado.insert("end", f"  • Tokens procesados: {len(tokens)}\n")
-            texto_resultado.insert("end", f"  • Funciones detectadas: {len(funciones)}\n")
-            if funciones:
-                texto_resultado.insert("end", f"  • Nombres de funciones: {', '.join(funciones)}\n")
-            
-            # Interpretación del resultado
-            texto_resultado.insert("end", "\n INTERPRETACIÓN:\n")
-            big_o = resultado.big_o
-            if "O(1)" in big_o:
-                texto_resultado.insert("end", " Complejidad constante - Muy eficiente\n")
-            elif "log" in big_o.lower():
-                texto_resultado.insert("end", " Complejidad logarítmica - Muy eficiente\n")
-            elif "O(n)" == big_o:
-                texto_resultado.insert("end", " Complejidad lineal - Eficiencia buena\n")
-            elif "n**2" in big_o or "n^2" in big_o:
-                texto_resultado.insert("end", " Complejidad cuadrática - Cuidado con datos grandes\n")
-            elif "2**n" in big_o or "2^n" in big_o:
-                texto_resultado.insert("end", " Complejidad exponencial - Solo para datos pequeños\n")
-            else:
-                texto_resultado.insert("end", " Complejidad personalizada - Analiza caso por caso\n")
-            
-            texto_resultado.insert("end", "\n💡 Usa las pestañas 'Gráfica' y 'Comparación' para más detalles\n")
-            
-            texto_resultado.config(state="disabled")
-            
-            # Habilitar botones
-            boton_ver_grafica.config(state="normal")
-            boton_comparar.config(state="normal")
-            boton_guardar.config(state="normal")
-            
-            # Guardar resultado
-            nonlocal ultimo_resultado
-            ultimo_resultado = resultado
-            
-        except Exception as e:
-            # Mostrar error
-            texto_resultado.config(state="normal")
-            texto_resultado.delete(1.0, "end")
-            texto_resultado.insert("end", " Error en el análisis:\n\n")
-            texto_resultado.insert("end", f" Detalles: {str(e)}\n\n")
-            texto_resultado.insert("end", " Posibles soluciones:\n")
-            texto_resultado.insert("end", "• Verifica que el código siga la sintaxis correcta\n")
-            texto_resultado.insert("end", "• Asegúrate de que las funciones estén bien definidas\n")
-            texto_resultado.insert("end", "• Revisa que los bucles tengan condiciones de parada\n")
-            texto_resultado.config(state="disabled")
-            
-            # Deshabilitar botones
-            boton_ver_grafica.config(state="disabled")
-            boton_comparar.config(state="disabled")
-            boton_guardar.config(state="disabled")
+        # Mostrar mensaje de procesamiento
+        if not en_vivo:
+            mostrar_progreso(0.0, "En cola")
+        
+        # El análisis corre en el hilo del ejecutor; un envío nuevo cancela el anterior
+        codigo_en_analisis = codigo
+        ejecutor.enviar('analisis', tarea_analisis, codigo,
+                        al_terminar=mostrar_resultado, al_fallar=mostrar_error,
+                        al_progresar=None if en_vivo else mostrar_progreso)
+
+    def mostrar_progreso(fraccion, mensaje):
+        texto_resultado.config(state="normal")
+        texto_resultado.delete(1.0, "end")
+        texto_resultado.insert("end", f" Procesando análisis... {int(fraccion * 100)}%\n")
+        texto_resultado.insert("end", f"  • {mensaje}\n")
+        texto_resultado.config(state="disabled")
+
+    def mostrar_resultado(resultado_y_detalles):
+        nonlocal ultimo_resultado, codigo_en_analisis
+        codigo_en_analisis = None
+        resultado, detalles = resultado_y_detalles
+        funciones = detalles['funciones']
+        
+        # Mostrar resultado
+        texto_resultado.config(state="normal")
+        texto_resultado.delete(1.0, "end")
+        
+        # Resultado exitoso
+        texto_resultado.insert("end", " ANÁLISIS COMPLETADO EXITOSAMENTE\n\n")
+        texto_resultado.insert("end", f" Función: {resultado.nombre_funcion or 'Código principal'}\n")
+        texto_resultado.insert("end", f" Tipo: {'Función recursiva' if resultado.recursivo else 'Función iterativa'}\n")
+        texto_resultado.insert("end", f"  T(n) = {resultado.funcion_tiempo.como_str()}\n")
+        texto_resultado.insert("end", f" Big O: {resultado.big_o}\n")
+        texto_resultado.insert("end", f" Recursivo: {'Sí' if resultado.recursivo else 'No'}\n\n")
+        
+        # Información adicional
+        texto_resultado.insert("end", " Detalles adicionales:\n")
+        texto_resultado.insert("end", f"  • Tokens procesados: {detalles['tokens']}\n")
+        texto_resultado.insert("end", f"  • Funciones detectadas: {len(funciones)}\n")
+        if funciones:
+            texto_resultado.insert("end", f"  • Nombres de funciones: {', '.join(funciones)}\n")
+        if detalles.get('desde_cache'):
+            texto_resultado.insert("end", "  • Resultado recuperado del cache\n")
+        
+        # Interpretación del resultado
+        texto_resultado.insert("end", "\n INTERPRETACIÓN:\n")
+        big_o = resultado.big_o
+        if "O(1)" in big_o:
+            texto_resultado.insert("end", " Complejidad constante - Muy eficiente\n")
+        elif "log" in big_o.lower():
+            texto_resultado.insert("end", " Complejidad logarítmica - Muy eficiente\n")
+        elif "O(n)" == big_o:
+            texto_resultado.insert("end", " Complejidad lineal - Eficiencia buena\n")
+        elif "n**2" in big_o or "n^2" in big_o:
+            texto_resultado.insert("end", " Complejidad cuadrática - Cuidado con datos grandes\n")
+        elif "2**n" in big_o or "2^n" in big_o:
+            texto_resultado.insert("end", " Complejidad exponencial - Solo para datos pequeños\n")
+        else:
+            texto_resultado.insert("end", " Complejidad personalizada - Analiza caso por caso\n")
+        
+        texto_resultado.insert("end", "\n💡 Usa las pestañas 'Gráfica' y 'Comparación' para más detalles\n")
+        
+        texto_resultado.config(state="disabled")
+        
+        # Habilitar botones
+        boton_ver_grafica.config(state="normal")
+        boton_comparar.config(state="normal")
+        boton_guardar.config(state="normal")
+        
+        # Guardar resultado
+        ultimo_resultado = resultado
+
+    def mostrar_error(e):
+        nonlocal codigo_en_analisis
+        codigo_en_analisis = None
+        # Mostrar error
+        texto_resultado.config(state="normal")
+        texto_resultado.delete(1.0, "end")
+        texto_resultado.insert("end", " Error en el análisis:\n\n")
+        texto_resultado.insert("end", f" Detalles: {str(e)}\n\n")
+        texto_resultado.insert("end", " Posibles soluciones:\n")
+        texto_resultado.insert("end", "• Verifica que el código siga la sintaxis correcta\n")
+        texto_resultado.insert("end", "• Asegúrate de que las funciones estén bien definidas\n")
+        texto_resultado.insert("end", "• Revisa que los bucles tengan condiciones de parada\n")
+        texto_resultado.config(state="disabled")
+        
+        # Deshabilitar botones
+        boton_ver_grafica.config(state="disabled")
+        boton_comparar.config(state="disabled")
+        boton_guardar.config(state="disabled")
+
+    def programar_analisis(evento=None):
+        """Tras cada tecla: descarta un análisis del texto anterior y, en vivo, reprograma"""
+        nonlocal analisis_programado, codigo_en_analisis
+        if codigo_en_analisis is not None and texto_codigo.get(1.0, "end-1c").strip() != codigo_en_analisis:
+            ejecutor.cancelar('analisis')
+            codigo_en_analisis = None
+            if not analisis_en_vivo.get():
+                texto_resultado.config(state="normal")
+                texto_resultado.delete(1.0, "end")
+                texto_resultado.insert("end", " Análisis cancelado: el código cambió. Presione 'Analizar' de nuevo.\n")
+                texto_resultado.config(state="disabled")
+        if not analisis_en_vivo.get():
+            return
+        if analisis_programado is not None:
+            container.after_cancel(analisis_programado)
+        analisis_programado = container.after(400, analizar_en_vivo)
+
+    def analizar_en_vivo():
+        nonlocal analisis_programado
+        analisis_programado = None
+        analizar_codigo(en_vivo=True)
 
     def guardar_analisis():
         if ultimo_resultado:
@@ -249,6 +296,7 @@ def crear_pestana_entrada_mejorada(frame, cambiar_a_grafica_callback=None, cambi
     scroll_codigo = tb.Scrollbar(frame_codigo, command=texto_codigo.yview)
     scroll_codigo.pack(side="right", fill="y")
     texto_codigo.config(yscrollcommand=scroll_codigo.set)
+    texto_codigo.bind("<KeyRelease>", programar_analisis)
 
     # --- BOTONES DE ACCIÓN ---
     frame_botones = tb.Frame(container)
@@ -266,6 +314,10 @@ def crear_pestana_entrada_mejorada(frame, cambiar_a_grafica_callback=None, cambi
     boton_guardar = tb.Button(frame_botones, text="💾 Guardar", command=guardar_analisis, bootstyle="warning", state="disabled")
     boton_guardar.pack(side="left", padx=5)
 
+    check_en_vivo = tb.Checkbutton(frame_botones, text="Análisis en vivo", variable=analisis_en_vivo,
+                                   command=programar_analisis, bootstyle="round-toggle")
+    check_en_vivo.pack(side="left", padx=5)
+
     # --- RESULTADO DEL ANÁLISIS ---
     etiqueta_resultado = tb.Label(container, text="📊 Resultado del análisis:", font=("Segoe UI", 12, "bold"))
     etiqueta_resultado.pack(anchor="w", padx=20, pady=(15, 5))
@@ -1,20 +1,75 @@
 import ttkbootstrap as tb
-import matplotlib
-matplotlib.use('TkAgg')  # Configurar backend antes de importar pyplot
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
-import numpy as np
-import sympy
+import math
 import sys
 import os
 
 # Agregar el directorio padre al path para importar módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.expresion_simbolica import ExpresionSimbolica, rango_evaluacion
+from gui.ejecutor import ejecutor_compartido
+from gui.superficie import SuperficieGrafica
+
+def backend_tk():
+    """
+    Importa matplotlib con el backend TkAgg recién al dibujar la primera gráfica.
+
+    Retorna (Figure, FigureCanvasTkAgg, NavigationToolbar2Tk); así abrir la
+    aplicación no paga la importación de matplotlib.
+    """
+    import matplotlib
+    matplotlib.use('TkAgg')  # Configurar backend antes de importar pyplot
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+    return Figure, FigureCanvasTkAgg, NavigationToolbar2Tk
+
+# Rangos de n disponibles para graficar
+RANGOS = {
+    "n ≤ 20": 20,
+    "n ≤ 100": 100,
+    "n ≤ 1000": 1000,
+    "n ≤ 10⁴": 10 ** 4,
+    "n ≤ 10⁶": 10 ** 6,
+}
+
+def calcular_curvas(trabajo, resultado, n_max):
+    """
+    Evalúa T(n) y la curva de su clase Big O sobre la grilla de n (en el hilo del ejecutor).
+
+    Retorna un dict con todo lo que el dibujo necesita, de modo que el hilo
+    de Tk sólo llama a matplotlib.
+    """
+    n_values = rango_evaluacion(n_max)
+    funcion_tiempo = resultado.funcion_tiempo
+    trabajo.progreso(0.1, "Evaluando T(n)")
+    t_values, t_en_log = funcion_tiempo.valores_grafica(n_values)
+
+    # Función representativa de la clase Big O
+    trabajo.progreso(0.5, "Evaluando la curva Big O")
+    big_o_funcion = ExpresionSimbolica(funcion_tiempo.clase_asintotica().como_expresion())
+    big_o_values, big_o_en_log = big_o_funcion.valores_grafica(n_values)
+    en_log10 = t_en_log or big_o_en_log
+    if en_log10:
+        # Alguna curva desborda: ambas se muestran como log10 T(n)
+        trabajo.progreso(0.8, "Pasando a escala logarítmica")
+        t_values = funcion_tiempo.evaluar_log(n_values) / math.log(10)
+        big_o_values = big_o_funcion.evaluar_log(n_values) / math.log(10)
+    return {
+        'n_max': n_max,
+        'n_values': n_values,
+        't_values': t_values,
+        'big_o_values': big_o_values,
+        'en_log10': en_log10,
+        't_str': funcion_tiempo.como_str(),
+    }
+
 def crear_pestana_grafica(frame):
     # Variable global para almacenar el resultado actual
     resultado_actual = None
+    # Figura persistente: se crea con la primera gráfica y luego sólo cambian sus datos
+    superficie = None
+    # La evaluación de las curvas corre fuera del hilo de Tk
+    ejecutor = ejecutor_compartido(frame)
     
     def actualizar_grafica(resultado_analisis=None):
         """Actualiza la gráfica con un nuevo resultado de análisis"""
@@ -24,117 +79,87 @@ def crear_pestana_grafica(frame):
             mostrar_grafica()
     
     def mostrar_grafica():
-        """Muestra la gráfica del análisis actual"""
+        """Evalúa las curvas del análisis actual en segundo plano y luego las dibuja"""
         if resultado_actual is None:
             # Mostrar mensaje cuando no hay datos
             etiqueta_info.config(text="No hay análisis para mostrar. Analice código en la pestaña 'Entrada' primero.")
             return
         
-        # Limpiar frame anterior si existe
-        for widget in frame_grafica.winfo_children():
-            widget.destroy()
+        # Cambiar de rango o de resultado antes de terminar cancela el cálculo anterior
+        n_max = RANGOS[combo_rango.get()]
+        etiqueta_info.config(text="Calculando gráfica...")
+        ejecutor.enviar('grafica', calcular_curvas, resultado_actual, n_max,
+                        al_terminar=dibujar_grafica, al_progresar=mostrar_progreso,
+                        al_fallar=lambda e: etiqueta_info.config(text=f"Error al generar gráfica: {str(e)}"))
+    
+    def mostrar_progreso(fraccion, mensaje):
+        etiqueta_info.config(text=f"Calculando gráfica... {int(fraccion * 100)}% ({mensaje})")
+    
+    def crear_superficie():
+        """Crea la figura, el canvas y la barra de herramientas (sólo la primera vez)"""
+        Figure, FigureCanvasTkAgg, NavigationToolbar2Tk = backend_tk()
+        
+        # Crear figura de matplotlib embebida; el diseño se ajusta en cada dibujo completo
+        fig = Figure(figsize=(12, 5), dpi=100, layout='tight')
+        ax1, ax2 = fig.subplots(1, 2)
+        ax1.set_title('Función de Tiempo T(n)')
+        ax2.set_title('Comparación T(n) vs Big O')
+        for ax in (ax1, ax2):
+            ax.set_xlabel('Tamaño de entrada (n)')
+            ax.grid(True, alpha=0.3)
         
+        # Integrar matplotlib con tkinter
+        canvas = FigureCanvasTkAgg(fig, frame_grafica)
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        
+        # Agregar barra de herramientas de navegación
+        toolbar_frame = tb.Frame(frame_grafica)
+        toolbar_frame.pack(fill="x")
+        toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
+        toolbar.update()
+        
+        superficie = SuperficieGrafica(canvas)
+        superficie.agregar_curva('t', ax1, 'b-', linewidth=2, markersize=6)
+        superficie.agregar_curva('t_comparada', ax2, 'b-', linewidth=2, markersize=6)
+        superficie.agregar_curva('big_o', ax2, 'r--', linewidth=2)
+        return superficie
+    
+    def dibujar_grafica(curvas):
+        """Actualiza las curvas ya evaluadas sobre la figura existente (hilo de Tk)"""
+        nonlocal superficie
         try:
-            # Crear figura de matplotlib embebida
-            fig = Figure(figsize=(12, 5), dpi=100)
-            ax1, ax2 = fig.subplots(1, 2)
-            fig.suptitle(f'Análisis de Complejidad - {resultado_actual.nombre_funcion or "Código"}', fontsize=14)
+            if superficie is None:
+                superficie = crear_superficie()
+            fig = superficie.figura
+            ax1, ax2 = fig.axes
             
-            # Configurar rango de valores
-            n_values = np.arange(1, 21)
+            titulo = f'Análisis de Complejidad - {resultado_actual.nombre_funcion or "Código"}'
+            if fig.get_suptitle() != titulo:
+                fig.suptitle(titulo, fontsize=14)
             
-            # Graficar función de tiempo T(n)
-            t_values = []
-            expr = resultado_actual.funcion_tiempo.expr
+            # Rango de valores (enteros hasta 400 puntos, grilla logarítmica por encima)
+            n_values = curvas['n_values']
+            en_log10 = curvas['en_log10']
+            marcador = 'o' if len(n_values) <= 50 else 'None'
+            escala_log = curvas['n_max'] > 100
+            etiqueta_y = 'log₁₀ Tiempo de ejecución' if en_log10 else 'Tiempo de ejecución'
+            etiqueta_t = f"T(n) = {curvas['t_str']}"
             
-            for n in n_values:
-                try:
-                    # Evaluar la expresión simbólica usando Symbol
-                    val = expr.subs(sympy.Symbol('N'), n)
-                    if hasattr(val, 'is_number') and val.is_number:
-                        t_values.append(float(val))
-                    elif hasattr(val, 'evalf'):
-                        # Si la expresión contiene variables no substituidas, evaluar numéricamente
-                        result = float(val.evalf())
-                        # Limitar valores muy grandes para visualización
-                        t_values.append(min(result, 1e6))
-                    else:
-                        t_values.append(float(val))
-                except Exception as e:
-                    # Fallback basado en Big O
-                    big_o = resultado_actual.big_o
-                    if "2^" in big_o or "2**" in big_o:
-                        t_values.append(min(2**n, 1e6))
-                    elif "n**2" in big_o or "n^2" in big_o:
-                        t_values.append(n**2)
-                    elif "n" in big_o.lower():
-                        t_values.append(n)
-                    else:
-                        t_values.append(1)
+            for ax in (ax1, ax2):
+                if ax.get_ylabel() != etiqueta_y:
+                    ax.set_ylabel(etiqueta_y)
+                superficie.fijar_escalas(ax, 'log' if escala_log else 'linear',
+                                         'symlog' if escala_log and not en_log10 else 'linear')
             
-            ax1.plot(n_values, t_values, 'b-o', linewidth=2, markersize=6, label=f'T(n) = {resultado_actual.funcion_tiempo.como_str()}')
-            ax1.set_xlabel('Tamaño de entrada (n)')
-            ax1.set_ylabel('Tiempo de ejecución')
-            ax1.set_title('Función de Tiempo T(n)')
-            ax1.grid(True, alpha=0.3)
-            ax1.legend()
-            
-            # Graficar comparación con Big O
-            big_o_str = resultado_actual.big_o.replace('O(', '').replace(')', '')
-            
-            # Generar función Big O para comparación
-            big_o_values = []
-            try:
-                # Preparar el string de Big O para sympy
-                big_o_clean = big_o_str.replace('**', '^').replace('^', '**')
-                N = sympy.Symbol('N')
-                local_dict = {'N': N, 'n': N, 'log': sympy.log}
-                big_o_expr = sympy.sympify(big_o_clean, locals=local_dict)
-                
-                for n in n_values:
-                    val = big_o_expr.subs(N, n)
-                    if hasattr(val, 'is_number') and val.is_number:
-                        big_o_values.append(float(val))
-                    elif hasattr(val, 'evalf'):
-                        result = float(val.evalf())
-                        big_o_values.append(min(result, 1e6))
-                    else:
-                        big_o_values.append(float(val))
-            except Exception as e:
-                # Fallback para casos complejos
-                if "2^" in big_o_str or "2**" in big_o_str:
-                    big_o_values = [min(2**n, 1e6) for n in n_values]
-                elif "n**2" in big_o_str or "n^2" in big_o_str:
-                    big_o_values = [n**2 for n in n_values]
-                elif "n" in big_o_str.lower():
-                    big_o_values = [n for n in n_values]
-                else:
-                    big_o_values = [1 for n in n_values]
-            
-            ax2.plot(n_values, t_values, 'b-o', linewidth=2, markersize=6, label=f'T(n) = {resultado_actual.funcion_tiempo.como_str()}')
-            ax2.plot(n_values, big_o_values, 'r--', linewidth=2, label=f'Big O = {resultado_actual.big_o}')
-            ax2.set_xlabel('Tamaño de entrada (n)')
-            ax2.set_ylabel('Tiempo de ejecución')
-            ax2.set_title('Comparación T(n) vs Big O')
-            ax2.grid(True, alpha=0.3)
-            ax2.legend()
-            
-            fig.tight_layout()
-            
-            # Integrar matplotlib con tkinter
-            canvas = FigureCanvasTkAgg(fig, frame_grafica)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
-            
-            # Agregar barra de herramientas de navegación
-            toolbar_frame = tb.Frame(frame_grafica)
-            toolbar_frame.pack(fill="x")
-            toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
-            toolbar.update()
+            superficie.fijar_datos('t', n_values, curvas['t_values'], etiqueta=etiqueta_t, marker=marcador)
+            superficie.fijar_datos('t_comparada', n_values, curvas['t_values'], etiqueta=etiqueta_t, marker=marcador)
+            superficie.fijar_datos('big_o', n_values, curvas['big_o_values'],
+                                   etiqueta=f'Big O = {resultado_actual.big_o}')
+            superficie.refrescar()
             
             # Actualizar etiqueta de información
             info_text = f"Función: {resultado_actual.nombre_funcion or 'Código principal'}\n"
-            info_text += f"T(n) = {resultado_actual.funcion_tiempo.como_str()}\n"
+            info_text += f"T(n) = {curvas['t_str']}\n"
             info_text += f"Big O: {resultado_actual.big_o}"
             if resultado_actual.recursivo:
                 info_text += "\nTipo: Función recursiva"
@@ -146,7 +171,7 @@ def crear_pestana_grafica(frame):
     
     def exportar_grafica():
         """Exporta la gráfica actual como imagen"""
-        if resultado_actual is None:
+        if resultado_actual is None or superficie is None:
             return
         
         import tkinter.filedialog
@@ -158,11 +183,7 @@ def crear_pestana_grafica(frame):
         
         if archivo:
             try:
-                # Obtener la figura actual del canvas
-                for widget in frame_grafica.winfo_children():
-                    if isinstance(widget, FigureCanvasTkAgg):
-                        widget.figure.savefig(archivo, dpi=300, bbox_inches='tight')
-                        break
+                superficie.exportar(archivo, dpi=300, bbox_inches='tight')
                 
                 import tkinter.messagebox
                 tkinter.messagebox.showinfo("Éxito", f"Gráfica guardada en: {archivo}")
@@ -182,6 +203,15 @@ def crear_pestana_grafica(frame):
     boton_exportar = tb.Button(frame_info, text="Exportar gráfica", command=exportar_grafica, bootstyle="success-outline")
     boton_exportar.pack(side="right")
     
+    # Selector del rango de n (se vuelve a graficar al cambiarlo)
+    combo_rango = tb.Combobox(frame_info, values=list(RANGOS), state="readonly", width=10)
+    combo_rango.set("n ≤ 20")
+    combo_rango.pack(side="right", padx=5)
+    combo_rango.bind("<<ComboboxSelected>>", lambda e: mostrar_grafica())
+    
+    etiqueta_rango = tb.Label(frame_info, text="Rango:", font=("Segoe UI", 10))
+    etiqueta_rango.pack(side="right")
+    
     # Etiqueta de información del análisis
     etiqueta_info = tb.Label(frame, text="No hay análisis para mostrar. Analice código en la pestaña 'Entrada' primero.", 
                            font=("Segoe UI", 11), wraplength=600, justify="left")
@@ -0,0 +1,153 @@
+# superficie.py
+#
+# Superficie de dibujo persistente: una sola Figure de matplotlib cuyas
+# curvas se actualizan en el lugar. No depende de Tk, así que sirve con
+# cualquier canvas basado en Agg (TkAgg en la interfaz, Agg en benchmarks).
+
+import numpy as np
+
+
+class SuperficieGrafica:
+    """
+    Figura que se crea una vez y se redibuja cambiando los datos de sus curvas.
+
+        superficie = SuperficieGrafica(canvas)
+        superficie.agregar_curva('t', ax, 'b-', linewidth=2)
+        ...
+        superficie.fijar_datos('t', n_values, t_values, etiqueta="T(n) = ...")
+        superficie.refrescar()
+
+    Las curvas son artistas 'animated': el dibujo completo del canvas pinta
+    ejes, grilla y leyendas, guarda ese fondo y recién entonces pinta las
+    curvas encima. En refrescar() los ejes se reajustan con relim() y
+    autoscale_view(); si límites, escalas y textos quedan iguales que en el
+    último dibujo completo, sólo se restaura el fondo, se pintan las curvas
+    y se hace blit. Si algo cambió (o el canvas no admite blit) se pide un
+    dibujo completo con draw_idle(), que en Tk se agrupa con los demás
+    pedidos pendientes.
+
+    savefig() también pinta los artistas 'animated', así que la figura se
+    exporta completa; ver exportar().
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.figura = canvas.figure
+        self.curvas = {}            # nombre -> Line2D
+        self.dibujos_completos = 0
+        self.blits = 0
+        self._fondo = None          # región guardada en el último dibujo completo
+        self._firma = None          # estado de ejes y textos de ese dibujo
+        self._leyendas = {}         # ejes -> etiquetas de su leyenda actual
+        self._id_dibujo = canvas.mpl_connect('draw_event', self._al_dibujar)
+
+    def agregar_curva(self, nombre, ax, formato='-', **propiedades):
+        """Crea (sin datos) la curva 'nombre' en 'ax'; se llama una vez por curva"""
+        linea, = ax.plot([], [], formato, animated=True, **propiedades)
+        self.curvas[nombre] = linea
+        return linea
+
+    def fijar_datos(self, nombre, x, y, etiqueta=None, **propiedades):
+        """Reemplaza los datos de una curva (y su etiqueta o propiedades, si cambian)"""
+        linea = self.curvas[nombre]
+        linea.set_data(x, y)
+        if etiqueta is not None and etiqueta != linea.get_label():
+            linea.set_label(etiqueta)
+        for propiedad, valor in propiedades.items():
+            if getattr(linea, f'get_{propiedad}')() != valor:
+                getattr(linea, f'set_{propiedad}')(valor)
+
+    @staticmethod
+    def fijar_escalas(ax, xscale, yscale):
+        """Cambia las escalas sólo si difieren (set_*scale reinicia localizadores)"""
+        if ax.get_xscale() != xscale:
+            ax.set_xscale(xscale)
+        if ax.get_yscale() != yscale:
+            ax.set_yscale(yscale)
+
+    # --- dibujo ---
+
+    def _ejes(self):
+        return list(dict.fromkeys(linea.axes for linea in self.curvas.values()))
+
+    def _actualizar_leyendas(self):
+        """Vuelve a crear la leyenda de los ejes cuyas etiquetas cambiaron"""
+        for ax in self._ejes():
+            etiquetas = tuple(linea.get_label() for linea in ax.get_lines())
+            if self._leyendas.get(ax) != etiquetas:
+                ax.legend()
+                self._leyendas[ax] = etiquetas
+
+    @staticmethod
+    def _reajustar(ax):
+        """Límites a partir de los datos actuales de las curvas"""
+        ax.set_autoscale_on(True)
+        ax.relim()
+        with np.errstate(over='ignore'):
+            ax.autoscale_view()
+        # Cerca del mayor float el margen de 'symlog' desborda y matplotlib
+        # vuelve a los límites por defecto: se usan los de los datos sin margen
+        datos = ax.dataLim
+        if np.isfinite(datos.bounds).all():
+            y0, y1 = ax.get_ylim()
+            if not (y0 <= datos.y0 and datos.y1 <= y1):
+                ax.set_ylim(datos.y0, datos.y1)
+
+    def _firma_actual(self):
+        """Todo lo que, si cambia, obliga a dibujar de nuevo el fondo"""
+        firma = [self.figura.bbox.bounds, self.figura.get_suptitle()]
+        for ax in self._ejes():
+            firma.extend((ax.get_xlim(), ax.get_ylim(), ax.get_xscale(), ax.get_yscale(),
+                          ax.get_xlabel(), ax.get_ylabel(), ax.get_title(), self._leyendas.get(ax)))
+        return tuple(firma)
+
+    def refrescar(self, reajustar=True):
+        """
+        Muestra los datos fijados: blit si la vista no cambió, dibujo completo si no.
+
+        Con reajustar=True (un resultado nuevo) los límites se recalculan a
+        partir de los datos aunque el usuario haya hecho zoom, como hacía la
+        figura recreada en cada actualización.
+        """
+        if reajustar:
+            for ax in self._ejes():
+                self._reajustar(ax)
+            toolbar = getattr(self.canvas, 'toolbar', None)
+            if toolbar is not None:
+                toolbar.update()  # la vista 'inicio' pasa a ser la nueva
+        self._actualizar_leyendas()
+
+        if self.canvas.supports_blit and self._fondo is not None and self._firma == self._firma_actual():
+            self.canvas.restore_region(self._fondo)
+            self._pintar_curvas()
+            self.canvas.blit(self.figura.bbox)
+            self.blits += 1
+        else:
+            # Hasta que el dibujo pendiente termine no hay fondo válido
+            self._fondo = None
+            self.canvas.draw_idle()
+
+    def _pintar_curvas(self):
+        for linea in self.curvas.values():
+            linea.axes.draw_artist(linea)
+
+    def _al_dibujar(self, evento):
+        """Después de cada dibujo completo (también los de zoom o cambio de tamaño)"""
+        if evento is not None and evento.canvas is not self.canvas:
+            return
+        if self.canvas.is_saving():
+            # savefig ya pinta las curvas y usa otra resolución: el fondo no sirve
+            self._fondo = None
+            return
+        self._fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+        self._firma = self._firma_actual()
+        self._pintar_curvas()
+        self.dibujos_completos += 1
+
+    def exportar(self, archivo, **opciones):
+        """Guarda la figura completa y vuelve a dibujar la que está en pantalla"""
+        self.figura.savefig(archivo, **opciones)
+        self.canvas.draw_idle()
+
+    def desconectar(self):
+        self.canvas.mpl_disconnect(self._id_dibujo)
@@ -6,7 +6,6 @@ y verificar que el analizador de complejidad detecte correctamente T(n) y Big O.
 
 import os
 import sys
-import subprocess
 import json
 from pathlib import Path
 
@@ -23,82 +22,21 @@ def obtener_archivos_ejemplo():
     archivos = list(carpeta_ejemplos.glob("*.txt"))
     return sorted(archivos)
 
-def ejecutar_analizador(archivo_ejemplo):
-    """Ejecuta el analizador para un archivo específico"""
-    try:
-        # Usar Python del entorno virtual
-        python_exe = r"C:/Users/tarqu/OneDrive/Documentos/ADAProyecto/ProyectoFinal---Algoritmica-I/.venv/Scripts/python.exe"
-        
-        # Ejecutar el comando principal con --cli
-        cmd = [python_exe, "main.py", "--cli", str(archivo_ejemplo)]
-        
-        # Configurar el entorno para UTF-8 en Windows
-        env = os.environ.copy()
-        env['PYTHONIOENCODING'] = 'utf-8'
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, 
-                              encoding='utf-8', errors='replace', env=env)
-        
-        if result.returncode != 0:
-            return {
-                'archivo': archivo_ejemplo.name,
-                'error': f"Error de ejecución: {result.stderr}",
-                'stdout': result.stdout,
-                'stderr': result.stderr
-            }
-        
-        # Parsear la salida para extraer T(n) y Big O
-        salida = result.stdout
-        return parsear_salida_analizador(archivo_ejemplo.name, salida)
-        
-    except subprocess.TimeoutExpired:
-        return {
-            'archivo': archivo_ejemplo.name,
-            'error': "Timeout - el análisis tardó más de 30 segundos"
-        }
-    except Exception as e:
+def adaptar_registro(registro):
+    """Convierte un resultado de analizar_lote al formato de este reporte"""
+    nombre = Path(registro['archivo']).name
+    if registro['error']:
         return {
-            'archivo': archivo_ejemplo.name,
-            'error': f"Excepción: {str(e)}"
+            'archivo': nombre,
+            'error': registro['error']
         }
-
-def parsear_salida_analizador(nombre_archivo, salida):
-    """Extrae T(n) y Big O de la salida del analizador"""
-    resultado = {
-        'archivo': nombre_archivo,
-        'tn': None,
-        'big_o': None,
-        'recursivo': False,
-        'funcion': None,
-        'salida_completa': salida
+    return {
+        'archivo': nombre,
+        'tn': registro['t_n'],
+        'big_o': registro['big_o'],
+        'recursivo': registro['recursivo'],
+        'funcion': registro['funcion']
     }
-    
-    lineas = salida.split('\n')
-    for i, linea in enumerate(lineas):
-        linea = linea.strip()
-        
-        # Buscar función analizada
-        if linea.startswith("Función: '") and "': " in linea:
-            inicio = linea.find("'") + 1
-            fin = linea.find("'", inicio)
-            if fin > inicio:
-                resultado['funcion'] = linea[inicio:fin]
-        
-        # Buscar si es recursiva
-        if "(recursiva)" in linea:
-            resultado['recursivo'] = True
-        
-        # Buscar T(n)
-        if "T(n) =" in linea:
-            tn_parte = linea.split("T(n) =", 1)[1].strip()
-            resultado['tn'] = tn_parte
-        
-        # Buscar Big O
-        if "Big O:" in linea:
-            big_o_parte = linea.split("Big O:", 1)[1].strip()
-            resultado['big_o'] = big_o_parte
-    
-    return resultado
 
 def clasificar_algoritmo_esperado(nombre_archivo):
     """Clasifica la complejidad esperada basada en el nombre del archivo"""
@@ -128,8 +66,10 @@ def clasificar_algoritmo_esperado(nombre_archivo):
     elif 'multiplicacion_matrices' in nombre:
         return 'O(N**3)', 'Cúbico'
     
-    # Algoritmos exponenciales O(2^n)
-    elif any(palabra in nombre for palabra in ['fibonacci_recursivo', 'hanoi']):
+    # Algoritmos exponenciales: Fibonacci crece como φ^n (φ ≈ 1.618), Hanoi como 2^n
+    elif 'fibonacci_recursivo' in nombre:
+        return 'O(φ**N)', 'Exponencial'
+    elif 'hanoi' in nombre:
         return 'O(2**N)', 'Exponencial'
     
     # Algoritmos con múltiples variables O(n*m)
@@ -175,6 +115,10 @@ def normalizar_big_o(big_o_str):
         'o(n³)': 'O(N**3)',
         'o(2^n)': 'O(2**N)',
         'o(2**n)': 'O(2**N)',
+        'o(1.618^n)': 'O(φ**N)',
+        'o(1.618**n)': 'O(φ**N)',
+        'o(φ^n)': 'O(φ**N)',
+        'o(φ**n)': 'O(φ**N)',
         'o(n*m)': 'O(N*M)',
         'o(n*w)': 'O(N*W)',
     }
@@ -323,13 +267,14 @@ def main():
     print(f"📁 Encontrados {len(archivos)} archivos de ejemplo")
     print()
     
-    # Procesar cada archivo
+    # Procesar los archivos en paralelo (los resultados llegan en orden)
+    from core.analisis_lote import analizar_lote
+    
     resultados = []
-    for i, archivo in enumerate(archivos, 1):
-        print(f"[{i:2d}/{len(archivos)}] Procesando: {archivo.name}... ", end="", flush=True)
-        
-        resultado = ejecutar_analizador(archivo)
+    for i, registro in enumerate(analizar_lote(archivos), 1):
+        resultado = adaptar_registro(registro)
         resultados.append(resultado)
+        print(f"[{i:2d}/{len(archivos)}] Procesando: {resultado['archivo']}... ", end="", flush=True)
         
         if 'error' in resultado:
             print("❌ ERROR")